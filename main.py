@@ -1,22 +1,46 @@
-from flask import Flask, render_template, redirect, url_for, request, send_file, flash, jsonify, session
-from jinja2 import DictLoader
+from flask import Flask, Response, abort, render_template, redirect, url_for, request, send_file, flash, jsonify, session, g, has_app_context
+from jinja2 import DictLoader, FileSystemBytecodeCache
+import click
 import sqlite3
 import os
+from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.utils import secure_filename
 from werkzeug.security import generate_password_hash, check_password_hash
+import io
 from io import BytesIO, StringIO
 from datetime import datetime, date, timedelta
 import uuid
 from functools import wraps
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from collections import OrderedDict, deque
 import csv
-import shutil
 import hashlib
-
-# Add for charts
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
 import base64
+import json
+import math
+import multiprocessing
+import random
+import re
+from bisect import bisect_right
+import subprocess
+import sys
+import threading
+import time
+import zlib
+
+import password_worker
+import timetable_solver
+from timetable_solver import solve_timetable
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; responses fall back to gzip
+    brotli = None
+
+# Process pools start from a fork server rather than forking this
+# multithreaded web process; the server only preloads the small worker modules
+WORKER_MP_CONTEXT = multiprocessing.get_context('forkserver')
+WORKER_MP_CONTEXT.set_forkserver_preload(['password_worker', 'timetable_solver'])
 
 app = Flask(__name__)
 app.secret_key = 'school-management-system-secret-key-2024'
@@ -24,8 +48,59 @@ app.config['UPLOAD_FOLDER'] = 'static/uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['ALLOWED_IMAGE_EXTENSIONS'] = ['PNG', 'JPG', 'JPEG', 'GIF', 'SVG']
 app.config['LOGO_FOLDER'] = 'static/logos'
+app.config['DATABASE'] = 'school.db'
+app.config['COMPRESS_RESPONSES'] = True
+app.config['COMPRESS_MIN_SIZE'] = 500  # bytes; smaller responses are sent as-is
+app.config['COMPRESS_LEVEL'] = 6  # gzip level 1-9
+app.config['COMPRESS_BROTLI_QUALITY'] = 5  # brotli quality 0-11
+app.config['ASSET_MINIFY'] = True  # strip comments and indentation from bundled CSS/JS at startup
+app.config['JINJA_BYTECODE_CACHE'] = True  # share compiled templates between workers through CACHE_FOLDER
+app.config['JINJA_PRECOMPILE'] = True  # compile every template at startup instead of on first use
+app.config['CACHE_FOLDER'] = 'cache'
+app.config['PAGE_SIZE'] = 50  # rows per page on paginated listings
+app.config['MAX_PAGE_SIZE'] = 500
+app.config['EXPORT_CHUNK_SIZE'] = 500  # rows fetched per round-trip when streaming exports
+app.config['STUDENT_IMPORT_BATCH_SIZE'] = 1000  # rows per transaction when importing students
+app.config['STUDENT_IMPORT_MAX_ERRORS'] = 500  # row errors kept for the import report
+app.config['STATEMENT_IMPORT_BATCH_SIZE'] = 1000  # payments per transaction when importing bank statements
+app.config['PASSWORD_HASH_METHOD'] = 'scrypt:32768:8:1'  # werkzeug's scrypt default: 32 MiB and ~0.15 s per hash
+app.config['PROVISION_WORKERS'] = max((os.cpu_count() or 1) // 2, 1)  # processes hashing passwords during bulk provisioning
+app.config['PROVISION_NICENESS'] = 10  # hashing processes run at lower priority than web requests
+app.config['PROVISION_BATCH_SIZE'] = 100  # accounts hashed per task and inserted per transaction
+app.config['PASSWORD_HASH_WORKERS'] = max((os.cpu_count() or 1) // 2, 1)  # hashes run at once; the rest of the CPU stays with requests
+app.config['PASSWORD_HASH_MAX_PENDING'] = 32  # hashes queued or running before logins are turned away
+app.config['LOGIN_THROTTLE_WINDOW'] = 300  # seconds failed logins are remembered
+app.config['LOGIN_MAX_FAILURES_PER_USER'] = 5  # failures per username and IP within the window
+app.config['LOGIN_MAX_FAILURES_PER_IP'] = 100  # failures on any username per IP within the window
+# Reverse proxies in front of the app. Throttling keys on the client IP, so
+# behind a proxy set this to the number of proxies that append X-Forwarded-For;
+# otherwise every user shares the proxy's address
+app.config['PROXY_FIX_X_FOR'] = 0
+app.config['USE_CLASS_STATS'] = True  # read student counts from the trigger-maintained class_stats table
+app.config['CHART_CACHE_MAX_FILES'] = 200  # rendered charts kept on disk before LRU eviction
+app.config['CHART_RENDER_WORKERS'] = 1  # pyplot is not thread-safe, so render one chart at a time
+app.config['CHART_RENDER_TIMEOUT'] = 30  # seconds a request waits for its chart
+app.config['TIMETABLE_GRID_CACHE_SIZE'] = 64  # rendered timetable grids kept per worker
+app.config['TIMETABLE_SCHOOL_DAYS'] = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']  # days the generator fills
+app.config['TIMETABLE_GENERATOR_TIME_BUDGET'] = 55  # seconds before the generator gives up
+app.config['TIMETABLE_GENERATOR_WORKERS'] = os.cpu_count() or 1  # solver processes searching in parallel
+app.config['CACHE_VERSION_CHECK_INTERVAL'] = 2  # seconds other workers may serve stale cached data
+app.config['DB_POOL_SIZE'] = 5  # connections per worker process
+app.config['DB_POOL_TIMEOUT'] = 10  # seconds to wait for a free connection
+# Storage profile applied to every new connection (busy_timeout first so the
+# switch to WAL waits for other workers instead of failing)
+app.config['DB_PRAGMAS'] = {
+    'busy_timeout': 5000,  # milliseconds
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,  # bytes
+    'cache_size': -32000,  # negative means KiB, i.e. ~32MB per connection
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',
+}
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(app.config['LOGO_FOLDER'], exist_ok=True)
+os.makedirs(app.config['CACHE_FOLDER'], exist_ok=True)
 
 # Login required decorator
 def login_required(f):
@@ -67,4521 +142,5650 @@ templates = {
 <meta name="viewport" content="width=device-width, initial-scale=1.0"/>
 <title>School Management System</title>
 <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
-<style>
-  :root {
-    --primary-color: #4361ee;
-    --secondary-color: #3f37c9;
-    --accent-color: #4cc9f0;
-    --success-color: #4ade80;
-    --warning-color: #facc15;
-    --danger-color: #f87171;
-    --dark-color: #1e293b;
-    --light-color: #f8fafc;
-    --gray-light: #e2e8f0;
-    --gray-medium: #94a3b8;
-    --sidebar-width-collapsed: 80px;
-    --sidebar-width-expanded: 250px;
-    --transition-speed: 0.3s;
-    --shadow-sm: 0 1px 2px 0 rgba(0, 0, 0, 0.05);
-    --shadow-md: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-    --shadow-lg: 0 10px 15px -3px rgba(0, 0, 0, 0.1);
-  }
+<link rel="stylesheet" href="{{ asset_url('base.css') }}">
+<script src="{{ asset_url('base.js') }}"></script>
+</head>
+<body>
+<div class="loading-overlay">
+  <div>
+    <div class="loading-spinner"></div>
+    <div class="loading-text">Loading...</div>
+  </div>
+</div>
 
-  * {
-    margin: 0;
-    padding: 0;
-    box-sizing: border-box;
-    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-  }
+{% if request.endpoint != 'login' %}
+<div class="sidebar">
+  <div class="user-info">
+    <div class="user-avatar">
+      <i class="fas fa-user"></i>
+    </div>
+    <div class="user-name">{{ session.username|default('User') }}</div>
+    <div class="user-role">{{ session.role|default('Guest')|title }}</div>
+  </div>
+  
+  <a href="{{ url_for('index') }}" {% if request.endpoint == 'index' %}class="active"{% endif %}>
+    <i class="fas fa-tachometer-alt"></i> <span>Dashboard</span>
+  </a>
+  
+  {% if session.role in ['admin', 'teacher'] %}
+  <a href="{{ url_for('students') }}" {% if request.endpoint.startswith('student') %}class="active"{% endif %}>
+    <i class="fas fa-users"></i> <span>Students</span>
+  </a>
+  {% endif %}
+  
+  {% if session.role in ['admin'] %}
+  <a href="{{ url_for('teachers') }}" {% if request.endpoint.startswith('teacher') %}class="active"{% endif %}>
+    <i class="fas fa-chalkboard-teacher"></i> <span>Teachers</span>
+  </a>
+  {% endif %}
+  
+  {% if session.role in ['admin', 'teacher'] %}
+  <a href="{{ url_for('classes') }}" {% if request.endpoint.startswith('classes') or request.endpoint.startswith('class') %}class="active"{% endif %}>
+    <i class="fas fa-school"></i> <span>Classes</span>
+  </a>
+  {% endif %}
+  
+  {% if session.role in ['admin'] %}
+  <a href="{{ url_for('fees') }}" {% if request.endpoint.startswith('fee') %}class="active"{% endif %}>
+    <i class="fas fa-money-bill-wave"></i> <span>Fees</span>
+  </a>
+  {% endif %}
+  
+  {% if session.role in ['admin', 'teacher'] %}
+  <a href="{{ url_for('attendance') }}" {% if request.endpoint.startswith('attendance') %}class="active"{% endif %}>
+    <i class="fas fa-clipboard-list"></i> <span>Attendance</span>
+  </a>
+  {% endif %}
+  
+  {% if session.role in ['admin', 'teacher'] %}
+  <a href="{{ url_for('grades') }}" {% if request.endpoint.startswith('grade') %}class="active"{% endif %}>
+    <i class="fas fa-chart-line"></i> <span>Grades</span>
+  </a>
+  {% endif %}
+  
+  {% if session.role in ['admin', 'teacher', 'student'] %}
+  <a href="{{ url_for('timetable') }}" {% if request.endpoint.startswith('timetable') %}class="active"{% endif %}>
+    <i class="fas fa-calendar-alt"></i> <span>Timetable</span>
+  </a>
+  {% endif %}
+  
+  {% if session.role == 'admin' %}
+  <a href="{{ url_for('settings') }}" {% if request.endpoint.startswith('settings') %}class="active"{% endif %}>
+    <i class="fas fa-cog"></i> <span>Settings</span>
+  </a>
+  <a href="{{ url_for('themes') }}" {% if request.endpoint == 'themes' %}class="active"{% endif %}>
+    <i class="fas fa-palette"></i> <span>Themes</span>
+  </a>
+  <a href="{{ url_for('user_management') }}" {% if request.endpoint.startswith('user_management') %}class="active"{% endif %}>
+    <i class="fas fa-user-cog"></i> <span>User Management</span>
+  </a>
+  {% endif %}
+  
+  {% if session.role == 'student' %}
+  <a href="{{ url_for('student_dashboard') }}" {% if request.endpoint == 'student_dashboard' %}class="active"{% endif %}>
+    <i class="fas fa-graduation-cap"></i> <span>My Dashboard</span>
+  </a>
+  <a href="{{ url_for('student_grades') }}" {% if request.endpoint == 'student_grades' %}class="active"{% endif %}>
+    <i class="fas fa-chart-line"></i> <span>My Grades</span>
+  </a>
+  <a href="{{ url_for('student_attendance') }}" {% if request.endpoint == 'student_attendance' %}class="active"{% endif %}>
+    <i class="fas fa-clipboard-list"></i> <span>My Attendance</span>
+  </a>
+  <a href="{{ url_for('student_fees') }}" {% if request.endpoint == 'student_fees' %}class="active"{% endif %}>
+    <i class="fas fa-money-bill-wave"></i> <span>My Fees</span>
+  </a>
+  {% endif %}
+  
+  {% if session.role == 'teacher' %}
+  <a href="{{ url_for('teacher_dashboard') }}" {% if request.endpoint == 'teacher_dashboard' %}class="active"{% endif %}>
+    <i class="fas fa-chalkboard-teacher"></i> <span>Teacher Dashboard</span>
+  </a>
+  {% endif %}
+  
+  <button class="logout-btn" onclick="window.location.href='{{ url_for('logout') }}'">
+    <i class="fas fa-sign-out-alt"></i> <span>Logout</span>
+  </button>
+</div>
+{% endif %}
 
-  body {
-    margin: 0;
-    background: linear-gradient(135deg, #f0f9ff, #e0f2fe);
-    color: var(--dark-color);
-    transition: all var(--transition-speed);
-  }
+<div class="content">
+  {% with messages = get_flashed_messages(with_categories=true) %}
+    {% if messages %}
+      {% for category, message in messages %}
+        <div class="alert alert-{{ category }}"><i class="fas fa-info-circle"></i> {{ message }}</div>
+      {% endfor %}
+    {% endif %}
+  {% endwith %}
+  {% block content %}{% endblock %}
+</div>
+</body>
+</html>''',
 
-  .sidebar {
-    position: fixed;
-    top: 0;
-    left: 0;
-    height: 100%;
-    width: var(--sidebar-width-expanded);
-    background: linear-gradient(to bottom, #1e293b, #0f172a);
-    display: flex;
-    flex-direction: column;
-    padding-top: 20px;
-    box-shadow: var(--shadow-lg);
-    z-index: 1000;
-    transition: all var(--transition-speed);
-  }
+    'login.html': '''{% extends "base.html" %}
+{% block content %}
+<div class="login-container">
+  <div class="login-card">
+    <div class="login-logo">
+      <h2>School Management System</h2>
+    </div>
+    
+    <h2>Login to Your Account</h2>
+    
+    <form method="post" action="{{ url_for('login') }}">
+      <div class="form-group">
+        <label for="username">Username</label>
+        <input type="text" id="username" name="username" required placeholder="Enter your username">
+      </div>
+      
+      <div class="form-group">
+        <label for="password">Password</label>
+        <div class="password-toggle">
+          <input type="password" id="password" name="password" required placeholder="Enter your password">
+          <span class="toggle-icon" onclick="togglePassword('password')">
+            <i class="fas fa-eye"></i>
+          </span>
+        </div>
+      </div>
+      
+      <div class="form-group">
+        <label for="role">Login As</label>
+        <select id="role" name="role" required>
+          <option value="">Select Role</option>
+          <option value="admin">Administrator</option>
+          <option value="teacher">Teacher</option>
+          <option value="student">Student</option>
+        </select>
+      </div>
+      
+      <button type="submit" class="button full-width" style="margin-top: 20px;">
+        <i class="fas fa-sign-in-alt"></i> Login
+      </button>
+      
+      <div style="text-align: center; margin-top: 20px; color: #64748b;">
+        <p>Default Admin: admin / school123</p>
+      </div>
+    </form>
+  </div>
+</div>
 
-  .sidebar.collapsed {
-    width: var(--sidebar-width-collapsed);
+<script>
+  function togglePassword(inputId) {
+    const input = document.getElementById(inputId);
+    const icon = document.querySelector(`[onclick="togglePassword('${inputId}')"] i`);
+    
+    if (input.type === 'password') {
+      input.type = 'text';
+      icon.classList.remove('fa-eye');
+      icon.classList.add('fa-eye-slash');
+    } else {
+      input.type = 'password';
+      icon.classList.remove('fa-eye-slash');
+      icon.classList.add('fa-eye');
+    }
   }
+</script>
+{% endblock %}''',
 
-  .sidebar-header {
-    display: flex;
-    flex-direction: column;
-    align-items: center;
-    padding: 10px 5px 20px;
-    border-bottom: 1px solid rgba(255,255,255,0.1);
-    margin-bottom: 20px;
-  }
+    'user_management.html': '''{% extends "base.html" %}
+{% from "pagination.html" import pagination %}
+{% block content %}
+<h1>User Management</h1>
 
-  .sidebar.collapsed .sidebar-header {
-    padding: 15px 5px;
-  }
+<div class="tabs">
+  <button class="tab active" onclick="toggleTabs('manageUsers')">Manage Users</button>
+  <button class="tab" onclick="toggleTabs('addUser')">Add New User</button>
+  <button class="tab" onclick="toggleTabs('resetPassword')">Reset Password</button>
+</div>
 
-  .sidebar h2 {
-    color: white;
-    font-size: 1.2rem;
-    text-align: center;
-    margin: 0;
-    white-space: nowrap;
-    overflow: hidden;
-    text-overflow: ellipsis;
-  }
+<div class="action-buttons">
+  <a href="{{ url_for('provision_users') }}" class="button secondary">Provision Accounts</a>
+</div>
 
-  .sidebar.collapsed h2 {
-    display: none;
-  }
-
-  .toggle-btn {
-    background: var(--primary-color);
-    border: none;
-    color: white;
-    width: 30px;
-    height: 30px;
-    border-radius: 50%;
-    cursor: pointer;
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    font-size: 14px;
-    transition: all var(--transition-speed);
-  }
-
-  .toggle-btn:hover {
-    background: #3b5bdb;
-    transform: scale(1.05);
-  }
-
-  .sidebar a {
-    padding: 14px 20px;
-    text-decoration: none;
-    font-size: 1rem;
-    color: white;
-    display: flex;
-    align-items: center;
-    transition: all 0.3s;
-    border-left: 4px solid transparent;
-    white-space: nowrap;
-  }
-
-  .sidebar a i {
-    margin-right: 12px;
-    font-size: 1.2rem;
-    min-width: 24px;
-    text-align: center;
-  }
-
-  .sidebar.collapsed a span {
-    display: none;
-  }
+<div id="manageUsers" class="tab-content active">
+  <div class="action-buttons">
+    <a href="{{ url_for('user_management') }}?role=all" class="button {% if role_filter == 'all' %}active{% endif %}">All Users</a>
+    <a href="{{ url_for('user_management') }}?role=student" class="button {% if role_filter == 'student' %}active{% endif %}">Students</a>
+    <a href="{{ url_for('user_management') }}?role=teacher" class="button {% if role_filter == 'teacher' %}active{% endif %}">Teachers</a>
+    <a href="{{ url_for('user_management') }}?role=admin" class="button {% if role_filter == 'admin' %}active{% endif %}">Admins</a>
+  </div>
 
-  .sidebar.collapsed a {
-    justify-content: center;
-    padding: 16px 10px;
-  }
+  <div class="search-box">
+    <input type="text" id="userSearch" onkeyup="filterTable('userSearch', 'usersTable')" placeholder="Search users by name, username, or role...">
+  </div>
 
-  .sidebar a:hover {
-    background-color: rgba(255,255,255,0.1);
-    border-left: 4px solid var(--accent-color);
-  }
+  <table id="usersTable">
+    <thead>
+      <tr>
+        <th>ID</th>
+        <th>Username</th>
+        <th>Full Name</th>
+        <th>Role</th>
+        <th>Status</th>
+        <th>Last Login</th>
+        <th>Created</th>
+        <th>Actions</th>
+      </tr>
+    </thead>
+    <tbody>
+      {% for user in users %}
+      <tr>
+        <td>{{ user.id }}</td>
+        <td>{{ user.username }}</td>
+        <td>{{ user.full_name or 'N/A' }}</td>
+        <td>
+          {% if user.role == 'admin' %}
+            <span class="badge badge-danger">Admin</span>
+          {% elif user.role == 'teacher' %}
+            <span class="badge badge-warning">Teacher</span>
+          {% elif user.role == 'student' %}
+            <span class="badge badge-info">Student</span>
+          {% endif %}
+        </td>
+        <td>
+          {% if user.is_active %}
+            <span class="badge badge-success">Active</span>
+          {% else %}
+            <span class="badge badge-danger">Inactive</span>
+          {% endif %}
+        </td>
+        <td>{{ user.last_login or 'Never' }}</td>
+        <td>{{ user.created_at[:10] }}</td>
+        <td>
+          <a href="{{ url_for('edit_user', id=user.id) }}" class="button" style="padding: 5px 10px; font-size: 12px;">Edit</a>
+          {% if user.role != 'admin' or user.id != session.user_id %}
+          <a href="{{ url_for('toggle_user_status', id=user.id) }}" class="button {% if user.is_active %}danger{% else %}secondary{% endif %}" style="padding: 5px 10px; font-size: 12px;" onclick="return confirmDelete('{% if user.is_active %}Deactivate{% else %}Activate{% endif %} this user?')">
+            {% if user.is_active %}Deactivate{% else %}Activate{% endif %}
+          </a>
+          {% endif %}
+          {% if user.id != session.user_id %}
+          <a href="{{ url_for('reset_user_password', id=user.id) }}" class="button warning" style="padding: 5px 10px; font-size: 12px;" onclick="return confirmDelete('Reset password for {{ user.username }}? Default password will be set.')">Reset Password</a>
+          {% endif %}
+        </td>
+      </tr>
+      {% endfor %}
+    </tbody>
+  </table>
+  
+  {{ pagination(users) }}
+</div>
 
-  .sidebar a.active {
-    background-color: rgba(76, 201, 240, 0.2);
-    border-left: 4px solid var(--accent-color);
-  }
+<div id="addUser" class="tab-content">
+  <div class="card">
+    <h3>Add New User</h3>
+    <form method="post" action="{{ url_for('add_user') }}">
+      <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
+        <div>
+          <div class="form-group">
+            <label for="username">Username *</label>
+            <input type="text" id="username" name="username" required>
+          </div>
+          
+          <div class="form-group">
+            <label for="full_name">Full Name</label>
+            <input type="text" id="full_name" name="full_name">
+          </div>
+          
+          <div class="form-group">
+            <label for="email">Email</label>
+            <input type="email" id="email" name="email">
+          </div>
+        </div>
+        
+        <div>
+          <div class="form-group">
+            <label for="role">Role *</label>
+            <select id="role" name="role" required onchange="toggleRoleFields()">
+              <option value="">Select Role</option>
+              <option value="admin">Administrator</option>
+              <option value="teacher">Teacher</option>
+              <option value="student">Student</option>
+            </select>
+          </div>
+          
+          <div class="form-group" id="studentField" style="display: none;">
+            <label for="admission_number">Student Admission Number</label>
+            <input type="text" id="admission_number" name="admission_number">
+          </div>
+          
+          <div class="form-group" id="teacherField" style="display: none;">
+            <label for="teacher_id">Teacher</label>
+            <select id="teacher_id" name="teacher_id">
+              <option value="">Select Teacher</option>
+              {% for teacher in teachers %}
+              <option value="{{ teacher.id }}">{{ teacher.name }}</option>
+              {% endfor %}
+            </select>
+          </div>
+          
+          <div class="form-group">
+            <label for="is_active">
+              <input type="checkbox" id="is_active" name="is_active" checked>
+              Active Account
+            </label>
+          </div>
+        </div>
+      </div>
+      
+      <div style="text-align: center; margin-top: 20px;">
+        <button type="submit" class="button">Add User</button>
+        <button type="reset" class="button secondary">Clear</button>
+      </div>
+    </form>
+  </div>
+  
+  <div class="card">
+    <h4>Default Password</h4>
+    <p>New users will be created with the default password: <strong>school123</strong></p>
+    <p>Users should change their password after first login.</p>
+  </div>
+</div>
 
-  .content {
-    margin-left: var(--sidebar-width-expanded);
-    padding: 20px;
-    min-height: 100vh;
-    transition: all var(--transition-speed);
-  }
+<div id="resetPassword" class="tab-content">
+  <div class="card">
+    <h3>Reset User Password</h3>
+    <form method="post" action="{{ url_for('reset_password_bulk') }}">
+      <div class="form-group">
+        <label for="user_id">Select User *</label>
+        <select id="user_id" name="user_id" required>
+          <option value="">Select User</option>
+          {% for user in all_users %}
+          <option value="{{ user.id }}">{{ user.username }} ({{ user.role }} - {{ user.full_name or 'N/A' }})</option>
+          {% endfor %}
+        </select>
+      </div>
+      
+      <div class="form-group">
+        <label for="new_password">New Password (optional)</label>
+        <div class="password-toggle">
+          <input type="password" id="new_password" name="new_password" placeholder="Leave blank for default password">
+          <span class="toggle-icon" onclick="togglePassword('new_password')">
+            <i class="fas fa-eye"></i>
+          </span>
+        </div>
+        <small>If left blank, password will be reset to default: school123</small>
+      </div>
+      
+      <div style="text-align: center; margin-top: 20px;">
+        <button type="submit" class="button">Reset Password</button>
+      </div>
+    </form>
+  </div>
+</div>
 
-  .sidebar.collapsed ~ .content {
-    margin-left: var(--sidebar-width-collapsed);
+<script>
+  function toggleRoleFields() {
+    const role = document.getElementById('role').value;
+    document.getElementById('studentField').style.display = role === 'student' ? 'block' : 'none';
+    document.getElementById('teacherField').style.display = role === 'teacher' ? 'block' : 'none';
   }
-
-  h1 {
-    color: var(--dark-color);
-    border-bottom: 2px solid var(--primary-color);
-    padding-bottom: 10px;
-    margin-bottom: 20px;
-    font-weight: 600;
+  
+  function togglePassword(inputId) {
+    const input = document.getElementById(inputId);
+    const icon = document.querySelector(`[onclick="togglePassword('${inputId}')"] i`);
+    
+    if (input.type === 'password') {
+      input.type = 'text';
+      icon.classList.remove('fa-eye');
+      icon.classList.add('fa-eye-slash');
+    } else {
+      input.type = 'password';
+      icon.classList.remove('fa-eye-slash');
+      icon.classList.add('fa-eye');
+    }
   }
+</script>
+{% endblock %}''',
 
-  .card {
-    background: white;
-    border-radius: 12px;
-    box-shadow: var(--shadow-md);
-    padding: 24px;
-    margin-bottom: 20px;
-    transition: transform 0.2s;
-  }
-
-  .card:hover {
-    transform: translateY(-3px);
-    box-shadow: var(--shadow-lg);
-  }
-
-  table {
-    width: 100%;
-    border-collapse: collapse;
-    background-color: #fff;
-    margin-bottom: 20px;
-    box-shadow: var(--shadow-sm);
-    border-radius: 8px;
-    overflow: hidden;
-  }
-
-  th, td {
-    padding: 14px 16px;
-    border: 1px solid var(--gray-light);
-    text-align: left;
-  }
-
-  th {
-    background-color: #f1f5f9;
-    font-weight: 600;
-    color: #334155;
-  }
-
-  tr:nth-child(even) {
-    background-color: #f8fafc;
-  }
-
-  tr:hover {
-    background-color: #f1f5f9;
-  }
-
-  a.button, button.button {
-    display: inline-flex;
-    align-items: center;
-    margin: 5px;
-    padding: 10px 20px;
-    background-color: var(--primary-color);
-    color: white;
-    text-decoration: none;
-    border-radius: 8px;
-    border: none;
-    cursor: pointer;
-    transition: all 0.3s;
-    font-size: 14px;
-    font-weight: 500;
-    gap: 8px;
-  }
-
-  a.button:hover, button.button:hover {
-    background-color: #3b5bdb;
-    transform: translateY(-2px);
-    box-shadow: var(--shadow-md);
-  }
-
-  a.button i, button.button i {
-    font-size: 1rem;
-  }
+    'edit_user.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Edit User</h1>
+<div class="card">
+  <form method="post">
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
+      <div>
+        <div class="form-group">
+          <label for="username">Username *</label>
+          <input type="text" id="username" name="username" value="{{ user.username }}" required>
+        </div>
+        
+        <div class="form-group">
+          <label for="full_name">Full Name</label>
+          <input type="text" id="full_name" name="full_name" value="{{ user.full_name or '' }}">
+        </div>
+        
+        <div class="form-group">
+          <label for="email">Email</label>
+          <input type="email" id="email" name="email" value="{{ user.email or '' }}">
+        </div>
+      </div>
+      
+      <div>
+        <div class="form-group">
+          <label for="role">Role *</label>
+          <select id="role" name="role" required>
+            <option value="admin" {% if user.role == 'admin' %}selected{% endif %}>Administrator</option>
+            <option value="teacher" {% if user.role == 'teacher' %}selected{% endif %}>Teacher</option>
+            <option value="student" {% if user.role == 'student' %}selected{% endif %}>Student</option>
+          </select>
+        </div>
+        
+        <div class="form-group">
+          <label for="is_active">
+            <input type="checkbox" id="is_active" name="is_active" {% if user.is_active %}checked{% endif %}>
+            Active Account
+          </label>
+        </div>
+        
+        {% if user.role == 'student' and user.admission_number %}
+        <div class="form-group">
+          <label>Linked Student</label>
+          <input type="text" value="{{ user.admission_number }}" readonly>
+        </div>
+        {% endif %}
+        
+        {% if user.role == 'teacher' and user.teacher_name %}
+        <div class="form-group">
+          <label>Linked Teacher</label>
+          <input type="text" value="{{ user.teacher_name }}" readonly>
+        </div>
+        {% endif %}
+      </div>
+    </div>
+    
+    <div style="text-align: center; margin-top: 20px;">
+      <button type="submit" class="button">Update User</button>
+      <a href="{{ url_for('user_management') }}" class="button secondary">Cancel</a>
+    </div>
+  </form>
+</div>
 
-  a.button.secondary {
-    background-color: var(--secondary-color);
-  }
+<div class="card">
+  <h3>Account Information</h3>
+  <table>
+    <tr>
+      <th>Created:</th>
+      <td>{{ user.created_at[:19] }}</td>
+    </tr>
+    <tr>
+      <th>Last Login:</th>
+      <td>{{ user.last_login or 'Never' }}</td>
+    </tr>
+    <tr>
+      <th>Last Updated:</th>
+      <td>{{ user.updated_at[:19] if user.updated_at else 'N/A' }}</td>
+    </tr>
+  </table>
+</div>
+{% endblock %}''',
 
-  a.button.secondary:hover {
-    background-color: #3830a9;
-  }
+    'student_dashboard.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Student Dashboard</h1>
+<p>Welcome back, {{ student.name }}!</p>
 
-  a.button.danger {
-    background-color: var(--danger-color);
-  }
+<div class="dashboard-stats">
+  <div class="stat-card">
+    <h3>Current Class</h3>
+    <div class="value">{{ student.class }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Attendance Rate</h3>
+    <div class="value">{{ attendance_rate }}%</div>
+  </div>
+  <div class="stat-card">
+    <h3>Average Grade</h3>
+    <div class="value">{{ average_grade }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Fee Balance</h3>
+    <div class="value">{{ fee_balance }}</div>
+  </div>
+</div>
 
-  a.button.danger:hover {
-    background-color: #ef4444;
-  }
+<div class="chart-grid">
+  <div class="chart-container">
+    <img class="chart-img" src="{{ url_for('chart', name='attendance_trend', fmt='svg') }}" alt="Attendance trend" loading="lazy">
+  </div>
+  <div class="chart-container">
+    <img class="chart-img" src="{{ url_for('chart', name='grade_distribution', fmt='svg') }}" alt="Grade distribution" loading="lazy">
+  </div>
+</div>
 
-  a.button.warning {
-    background-color: var(--warning-color);
-    color: #1e293b;
-  }
+<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(400px, 1fr)); gap: 20px; margin-top: 30px;">
+  <div class="card">
+    <h3>Today's Timetable</h3>
+    {% if today_timetable %}
+    <table>
+      <thead>
+        <tr><th>Period</th><th>Subject</th><th>Teacher</th><th>Room</th></tr>
+      </thead>
+      <tbody>
+        {% for entry in today_timetable %}
+        <tr>
+          <td>Period {{ entry.period }}</td>
+          <td>{{ entry.subject }}</td>
+          <td>{{ entry.teacher_name or 'N/A' }}</td>
+          <td>{{ entry.room or 'N/A' }}</td>
+        </tr>
+        {% endfor %}
+      </tbody>
+    </table>
+    {% else %}
+    <p>No classes scheduled for today.</p>
+    {% endif %}
+  </div>
+  
+  <div class="card">
+    <h3>Recent Grades</h3>
+    {% if recent_grades %}
+    <table>
+      <thead>
+        <tr><th>Subject</th><th>Term</th><th>Score</th><th>Grade</th></tr>
+      </thead>
+      <tbody>
+        {% for grade in recent_grades %}
+        <tr>
+          <td>{{ grade.subject }}</td>
+          <td>{{ grade.term }}</td>
+          <td>{{ grade.score }}</td>
+          <td class="grade-{{ grade.grade }}">{{ grade.grade }}</td>
+        </tr>
+        {% endfor %}
+      </tbody>
+    </table>
+    <a href="{{ url_for('student_grades') }}" class="button" style="margin-top: 10px;">View All Grades</a>
+    {% else %}
+    <p>No grades recorded yet.</p>
+    {% endif %}
+  </div>
+</div>
 
-  a.button.warning:hover {
-    background-color: #eab308;
-  }
+<div class="card">
+  <h3>Quick Links</h3>
+  <div class="action-buttons">
+    <a href="{{ url_for('student_grades') }}" class="button">My Grades</a>
+    <a href="{{ url_for('student_attendance') }}" class="button secondary">My Attendance</a>
+    <a href="{{ url_for('student_fees') }}" class="button">My Fees</a>
+    <a href="{{ url_for('timetable') }}?class_filter={{ student.class }}" class="button secondary">Full Timetable</a>
+    {% if medical_info %}
+    <a href="#medical-info" class="button warning">Medical Information</a>
+    {% endif %}
+  </div>
+</div>
 
-  form input[type=text], form input[type=number], form input[type=date], form input[type=email], form input[type=tel], form input[type=password], form select, form textarea {
-    padding: 12px 15px;
-    margin: 8px 0;
-    width: 100%;
-    box-sizing: border-box;
-    border: 2px solid var(--gray-light);
-    border-radius: 8px;
-    font-size: 14px;
-    transition: all 0.3s;
-  }
+{% if medical_info %}
+<div class="card" id="medical-info">
+  <h3>Medical Information</h3>
+  <div class="medical-alert {% if medical_info.has_condition %}danger{% else %}info{% endif %}">
+    <i class="fas fa-heartbeat"></i>
+    <strong>Medical Status:</strong>
+    {% if medical_info.has_condition %}
+    Has Special Medical Condition
+    {% else %}
+    No Special Medical Conditions
+    {% endif %}
+  </div>
+  
+  {% if medical_info.conditions %}
+  <div style="margin-top: 15px;">
+    <h4>Medical Conditions</h4>
+    <p>{{ medical_info.conditions }}</p>
+  </div>
+  {% endif %}
+  
+  {% if medical_info.allergies %}
+  <div style="margin-top: 15px;">
+    <h4>Allergies</h4>
+    <p>{{ medical_info.allergies }}</p>
+  </div>
+  {% endif %}
+  
+  {% if medical_info.medications %}
+  <div style="margin-top: 15px;">
+    <h4>Current Medications</h4>
+    <p>{{ medical_info.medications }}</p>
+  </div>
+  {% endif %}
+  
+  {% if medical_info.emergency_contact_name %}
+  <div style="margin-top: 15px;">
+    <h4>Emergency Contact</h4>
+    <table>
+      <tr>
+        <th>Name:</th>
+        <td>{{ medical_info.emergency_contact_name }}</td>
+      </tr>
+      <tr>
+        <th>Relationship:</th>
+        <td>{{ medical_info.emergency_contact_relation }}</td>
+      </tr>
+      <tr>
+        <th>Phone:</th>
+        <td>{{ medical_info.emergency_contact_phone }}</td>
+      </tr>
+      {% if medical_info.emergency_contact_alt_phone %}
+      <tr>
+        <th>Alternate Phone:</th>
+        <td>{{ medical_info.emergency_contact_alt_phone }}</td>
+      </tr>
+      {% endif %}
+    </table>
+  </div>
+  {% endif %}
+</div>
+{% endif %}
+{% endblock %}''',
 
-  form input:focus, form select:focus, form textarea:focus {
-    outline: none;
-    border-color: var(--primary-color);
-    box-shadow: 0 0 0 3px rgba(67, 97, 238, 0.2);
-  }
+    'student_grades.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>My Grades</h1>
 
-  img.passport {
-    max-width: 100px;
-    max-height: 100px;
-    border-radius: 8px;
-    border: 2px solid var(--gray-light);
-    object-fit: cover;
-  }
+<div class="card">
+  <h3>Grade Summary</h3>
+  <table>
+    <thead>
+      <tr>
+        <th>Term</th>
+        <th>Number of Subjects</th>
+        <th>Average Score</th>
+        <th>Average Grade</th>
+        <th>Position</th>
+      </tr>
+    </thead>
+    <tbody>
+      {% for term, data in term_summary.items() %}
+      <tr>
+        <td>{{ term }}</td>
+        <td>{{ data.count }}</td>
+        <td>{{ "%.2f"|format(data.average) }}%</td>
+        <td class="grade-{{ data.grade }}">{{ data.grade }}</td>
+        <td>{{ data.position or 'N/A' }}</td>
+      </tr>
+      {% endfor %}
+    </tbody>
+  </table>
+</div>
 
-  .status-present { color: var(--success-color); font-weight: bold; }
-  .status-absent { color: var(--danger-color); font-weight: bold; }
-  .status-late { color: var(--warning-color); font-weight: bold; }
-  .status-excused { color: var(--accent-color); font-weight: bold; }
+<div class="card">
+  <h3>All Grades</h3>
+  {% if grades %}
+  <table>
+    <thead>
+      <tr>
+        <th>Subject</th>
+        <th>Term</th>
+        <th>Year</th>
+        <th>Score</th>
+        <th>Grade</th>
+        <th>Date Recorded</th>
+      </tr>
+    </thead>
+    <tbody>
+      {% for grade in grades %}
+      <tr>
+        <td>{{ grade.subject }}</td>
+        <td>{{ grade.term }}</td>
+        <td>{{ grade.year }}</td>
+        <td>{{ grade.score }}</td>
+        <td class="grade-{{ grade.grade }}">{{ grade.grade }}</td>
+        <td>{{ grade.created_at[:10] }}</td>
+      </tr>
+      {% endfor %}
+    </tbody>
+  </table>
+  {% else %}
+  <p>No grades recorded yet.</p>
+  {% endif %}
+</div>
 
-  .alert {
-    padding: 16px 20px;
-    margin: 15px 0;
-    border-radius: 8px;
-    font-size: 14px;
-    display: flex;
-    align-items: center;
-    gap: 10px;
-  }
+<div class="card">
+  <h3>Subject Performance</h3>
+  {% if subject_performance %}
+  {% for subject in subject_performance %}
+  <div class="subject-performance" data-score="{{ subject.average_score|round }}" data-grade="{{ subject.grade }}">
+    <div class="subject-name">{{ subject.name }}</div>
+    <div class="score-bar">
+      <div class="score-fill" style="width: {{ subject.average_score|round }}%;"></div>
+      <div class="score-text">{{ subject.average_score|round }}% ({{ subject.grade }})</div>
+    </div>
+  </div>
+  {% endfor %}
+  {% else %}
+  <p>No subject performance data available.</p>
+  {% endif %}
+</div>
 
-  .alert i {
-    font-size: 1.2rem;
-  }
+<script>
+  document.addEventListener('DOMContentLoaded', function() {
+    updateScoreBars();
+  });
+</script>
+{% endblock %}''',
 
-  .alert-success {
-    background-color: #dcfce7;
-    color: #166534;
-    border: 1px solid #bbf7d0;
-  }
+    'student_attendance.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>My Attendance</h1>
 
-  .alert-error {
-    background-color: #fecaca;
-    color: #991b1b;
-    border: 1px solid #fecaca;
-  }
+<div class="dashboard-stats">
+  <div class="stat-card">
+    <h3>Present Days</h3>
+    <div class="value">{{ attendance_stats.present }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Absent Days</h3>
+    <div class="value">{{ attendance_stats.absent }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Late Days</h3>
+    <div class="value">{{ attendance_stats.late }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Attendance Rate</h3>
+    <div class="value">{{ attendance_stats.rate }}%</div>
+  </div>
+</div>
 
-  .alert-warning {
-    background-color: #fef3c7;
-    color: #92400e;
-    border: 1px solid #fde68a;
-  }
+<div class="card">
+  <h3>Recent Attendance</h3>
+  {% if recent_attendance %}
+  <table>
+    <thead>
+      <tr>
+        <th>Date</th>
+        <th>Status</th>
+        <th>Remarks</th>
+      </tr>
+    </thead>
+    <tbody>
+      {% for record in recent_attendance %}
+      <tr>
+        <td>{{ record.date }}</td>
+        <td>
+          {% if record.status == 'Present' %}
+            <span class="status-present">Present</span>
+          {% elif record.status == 'Absent' %}
+            <span class="status-absent">Absent</span>
+          {% elif record.status == 'Late' %}
+            <span class="status-late">Late</span>
+          {% elif record.status == 'Excused' %}
+            <span class="status-excused">Excused</span>
+          {% endif %}
+        </td>
+        <td>{{ record.remarks or '-' }}</td>
+      </tr>
+      {% endfor %}
+    </tbody>
+  </table>
+  {% else %}
+  <p>No attendance records found.</p>
+  {% endif %}
+</div>
 
-  .filter-form {
-    background-color: #f1f5f9;
-    padding: 20px;
-    border-radius: 12px;
-    margin-bottom: 20px;
-    box-shadow: var(--shadow-sm);
-  }
-
-  .filter-form label {
-    display: inline-block;
-    margin-right: 10px;
-    font-weight: 600;
-    margin-bottom: 5px;
-    color: #334155;
-  }
-
-  .filter-form input, .filter-form select {
-    margin-right: 20px;
-    margin-bottom: 10px;
-    padding: 10px 15px;
-  }
-
-  .receipt {
-    border: 1px solid var(--gray-light);
-    padding: 30px;
-    margin: 20px auto;
-    background-color: white;
-    max-width: 800px;
-    border-radius: 12px;
-    box-shadow: var(--shadow-lg);
-  }
-
-  .receipt-header {
-    text-align: center;
-    border-bottom: 2px solid var(--primary-color);
-    padding-bottom: 20px;
-    margin-bottom: 30px;
-  }
-
-  .receipt-header h2 {
-    color: var(--dark-color);
-    margin: 0;
-  }
-
-  .receipt-details {
-    margin: 20px 0;
-    width: 100%;
-  }
-
-  .receipt-details td {
-    padding: 10px 15px;
-    vertical-align: top;
-  }
+<div class="card">
+  <h3>Monthly Attendance Summary</h3>
+  <form method="get" style="display: flex; gap: 10px; margin-bottom: 20px;">
+    <input type="month" name="month" value="{{ month }}" onchange="this.form.submit()">
+  </form>
+  
+  {% if monthly_attendance %}
+  <table>
+    <thead>
+      <tr>
+        <th>Date</th>
+        <th>Day</th>
+        <th>Status</th>
+        <th>Remarks</th>
+      </tr>
+    </thead>
+    <tbody>
+      {% for record in monthly_attendance %}
+      <tr>
+        <td>{{ record.date }}</td>
+        <td>{{ record.day_name }}</td>
+        <td>
+          {% if record.status == 'Present' %}
+            <span class="status-present">Present</span>
+          {% elif record.status == 'Absent' %}
+            <span class="status-absent">Absent</span>
+          {% elif record.status == 'Late' %}
+            <span class="status-late">Late</span>
+          {% elif record.status == 'Excused' %}
+            <span class="status-excused">Excused</span>
+          {% endif %}
+        </td>
+        <td>{{ record.remarks or '-' }}</td>
+      </tr>
+      {% endfor %}
+    </tbody>
+  </table>
+  {% else %}
+  <p>No attendance records for {{ month }}.</p>
+  {% endif %}
+</div>
+{% endblock %}''',
 
-  .receipt-details tr:nth-child(even) {
-    background-color: #f8fafc;
-  }
+    'student_fees.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>My Fees</h1>
 
-  .balance {
-    font-weight: bold;
-    color: #dc2626;
-    font-size: 1.1em;
-  }
+<div class="dashboard-stats">
+  <div class="stat-card">
+    <h3>Total Fee</h3>
+    <div class="value">{{ fee_summary.total_fee }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Total Paid</h3>
+    <div class="value">{{ fee_summary.total_paid }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Balance</h3>
+    <div class="value {% if fee_summary.balance > 0 %}balance{% else %}paid{% endif %}">{{ fee_summary.balance }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Payment Status</h3>
+    <div class="value">
+      {% if fee_summary.balance <= 0 %}
+        <span class="paid">Paid</span>
+      {% elif fee_summary.balance < fee_summary.total_fee %}
+        <span style="color: #f59e0b;">Partial</span>
+      {% else %}
+        <span class="balance">Pending</span>
+      {% endif %}
+    </div>
+  </div>
+</div>
 
-  .paid {
-    font-weight: bold;
-    color: #16a34a;
-    font-size: 1.1em;
-  }
+<div class="card">
+  <h3>Fee Structures</h3>
+  {% if fee_structures %}
+  <table>
+    <thead>
+      <tr>
+        <th>Term</th>
+        <th>Year</th>
+        <th>Total Amount</th>
+        <th>Paid Amount</th>
+        <th>Balance</th>
+        <th>Status</th>
+      </tr>
+    </thead>
+    <tbody>
+      {% for fs in fee_structures %}
+      <tr>
+        <td>{{ fs.term }}</td>
+        <td>{{ fs.year }}</td>
+        <td>{{ fs.amount }}</td>
+        <td class="paid">{{ fs.paid_amount }}</td>
+        <td class="{% if fs.balance > 0 %}balance{% else %}paid{% endif %}">{{ fs.balance }}</td>
+        <td>
+          {% if fs.balance <= 0 %}
+            <span class="badge badge-success">Paid</span>
+          {% elif fs.paid_amount > 0 %}
+            <span class="badge badge-warning">Partial</span>
+          {% else %}
+            <span class="badge badge-danger">Unpaid</span>
+          {% endif %}
+        </td>
+      </tr>
+      {% endfor %}
+    </tbody>
+  </table>
+  {% else %}
+  <p>No fee structures found.</p>
+  {% endif %}
+</div>
 
-  .total-row {
-    border-top: 2px solid var(--dark-color);
-    font-weight: bold;
-    font-size: 1.1em;
-  }
+<div class="card">
+  <h3>Payment History</h3>
+  {% if payments %}
+  <table>
+    <thead>
+      <tr>
+        <th>Date</th>
+        <th>Receipt No</th>
+        <th>Term</th>
+        <th>Year</th>
+        <th>Amount Paid</th>
+        <th>Payment Method</th>
+        <th>Remarks</th>
+      </tr>
+    </thead>
+    <tbody>
+      {% for payment in payments %}
+      <tr>
+        <td>{{ payment.date_paid }}</td>
+        <td>{{ payment.receipt_number }}</td>
+        <td>{{ payment.term }}</td>
+        <td>{{ payment.year }}</td>
+        <td class="paid">{{ payment.amount_paid }}</td>
+        <td>{{ payment.payment_method or 'Cash' }}</td>
+        <td>{{ payment.remarks or '-' }}</td>
+      </tr>
+      {% endfor %}
+    </tbody>
+  </table>
+  {% else %}
+  <p>No payment history found.</p>
+  {% endif %}
+</div>
+{% endblock %}''',
 
-  .dashboard-stats {
-    display: grid;
-    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-    gap: 20px;
-    margin: 30px 0;
-  }
+    'teacher_dashboard.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Teacher Dashboard</h1>
+<p>Welcome, {{ teacher.name }}!</p>
 
-  .stat-card {
-    background: white;
-    padding: 24px;
-    border-radius: 12px;
-    text-align: center;
-    box-shadow: var(--shadow-md);
-    transition: transform 0.3s;
-    border-top: 4px solid var(--primary-color);
-  }
+<div class="dashboard-stats">
+  <div class="stat-card">
+    <h3>Assigned Classes</h3>
+    <div class="value">{{ stats.class_count }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Total Students</h3>
+    <div class="value">{{ stats.student_count }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Today's Classes</h3>
+    <div class="value">{{ stats.today_classes }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Pending Grades</h3>
+    <div class="value">{{ stats.pending_grades }}</div>
+  </div>
+</div>
 
-  .stat-card:hover {
-    transform: translateY(-5px);
-    box-shadow: var(--shadow-lg);
-  }
+<div class="chart-grid">
+  <div class="chart-container">
+    <img class="chart-img" src="{{ url_for('chart', name='attendance_trend', fmt='svg') }}" alt="Attendance trend" loading="lazy">
+  </div>
+  <div class="chart-container">
+    <img class="chart-img" src="{{ url_for('chart', name='grade_distribution', fmt='svg') }}" alt="Grade distribution" loading="lazy">
+  </div>
+</div>
 
-  .stat-card h3 {
-    margin: 0 0 10px 0;
-    color: #64748b;
-    font-size: 14px;
-    text-transform: uppercase;
-    font-weight: 600;
-  }
-
-  .stat-card .value {
-    font-size: 32px;
-    font-weight: 700;
-    color: var(--primary-color);
-  }
+<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(400px, 1fr)); gap: 20px; margin-top: 30px;">
+  <div class="card">
+    <h3>Today's Schedule</h3>
+    {% if today_schedule %}
+    <table>
+      <thead>
+        <tr><th>Time</th><th>Class</th><th>Subject</th><th>Room</th></tr>
+      </thead>
+      <tbody>
+        {% for entry in today_schedule %}
+        <tr>
+          <td>Period {{ entry.period }}</td>
+          <td>{{ entry.class }}</td>
+          <td>{{ entry.subject }}</td>
+          <td>{{ entry.room or 'N/A' }}</td>
+        </tr>
+        {% endfor %}
+      </tbody>
+    </table>
+    {% else %}
+    <p>No classes scheduled for today.</p>
+    {% endif %}
+  </div>
+  
+  <div class="card">
+    <h3>My Classes</h3>
+    {% if my_classes %}
+    <table>
+      <thead>
+        <tr><th>Class</th><th>Students</th><th>Action</th></tr>
+      </thead>
+      <tbody>
+        {% for cls in my_classes %}
+        <tr>
+          <td>{{ cls.name }}</td>
+          <td>{{ cls.student_count }}</td>
+          <td>
+            <a href="{{ url_for('attendance') }}?class_filter={{ cls.name }}" class="button" style="padding: 5px 10px; font-size: 12px;">Take Attendance</a>
+          </td>
+        </tr>
+        {% endfor %}
+      </tbody>
+    </table>
+    {% else %}
+    <p>No classes assigned yet.</p>
+    {% endif %}
+  </div>
+</div>
 
-  .action-buttons {
-    display: flex;
-    flex-wrap: wrap;
-    gap: 12px;
-    margin: 20px 0;
-  }
+<div class="card">
+  <h3>Quick Actions</h3>
+  <div class="action-buttons">
+    <a href="{{ url_for('mark_attendance') }}" class="button">Mark Attendance</a>
+    <a href="{{ url_for('add_grade') }}" class="button secondary">Add Grades</a>
+    <a href="{{ url_for('timetable') }}" class="button">View Timetable</a>
+    <a href="{{ url_for('grades') }}" class="button secondary">View All Grades</a>
+  </div>
+</div>
 
-  .search-box {
-    margin: 20px 0;
-    padding: 15px;
-    background: white;
-    border-radius: 12px;
-    box-shadow: var(--shadow-sm);
-  }
+<div class="card">
+  <h3>Recent Attendance Updates</h3>
+  {% if recent_attendance %}
+  <table>
+    <thead>
+      <tr>
+        <th>Date</th>
+        <th>Class</th>
+        <th>Student</th>
+        <th>Status</th>
+      </tr>
+    </thead>
+    <tbody>
+      {% for record in recent_attendance %}
+      <tr>
+        <td>{{ record.date }}</td>
+        <td>{{ record.class }}</td>
+        <td>{{ record.student_name }}</td>
+        <td>
+          {% if record.status == 'Present' %}
+            <span class="status-present">Present</span>
+          {% elif record.status == 'Absent' %}
+            <span class="status-absent">Absent</span>
+          {% elif record.status == 'Late' %}
+            <span class="status-late">Late</span>
+          {% elif record.status == 'Excused' %}
+            <span class="status-excused">Excused</span>
+          {% endif %}
+        </td>
+      </tr>
+      {% endfor %}
+    </tbody>
+  </table>
+  {% else %}
+  <p>No recent attendance records.</p>
+  {% endif %}
+</div>
+{% endblock %}''',
 
-  .search-box input {
-    width: 300px;
-    max-width: 100%;
-    padding: 12px 15px;
-  }
+    'index.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Dashboard</h1>
+<p>Welcome back, {{ session.username }}!</p>
 
-  .print-only {
-    display: none;
-  }
+<div class="dashboard-stats">
+  <div class="stat-card">
+    <h3>Total Students</h3>
+    <div class="value">{{ total_students }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Total Teachers</h3>
+    <div class="value">{{ total_teachers }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Total Classes</h3>
+    <div class="value">{{ total_classes }}</div>
+  </div>
+</div>
 
-  @media print {
-    .sidebar, .button, .no-print {
-      display: none !important;
-    }
-    .content {
-      margin-left: 0 !important;
-      padding: 0 !important;
-    }
-    .print-only {
-      display: block;
-    }
-    .receipt {
-      border: none;
-      box-shadow: none;
-      margin: 0;
-      padding: 0;
-    }
-    .timetable {
-      border: none !important;
-      box-shadow: none !important;
-    }
-    .timetable th, .timetable td {
-      border: 1px solid #000 !important;
-    }
-  }
+<div class="chart-grid">
+  <div class="chart-container">
+    <img class="chart-img" src="{{ url_for('chart', name='attendance_trend', fmt='svg') }}" alt="Attendance trend" loading="lazy">
+  </div>
+  <div class="chart-container">
+    <img class="chart-img" src="{{ url_for('chart', name='fee_collection', fmt='svg') }}" alt="Fee collection" loading="lazy">
+  </div>
+  <div class="chart-container">
+    <img class="chart-img" src="{{ url_for('chart', name='grade_distribution', fmt='svg') }}" alt="Grade distribution" loading="lazy">
+  </div>
+</div>
 
-  .form-group {
-    margin-bottom: 18px;
-  }
+<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(400px, 1fr)); gap: 20px; margin-top: 30px;">
+  <div class="card">
+    <h3>Recent Students</h3>
+    {% if recent_students %}
+    <table>
+      <thead>
+        <tr><th>Admission No</th><th>Name</th><th>Class</th><th>Date Added</th></tr>
+      </thead>
+      <tbody>
+        {% for student in recent_students %}
+        <tr>
+          <td>{{ student.admission_number }}</td>
+          <td>{{ student.name }}</td>
+          <td>{{ student.class }}</td>
+          <td>{{ student.created_at[:10] }}</td>
+        </tr>
+        {% endfor %}
+      </tbody>
+    </table>
+    {% else %}
+    <p>No students found.</p>
+    {% endif %}
+    <a href="{{ url_for('students') }}" class="button" style="margin-top: 10px;">View All Students</a>
+  </div>
+  
+  <div class="card">
+    <h3>Recent Payments</h3>
+    {% if recent_payments %}
+    <table>
+      <thead>
+        <tr><th>Receipt No</th><th>Student</th><th>Amount</th><th>Date</th></tr>
+      </thead>
+      <tbody>
+        {% for payment in recent_payments %}
+        <tr>
+          <td>{{ payment.receipt_number }}</td>
+          <td>{{ payment.student_name }}</td>
+          <td>{{ payment.amount_paid }}</td>
+          <td>{{ payment.date_paid }}</td>
+        </tr>
+        {% endfor %}
+      </tbody>
+    </table>
+    {% else %}
+    <p>No recent payments.</p>
+    {% endif %}
+    <a href="{{ url_for('fees') }}" class="button" style="margin-top: 10px;">View All Fees</a>
+  </div>
+</div>
 
-  .form-group label {
-    display: block;
-    margin-bottom: 6px;
-    font-weight: 600;
-    color: #334155;
-  }
+<div class="card">
+  <h3>Quick Actions</h3>
+  <div class="action-buttons">
+    <a href="{{ url_for('add_student') }}" class="button">Add New Student</a>
+    <a href="{{ url_for('add_teacher') }}" class="button secondary">Add New Teacher</a>
+    <a href="{{ url_for('attendance') }}" class="button">Mark Attendance</a>
+    <a href="{{ url_for('add_fee_structure') }}" class="button secondary">Add Fee Structure</a>
+    <a href="{{ url_for('timetable') }}" class="button">Manage Timetable</a>
+    <a href="{{ url_for('settings') }}" class="button secondary">System Settings</a>
+  </div>
+</div>
+{% endblock %}''',
 
-  .badge {
-    display: inline-block;
-    padding: 4px 10px;
-    border-radius: 20px;
-    font-size: 12px;
-    font-weight: 600;
-    margin: 2px;
-  }
+    'students.html': '''{% extends "base.html" %}
+{% from "pagination.html" import pagination %}
+{% block content %}
+<h1>Students</h1>
 
-  .badge-success { background-color: #dcfce7; color: #166534; }
-  .badge-warning { background-color: #fef3c7; color: #92400e; }
-  .badge-danger { background-color: #fecaca; color: #991b1b; }
-  .badge-info { background-color: #dbeafe; color: #1d4ed8; }
-
-  .tabs {
-    display: flex;
-    border-bottom: 1px solid var(--gray-light);
-    margin-bottom: 20px;
-    background: white;
-    border-radius: 8px;
-    overflow: hidden;
-    box-shadow: var(--shadow-sm);
-  }
-
-  .tab {
-    padding: 12px 24px;
-    cursor: pointer;
-    border: none;
-    background: none;
-    font-size: 16px;
-    color: #64748b;
-    font-weight: 500;
-    transition: all 0.3s;
-  }
+<div class="action-buttons">
+  <a href="{{ url_for('add_student') }}" class="button">Add New Student</a>
+  {% if session.role == 'admin' %}
+  <a href="{{ url_for('import_students') }}" class="button secondary">Import from CSV</a>
+  {% endif %}
+</div>
 
-  .tab:hover {
-    background-color: #f1f5f9;
-  }
+<form method="get" action="{{ url_for('students') }}" class="search-box">
+  <input type="text" id="studentSearch" name="q" value="{{ search_query }}" onkeyup="filterTable('studentSearch', 'studentsTable')" placeholder="Search students by name, admission number, guardian, or class... (press Enter to search all students)">
+</form>
 
-  .tab.active {
-    color: var(--primary-color);
-    background-color: #eff6ff;
-    border-bottom: 3px solid var(--primary-color);
-  }
+{% if search_query %}
+<p>Best matches for "{{ search_query }}" &mdash; <a href="{{ url_for('students') }}">show all students</a></p>
+{% endif %}
 
-  .tab-content {
-    display: none;
-  }
+<table id="studentsTable">
+  <thead>
+    <tr>
+      <th>ID</th>
+      <th>Admission No</th>
+      <th>Name</th>
+      <th>Age</th>
+      <th>Class</th>
+      <th>Guardian</th>
+      <th>Guardian Contacts</th>
+      <th>Medical Info</th>
+      <th>Actions</th>
+    </tr>
+  </thead>
+  <tbody>
+    {% for student in students %}
+    <tr>
+      <td>{{ student.id }}</td>
+      <td>{{ student.admission_number }}</td>
+      <td>{{ student.name }}</td>
+      <td>{{ student.age or 'N/A' }}</td>
+      <td>{{ student.class or 'N/A' }}</td>
+      <td>{{ student.guardian_name or 'N/A' }}</td>
+      <td>{{ student.guardian_contacts or 'N/A' }}</td>
+      <td>
+        {% if student.has_medical_condition %}
+          <span class="badge badge-danger">Medical</span>
+        {% else %}
+          <span class="badge badge-success">Healthy</span>
+        {% endif %}
+      </td>
+      <td>
+        <a href="{{ url_for('edit_student', id=student.id) }}" class="button" style="padding: 5px 10px; font-size: 12px;">Edit</a>
+        <a href="{{ url_for('view_medical_info', id=student.id) }}" class="button warning" style="padding: 5px 10px; font-size: 12px;">Medical</a>
+      </td>
+    </tr>
+    {% endfor %}
+  </tbody>
+</table>
 
-  .tab-content.active {
-    display: block;
-  }
+{{ pagination(students) }}
 
-  .grade-A { color: #22c55e; font-weight: bold; }
-  .grade-B { color: #2563eb; font-weight: bold; }
-  .grade-C { color: #f59e0b; font-weight: bold; }
-  .grade-D { color: #f97316; font-weight: bold; }
-  .grade-F { color: #ef4444; font-weight: bold; }
+<script>
+  function filterTable(inputId, tableId) {
+    const input = document.getElementById(inputId);
+    const filter = input.value.toUpperCase();
+    const table = document.getElementById(tableId);
+    const rows = table.getElementsByTagName('tr');
 
-  .report-card {
-    border: 1px solid var(--gray-light);
-    padding: 30px;
-    margin: 20px auto;
-    background-color: white;
-    max-width: 1000px;
-    border-radius: 12px;
-    box-shadow: var(--shadow-lg);
+    for (let i = 1; i < rows.length; i++) {
+      const cells = rows[i].getElementsByTagName('td');
+      let match = false;
+      
+      for (let j = 0; j < cells.length; j++) {
+        const cell = cells[j];
+        if (cell) {
+          if (cell.textContent.toUpperCase().indexOf(filter) > -1) {
+            match = true;
+            break;
+          }
+        }
+      }
+      rows[i].style.display = match ? '' : 'none';
+    }
   }
+</script>
+{% endblock %}''',
 
-  .report-header {
-    text-align: center;
-    border-bottom: 2px solid var(--primary-color);
-    padding-bottom: 20px;
-    margin-bottom: 30px;
-  }
+    'import_students.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Import Students</h1>
 
-  .performance-summary {
-    background: #f1f5f9;
-    padding: 20px;
-    border-radius: 12px;
-    margin: 20px 0;
-  }
+{% if status %}
+<div class="card" id="importStatus" data-url="{{ url_for('import_students_status', job_id=job_id) }}">
+  <h3>Import <span id="importState">{{ status.state }}</span></h3>
+  <div style="background: var(--gray-light); border-radius: 6px; overflow: hidden; height: 20px;">
+    <div id="importBar" style="background: var(--primary-color); height: 100%; width: {{ status.progress }}%;"></div>
+  </div>
+  <p>
+    <span id="importProcessed">{{ status.processed }}</span> rows processed &mdash;
+    <span id="importInserted">{{ status.inserted or 0 }}</span> added,
+    <span id="importUpdated">{{ status.updated or 0 }}</span> updated,
+    <span id="importSkipped">{{ status.skipped or 0 }}</span> skipped,
+    <span id="importFailed">{{ status.failed or 0 }}</span> with errors
+    (<span id="importRate">{{ status.rows_per_second or 0 }}</span> rows/s)
+  </p>
+  <p id="importMessage" class="balance">{{ status.message or '' }}</p>
+  <table id="importErrors" {% if not status.errors %}style="display: none;"{% endif %}>
+    <thead>
+      <tr>
+        <th>Line</th>
+        <th>Admission No</th>
+        <th>Error</th>
+      </tr>
+    </thead>
+    <tbody>
+      {% for error in status.errors or [] %}
+      <tr>
+        <td>{{ error.line }}</td>
+        <td>{{ error.admission_number }}</td>
+        <td>{{ error.error }}</td>
+      </tr>
+      {% endfor %}
+    </tbody>
+  </table>
+</div>
+{% endif %}
 
-  /* Timetable Styles */
-  .timetable {
-    width: 100%;
-    border-collapse: separate;
-    border-spacing: 4px;
-    margin: 20px 0;
-    background: white;
-    border-radius: 12px;
-    overflow: hidden;
-    box-shadow: var(--shadow-md);
-  }
+<div class="card">
+  <h3>Upload CSV</h3>
+  <p>The first row must be a header. Required columns: Admission Number, Name, Class. Other recognised columns: {{ columns|reject('in', ['admission_number', 'name', 'class'])|join(', ') }}. The students export uses the same headings.</p>
+  <form method="post" enctype="multipart/form-data">
+    <div class="form-group">
+      <label for="csv_file">CSV File *</label>
+      <input type="file" id="csv_file" name="csv_file" accept=".csv,text/csv" required>
+    </div>
+    <div class="form-group">
+      <label for="on_conflict">When the admission number already exists</label>
+      <select id="on_conflict" name="on_conflict">
+        <option value="skip">Skip the row</option>
+        <option value="update">Update the student</option>
+      </select>
+    </div>
+    <button type="submit" class="button">Import Students</button>
+    <a href="{{ url_for('students') }}" class="button secondary">Back to Students</a>
+  </form>
+</div>
 
-  .timetable th {
-    background:skyblue;
-    color: white;
-    padding: 16px;
-    text-align: center;
-    font-weight: 600;
-    border-radius: 8px 8px 0 0;
-  }
+{% if status and status.state in ['queued', 'running'] %}
+<script>
+  (function pollImport() {
+    const panel = document.getElementById('importStatus');
+    fetch(panel.dataset.url).then(response => response.json()).then(status => {
+      document.getElementById('importState').textContent = status.state;
+      document.getElementById('importBar').style.width = status.progress + '%';
+      ['processed', 'inserted', 'updated', 'skipped', 'failed'].forEach(key => {
+        document.getElementById('import' + key.charAt(0).toUpperCase() + key.slice(1)).textContent = status[key] || 0;
+      });
+      document.getElementById('importRate').textContent = status.rows_per_second || 0;
+      document.getElementById('importMessage').textContent = status.message || '';
+      if (status.state === 'queued' || status.state === 'running') {
+        setTimeout(pollImport, 1000);
+      } else {
+        // Reload once to show the error report
+        window.location.reload();
+      }
+    });
+  })();
+</script>
+{% endif %}
+{% endblock %}''',
 
-  .timetable td {
-    padding: 8px;
-    border-radius: 8px;
-    vertical-align: top;
-    height: 120px;
-    background-color: #f8fafc;
-    position: relative;
-  }
+    'provision_users.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Provision Accounts</h1>
 
-  .timetable tr:first-child td {
-    border-top: none;
-  }
+{% if status %}
+<div class="card" id="provisionStatus" data-url="{{ url_for('provision_users_status', job_id=job_id) }}">
+  <h3>Creating {{ status.role }} accounts: <span id="provisionState">{{ status.state }}</span></h3>
+  <div style="background: var(--gray-light); border-radius: 6px; overflow: hidden; height: 20px;">
+    <div id="provisionBar" style="background: var(--primary-color); height: 100%; width: {{ status.progress }}%;"></div>
+  </div>
+  <p>
+    <span id="provisionProcessed">{{ status.processed }}</span> of <span id="provisionTotal">{{ status.total or 0 }}</span> processed &mdash;
+    <span id="provisionCreated">{{ status.created or 0 }}</span> created,
+    <span id="provisionSkipped">{{ status.skipped or 0 }}</span> skipped,
+    <span id="provisionFailed">{{ status.failed or 0 }}</span> failed
+    (<span id="provisionRate">{{ status.accounts_per_second or 0 }}</span> accounts/s)
+  </p>
+  <p id="provisionMessage" class="balance">{{ status.message or '' }}</p>
+  {% if status.errors %}
+  <table>
+    <thead>
+      <tr>
+        <th>Username</th>
+        <th>Error</th>
+      </tr>
+    </thead>
+    <tbody>
+      {% for error in status.errors %}
+      <tr>
+        <td>{{ error.username }}</td>
+        <td>{{ error.error }}</td>
+      </tr>
+      {% endfor %}
+    </tbody>
+  </table>
+  {% endif %}
+</div>
+{% endif %}
 
-  .timetable .time-slot {
-    background: #f1f5f9;
-    font-weight: 600;
-    text-align: center;
-    width: 100px;
-    padding: 10px;
-    border-radius: 6px;
-  }
+<div class="card">
+  <h3>Create Missing Accounts</h3>
+  <p>{{ missing.students }} students and {{ missing.teachers }} teachers have no account yet. Students sign in with their admission number; teachers with the first part of their email address, or their name. Every new account gets the default password <strong>school123</strong>.</p>
+  <form method="post">
+    <div class="form-group">
+      <label for="role">Create accounts for</label>
+      <select id="role" name="role">
+        <option value="student">Students ({{ missing.students }})</option>
+        <option value="teacher">Teachers ({{ missing.teachers }})</option>
+      </select>
+    </div>
+    <button type="submit" class="button">Provision Accounts</button>
+    <a href="{{ url_for('user_management') }}" class="button secondary">Back to Users</a>
+  </form>
+</div>
 
-  .timetable .period {
-    border-radius: 8px;
-    padding: 10px;
-    margin: 3px 0;
-    color: white;
-    font-weight: 600;
-    position: relative;
-    min-height: 80px;
-    border: 2px solid rgba(255,255, 255, 0.3);
-    transition: all 0.2s;
-    display: flex;
-    flex-direction: column;
-    justify-content: center;
-  }
+{% if status and status.state in ['queued', 'running'] %}
+<script>
+  (function pollProvision() {
+    const panel = document.getElementById('provisionStatus');
+    fetch(panel.dataset.url).then(response => response.json()).then(status => {
+      document.getElementById('provisionState').textContent = status.state;
+      document.getElementById('provisionBar').style.width = status.progress + '%';
+      ['processed', 'total', 'created', 'skipped', 'failed'].forEach(key => {
+        document.getElementById('provision' + key.charAt(0).toUpperCase() + key.slice(1)).textContent = status[key] || 0;
+      });
+      document.getElementById('provisionRate').textContent = status.accounts_per_second || 0;
+      document.getElementById('provisionMessage').textContent = status.message || '';
+      if (status.state === 'queued' || status.state === 'running') {
+        setTimeout(pollProvision, 1000);
+      } else {
+        // Reload once to show the final counts
+        window.location.reload();
+      }
+    });
+  })();
+</script>
+{% endif %}
+{% endblock %}''',
 
-  .timetable .period:hover {
-    opacity: 0.95;
-    transform: scale(1.02);
-    cursor: pointer;
-    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
-  }
+    'add_student.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Add New Student</h1>
 
-  .period-empty {
-    background: #f8fafc;
-    color: #94a3b8;
-    text-align: center;
-    padding: 15px;
-    border-radius: 8px;
-    font-style: italic;
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    min-height: 80px;
-  }
+<div class="card">
+  <form method="post">
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
+      <div>
+        <div class="form-group">
+          <label for="admission_number">Admission Number *</label>
+          <input type="text" id="admission_number" name="admission_number" required>
+        </div>
+        
+        <div class="form-group">
+          <label for="name">Full Name *</label>
+          <input type="text" id="name" name="name" required>
+        </div>
+        
+        <div class="form-group">
+          <label for="age">Age</label>
+          <input type="number" id="age" name="age" min="1" max="30">
+        </div>
+        
+        <div class="form-group">
+          <label for="class">Class *</label>
+          <select id="class" name="class" required>
+            <option value="">Select Class</option>
+            <option value="Form 1">Form 1</option>
+            <option value="Form 2">Form 2</option>
+            <option value="Form 3">Form 3</option>
+            <option value="Form 4">Form 4</option>
+            <option value="Form 5">Form 5</option>
+            <option value="Form 6">Form 6</option>
+          </select>
+        </div>
+      </div>
+      
+      <div>
+        <div class="form-group">
+          <label for="guardian_name">Guardian Name</label>
+          <input type="text" id="guardian_name" name="guardian_name">
+        </div>
+        
+        <div class="form-group">
+          <label for="guardian_contacts">Guardian Contacts</label>
+          <input type="text" id="guardian_contacts" name="guardian_contacts" placeholder="Phone numbers">
+        </div>
+        
+        <div class="form-group">
+          <label for="guardian_email">Guardian Email</label>
+          <input type="email" id="guardian_email" name="guardian_email">
+        </div>
+        
+        <div class="form-group">
+          <label for="address">Address</label>
+          <textarea id="address" name="address" rows="3"></textarea>
+        </div>
+      </div>
+    </div>
+    
+    <h3>Medical Information</h3>
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px; margin-top: 20px;">
+      <div>
+        <div class="form-group">
+          <label for="has_medical_condition">
+            <input type="checkbox" id="has_medical_condition" name="has_medical_condition">
+            Has Special Medical Condition
+          </label>
+        </div>
+        
+        <div class="form-group">
+          <label for="medical_conditions">Medical Conditions</label>
+          <textarea id="medical_conditions" name="medical_conditions" rows="3" placeholder="Describe any medical conditions"></textarea>
+        </div>
+        
+        <div class="form-group">
+          <label for="allergies">Allergies</label>
+          <textarea id="allergies" name="allergies" rows="2" placeholder="List any allergies"></textarea>
+        </div>
+      </div>
+      
+      <div>
+        <div class="form-group">
+          <label for="medications">Current Medications</label>
+          <textarea id="medications" name="medications" rows="2"></textarea>
+        </div>
+        
+        <div class="form-group">
+          <label for="blood_type">Blood Type</label>
+          <input type="text" id="blood_type" name="blood_type" placeholder="e.g., O+">
+        </div>
+      </div>
+    </div>
+    
+    <h3>Emergency Contact</h3>
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px; margin-top: 20px;">
+      <div>
+        <div class="form-group">
+          <label for="emergency_contact_name">Emergency Contact Name</label>
+          <input type="text" id="emergency_contact_name" name="emergency_contact_name">
+        </div>
+        
+        <div class="form-group">
+          <label for="emergency_contact_relation">Relationship</label>
+          <input type="text" id="emergency_contact_relation" name="emergency_contact_relation" placeholder="e.g., Father, Mother">
+        </div>
+      </div>
+      
+      <div>
+        <div class="form-group">
+          <label for="emergency_contact_phone">Emergency Phone</label>
+          <input type="tel" id="emergency_contact_phone" name="emergency_contact_phone">
+        </div>
+        
+        <div class="form-group">
+          <label for="emergency_contact_alt_phone">Alternate Phone</label>
+          <input type="tel" id="emergency_contact_alt_phone" name="emergency_contact_alt_phone">
+        </div>
+      </div>
+    </div>
+    
+    <div style="text-align: center; margin-top: 20px;">
+      <button type="submit" class="button">Add Student</button>
+      <button type="reset" class="button secondary">Clear</button>
+    </div>
+  </form>
+</div>
+{% endblock %}''',
+
+    'edit_student.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Edit Student</h1>
+
+<div class="card">
+  <form method="post">
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
+      <div>
+        <div class="form-group">
+          <label for="admission_number">Admission Number</label>
+          <input type="text" id="admission_number" name="admission_number" value="{{ student.admission_number }}" readonly>
+        </div>
+        
+        <div class="form-group">
+          <label for="name">Full Name *</label>
+          <input type="text" id="name" name="name" value="{{ student.name }}" required>
+        </div>
+        
+        <div class="form-group">
+          <label for="age">Age</label>
+          <input type="number" id="age" name="age" min="1" max="30" value="{{ student.age or '' }}">
+        </div>
+        
+        <div class="form-group">
+          <label for="class">Class *</label>
+          <select id="class" name="class" required>
+            <option value="">Select Class</option>
+            <option value="Form 1" {% if student.class == 'Form 1' %}selected{% endif %}>Form 1</option>
+            <option value="Form 2" {% if student.class == 'Form 2' %}selected{% endif %}>Form 2</option>
+            <option value="Form 3" {% if student.class == 'Form 3' %}selected{% endif %}>Form 3</option>
+            <option value="Form 4" {% if student.class == 'Form 4' %}selected{% endif %}>Form 4</option>
+            <option value="Form 5" {% if student.class == 'Form 5' %}selected{% endif %}>Form 5</option>
+            <option value="Form 6" {% if student.class == 'Form 6' %}selected{% endif %}>Form 6</option>
+          </select>
+        </div>
+      </div>
+      
+      <div>
+        <div class="form-group">
+          <label for="guardian_name">Guardian Name</label>
+          <input type="text" id="guardian_name" name="guardian_name" value="{{ student.guardian_name or '' }}">
+        </div>
+        
+        <div class="form-group">
+          <label for="guardian_contacts">Guardian Contacts</label>
+          <input type="text" id="guardian_contacts" name="guardian_contacts" value="{{ student.guardian_contacts or '' }}" placeholder="Phone numbers">
+        </div>
+        
+        <div class="form-group">
+          <label for="guardian_email">Guardian Email</label>
+          <input type="email" id="guardian_email" name="guardian_email" value="{{ student.guardian_email or '' }}">
+        </div>
+        
+        <div class="form-group">
+          <label for="address">Address</label>
+          <textarea id="address" name="address" rows="3">{{ student.address or '' }}</textarea>
+        </div>
+      </div>
+    </div>
+    
+    <h3>Medical Information</h3>
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px; margin-top: 20px;">
+      <div>
+        <div class="form-group">
+          <label for="has_medical_condition">
+            <input type="checkbox" id="has_medical_condition" name="has_medical_condition" {% if student.has_medical_condition %}checked{% endif %}>
+            Has Special Medical Condition
+          </label>
+        </div>
+        
+        <div class="form-group">
+          <label for="medical_conditions">Medical Conditions</label>
+          <textarea id="medical_conditions" name="medical_conditions" rows="3">{{ student.medical_conditions or '' }}</textarea>
+        </div>
+        
+        <div class="form-group">
+          <label for="allergies">Allergies</label>
+          <textarea id="allergies" name="allergies" rows="2">{{ student.allergies or '' }}</textarea>
+        </div>
+      </div>
+      
+      <div>
+        <div class="form-group">
+          <label for="medications">Current Medications</label>
+          <textarea id="medications" name="medications" rows="2">{{ student.medications or '' }}</textarea>
+        </div>
+        
+        <div class="form-group">
+          <label for="blood_type">Blood Type</label>
+          <input type="text" id="blood_type" name="blood_type" value="{{ student.blood_type or '' }}">
+        </div>
+      </div>
+    </div>
+    
+    <h3>Emergency Contact</h3>
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px; margin-top: 20px;">
+      <div>
+        <div class="form-group">
+          <label for="emergency_contact_name">Emergency Contact Name</label>
+          <input type="text" id="emergency_contact_name" name="emergency_contact_name" value="{{ student.emergency_contact_name or '' }}">
+        </div>
+        
+        <div class="form-group">
+          <label for="emergency_contact_relation">Relationship</label>
+          <input type="text" id="emergency_contact_relation" name="emergency_contact_relation" value="{{ student.emergency_contact_relation or '' }}">
+        </div>
+      </div>
+      
+      <div>
+        <div class="form-group">
+          <label for="emergency_contact_phone">Emergency Phone</label>
+          <input type="tel" id="emergency_contact_phone" name="emergency_contact_phone" value="{{ student.emergency_contact_phone or '' }}">
+        </div>
+        
+        <div class="form-group">
+          <label for="emergency_contact_alt_phone">Alternate Phone</label>
+          <input type="tel" id="emergency_contact_alt_phone" name="emergency_contact_alt_phone" value="{{ student.emergency_contact_alt_phone or '' }}">
+        </div>
+      </div>
+    </div>
+    
+    <div style="text-align: center; margin-top: 20px;">
+      <button type="submit" class="button">Update Student</button>
+      <a href="{{ url_for('students') }}" class="button secondary">Cancel</a>
+    </div>
+  </form>
+</div>
+{% endblock %}''',
+
+    'medical_info.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Medical Information - {{ student.name }}</h1>
+
+<div class="card">
+  <h3>Basic Information</h3>
+  <table>
+    <tr>
+      <th>Admission Number:</th>
+      <td>{{ student.admission_number }}</td>
+    </tr>
+    <tr>
+      <th>Name:</th>
+      <td>{{ student.name }}</td>
+    </tr>
+    <tr>
+      <th>Class:</th>
+      <td>{{ student.class }}</td>
+    </tr>
+    <tr>
+      <th>Age:</th>
+      <td>{{ student.age or 'N/A' }}</td>
+    </tr>
+  </table>
+</div>
+
+<div class="card">
+  <h3>Medical Status</h3>
+  <div class="medical-alert {% if student.has_medical_condition %}danger{% else %}info{% endif %}">
+    <i class="fas fa-heartbeat"></i>
+    <strong>Medical Condition:</strong>
+    {% if student.has_medical_condition %}
+    Has Special Medical Condition
+    {% else %}
+    No Special Medical Conditions
+    {% endif %}
+  </div>
+  
+  {% if student.medical_conditions %}
+  <div style="margin-top: 15px;">
+    <h4>Medical Conditions</h4>
+    <p>{{ student.medical_conditions }}</p>
+  </div>
+  {% endif %}
+  
+  {% if student.allergies %}
+  <div style="margin-top: 15px;">
+    <h4>Allergies</h4>
+    <p>{{ student.allergies }}</p>
+  </div>
+  {% endif %}
+  
+  {% if student.medications %}
+  <div style="margin-top: 15px;">
+    <h4>Current Medications</h4>
+    <p>{{ student.medications }}</p>
+  </div>
+  {% endif %}
+  
+  {% if student.blood_type %}
+  <div style="margin-top: 15px;">
+    <h4>Blood Type</h4>
+    <p>{{ student.blood_type }}</p>
+  </div>
+  {% endif %}
+</div>
+
+<div class="card">
+  <h3>Emergency Contact</h3>
+  {% if student.emergency_contact_name %}
+  <table>
+    <tr>
+      <th>Name:</th>
+      <td>{{ student.emergency_contact_name }}</td>
+    </tr>
+    <tr>
+      <th>Relationship:</th>
+      <td>{{ student.emergency_contact_relation }}</td>
+    </tr>
+    <tr>
+      <th>Phone:</th>
+      <td>{{ student.emergency_contact_phone }}</td>
+    </tr>
+    {% if student.emergency_contact_alt_phone %}
+    <tr>
+      <th>Alternate Phone:</th>
+      <td>{{ student.emergency_contact_alt_phone }}</td>
+    </tr>
+    {% endif %}
+  </table>
+  {% else %}
+  <p>No emergency contact information available.</p>
+  {% endif %}
+</div>
+
+<div class="action-buttons">
+  <a href="{{ url_for('edit_student', id=student.id) }}" class="button">Edit Student</a>
+  <a href="{{ url_for('students') }}" class="button secondary">Back to Students</a>
+</div>
+{% endblock %}''',
+
+    'teachers.html': '''{% extends "base.html" %}
+{% from "pagination.html" import pagination %}
+{% block content %}
+<h1>Teachers</h1>
+
+<div class="action-buttons">
+  <a href="{{ url_for('add_teacher') }}" class="button">Add New Teacher</a>
+</div>
+
+<table id="teachersTable">
+  <thead>
+    <tr>
+      <th>ID</th>
+      <th>Name</th>
+      <th>Email</th>
+      <th>Phone</th>
+      <th>Qualification</th>
+      <th>Actions</th>
+    </tr>
+  </thead>
+  <tbody>
+    {% for teacher in teachers %}
+    <tr>
+      <td>{{ teacher.id }}</td>
+      <td>{{ teacher.name }}</td>
+      <td>{{ teacher.email or 'N/A' }}</td>
+      <td>{{ teacher.phone or 'N/A' }}</td>
+      <td>{{ teacher.qualification or 'N/A' }}</td>
+      <td>
+        <a href="{{ url_for('edit_teacher', id=teacher.id) }}" class="button" style="padding: 5px 10px; font-size: 12px;">Edit</a>
+        <a href="{{ url_for('delete_teacher', id=teacher.id) }}" class="button danger" style="padding: 5px 10px; font-size: 12px;" onclick="return confirmDelete('Delete this teacher?')">Delete</a>
+      </td>
+    </tr>
+    {% endfor %}
+  </tbody>
+</table>
+
+{{ pagination(teachers) }}
+{% endblock %}''',
+
+    'add_teacher.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Add New Teacher</h1>
+
+<div class="card">
+  <form method="post">
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
+      <div>
+        <div class="form-group">
+          <label for="name">Full Name *</label>
+          <input type="text" id="name" name="name" required>
+        </div>
+        
+        <div class="form-group">
+          <label for="email">Email</label>
+          <input type="email" id="email" name="email">
+        </div>
+      </div>
+      
+      <div>
+        <div class="form-group">
+          <label for="phone">Phone</label>
+          <input type="tel" id="phone" name="phone">
+        </div>
+        
+        <div class="form-group">
+          <label for="qualification">Qualification</label>
+          <input type="text" id="qualification" name="qualification" placeholder="e.g., B.Ed, M.Ed">
+        </div>
+      </div>
+    </div>
+    
+    <div style="text-align: center; margin-top: 20px;">
+      <button type="submit" class="button">Add Teacher</button>
+      <button type="reset" class="button secondary">Clear</button>
+    </div>
+  </form>
+</div>
+{% endblock %}''',
+
+    'edit_teacher.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Edit Teacher</h1>
+
+<div class="card">
+  <form method="post">
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
+      <div>
+        <div class="form-group">
+          <label for="name">Full Name *</label>
+          <input type="text" id="name" name="name" value="{{ teacher.name }}" required>
+        </div>
+        
+        <div class="form-group">
+          <label for="email">Email</label>
+          <input type="email" id="email" name="email" value="{{ teacher.email or '' }}">
+        </div>
+      </div>
+      
+      <div>
+        <div class="form-group">
+          <label for="phone">Phone</label>
+          <input type="tel" id="phone" name="phone" value="{{ teacher.phone or '' }}">
+        </div>
+        
+        <div class="form-group">
+          <label for="qualification">Qualification</label>
+          <input type="text" id="qualification" name="qualification" value="{{ teacher.qualification or '' }}">
+        </div>
+      </div>
+    </div>
+    
+    <div style="text-align: center; margin-top: 20px;">
+      <button type="submit" class="button">Update Teacher</button>
+      <a href="{{ url_for('teachers') }}" class="button secondary">Cancel</a>
+    </div>
+  </form>
+</div>
+{% endblock %}''',
+
+    'classes.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Classes</h1>
+
+<div class="action-buttons">
+  <a href="{{ url_for('add_class') }}" class="button">Add New Class</a>
+</div>
+
+<table id="classesTable">
+  <thead>
+    <tr>
+      <th>ID</th>
+      <th>Class Name</th>
+      <th>Teacher</th>
+      <th>Students</th>
+      <th>Description</th>
+      <th>Actions</th>
+    </tr>
+  </thead>
+  <tbody>
+    {% for cls in classes %}
+    <tr>
+      <td>{{ cls.id }}</td>
+      <td>{{ cls.name }}</td>
+      <td>{{ cls.teacher_name or 'Not Assigned' }}</td>
+      <td>{{ cls.student_count }}</td>
+      <td>{{ cls.description or 'N/A' }}</td>
+      <td>
+        <a href="{{ url_for('edit_class', id=cls.id) }}" class="button" style="padding: 5px 10px; font-size: 12px;">Edit</a>
+        <a href="{{ url_for('delete_class', id=cls.id) }}" class="button danger" style="padding: 5px 10px; font-size: 12px;" onclick="return confirmDelete('Delete this class?')">Delete</a>
+      </td>
+    </tr>
+    {% endfor %}
+  </tbody>
+</table>
+{% endblock %}''',
+
+    'add_class.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Add New Class</h1>
+
+<div class="card">
+  <form method="post">
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
+      <div>
+        <div class="form-group">
+          <label for="name">Class Name *</label>
+          <input type="text" id="name" name="name" required placeholder="e.g., Form 1A">
+        </div>
+        
+        <div class="form-group">
+          <label for="teacher_id">Class Teacher</label>
+          <select id="teacher_id" name="teacher_id">
+            <option value="">Select Teacher</option>
+            {% for teacher in teachers %}
+            <option value="{{ teacher.id }}">{{ teacher.name }}</option>
+            {% endfor %}
+          </select>
+        </div>
+      </div>
+      
+      <div>
+        <div class="form-group">
+          <label for="description">Description</label>
+          <textarea id="description" name="description" rows="4" placeholder="Class description..."></textarea>
+        </div>
+      </div>
+    </div>
+    
+    <div style="text-align: center; margin-top: 20px;">
+      <button type="submit" class="button">Add Class</button>
+      <button type="reset" class="button secondary">Clear</button>
+    </div>
+  </form>
+</div>
+{% endblock %}''',
 
-  .subject-math { background: linear-gradient(135deg, #667eea, #764ba2); }
-  .subject-english { background: linear-gradient(135deg, #f093fb, #f5576c); }
-  .subject-science { background: linear-gradient(135deg, #4facfe, #00f2fe); }
-  .subject-history { background: linear-gradient(135deg, #43e97b, #38f9d7); }
-  .subject-geography { background: linear-gradient(135deg, #fa709a, #fee140); }
-  .subject-physics { background: linear-gradient(135deg, #30cfd0, #330867); }
-  .subject-chemistry { background: linear-gradient(135deg, #a8edea, #fed6e3); }
-  .subject-biology { background: linear-gradient(135deg, #5ee7df, #b490ca); }
-  .subject-computer { background: linear-gradient(135deg, #d299c2, #fef9d7); }
-  .subject-art { background: linear-gradient(135deg, #f6d365, #fda085); }
-  .subject-pe { background: linear-gradient(135deg, #a1c4fd, #c2e9fb); }
-  .subject-music { background: linear-gradient(135deg, #ffecd2, #fcb69f); }
-  .break-period {
-    background: repeating-linear-gradient(45deg, #e0e7ff, #e0e7ff 10px, #c7d2fe 10px, #c7d2fe 20px);
-    color: #4f46e5;
-    text-align: center;
-    font-weight: 600;
-  }
+    'edit_class.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Edit Class</h1>
 
-  .period-details {
-    font-size: 11px;
-  }
+<div class="card">
+  <form method="post">
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
+      <div>
+        <div class="form-group">
+          <label for="name">Class Name *</label>
+          <input type="text" id="name" name="name" value="{{ cls.name }}" required>
+        </div>
+        
+        <div class="form-group">
+          <label for="teacher_id">Class Teacher</label>
+          <select id="teacher_id" name="teacher_id">
+            <option value="">Select Teacher</option>
+            {% for teacher in teachers %}
+            <option value="{{ teacher.id }}" {% if cls.teacher_id == teacher.id %}selected{% endif %}>{{ teacher.name }}</option>
+            {% endfor %}
+          </select>
+        </div>
+      </div>
+      
+      <div>
+        <div class="form-group">
+          <label for="description">Description</label>
+          <textarea id="description" name="description" rows="4">{{ cls.description or '' }}</textarea>
+        </div>
+      </div>
+    </div>
+    
+    <div style="text-align: center; margin-top: 20px;">
+      <button type="submit" class="button">Update Class</button>
+      <a href="{{ url_for('classes') }}" class="button secondary">Cancel</a>
+    </div>
+  </form>
+</div>
+{% endblock %}''',
 
-  .period-details .subject {
-    font-size: 13px;
-    font-weight: 600;
-    margin-bottom: 5px;
-  }
+    'fees.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Fee Management</h1>
 
-  .period-details .teacher {
-    font-size: 11px;
-    opacity: 0.9;
-  }
+<div class="action-buttons">
+  <a href="{{ url_for('fee_arrears') }}" class="button secondary">Arrears Report</a>
+  <a href="{{ url_for('import_fee_statement') }}" class="button secondary">Import Statement</a>
+</div>
 
-  .period-details .room {
-    font-size: 10px;
-    opacity: 0.85;
-    background: rgba(0,0,0,0.2);
-    padding: 2px 6px;
-    border-radius: 4px;
-    display: inline-block;
-    margin-top: 3px;
-  }
+<div class="tabs">
+  <button class="tab active" onclick="toggleTabs('recentPayments')">Recent Payments</button>
+  <button class="tab" onclick="toggleTabs('feeStructures')">Fee Structures</button>
+  <button class="tab" onclick="toggleTabs('addPayment')">Add Payment</button>
+  <button class="tab" onclick="toggleTabs('addStructure')">Add Structure</button>
+</div>
 
-  .timetable-controls {
-    background: white;
-    padding: 18px;
-    border-radius: 12px;
-    margin-bottom: 20px;
-    display: flex;
-    flex-wrap: wrap;
-    gap: 15px;
-    align-items: center;
-    box-shadow: var(--shadow-sm);
-  }
+<div id="recentPayments" class="tab-content active">
+  <div class="card">
+    <h3>Recent Fee Payments</h3>
+    {% if recent_payments %}
+    <table>
+      <thead>
+        <tr>
+          <th>Receipt No</th>
+          <th>Student</th>
+          <th>Class</th>
+          <th>Term</th>
+          <th>Year</th>
+          <th>Amount Paid</th>
+          <th>Balance</th>
+          <th>Date</th>
+          <th>Actions</th>
+        </tr>
+      </thead>
+      <tbody>
+        {% for payment in recent_payments %}
+        <tr>
+          <td>{{ payment.receipt_number }}</td>
+          <td>{{ payment.student_name }}</td>
+          <td>{{ payment.class_name }}</td>
+          <td>{{ payment.term }}</td>
+          <td>{{ payment.year }}</td>
+          <td class="paid">{{ payment.amount_paid }}</td>
+          <td class="{% if payment.balance > 0 %}balance{% else %}paid{% endif %}">{{ payment.balance }}</td>
+          <td>{{ payment.date_paid }}</td>
+          <td>
+            <a href="{{ url_for('view_receipt', id=payment.id) }}" class="button" style="padding: 5px 10px; font-size: 12px;">Receipt</a>
+          </td>
+        </tr>
+        {% endfor %}
+      </tbody>
+    </table>
+    {% else %}
+    <p>No recent payments found.</p>
+    {% endif %}
+  </div>
+</div>
 
-  .timetable-controls select, .timetable-controls input {
-    padding: 10px 15px;
-    border: 2px solid var(--gray-light);
-    border-radius: 8px;
-    font-size: 14px;
-    transition: all 0.3s;
-  }
+<div id="feeStructures" class="tab-content">
+  <div class="card">
+    <h3>Fee Structures</h3>
+    {% if fee_structures %}
+    <table>
+      <thead>
+        <tr>
+          <th>Class</th>
+          <th>Term</th>
+          <th>Year</th>
+          <th>Amount</th>
+          <th>Due Date</th>
+          <th>Description</th>
+          <th>Actions</th>
+        </tr>
+      </thead>
+      <tbody>
+        {% for fs in fee_structures %}
+        <tr>
+          <td>{{ fs.class }}</td>
+          <td>{{ fs.term }}</td>
+          <td>{{ fs.year }}</td>
+          <td>{{ fs.amount }}</td>
+          <td>{{ fs.due_date or 'N/A' }}</td>
+          <td>{{ fs.description or 'N/A' }}</td>
+          <td>
+            <a href="{{ url_for('edit_fee_structure', id=fs.id) }}" class="button" style="padding: 5px 10px; font-size: 12px;">Edit</a>
+            <a href="{{ url_for('delete_fee_structure', id=fs.id) }}" class="button danger" style="padding: 5px 10px; font-size: 12px;" onclick="return confirmDelete('Delete this fee structure?')">Delete</a>
+          </td>
+        </tr>
+        {% endfor %}
+      </tbody>
+    </table>
+    {% else %}
+    <p>No fee structures found.</p>
+    {% endif %}
+  </div>
+</div>
 
-  .timetable-controls select:focus, .timetable-controls input:focus {
-    outline: none;
-    border-color: var(--primary-color);
-    box-shadow: 0 0 0 3px rgba(67, 97, 238, 0.2);
-  }
+<div id="addPayment" class="tab-content">
+  <div class="card">
+    <h3>Add Fee Payment</h3>
+    <form method="post" action="{{ url_for('add_fee_payment') }}">
+      <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
+        <div>
+          <div class="form-group">
+            <label for="student_id">Student *</label>
+            <select id="student_id" name="student_id" required>
+              <option value="">Select Student</option>
+              {% for student in students %}
+              <option value="{{ student.id }}">{{ student.name }} ({{ student.admission_number }}) - {{ student.class }}</option>
+              {% endfor %}
+            </select>
+          </div>
+          
+          <div class="form-group">
+            <label for="fee_structure_id">Fee Structure *</label>
+            <select id="fee_structure_id" name="fee_structure_id" required>
+              <option value="">Select Fee Structure</option>
+              {% for fs in fee_structures %}
+              <option value="{{ fs.id }}">{{ fs.class }} - {{ fs.term }} {{ fs.year }} - {{ fs.amount }}</option>
+              {% endfor %}
+            </select>
+          </div>
+        </div>
+        
+        <div>
+          <div class="form-group">
+            <label for="amount_paid">Amount Paid *</label>
+            <input type="number" id="amount_paid" name="amount_paid" step="0.01" min="0" required>
+          </div>
+          
+          <div class="form-group">
+            <label for="payment_method">Payment Method</label>
+            <select id="payment_method" name="payment_method">
+              <option value="Cash">Cash</option>
+              <option value="Bank Transfer">Bank Transfer</option>
+              <option value="Mobile Money">Mobile Money</option>
+              <option value="Cheque">Cheque</option>
+              <option value="Other">Other</option>
+            </select>
+          </div>
+          
+          <div class="form-group">
+            <label for="remarks">Remarks</label>
+            <input type="text" id="remarks" name="remarks" placeholder="Payment remarks">
+          </div>
+        </div>
+      </div>
+      
+      <div style="text-align: center; margin-top: 20px;">
+        <button type="submit" class="button">Record Payment</button>
+        <button type="reset" class="button secondary">Clear</button>
+      </div>
+    </form>
+  </div>
+</div>
 
-  .color-legend {
-    display: flex;
-    flex-wrap: wrap;
-    gap: 12px;
-    margin: 20px 0;
-    padding: 18px;
-    background: white;
-    border-radius: 12px;
-    box-shadow: var(--shadow-sm);
-  }
+<div id="addStructure" class="tab-content">
+  <div class="card">
+    <h3>Add Fee Structure</h3>
+    <form method="post" action="{{ url_for('add_fee_structure') }}">
+      <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
+        <div>
+          <div class="form-group">
+            <label for="class">Class *</label>
+            <select id="class" name="class" required>
+              <option value="">Select Class</option>
+              <option value="Form 1">Form 1</option>
+              <option value="Form 2">Form 2</option>
+              <option value="Form 3">Form 3</option>
+              <option value="Form 4">Form 4</option>
+              <option value="Form 5">Form 5</option>
+              <option value="Form 6">Form 6</option>
+            </select>
+          </div>
+          
+          <div class="form-group">
+            <label for="term">Term *</label>
+            <select id="term" name="term" required>
+              <option value="">Select Term</option>
+              <option value="Term 1">Term 1</option>
+              <option value="Term 2">Term 2</option>
+              <option value="Term 3">Term 3</option>
+            </select>
+          </div>
+        </div>
+        
+        <div>
+          <div class="form-group">
+            <label for="year">Year *</label>
+            <input type="number" id="year" name="year" min="2000" max="2100" value="{{ current_year }}" required>
+          </div>
+          
+          <div class="form-group">
+            <label for="amount">Amount *</label>
+            <input type="number" id="amount" name="amount" step="0.01" min="0" required>
+          </div>
+        </div>
+      </div>
+      
+      <div class="form-group">
+        <label for="description">Description</label>
+        <input type="text" id="description" name="description" placeholder="Fee structure description">
+      </div>
+      
+      <div class="form-group">
+        <label for="due_date">Due Date</label>
+        <input type="date" id="due_date" name="due_date">
+      </div>
+      
+      <div style="text-align: center; margin-top: 20px;">
+        <button type="submit" class="button">Add Fee Structure</button>
+        <button type="reset" class="button secondary">Clear</button>
+      </div>
+    </form>
+  </div>
+</div>
+{% endblock %}''',
 
-  .color-item {
-    display: flex;
-    align-items: center;
-    gap: 6px;
-    padding: 6px 12px;
-    background: #f8fafc;
-    border-radius: 6px;
-    border: 1px solid var(--gray-light);
-  }
+    'fees_arrears.html': '''{% extends "base.html" %}
+{% from "pagination.html" import pagination %}
+{% block content %}
+<h1>Fee Arrears</h1>
 
-  .color-box {
-    width: 20px;
-    height: 20px;
-    border-radius: 4px;
-  }
+<div class="card">
+  <form method="get" action="{{ url_for('fee_arrears') }}" style="display: flex; flex-wrap: wrap; gap: 15px; align-items: flex-end;">
+    <div class="form-group">
+      <label for="class_filter">Class</label>
+      <select id="class_filter" name="class_filter">
+        <option value="">All Classes</option>
+        {% for class_name in classes %}
+        <option value="{{ class_name }}" {% if filters.class_filter == class_name %}selected{% endif %}>{{ class_name }}</option>
+        {% endfor %}
+      </select>
+    </div>
+    <div class="form-group">
+      <label for="term">Term</label>
+      <select id="term" name="term">
+        <option value="">All Terms</option>
+        {% for term in ['Term 1', 'Term 2', 'Term 3'] %}
+        <option value="{{ term }}" {% if filters.term == term %}selected{% endif %}>{{ term }}</option>
+        {% endfor %}
+      </select>
+    </div>
+    <div class="form-group">
+      <label for="year">Year</label>
+      <input type="number" id="year" name="year" value="{{ filters.year or '' }}" placeholder="All Years">
+    </div>
+    <div class="form-group">
+      <button type="submit" class="button">Filter</button>
+      <a href="{{ url_for('export_fee_arrears', **filters) }}" class="button secondary">Export CSV</a>
+    </div>
+  </form>
+</div>
 
-  .full-width {
-    width: 100%;
-  }
+<div class="dashboard-stats">
+  <div class="stat-card">
+    <h3>Students Owing</h3>
+    <div class="value">{{ summary.debtors or 0 }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Total Arrears</h3>
+    <div class="value">{{ '%.2f'|format(summary.outstanding or 0) }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Overdue 90+ Days</h3>
+    <div class="value">{{ '%.2f'|format(summary.over_90 or 0) }}</div>
+  </div>
+</div>
 
-  .day-header {
-    text-align: center;
-    background: linear-gradient(to right, var(--primary-color), var(--secondary-color));
-    color: white;
-    padding: 10px;
-    border-radius: 6px;
-    margin-bottom: 5px;
-  }
+<div class="card">
+  <h3>Students With Outstanding Fees</h3>
+  {% if arrears %}
+  <table>
+    <thead>
+      <tr>
+        <th>Admission No</th>
+        <th>Student</th>
+        <th>Class</th>
+        <th>Expected</th>
+        <th>Paid</th>
+        <th>Outstanding</th>
+        <th>Not Yet Due</th>
+        <th>1-30 Days</th>
+        <th>31-60 Days</th>
+        <th>61-90 Days</th>
+        <th>90+ Days</th>
+        <th>Last Payment</th>
+      </tr>
+    </thead>
+    <tbody>
+      {% for row in arrears %}
+      <tr>
+        <td>{{ row.admission_number }}</td>
+        <td>{{ row.name }}</td>
+        <td>{{ row.class }}</td>
+        <td>{{ '%.2f'|format(row.expected) }}</td>
+        <td class="paid">{{ '%.2f'|format(row.paid) }}</td>
+        <td class="balance">{{ '%.2f'|format(row.outstanding) }}</td>
+        <td>{{ '%.2f'|format(row.not_due) }}</td>
+        <td>{{ '%.2f'|format(row.days_1_30) }}</td>
+        <td>{{ '%.2f'|format(row.days_31_60) }}</td>
+        <td>{{ '%.2f'|format(row.days_61_90) }}</td>
+        <td>{{ '%.2f'|format(row.over_90) }}</td>
+        <td>{{ row.last_payment_date or 'Never' }}</td>
+      </tr>
+      {% endfor %}
+    </tbody>
+  </table>
+  
+  {{ pagination(arrears) }}
+  {% else %}
+  <p>No outstanding fees for the selected filters.</p>
+  {% endif %}
+</div>
+{% endblock %}''',
 
-  .timetable-container {
-    overflow-x: auto;
-  }
+    'fee_statements.html': '''{% extends "base.html" %}
+{% from "pagination.html" import pagination %}
+{% block content %}
+<h1>Import Bank Statement</h1>
 
-  /* Loading animation styles */
-  .loading-overlay {
-    position: fixed;
-    top: 0;
-    left: 0;
-    width: 100%;
-    height: 100%;
-    background: rgba(0, 0, 0, 0.5);
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    z-index: 9999;
-    opacity: 0;
-    visibility: hidden;
-    transition: all 0.3s ease;
-  }
+<div class="card">
+  <h3>Upload Statement CSV</h3>
+  <p>The first row must be a header. Required columns: Transaction ID (or Receipt No), Amount (or Credit / Paid In) and a reference column such as Account, Bill Ref or Narrative that contains the student's admission number. Date and Payer columns are used when present. Debits are ignored and transactions that were already imported are skipped.</p>
+  <form method="post" enctype="multipart/form-data">
+    <div class="form-group">
+      <label for="csv_file">CSV File *</label>
+      <input type="file" id="csv_file" name="csv_file" accept=".csv,text/csv" required>
+    </div>
+    <div class="form-group">
+      <label for="payment_method">Payment Method</label>
+      <select id="payment_method" name="payment_method">
+        <option value="Bank Transfer">Bank Transfer</option>
+        <option value="Mobile Money">Mobile Money</option>
+      </select>
+    </div>
+    <button type="submit" class="button">Import Statement</button>
+    <a href="{{ url_for('fees') }}" class="button secondary">Back to Fees</a>
+  </form>
+</div>
 
-  .loading-overlay.show {
-    opacity: 1;
-    visibility: visible;
-  }
+<div class="card">
+  <h3>Awaiting Review ({{ pending.entries or 0 }} entries, {{ '%.2f'|format(pending.amount or 0) }})</h3>
+  {% if reviews %}
+  <table>
+    <thead>
+      <tr>
+        <th>Transaction ID</th>
+        <th>Date</th>
+        <th>Amount</th>
+        <th>Reference</th>
+        <th>Payer</th>
+        <th>Reason</th>
+        <th>Actions</th>
+      </tr>
+    </thead>
+    <tbody>
+      {% for entry in reviews %}
+      <tr>
+        <td>{{ entry.transaction_id or '' }}</td>
+        <td>{{ entry.date_paid or '' }}</td>
+        <td>{{ '%.2f'|format(entry.amount) if entry.amount is not none else '' }}</td>
+        <td>{{ entry.reference or '' }}</td>
+        <td>{{ entry.payer or '' }}</td>
+        <td class="balance">{{ entry.reason }}</td>
+        <td>
+          <form method="post" action="{{ url_for('assign_statement_entry', id=entry.id) }}" style="display: inline-flex; gap: 5px;">
+            <input type="text" name="admission_number" placeholder="Admission No" required>
+            <button type="submit" class="button" style="padding: 5px 10px; font-size: 12px;">Post</button>
+          </form>
+          <form method="post" action="{{ url_for('dismiss_statement_entry', id=entry.id) }}" style="display: inline;">
+            <button type="submit" class="button danger" style="padding: 5px 10px; font-size: 12px;" onclick="return confirmDelete('Dismiss this statement entry?')">Dismiss</button>
+          </form>
+        </td>
+      </tr>
+      {% endfor %}
+    </tbody>
+  </table>
+  
+  {{ pagination(reviews) }}
+  {% else %}
+  <p>No statement entries are waiting for review.</p>
+  {% endif %}
+</div>
+{% endblock %}''',
 
-  .loading-spinner {
-    width: 50px;
-    height: 50px;
-    border: 5px solid rgba(255, 255, 255, 0.3);
-    border-radius: 50%;
-    border-top-color: #fff;
-    animation: spin 1s linear infinite;
-  }
+    'attendance.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Attendance Management</h1>
 
-  @keyframes spin {
-    to { transform: rotate(360deg); }
-  }
+<div class="filter-form">
+  <form method="get">
+    <div style="display: flex; flex-wrap: wrap; gap: 15px; align-items: center;">
+      <div>
+        <label for="class_filter">Filter by Class:</label>
+        <select id="class_filter" name="class_filter" onchange="this.form.submit()">
+          <option value="">All Classes</option>
+          {% for class_name in class_list %}
+          <option value="{{ class_name }}" {% if current_class == class_name %}selected{% endif %}>{{ class_name }}</option>
+          {% endfor %}
+        </select>
+      </div>
+      
+      <div>
+        <label for="date">Select Date:</label>
+        <input type="date" id="date" name="date" value="{{ selected_date }}" onchange="this.form.submit()">
+      </div>
+      
+      <div>
+        <button type="submit" class="button">Apply Filters</button>
+        <a href="{{ url_for('attendance') }}" class="button secondary">Reset</a>
+      </div>
+    </div>
+  </form>
+</div>
 
-  .loading-text {
-    color: white;
-    margin-top: 10px;
-    font-size: 16px;
-    font-weight: 500;
-  }
+{% if today_stats %}
+<div class="dashboard-stats">
+  <div class="stat-card">
+    <h3>Present Today</h3>
+    <div class="value">{{ today_stats.present or 0 }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Absent Today</h3>
+    <div class="value">{{ today_stats.absent or 0 }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Late Today</h3>
+    <div class="value">{{ today_stats.late or 0 }}</div>
+  </div>
+  <div class="stat-card">
+    <h3>Excused Today</h3>
+    <div class="value">{{ today_stats.excused or 0 }}</div>
+  </div>
+</div>
+{% endif %}
 
-  /* Chart Styles */
-  .chart-container {
-    background: white;
-    padding: 20px;
-    border-radius: 12px;
-    box-shadow: var(--shadow-md);
-    margin: 20px 0;
-  }
+<div class="card">
+  <h3>Mark Attendance for {{ selected_date }}</h3>
+  <form method="post" action="{{ url_for('save_attendance') }}">
+    <input type="hidden" name="date" value="{{ selected_date }}">
+    {% if current_class %}
+    <input type="hidden" name="class_filter" value="{{ current_class }}">
+    {% endif %}
+    
+    <table>
+      <thead>
+        <tr>
+          <th>Admission No</th>
+          <th>Name</th>
+          <th>Class</th>
+          <th>Last 7 Days</th>
+          <th>Status</th>
+          <th>Remarks</th>
+        </tr>
+      </thead>
+      <tbody>
+        {% for student in students %}
+        <tr>
+          <td>{{ student.admission_number }}</td>
+          <td>{{ student.name }}</td>
+          <td>{{ student.class }}</td>
+          <td>
+            {% if student.attendance_summary %}
+            P:{{ student.attendance_summary.present }} 
+            A:{{ student.attendance_summary.absent }}
+            L:{{ student.attendance_summary.late }}
+            {% else %}
+            No data
+            {% endif %}
+          </td>
+          <td>
+            <select name="status_{{ student.id }}">
+              <option value="Present" {% if student.status == 'Present' %}selected{% endif %}>Present</option>
+              <option value="Absent" {% if student.status == 'Absent' %}selected{% endif %}>Absent</option>
+              <option value="Late" {% if student.status == 'Late' %}selected{% endif %}>Late</option>
+              <option value="Excused" {% if student.status == 'Excused' %}selected{% endif %}>Excused</option>
+            </select>
+          </td>
+          <td>
+            <input type="text" name="remarks_{{ student.id }}" placeholder="Remarks" value="">
+          </td>
+        </tr>
+        {% endfor %}
+      </tbody>
+    </table>
+    
+    <div style="text-align: center; margin-top: 20px;">
+      <button type="submit" class="button">Save Attendance</button>
+    </div>
+  </form>
+</div>
+{% endblock %}''',
 
-  .chart-title {
-    text-align: center;
-    margin-bottom: 20px;
-    color: var(--dark-color);
-  }
+    'grades.html': '''{% extends "base.html" %}
+{% from "pagination.html" import pagination %}
+{% block content %}
+<h1>Grades Management</h1>
 
-  .chart-img {
-    width: 100%;
-    max-width: 800px;
-    height: auto;
-    display: block;
-    margin: 0 auto;
-    border-radius: 8px;
-  }
+<div class="action-buttons">
+  <a href="{{ url_for('add_grade') }}" class="button">Add New Grade</a>
+  <a href="{{ url_for('grade_entry') }}" class="button">Enter Class Scores</a>
+  <a href="{{ url_for('export_grades') }}" class="button secondary">Export Grades</a>
+</div>
 
-  .chart-grid {
-    display: grid;
-    grid-template-columns: repeat(auto-fit, minmax(350px, 1fr));
-    gap: 20px;
-    margin: 20px 0;
-  }
+<div class="card">
+  <h3>Recent Grades</h3>
+  {% if recent_grades %}
+  <table>
+    <thead>
+      <tr>
+        <th>Student</th>
+        <th>Admission No</th>
+        <th>Class</th>
+        <th>Subject</th>
+        <th>Term</th>
+        <th>Year</th>
+        <th>Score</th>
+        <th>Grade</th>
+        <th>Remarks</th>
+        <th>Date</th>
+        <th>Actions</th>
+      </tr>
+    </thead>
+    <tbody>
+      {% for grade in recent_grades %}
+      <tr>
+        <td>{{ grade.student_name }}</td>
+        <td>{{ grade.admission_number }}</td>
+        <td>{{ grade.class }}</td>
+        <td>{{ grade.subject }}</td>
+        <td>{{ grade.term }}</td>
+        <td>{{ grade.year }}</td>
+        <td>{{ grade.score }}</td>
+        <td class="grade-{{ grade.grade }}">{{ grade.grade }}</td>
+        <td>{{ grade.remarks or '-' }}</td>
+        <td>{{ grade.created_at[:10] }}</td>
+        <td>
+          <a href="{{ url_for('edit_grade', id=grade.id) }}" class="button" style="padding: 5px 10px; font-size: 12px;">Edit</a>
+          <a href="{{ url_for('delete_grade', id=grade.id) }}" class="button danger" style="padding: 5px 10px; font-size: 12px;" onclick="return confirmDelete('Delete this grade?')">Delete</a>
+        </td>
+      </tr>
+      {% endfor %}
+    </tbody>
+  </table>
+  
+  {{ pagination(recent_grades) }}
+  {% else %}
+  <p>No grades recorded yet.</p>
+  {% endif %}
+</div>
+{% endblock %}''',
 
-  /* School Logo Styles */
-  .logo-container {
-    text-align: center;
-    margin: 20px 0;
-  }
+    'grade_entry.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Enter Class Scores</h1>
 
-  .school-logo {
-    max-width: 200px;
-    max-height: 100px;
-    object-fit: contain;
-  }
+<div class="card">
+  <form method="get" action="{{ url_for('grade_entry') }}">
+    <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(180px, 1fr)); gap: 15px;">
+      <div class="form-group">
+        <label for="class_filter">Class *</label>
+        <select id="class_filter" name="class_filter" required>
+          <option value="">Select Class</option>
+          {% for class_name in all_classes %}
+          <option value="{{ class_name }}" {% if selected_class == class_name %}selected{% endif %}>{{ class_name }}</option>
+          {% endfor %}
+        </select>
+      </div>
+      <div class="form-group">
+        <label for="term">Term *</label>
+        <select id="term" name="term">
+          {% for term in terms %}
+          <option value="{{ term }}" {% if selected_term == term %}selected{% endif %}>{{ term }}</option>
+          {% endfor %}
+        </select>
+      </div>
+      <div class="form-group">
+        <label for="year">Year *</label>
+        <input type="number" id="year" name="year" value="{{ selected_year }}" required>
+      </div>
+      <div class="form-group">
+        <label for="subjects">Subjects *</label>
+        <select id="subjects" name="subjects" multiple size="6" required>
+          {% for subject in all_subjects %}
+          <option value="{{ subject }}" {% if subject in selected_subjects %}selected{% endif %}>{{ subject }}</option>
+          {% endfor %}
+        </select>
+      </div>
+    </div>
+    <button type="submit" class="button">Load Score Sheet</button>
+  </form>
+</div>
 
-  .logo-preview {
-    border: 2px dashed var(--gray-light);
-    padding: 20px;
-    border-radius: 8px;
-    margin: 15px 0;
-    text-align: center;
-  }
+{% if errors %}
+<div class="card">
+  <h3>Scores to fix</h3>
+  <ul>
+    {% for error in errors %}
+    <li class="balance">{{ error }}</li>
+    {% endfor %}
+  </ul>
+</div>
+{% endif %}
 
-  .grading-system-table {
-    width: 100%;
-    margin: 20px 0;
-  }
+{% if selected_class and selected_subjects %}
+<div class="card">
+  <h3>{{ selected_class }} &mdash; {{ selected_term }} {{ selected_year }}</h3>
+  {% if students %}
+  <form method="post" action="{{ url_for('grade_entry') }}">
+    <input type="hidden" name="class_filter" value="{{ selected_class }}">
+    <input type="hidden" name="term" value="{{ selected_term }}">
+    <input type="hidden" name="year" value="{{ selected_year }}">
+    {% for subject in selected_subjects %}
+    <input type="hidden" name="subjects" value="{{ subject }}">
+    {% endfor %}
+    <div style="overflow-x: auto;">
+      <table>
+        <thead>
+          <tr>
+            <th>Admission No</th>
+            <th>Student</th>
+            {% for subject in selected_subjects %}
+            <th>{{ subject }}</th>
+            {% endfor %}
+          </tr>
+        </thead>
+        <tbody>
+          {% for student in students %}
+          <tr>
+            <td>{{ student.admission_number }}</td>
+            <td>{{ student.name }}</td>
+            {% for subject in selected_subjects %}
+            <td>
+              <input type="number" name="score_{{ student.id }}_{{ loop.index0 }}" value="{{ scores.get((student.id, subject), '') }}" min="0" max="100" step="0.01" style="width: 80px;">
+            </td>
+            {% endfor %}
+          </tr>
+          {% endfor %}
+        </tbody>
+      </table>
+    </div>
+    <p>Grades are worked out from the current grading system when the sheet is saved. Blank cells are left unchanged.</p>
+    <button type="submit" class="button">Save All Scores</button>
+  </form>
+  {% else %}
+  <p>No students in {{ selected_class }}.</p>
+  {% endif %}
+</div>
+{% endif %}
 
-  .grading-system-table th {
-    background: var(--primary-color);
-    color: white;
-  }
+<div class="card">
+  <h3>Import Scores from CSV</h3>
+  <p>Columns: Admission Number, Subject, Score, and optionally Remarks, Term and Year. Term and year below apply to rows that do not have their own.</p>
+  <form method="post" action="{{ url_for('import_grades') }}" enctype="multipart/form-data">
+    <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(180px, 1fr)); gap: 15px;">
+      <div class="form-group">
+        <label for="csv_file">CSV File *</label>
+        <input type="file" id="csv_file" name="csv_file" accept=".csv,text/csv" required>
+      </div>
+      <div class="form-group">
+        <label for="import_term">Term</label>
+        <select id="import_term" name="term">
+          {% for term in terms %}
+          <option value="{{ term }}" {% if selected_term == term %}selected{% endif %}>{{ term }}</option>
+          {% endfor %}
+        </select>
+      </div>
+      <div class="form-group">
+        <label for="import_year">Year</label>
+        <input type="number" id="import_year" name="year" value="{{ selected_year }}">
+      </div>
+    </div>
+    <button type="submit" class="button">Import Scores</button>
+  </form>
+</div>
+{% endblock %}''',
 
-  .grade-color-box {
-    width: 20px;
-    height: 20px;
-    display: inline-block;
-    margin-right: 10px;
-    border-radius: 4px;
-    vertical-align: middle;
-  }
+    'add_grade.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Add New Grade</h1>
 
-  .grade-A-bg { background-color: #22c55e; }
-  .grade-B-bg { background-color: #2563eb; }
-  .grade-C-bg { background-color: #f59e0b; }
-  .grade-D-bg { background-color: #f97316; }
-  .grade-F-bg { background-color: #ef4444; }
+<div class="card">
+  <form method="post">
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
+      <div>
+        <div class="form-group">
+          <label for="student_id">Student *</label>
+          <select id="student_id" name="student_id" required>
+            <option value="">Select Student</option>
+            {% for student in students %}
+            <option value="{{ student.id }}">{{ student.name }} ({{ student.admission_number }}) - {{ student.class }}</option>
+            {% endfor %}
+          </select>
+        </div>
+        
+        <div class="form-group">
+          <label for="subject">Subject *</label>
+          <input type="text" id="subject" name="subject" required placeholder="e.g., Mathematics">
+        </div>
+        
+        <div class="form-group">
+          <label for="term">Term *</label>
+          <select id="term" name="term" required>
+            <option value="">Select Term</option>
+            <option value="Term 1">Term 1</option>
+            <option value="Term 2">Term 2</option>
+            <option value="Term 3">Term 3</option>
+          </select>
+        </div>
+      </div>
+      
+      <div>
+        <div class="form-group">
+          <label for="year">Year *</label>
+          <input type="number" id="year" name="year" min="2000" max="2100" value="{{ current_year }}" required>
+        </div>
+        
+        <div class="form-group">
+          <label for="score">Score *</label>
+          <input type="number" id="score" name="score" min="0" max="100" step="0.01" required placeholder="0-100">
+        </div>
+        
+        <div class="form-group">
+          <label for="remarks">Remarks</label>
+          <input type="text" id="remarks" name="remarks" placeholder="Grade remarks">
+        </div>
+      </div>
+    </div>
+    
+    <div style="text-align: center; margin-top: 20px;">
+      <button type="submit" class="button">Add Grade</button>
+      <button type="reset" class="button secondary">Clear</button>
+    </div>
+  </form>
+</div>
 
-  .performance-metrics {
-    display: grid;
-    grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-    gap: 15px;
-    margin: 20px 0;
-  }
+<div class="card">
+  <h3>Grading System</h3>
+  <table class="grading-system-table">
+    <thead>
+      <tr>
+        <th>Grade</th>
+        <th>Score Range</th>
+        <th>Color</th>
+      </tr>
+    </thead>
+    <tbody>
+      <tr>
+        <td class="grade-A">A</td>
+        <td>{{ grading.min_a }} - {{ grading.max_a }}</td>
+        <td><div class="grade-color-box grade-A-bg"></div></td>
+      </tr>
+      <tr>
+        <td class="grade-B">B</td>
+        <td>{{ grading.min_b }} - {{ grading.max_b }}</td>
+        <td><div class="grade-color-box grade-B-bg"></div></td>
+      </tr>
+      <tr>
+        <td class="grade-C">C</td>
+        <td>{{ grading.min_c }} - {{ grading.max_c }}</td>
+        <td><div class="grade-color-box grade-C-bg"></div></td>
+      </tr>
+      <tr>
+        <td class="grade-D">D</td>
+        <td>{{ grading.min_d }} - {{ grading.max_d }}</td>
+        <td><div class="grade-color-box grade-D-bg"></div></td>
+      </tr>
+      <tr>
+        <td class="grade-F">F</td>
+        <td>{{ grading.min_f }} - {{ grading.max_f }}</td>
+        <td><div class="grade-color-box grade-F-bg"></div></td>
+      </tr>
+    </tbody>
+  </table>
+</div>
+{% endblock %}''',
 
-  .metric-card {
-    background: white;
-    padding: 20px;
-    border-radius: 8px;
-    box-shadow: var(--shadow-sm);
-    text-align: center;
-  }
+    'edit_grade.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Edit Grade</h1>
 
-  .metric-value {
-    font-size: 24px;
-    font-weight: bold;
-    color: var(--primary-color);
-  }
+<div class="card">
+  <form method="post">
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
+      <div>
+        <div class="form-group">
+          <label for="student_id">Student</label>
+          <input type="text" value="{{ grade.student_name }} ({{ grade.admission_number }}) - {{ grade.class }}" readonly>
+        </div>
+        
+        <div class="form-group">
+          <label for="subject">Subject *</label>
+          <input type="text" id="subject" name="subject" value="{{ grade.subject }}" required>
+        </div>
+        
+        <div class="form-group">
+          <label for="term">Term *</label>
+          <select id="term" name="term" required>
+            <option value="Term 1" {% if grade.term == 'Term 1' %}selected{% endif %}>Term 1</option>
+            <option value="Term 2" {% if grade.term == 'Term 2' %}selected{% endif %}>Term 2</option>
+            <option value="Term 3" {% if grade.term == 'Term 3' %}selected{% endif %}>Term 3</option>
+          </select>
+        </div>
+      </div>
+      
+      <div>
+        <div class="form-group">
+          <label for="year">Year *</label>
+          <input type="number" id="year" name="year" min="2000" max="2100" value="{{ grade.year }}" required>
+        </div>
+        
+        <div class="form-group">
+          <label for="score">Score *</label>
+          <input type="number" id="score" name="score" min="0" max="100" step="0.01" value="{{ grade.score }}" required>
+        </div>
+        
+        <div class="form-group">
+          <label for="remarks">Remarks</label>
+          <input type="text" id="remarks" name="remarks" value="{{ grade.remarks or '' }}">
+        </div>
+      </div>
+    </div>
+    
+    <div style="text-align: center; margin-top: 20px;">
+      <button type="submit" class="button">Update Grade</button>
+      <a href="{{ url_for('grades') }}" class="button secondary">Cancel</a>
+    </div>
+  </form>
+</div>
+{% endblock %}''',
 
-  .metric-label {
-    color: #64748b;
-    font-size: 14px;
-    margin-top: 5px;
-  }
+    'timetable.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Timetable Management</h1>
 
-  .subject-performance {
-    display: flex;
-    align-items: center;
-    gap: 15px;
-    margin: 10px 0;
-    padding: 10px;
-    background: #f8fafc;
-    border-radius: 6px;
-  }
+{% if generation %}
+<div class="card" id="generationStatus" data-url="{{ url_for('generate_timetable_status', job_id=generation_id) }}">
+  <h3>Timetable generation: <span id="generationState">{{ generation.state }}</span></h3>
+  <p id="generationMessage" class="{% if generation.state == 'failed' %}balance{% else %}paid{% endif %}">{{ generation.message or 'Searching for a clash-free schedule...' }}</p>
+</div>
+{% if generation.state in ['queued', 'running'] %}
+<script>
+  (function pollGeneration() {
+    const panel = document.getElementById('generationStatus');
+    fetch(panel.dataset.url).then(response => response.json()).then(status => {
+      document.getElementById('generationState').textContent = status.state;
+      if (status.state === 'queued' || status.state === 'running') {
+        setTimeout(pollGeneration, 1000);
+      } else {
+        // Reload once to show the new timetable
+        window.location.reload();
+      }
+    });
+  })();
+</script>
+{% endif %}
+{% endif %}
 
-  .subject-name {
-    min-width: 150px;
-    font-weight: 600;
-  }
+<div class="tabs">
+  <button class="tab active" onclick="toggleTabs('viewTimetable')">View Timetable</button>
+  <button class="tab" onclick="toggleTabs('manageTimetable')">Manage Timetable</button>
+  <button class="tab" onclick="toggleTabs('addEntry')">Add Entry</button>
+  {% if session.role == 'admin' %}
+  <button class="tab" onclick="toggleTabs('generateTimetable')">Generate</button>
+  {% endif %}
+</div>
 
-  .score-bar {
-    flex: 1;
-    height: 20px;
-    background: #e2e8f0;
-    border-radius: 10px;
-    overflow: hidden;
-    position: relative;
-  }
+<div id="viewTimetable" class="tab-content active">
+  <div class="timetable-controls">
+    <div style="display: flex; flex-wrap: wrap; gap: 15px; align-items: center;">
+      <div>
+        <label for="class_filter">Class:</label>
+        <select id="class_filter" onchange="filterTimetable()">
+          <option value="">All Classes</option>
+          {% for class_name in all_classes %}
+          <option value="{{ class_name }}" {% if selected_class == class_name %}selected{% endif %}>{{ class_name }}</option>
+          {% endfor %}
+        </select>
+      </div>
+      
+      <div>
+        <label for="teacher_filter">Teacher:</label>
+        <select id="teacher_filter" onchange="filterTimetable()">
+          <option value="">All Teachers</option>
+          {% for teacher in teachers %}
+          <option value="{{ teacher.name }}" {% if selected_teacher == teacher.name %}selected{% endif %}>{{ teacher.name }}</option>
+          {% endfor %}
+        </select>
+      </div>
+      
+      <div>
+        <label for="day_filter">Day:</label>
+        <select id="day_filter" onchange="filterTimetable()">
+          <option value="">All Days</option>
+          <option value="Monday" {% if selected_day == 'Monday' %}selected{% endif %}>Monday</option>
+          <option value="Tuesday" {% if selected_day == 'Tuesday' %}selected{% endif %}>Tuesday</option>
+          <option value="Wednesday" {% if selected_day == 'Wednesday' %}selected{% endif %}>Wednesday</option>
+          <option value="Thursday" {% if selected_day == 'Thursday' %}selected{% endif %}>Thursday</option>
+          <option value="Friday" {% if selected_day == 'Friday' %}selected{% endif %}>Friday</option>
+          <option value="Saturday" {% if selected_day == 'Saturday' %}selected{% endif %}>Saturday</option>
+        </select>
+      </div>
+    </div>
+  </div>
 
-  .score-fill {
-    height: 100%;
-    border-radius: 10px;
-    transition: width 0.5s ease;
-  }
+  <div class="color-legend">
+    {% for subject in subjects %}
+    <div class="color-item">
+      <div class="color-box" style="background-color: {{ generate_color(subject) }};"></div>
+      <span>{{ subject }}</span>
+    </div>
+    {% endfor %}
+  </div>
 
-  .score-text {
-    position: absolute;
-    right: 10px;
-    top: 0;
-    line-height: 20px;
-    font-size: 12px;
-    font-weight: 600;
-  }
+  {{ timetable_grid_html|safe }}
+</div>
 
-  /* Login Styles */
-  .login-container {
-    display: flex;
-    justify-content: center;
-    align-items: center;
-    min-height: 100vh;
-    background: linear-gradient(135deg, #4361ee, #3a0ca3);
-  }
+<div id="manageTimetable" class="tab-content">
+  <div class="card">
+    <h3>All Timetable Entries</h3>
+    {% if all_entries %}
+    <table>
+      <thead>
+        <tr>
+          <th>Class</th>
+          <th>Day</th>
+          <th>Period</th>
+          <th>Subject</th>
+          <th>Teacher</th>
+          <th>Room</th>
+          <th>Actions</th>
+        </tr>
+      </thead>
+      <tbody>
+        {% for entry in all_entries %}
+        <tr>
+          <td>{{ entry.class }}</td>
+          <td>{{ entry.day }}</td>
+          <td>Period {{ entry.period }}</td>
+          <td>{{ entry.subject }}</td>
+          <td>{{ entry.teacher_name or 'N/A' }}</td>
+          <td>{{ entry.room or 'N/A' }}</td>
+          <td>
+            <a href="{{ url_for('edit_timetable_entry', id=entry.id) }}" class="button" style="padding: 5px 10px; font-size: 12px;">Edit</a>
+            <a href="{{ url_for('delete_timetable_entry', id=entry.id) }}" class="button danger" style="padding: 5px 10px; font-size: 12px;" onclick="return confirmDelete('Delete this timetable entry?')">Delete</a>
+          </td>
+        </tr>
+        {% endfor %}
+      </tbody>
+    </table>
+    {% else %}
+    <p>No timetable entries found.</p>
+    {% endif %}
+  </div>
+</div>
 
-  .login-card {
-    background: white;
-    padding: 40px;
-    border-radius: 16px;
-    box-shadow: var(--shadow-lg);
-    width: 100%;
-    max-width: 400px;
-    margin: 20px;
-  }
+<div id="addEntry" class="tab-content">
+  <div class="card">
+    <h3>Add Timetable Entry</h3>
+    <form method="post" action="{{ url_for('add_timetable_entry') }}">
+      <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
+        <div>
+          <div class="form-group">
+            <label for="class">Class *</label>
+            <select id="class" name="class" required>
+              <option value="">Select Class</option>
+              {% for class_name in all_classes %}
+              <option value="{{ class_name }}">{{ class_name }}</option>
+              {% endfor %}
+            </select>
+          </div>
+          
+          <div class="form-group">
+            <label for="day">Day *</label>
+            <select id="day" name="day" required>
+              <option value="">Select Day</option>
+              <option value="Monday">Monday</option>
+              <option value="Tuesday">Tuesday</option>
+              <option value="Wednesday">Wednesday</option>
+              <option value="Thursday">Thursday</option>
+              <option value="Friday">Friday</option>
+              <option value="Saturday">Saturday</option>
+            </select>
+          </div>
+          
+          <div class="form-group">
+            <label for="period">Period *</label>
+            <select id="period" name="period" required>
+              <option value="">Select Period</option>
+              {% for i in range(1, 9) %}
+              <option value="{{ i }}">Period {{ i }}</option>
+              {% endfor %}
+            </select>
+          </div>
+        </div>
+        
+        <div>
+          <div class="form-group">
+            <label for="subject">Subject *</label>
+            <input type="text" id="subject" name="subject" required placeholder="e.g., Mathematics">
+          </div>
+          
+          <div class="form-group">
+            <label for="teacher_id">Teacher</label>
+            <select id="teacher_id" name="teacher_id">
+              <option value="">Select Teacher</option>
+              {% for teacher in teachers %}
+              <option value="{{ teacher.id }}">{{ teacher.name }}</option>
+              {% endfor %}
+            </select>
+          </div>
+          
+          <div class="form-group">
+            <label for="room">Room</label>
+            <input type="text" id="room" name="room" placeholder="e.g., Room 101">
+          </div>
+        </div>
+      </div>
+      
+      <div class="form-group">
+        <label for="description">Description</label>
+        <textarea id="description" name="description" rows="3" placeholder="Optional description"></textarea>
+      </div>
+      
+      <div style="text-align: center; margin-top: 20px;">
+        <button type="submit" class="button">Add Timetable Entry</button>
+        <button type="reset" class="button secondary">Clear</button>
+      </div>
+    </form>
+  </div>
+</div>
 
-  .login-card h2 {
-    text-align: center;
-    margin-bottom: 30px;
-    color: var(--dark-color);
-  }
+{% if session.role == 'admin' %}
+<div id="generateTimetable" class="tab-content">
+  <div class="card">
+    <h3>Weekly Requirements</h3>
+    {% if requirements %}
+    <table>
+      <thead>
+        <tr>
+          <th>Class</th>
+          <th>Subject</th>
+          <th>Periods / Week</th>
+          <th>Teacher</th>
+          <th>Room</th>
+          <th>Actions</th>
+        </tr>
+      </thead>
+      <tbody>
+        {% for requirement in requirements %}
+        <tr>
+          <td>{{ requirement.class }}</td>
+          <td>{{ requirement.subject }}</td>
+          <td>{{ requirement.periods_per_week }}</td>
+          <td>{{ requirement.teacher_name or 'Any qualified' }}</td>
+          <td>{{ requirement.room or 'N/A' }}</td>
+          <td>
+            <a href="{{ url_for('delete_timetable_requirement', id=requirement.id) }}" class="button danger" style="padding: 5px 10px; font-size: 12px;" onclick="return confirmDelete('Delete this requirement?')">Delete</a>
+          </td>
+        </tr>
+        {% endfor %}
+      </tbody>
+    </table>
+    {% else %}
+    <p>No requirements set up yet.</p>
+    {% endif %}
+    
+    <form method="post" action="{{ url_for('add_timetable_requirement') }}" style="margin-top: 20px;">
+      <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 15px;">
+        <div class="form-group">
+          <label for="req_class">Class *</label>
+          <select id="req_class" name="class" required>
+            <option value="">Select Class</option>
+            {% for class_name in all_classes %}
+            <option value="{{ class_name }}">{{ class_name }}</option>
+            {% endfor %}
+          </select>
+        </div>
+        <div class="form-group">
+          <label for="req_subject">Subject *</label>
+          <select id="req_subject" name="subject" required>
+            <option value="">Select Subject</option>
+            {% for subject in subject_names %}
+            <option value="{{ subject }}">{{ subject }}</option>
+            {% endfor %}
+          </select>
+        </div>
+        <div class="form-group">
+          <label for="req_periods">Periods / Week *</label>
+          <input type="number" id="req_periods" name="periods_per_week" min="1" max="{{ school_days|length * 8 }}" required>
+        </div>
+        <div class="form-group">
+          <label for="req_teacher">Teacher</label>
+          <select id="req_teacher" name="teacher_id">
+            <option value="">Any qualified</option>
+            {% for teacher in teachers %}
+            <option value="{{ teacher.id }}">{{ teacher.name }}</option>
+            {% endfor %}
+          </select>
+        </div>
+        <div class="form-group">
+          <label for="req_room">Room</label>
+          <input type="text" id="req_room" name="room" placeholder="e.g., Lab 1">
+        </div>
+      </div>
+      <button type="submit" class="button">Save Requirement</button>
+    </form>
+  </div>
+  
+  <div class="card">
+    <h3>Teacher Availability</h3>
+    {% if unavailability %}
+    <table>
+      <thead>
+        <tr>
+          <th>Teacher</th>
+          <th>Day</th>
+          <th>Period</th>
+          <th>Actions</th>
+        </tr>
+      </thead>
+      <tbody>
+        {% for blocked in unavailability %}
+        <tr>
+          <td>{{ blocked.teacher_name }}</td>
+          <td>{{ blocked.day }}</td>
+          <td>{% if blocked.period %}Period {{ blocked.period }}{% else %}All day{% endif %}</td>
+          <td>
+            <a href="{{ url_for('delete_teacher_unavailability', id=blocked.id) }}" class="button danger" style="padding: 5px 10px; font-size: 12px;">Remove</a>
+          </td>
+        </tr>
+        {% endfor %}
+      </tbody>
+    </table>
+    {% else %}
+    <p>All teachers are available every period.</p>
+    {% endif %}
+    
+    <form method="post" action="{{ url_for('add_teacher_unavailability') }}" style="margin-top: 20px;">
+      <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 15px;">
+        <div class="form-group">
+          <label for="blocked_teacher">Teacher *</label>
+          <select id="blocked_teacher" name="teacher_id" required>
+            <option value="">Select Teacher</option>
+            {% for teacher in teachers %}
+            <option value="{{ teacher.id }}">{{ teacher.name }}</option>
+            {% endfor %}
+          </select>
+        </div>
+        <div class="form-group">
+          <label for="blocked_day">Day *</label>
+          <select id="blocked_day" name="day" required>
+            {% for day in school_days %}
+            <option value="{{ day }}">{{ day }}</option>
+            {% endfor %}
+          </select>
+        </div>
+        <div class="form-group">
+          <label for="blocked_period">Period</label>
+          <select id="blocked_period" name="period">
+            <option value="">All day</option>
+            {% for i in range(1, 9) %}
+            <option value="{{ i }}">Period {{ i }}</option>
+            {% endfor %}
+          </select>
+        </div>
+      </div>
+      <button type="submit" class="button">Mark Unavailable</button>
+    </form>
+  </div>
+  
+  <div class="card">
+    <h3>Generate Timetable</h3>
+    <p>Replaces the timetable of the selected classes (all classes with requirements if none are selected) with a clash-free schedule. Other classes' entries are kept and worked around.</p>
+    <form method="post" action="{{ url_for('generate_timetable_entries') }}" onsubmit="return confirmDelete('Replace the existing timetable for these classes?')">
+      <div class="form-group">
+        <label for="generate_classes">Classes</label>
+        <select id="generate_classes" name="classes" multiple size="6">
+          {% for class_name in requirements|map(attribute='class')|unique %}
+          <option value="{{ class_name }}">{{ class_name }}</option>
+          {% endfor %}
+        </select>
+      </div>
+      <button type="submit" class="button">Generate Timetable</button>
+    </form>
+  </div>
+</div>
+{% endif %}
 
-  .login-logo {
-    text-align: center;
-    margin-bottom: 30px;
+<script>
+  function filterTimetable() {
+    const classFilter = document.getElementById('class_filter').value;
+    const teacherFilter = document.getElementById('teacher_filter').value;
+    const dayFilter = document.getElementById('day_filter').value;
+    
+    let url = '{{ url_for("timetable") }}?';
+    if (classFilter) url += 'class_filter=' + encodeURIComponent(classFilter) + '&';
+    if (teacherFilter) url += 'teacher=' + encodeURIComponent(teacherFilter) + '&';
+    if (dayFilter) url += 'day=' + encodeURIComponent(dayFilter);
+    
+    window.location.href = url;
   }
+</script>
+{% endblock %}''',
 
-  .login-logo img {
-    max-width: 150px;
-  }
+    'settings.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>System Settings</h1>
 
-  .password-toggle {
-    position: relative;
-  }
+<div class="tabs">
+  <button class="tab active" onclick="toggleTabs('schoolSettings')">School Settings</button>
+  <button class="tab" onclick="toggleTabs('gradingSystem')">Grading System</button>
+  <button class="tab" onclick="toggleTabs('backupRestore')">Backup & Restore</button>
+</div>
 
-  .password-toggle input {
-    padding-right: 40px;
-  }
+<div id="schoolSettings" class="tab-content active">
+  <div class="card">
+    <h3>School Information</h3>
+    <form method="post" action="{{ url_for('update_school_settings') }}" enctype="multipart/form-data">
+      <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
+        <div>
+          <div class="form-group">
+            <label for="school_name">School Name *</label>
+            <input type="text" id="school_name" name="school_name" value="{{ settings.school_name }}" required>
+          </div>
+          
+          <div class="form-group">
+            <label for="school_address">School Address</label>
+            <textarea id="school_address" name="school_address" rows="3">{{ settings.school_address or '' }}</textarea>
+          </div>
+        </div>
+        
+        <div>
+          <div class="form-group">
+            <label for="school_phone">School Phone</label>
+            <input type="tel" id="school_phone" name="school_phone" value="{{ settings.school_phone or '' }}">
+          </div>
+          
+          <div class="form-group">
+            <label for="school_email">School Email</label>
+            <input type="email" id="school_email" name="school_email" value="{{ settings.school_email or '' }}">
+          </div>
+          
+          <div class="form-group">
+            <label for="logo">School Logo</label>
+            <input type="file" id="logo" name="logo" accept="image/*">
+            {% if settings.logo_path and os.path.exists(settings.logo_path) %}
+            <div class="logo-preview">
+              <img src="{{ url_for('static', filename=settings.logo_path.replace('static/', '')) }}" alt="School Logo" class="school-logo">
+              <p>Current Logo</p>
+            </div>
+            {% endif %}
+          </div>
+        </div>
+      </div>
+      
+      <div style="text-align: center; margin-top: 20px;">
+        <button type="submit" class="button">Save Settings</button>
+      </div>
+    </form>
+  </div>
+</div>
 
-  .password-toggle .toggle-icon {
-    position: absolute;
-    right: 15px;
-    top: 50%;
-    transform: translateY(-50%);
-    cursor: pointer;
-    color: var(--gray-medium);
-  }
+<div id="gradingSystem" class="tab-content">
+  <div class="card">
+    <h3>Current Grading System</h3>
+    <table class="grading-system-table">
+      <thead>
+        <tr>
+          <th>Grade</th>
+          <th>Minimum Score</th>
+          <th>Maximum Score</th>
+          <th>Color</th>
+        </tr>
+      </thead>
+      <tbody>
+        <tr>
+          <td class="grade-A">A</td>
+          <td>{{ default_grading.min_a }}</td>
+          <td>{{ default_grading.max_a }}</td>
+          <td><div class="grade-color-box grade-A-bg"></div></td>
+        </tr>
+        <tr>
+          <td class="grade-B">B</td>
+          <td>{{ default_grading.min_b }}</td>
+          <td>{{ default_grading.max_b }}</td>
+          <td><div class="grade-color-box grade-B-bg"></div></td>
+        </tr>
+        <tr>
+          <td class="grade-C">C</td>
+          <td>{{ default_grading.min_c }}</td>
+          <td>{{ default_grading.max_c }}</td>
+          <td><div class="grade-color-box grade-C-bg"></div></td>
+        </tr>
+        <tr>
+          <td class="grade-D">D</td>
+          <td>{{ default_grading.min_d }}</td>
+          <td>{{ default_grading.max_d }}</td>
+          <td><div class="grade-color-box grade-D-bg"></div></td>
+        </tr>
+        <tr>
+          <td class="grade-F">F</td>
+          <td>{{ default_grading.min_f }}</td>
+          <td>{{ default_grading.max_f }}</td>
+          <td><div class="grade-color-box grade-F-bg"></div></td>
+        </tr>
+      </tbody>
+    </table>
+  </div>
+  
+  <div class="card">
+    <h3>Edit Grading System</h3>
+    <form method="post" action="{{ url_for('update_grading_system') }}">
+      <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px;">
+        <div class="form-group">
+          <label for="min_a">Min A</label>
+          <input type="number" id="min_a" name="min_a" min="0" max="100" value="{{ default_grading.min_a }}" required>
+        </div>
+        <div class="form-group">
+          <label for="max_a">Max A</label>
+          <input type="number" id="max_a" name="max_a" min="0" max="100" value="{{ default_grading.max_a }}" required>
+        </div>
+        <div class="form-group">
+          <label for="min_b">Min B</label>
+          <input type="number" id="min_b" name="min_b" min="0" max="100" value="{{ default_grading.min_b }}" required>
+        </div>
+        <div class="form-group">
+          <label for="max_b">Max B</label>
+          <input type="number" id="max_b" name="max_b" min="0" max="100" value="{{ default_grading.max_b }}" required>
+        </div>
+        <div class="form-group">
+          <label for="min_c">Min C</label>
+          <input type="number" id="min_c" name="min_c" min="0" max="100" value="{{ default_grading.min_c }}" required>
+        </div>
+        <div class="form-group">
+          <label for="max_c">Max C</label>
+          <input type="number" id="max_c" name="max_c" min="0" max="100" value="{{ default_grading.max_c }}" required>
+        </div>
+        <div class="form-group">
+          <label for="min_d">Min D</label>
+          <input type="number" id="min_d" name="min_d" min="0" max="100" value="{{ default_grading.min_d }}" required>
+        </div>
+        <div class="form-group">
+          <label for="max_d">Max D</label>
+          <input type="number" id="max_d" name="max_d" min="0" max="100" value="{{ default_grading.max_d }}" required>
+        </div>
+        <div class="form-group">
+          <label for="min_f">Min F</label>
+          <input type="number" id="min_f" name="min_f" min="0" max="100" value="{{ default_grading.min_f }}" required>
+        </div>
+        <div class="form-group">
+          <label for="max_f">Max F</label>
+          <input type="number" id="max_f" name="max_f" min="0" max="100" value="{{ default_grading.max_f }}" required>
+        </div>
+      </div>
+      
+      <div style="text-align: center; margin-top: 20px;">
+        <button type="submit" class="button">Update Grading System</button>
+      </div>
+    </form>
+  </div>
+</div>
 
-  /* User info in sidebar */
-  .user-info {
-    padding: 15px;
-    text-align: center;
-    border-bottom: 1px solid rgba(255,255,255,0.1);
-    margin-bottom: 10px;
-  }
+<div id="backupRestore" class="tab-content">
+  <div class="card">
+    <h3>Database Backup</h3>
+    <p>Create a backup of the entire database.</p>
+    <div class="action-buttons">
+      <a href="{{ url_for('backup_database') }}" class="button" onclick="return confirm('Create database backup?')">
+        <i class="fas fa-download"></i> Backup Database
+      </a>
+    </div>
+  </div>
+  
+  <div class="card">
+    <h3>Restore Database</h3>
+    <p>Warning: This will replace all current data with the backup file.</p>
+    <form method="post" action="{{ url_for('restore_database') }}" enctype="multipart/form-data">
+      <div class="form-group">
+        <label for="backup_file">Select Backup File</label>
+        <input type="file" id="backup_file" name="backup_file" accept=".db,.sqlite,.sqlite3" required>
+      </div>
+      
+      <div style="text-align: center; margin-top: 20px;">
+        <button type="submit" class="button danger" onclick="return confirm('WARNING: This will overwrite all current data. Continue?')">
+          <i class="fas fa-upload"></i> Restore Database
+        </button>
+      </div>
+    </form>
+  </div>
+</div>
+{% endblock %}''',
 
-  .user-avatar {
-    width: 50px;
-    height: 50px;
-    border-radius: 50%;
-    background: var(--accent-color);
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    margin: 0 auto 10px;
-    color: white;
-    font-size: 20px;
-  }
+    'themes.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Theme Selection</h1>
 
-  .user-name {
-    color: white;
-    font-weight: 600;
-    margin-bottom: 5px;
-  }
+<div class="card">
+  <h3>Select Theme</h3>
+  <p>Choose a theme for the School Management System:</p>
+  
+  <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 20px; margin-top: 20px;">
+    <div class="card theme-preview" onclick="applyTheme('modern-blue')" style="cursor: pointer; text-align: center;">
+      <div style="width: 100%; height: 100px; background: linear-gradient(135deg, #4361ee, #3a0ca3); border-radius: 8px;"></div>
+      <h4>Modern Blue</h4>
+      <p>Default blue theme</p>
+    </div>
+    
+    <div class="card theme-preview" onclick="applyTheme('elegant-green')" style="cursor: pointer; text-align: center;">
+      <div style="width: 100%; height: 100px; background: linear-gradient(135deg, #2ecc71, #27ae60); border-radius: 8px;"></div>
+      <h4>Elegant Green</h4>
+      <p>Fresh green theme</p>
+    </div>
+    
+    <div class="card theme-preview" onclick="applyTheme('sunset-orange')" style="cursor: pointer; text-align: center;">
+      <div style="width: 100%; height: 100px; background: linear-gradient(135deg, #ff7e5f, #feb47b); border-radius: 8px;"></div>
+      <h4>Sunset Orange</h4>
+      <p>Warm orange theme</p>
+    </div>
+    
+    <div class="card theme-preview" onclick="applyTheme('dusk-purple')" style="cursor: pointer; text-align: center;">
+      <div style="width: 100%; height: 100px; background: linear-gradient(135deg, #654ea3, #da98b4); border-radius: 8px;"></div>
+      <h4>Dusk Purple</h4>
+      <p>Royal purple theme</p>
+    </div>
+    
+    <div class="card theme-preview" onclick="applyTheme('forest-teal')" style="cursor: pointer; text-align: center;">
+      <div style="width: 100%; height: 100px; background: linear-gradient(135deg, #11998e, #38ef7d); border-radius: 8px;"></div>
+      <h4>Forest Teal</h4>
+      <p>Nature teal theme</p>
+    </div>
+    
+    <div class="card theme-preview" onclick="applyTheme('light-theme')" style="cursor: pointer; text-align: center;">
+      <div style="width: 100%; height: 100px; background: linear-gradient(135deg, #f9fafb, #f3f4f6); border-radius: 8px;"></div>
+      <h4>Light Theme</h4>
+      <p>Light mode theme</p>
+    </div>
+    
+    <div class="card theme-preview" onclick="applyTheme('dark-theme')" style="cursor: pointer; text-align: center;">
+      <div style="width: 100%; height: 100px; background: linear-gradient(135deg, #1f2937, #111827); border-radius: 8px;"></div>
+      <h4>Dark Theme</h4>
+      <p>Dark mode theme</p>
+    </div>
+  </div>
+</div>
 
-  .user-role {
-    color: rgba(255,255,255,0.8);
-    font-size: 12px;
-    background: rgba(255,255,255,0.1);
-    padding: 3px 8px;
-    border-radius: 10px;
-    display: inline-block;
-  }
+<div class="card">
+  <h3>Current Theme</h3>
+  <p>Your current theme preferences are saved in your browser.</p>
+  <p>To reset to default theme, clear your browser cookies or select "Modern Blue".</p>
+</div>
+{% endblock %}''',
 
-  /* Medical alert styles */
-  .medical-alert {
-    background-color: #fef3c7;
-    border-left: 4px solid #f59e0b;
-    padding: 12px 16px;
-    margin: 10px 0;
-    border-radius: 4px;
-  }
+    'receipt.html': '''{% extends "base.html" %}
+{% block content %}
+<div class="receipt">
+  <div class="receipt-header">
+    <h2>FEE PAYMENT RECEIPT</h2>
+    <p>{{ settings.school_name }}</p>
+    {% if settings.school_address %}<p>{{ settings.school_address }}</p>{% endif %}
+    {% if settings.school_phone %}<p>Tel: {{ settings.school_phone }}</p>{% endif %}
+  </div>
+  
+  <table class="receipt-details">
+    <tr>
+      <td><strong>Receipt No:</strong></td>
+      <td>{{ payment.receipt_number }}</td>
+      <td><strong>Date:</strong></td>
+      <td>{{ payment.date_paid }}</td>
+    </tr>
+    <tr>
+      <td><strong>Student Name:</strong></td>
+      <td>{{ student.name }}</td>
+      <td><strong>Admission No:</strong></td>
+      <td>{{ student.admission_number }}</td>
+    </tr>
+    <tr>
+      <td><strong>Class:</strong></td>
+      <td>{{ student.class }}</td>
+      <td><strong>Term:</strong></td>
+      <td>{{ payment.term }} {{ payment.year }}</td>
+    </tr>
+    <tr>
+      <td><strong>Total Fee:</strong></td>
+      <td>{{ fee_structure.amount }}</td>
+      <td><strong>Amount Paid:</strong></td>
+      <td class="paid">{{ payment.amount_paid }}</td>
+    </tr>
+    <tr>
+      <td><strong>Previous Balance:</strong></td>
+      <td>{{ previous_balance }}</td>
+      <td><strong>New Balance:</strong></td>
+      <td class="balance">{{ new_balance }}</td>
+    </tr>
+    <tr>
+      <td><strong>Payment Method:</strong></td>
+      <td>{{ payment.payment_method or 'Cash' }}</td>
+      <td><strong>Transaction ID:</strong></td>
+      <td>{{ payment.transaction_id or 'N/A' }}</td>
+    </tr>
+    {% if payment.remarks %}
+    <tr>
+      <td><strong>Remarks:</strong></td>
+      <td colspan="3">{{ payment.remarks }}</td>
+    </tr>
+    {% endif %}
+  </table>
+  
+  <div style="text-align: center; margin-top: 40px;">
+    <p>_________________________</p>
+    <p>Cashier's Signature</p>
+  </div>
+  
+  <div style="text-align: center; margin-top: 20px; font-size: 12px; color: #666;">
+    <p>Thank you for your payment!</p>
+    <p>Keep this receipt for your records.</p>
+  </div>
+</div>
 
-  .medical-alert.danger {
-    background-color: #fecaca;
-    border-left-color: #ef4444;
-  }
+<div class="action-buttons no-print">
+  <button onclick="printReceipt()" class="button"><i class="fas fa-print"></i> Print Receipt</button>
+  <a href="{{ url_for('fees') }}" class="button secondary"><i class="fas fa-arrow-left"></i> Back to Fees</a>
+</div>
+{% endblock %}''',
 
-  .medical-alert.info {
-    background-color: #dbeafe;
-    border-left-color: #3b82f6;
-  }
+    'medical_info.html': '''{% extends "base.html" %}
+{% block content %}
+<h1>Medical Information - {{ student.name }}</h1>
 
-  .medical-badge {
-    font-size: 11px;
-    padding: 2px 8px;
-    border-radius: 12px;
-    font-weight: 600;
-    margin-left: 5px;
-  }
+<div class="card">
+  <h3>Basic Information</h3>
+  <table>
+    <tr>
+      <th>Admission Number:</th>
+      <td>{{ student.admission_number }}</td>
+    </tr>
+    <tr>
+      <th>Name:</th>
+      <td>{{ student.name }}</td>
+    </tr>
+    <tr>
+      <th>Class:</th>
+      <td>{{ student.class }}</td>
+    </tr>
+    <tr>
+      <th>Age:</th>
+      <td>{{ student.age or 'N/A' }}</td>
+    </tr>
+  </table>
+</div>
 
-  .medical-badge.condition {
-    background-color: #fef3c7;
-    color: #92400e;
-  }
+<div class="card">
+  <h3>Medical Status</h3>
+  <div class="medical-alert {% if student.has_medical_condition %}danger{% else %}info{% endif %}">
+    <i class="fas fa-heartbeat"></i>
+    <strong>Medical Condition:</strong>
+    {% if student.has_medical_condition %}
+    Has Special Medical Condition
+    {% else %}
+    No Special Medical Conditions
+    {% endif %}
+  </div>
+  
+  {% if student.medical_conditions %}
+  <div style="margin-top: 15px;">
+    <h4>Medical Conditions</h4>
+    <p>{{ student.medical_conditions }}</p>
+  </div>
+  {% endif %}
+  
+  {% if student.allergies %}
+  <div style="margin-top: 15px;">
+    <h4>Allergies</h4>
+    <p>{{ student.allergies }}</p>
+  </div>
+  {% endif %}
+  
+  {% if student.medications %}
+  <div style="margin-top: 15px;">
+    <h4>Current Medications</h4>
+    <p>{{ student.medications }}</p>
+  </div>
+  {% endif %}
+  
+  {% if student.blood_type %}
+  <div style="margin-top: 15px;">
+    <h4>Blood Type</h4>
+    <p>{{ student.blood_type }}</p>
+  </div>
+  {% endif %}
+</div>
 
-  .medical-badge.emergency {
-    background-color: #fee2e2;
-    color: #991b1b;
-  }
+<div class="card">
+  <h3>Emergency Contact</h3>
+  {% if student.emergency_contact_name %}
+  <table>
+    <tr>
+      <th>Name:</th>
+      <td>{{ student.emergency_contact_name }}</td>
+    </tr>
+    <tr>
+      <th>Relationship:</th>
+      <td>{{ student.emergency_contact_relation }}</td>
+    </tr>
+    <tr>
+      <th>Phone:</th>
+      <td>{{ student.emergency_contact_phone }}</td>
+    </tr>
+    {% if student.emergency_contact_alt_phone %}
+    <tr>
+      <th>Alternate Phone:</th>
+      <td>{{ student.emergency_contact_alt_phone }}</td>
+    </tr>
+    {% endif %}
+  </table>
+  {% else %}
+  <p>No emergency contact information available.</p>
+  {% endif %}
+</div>
 
-  .medical-badge.allergy {
-    background-color: #f0f9ff;
-    color: #0369a1;
-  }
+<div class="action-buttons">
+  <a href="{{ url_for('edit_student', id=student.id) }}" class="button">Edit Student</a>
+  <a href="{{ url_for('students') }}" class="button secondary">Back to Students</a>
+</div>
+{% endblock %}''',
 
-  /* Login button in sidebar */
-  .logout-btn {
-    margin-top: auto;
-    margin-bottom: 20px;
-    padding: 15px 20px;
-    background: rgba(255, 255, 255, 0.1);
-    border: none;
-    color: white;
-    cursor: pointer;
-    font-size: 14px;
-    text-align: left;
-    transition: all 0.3s;
-    border-left: 4px solid transparent;
-  }
+    'pagination.html': '''{% macro pagination(page) %}
+{% if page.prev_url or page.next_url %}
+<div class="action-buttons">
+  {% if page.prev_url %}
+  <a href="{{ page.prev_url }}" class="button secondary"><i class="fas fa-chevron-left"></i> Previous</a>
+  {% endif %}
+  {% if page.next_url %}
+  <a href="{{ page.next_url }}" class="button secondary">Next <i class="fas fa-chevron-right"></i></a>
+  {% endif %}
+</div>
+{% endif %}
+{% endmacro %}''',
 
-  .logout-btn:hover {
-    background: rgba(255, 255, 255, 0.2);
-    border-left: 4px solid var(--danger-color);
+    'timetable_grid.html': '''{% if timetable_grid %}
+<div class="timetable-container">
+  <table class="timetable">
+    <thead>
+      <tr>
+        <th>Period</th>
+        {% for day in days %}
+        <th>{{ day }}</th>
+        {% endfor %}
+      </tr>
+    </thead>
+    <tbody>
+      {% for period in periods %}
+      <tr>
+        <td class="time-slot">Period {{ period }}</td>
+        {% for day in days %}
+        <td>
+          {% for entry in timetable_grid.get((day, period), []) %}
+          <div class="period" data-subject="{{ entry.subject }}" style="background: {{ generate_color(entry.subject) }}">
+            <div class="period-details">
+              <div class="subject">{{ entry.subject }}</div>
+              {% if not selected_class %}
+              <div class="class">{{ entry.class }}</div>
+              {% endif %}
+              <div class="teacher">{{ entry.teacher_name or 'N/A' }}</div>
+              <div class="room">{{ entry.room or 'N/A' }}</div>
+              {% if entry.description %}
+              <div style="font-size: 10px; margin-top: 5px;">{{ entry.description }}</div>
+              {% endif %}
+            </div>
+          </div>
+          {% else %}
+          <div class="period-empty">Free Period</div>
+          {% endfor %}
+        </td>
+        {% endfor %}
+      </tr>
+      {% endfor %}
+    </tbody>
+  </table>
+</div>
+{% else %}
+<div class="card">
+  <p>No timetable entries found for the selected filters.</p>
+</div>
+{% endif %}'''
+}
+
+# Static assets shared by every page, served under fingerprinted URLs
+assets = {
+    'base.css': '''  :root {
+    --primary-color: #4361ee;
+    --secondary-color: #3f37c9;
+    --accent-color: #4cc9f0;
+    --success-color: #4ade80;
+    --warning-color: #facc15;
+    --danger-color: #f87171;
+    --dark-color: #1e293b;
+    --light-color: #f8fafc;
+    --gray-light: #e2e8f0;
+    --gray-medium: #94a3b8;
+    --sidebar-width-collapsed: 80px;
+    --sidebar-width-expanded: 250px;
+    --transition-speed: 0.3s;
+    --shadow-sm: 0 1px 2px 0 rgba(0, 0, 0, 0.05);
+    --shadow-md: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
+    --shadow-lg: 0 10px 15px -3px rgba(0, 0, 0, 0.1);
   }
 
-  .logout-btn i {
-    margin-right: 12px;
+  * {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
   }
 
-  /* Profile dropdown */
-  .profile-dropdown {
-    position: relative;
+  body {
+    margin: 0;
+    background: linear-gradient(135deg, #f0f9ff, #e0f2fe);
+    color: var(--dark-color);
+    transition: all var(--transition-speed);
   }
 
-  .profile-menu {
-    position: absolute;
-    top: 100%;
+  .sidebar {
+    position: fixed;
+    top: 0;
     left: 0;
-    background: white;
+    height: 100%;
+    width: var(--sidebar-width-expanded);
+    background: linear-gradient(to bottom, #1e293b, #0f172a);
+    display: flex;
+    flex-direction: column;
+    padding-top: 20px;
     box-shadow: var(--shadow-lg);
-    border-radius: 8px;
-    min-width: 200px;
     z-index: 1000;
-    display: none;
+    transition: all var(--transition-speed);
   }
 
-  .profile-dropdown:hover .profile-menu {
-    display: block;
+  .sidebar.collapsed {
+    width: var(--sidebar-width-collapsed);
   }
 
-  .profile-menu a {
-    padding: 12px 16px;
-    color: var(--dark-color);
-    text-decoration: none;
-    display: block;
-    border-bottom: 1px solid var(--gray-light);
+  .sidebar-header {
+    display: flex;
+    flex-direction: column;
+    align-items: center;
+    padding: 10px 5px 20px;
+    border-bottom: 1px solid rgba(255,255,255,0.1);
+    margin-bottom: 20px;
   }
 
-  .profile-menu a:hover {
-    background: var(--gray-light);
+  .sidebar.collapsed .sidebar-header {
+    padding: 15px 5px;
   }
 
-  .profile-menu a:last-child {
-    border-bottom: none;
-  }
-</style>
-<script>
-  function confirmDelete(message) {
-    return confirm(message || 'Are you sure you want to delete this?');
+  .sidebar h2 {
+    color: white;
+    font-size: 1.2rem;
+    text-align: center;
+    margin: 0;
+    white-space: nowrap;
+    overflow: hidden;
+    text-overflow: ellipsis;
   }
 
-  function toggleTabs(tabName) {
-    document.querySelectorAll('.tab').forEach(tab => tab.classList.remove('active'));
-    document.querySelectorAll('.tab-content').forEach(content => content.classList.remove('active'));
-
-    const tabElement = document.querySelector(`[onclick*="${tabName}"]`);
-    if (tabElement) tabElement.classList.add('active');
-    const contentElement = document.getElementById(tabName);
-    if (contentElement) contentElement.classList.add('active');
+  .sidebar.collapsed h2 {
+    display: none;
   }
 
-  function filterTable(inputId, tableId) {
-    const input = document.getElementById(inputId);
-    const filter = input.value.toUpperCase();
-    const table = document.getElementById(tableId);
-    const rows = table.getElementsByTagName('tr');
-
-    for (let i = 1; i < rows.length; i++) {
-      let match = false;
-      const cells = rows[i].getElementsByTagName('td');
-      for (let j = 0; j < cells.length; j++) {
-        const cell = cells[j];
-        if (cell) {
-          if (cell.textContent.toUpperCase().indexOf(filter) > -1) {
-            match = true;
-            break;
-          }
-        }
-      }
-      rows[i].style.display = match ? '' : 'none';
-    }
+  .toggle-btn {
+    background: var(--primary-color);
+    border: none;
+    color: white;
+    width: 30px;
+    height: 30px;
+    border-radius: 50%;
+    cursor: pointer;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    font-size: 14px;
+    transition: all var(--transition-speed);
   }
 
-  function printReceipt() {
-    window.print();
+  .toggle-btn:hover {
+    background: #3b5bdb;
+    transform: scale(1.05);
   }
 
-  function generateColor(subject) {
-    if (!subject) return '#999999';
+  .sidebar a {
+    padding: 14px 20px;
+    text-decoration: none;
+    font-size: 1rem;
+    color: white;
+    display: flex;
+    align-items: center;
+    transition: all 0.3s;
+    border-left: 4px solid transparent;
+    white-space: nowrap;
+  }
 
-    const colorMap = {
-      'mathematics': '#667eea',
-      'english': '#f5576c',
-      'science': '#4facfe',
-      'history': '#43e97b',
-      'geography': '#fee140',
-      'physics': '#30cfd0',
-      'chemistry': '#a8edea',
-      'biology': '#5ee7df',
-      'computer': '#d299c2',
-      'art': '#f6d365',
-      'physical education': '#a1c4fd',
-      'pe': '#a1c4fd',
-      'music': '#fcb69f',
-      'business': '#c2e9fb',
-      'religious': '#fed6e3'
-    };
+  .sidebar a i {
+    margin-right: 12px;
+    font-size: 1.2rem;
+    min-width: 24px;
+    text-align: center;
+  }
 
-    subject = subject.toLowerCase().trim();
-    for (const [key, color] of Object.entries(colorMap)) {
-      if (subject.includes(key)) {
-        return color;
-      }
-    }
+  .sidebar.collapsed a span {
+    display: none;
+  }
 
-    // Generate consistent color from subject name
-    let hash = 0;
-    for (let i = 0; i < subject.length; i++) {
-      hash = subject.charCodeAt(i) + ((hash << 5) - hash);
-    }
-    const hue = hash % 360;
-    return `hsl(${hue}, 70%, 60%)`;
+  .sidebar.collapsed a {
+    justify-content: center;
+    padding: 16px 10px;
   }
 
-  // Toggle sidebar function
-  function toggleSidebar() {
-    const sidebar = document.querySelector('.sidebar');
-    sidebar.classList.toggle('collapsed');
+  .sidebar a:hover {
+    background-color: rgba(255,255,255,0.1);
+    border-left: 4px solid var(--accent-color);
   }
 
-  // Show loading animation
-  function showLoading(text = 'Loading...') {
-    const overlay = document.querySelector('.loading-overlay');
-    const textElement = overlay.querySelector('.loading-text');
-    textElement.textContent = text;
-    overlay.classList.add('show');
+  .sidebar a.active {
+    background-color: rgba(76, 201, 240, 0.2);
+    border-left: 4px solid var(--accent-color);
   }
 
-  // Hide loading animation
-  function hideLoading() {
-    const overlay = document.querySelector('.loading-overlay');
-    overlay.classList.remove('show');
+  .content {
+    margin-left: var(--sidebar-width-expanded);
+    padding: 20px;
+    min-height: 100vh;
+    transition: all var(--transition-speed);
   }
 
-  // Toggle password visibility
-  function togglePassword(inputId) {
-    const input = document.getElementById(inputId);
-    const icon = document.querySelector(`[onclick="togglePassword('${inputId}')"] i`);
-    
-    if (input.type === 'password') {
-      input.type = 'text';
-      icon.classList.remove('fa-eye');
-      icon.classList.add('fa-eye-slash');
-    } else {
-      input.type = 'password';
-      icon.classList.remove('fa-eye-slash');
-      icon.classList.add('fa-eye');
-    }
+  .sidebar.collapsed ~ .content {
+    margin-left: var(--sidebar-width-collapsed);
   }
 
-  // Add loading animation to forms on submit
-  document.addEventListener('DOMContentLoaded', function() {
-    // Add sidebar toggle button
-    const sidebar = document.querySelector('.sidebar');
-    const sidebarHeader = document.createElement('div');
-    sidebarHeader.className = 'sidebar-header';
-    sidebarHeader.innerHTML = `
-      <button class="toggle-btn" onclick="toggleSidebar()" title="Toggle Sidebar">
-        <i class="fas fa-bars"></i>
-      </button>
-    `;
-    sidebar.insertBefore(sidebarHeader, sidebar.firstChild);
+  h1 {
+    color: var(--dark-color);
+    border-bottom: 2px solid var(--primary-color);
+    padding-bottom: 10px;
+    margin-bottom: 20px;
+    font-weight: 600;
+  }
 
-    // Auto-hide alerts after 5 seconds
-    setTimeout(function() {
-      const alerts = document.querySelectorAll('.alert');
-      alerts.forEach(alert => {
-        alert.style.opacity = '0';
-        alert.style.transition = 'opacity 0.5s';
-        setTimeout(() => alert.style.display = 'none', 500);
-      });
-    }, 5000);
+  .card {
+    background: white;
+    border-radius: 12px;
+    box-shadow: var(--shadow-md);
+    padding: 24px;
+    margin-bottom: 20px;
+    transition: transform 0.2s;
+  }
 
-    // Initialize timetable colors
-    document.querySelectorAll('.period').forEach(period => {
-      const subject = period.getAttribute('data-subject');
-      if (subject) {
-        const color = generateColor(subject);
-        period.style.background = color;
-      }
-    });
+  .card:hover {
+    transform: translateY(-3px);
+    box-shadow: var(--shadow-lg);
+  }
 
-    // Auto-select today in date inputs
-    const today = new Date().toISOString().split('T')[0];
-    document.querySelectorAll('input[type="date"]').forEach(input => {
-      if (!input.value && (input.id.includes('date') || input.name.includes('date'))) {
-        input.value = today;
-      }
-    });
+  table {
+    width: 100%;
+    border-collapse: collapse;
+    background-color: #fff;
+    margin-bottom: 20px;
+    box-shadow: var(--shadow-sm);
+    border-radius: 8px;
+    overflow: hidden;
+  }
 
-    // Add loading animation to forms
-    document.querySelectorAll('form').forEach(form => {
-      form.addEventListener('submit', function() {
-        showLoading('Processing...');
-      });
-    });
+  th, td {
+    padding: 14px 16px;
+    border: 1px solid var(--gray-light);
+    text-align: left;
+  }
 
-    // Add loading for anchor links that might take time
-    document.querySelectorAll('a').forEach(link => {
-      if (link.href.includes('add_') || link.href.includes('edit_') || link.href.includes('delete_')) {
-        link.addEventListener('click', function() {
-          showLoading('Loading...');
-          setTimeout(hideLoading, 1000); // Hide after 1 second
-        });
-      }
-    });
+  th {
+    background-color: #f1f5f9;
+    font-weight: 600;
+    color: #334155;
+  }
 
-    // Update score bars
-    updateScoreBars();
-  });
+  tr:nth-child(even) {
+    background-color: #f8fafc;
+  }
 
-  function updateScoreBars() {
-    document.querySelectorAll('.subject-performance').forEach(item => {
-      const score = parseInt(item.getAttribute('data-score'));
-      const grade = item.getAttribute('data-grade');
-      const fill = item.querySelector('.score-fill');
-      const text = item.querySelector('.score-text');
-      
-      if (fill && text) {
-        fill.style.width = score + '%';
-        
-        // Set color based on grade
-        if (grade === 'A') fill.style.background = '#22c55e';
-        else if (grade === 'B') fill.style.background = '#2563eb';
-        else if (grade === 'C') fill.style.background = '#f59e0b';
-        else if (grade === 'D') fill.style.background = '#f97316';
-        else fill.style.background = '#ef4444';
-        
-        text.textContent = score + '%';
-      }
-    });
+  tr:hover {
+    background-color: #f1f5f9;
   }
 
-  // Initialize theme on page load
-  document.addEventListener('DOMContentLoaded', function() {
-    const savedTheme = getCookie('selected_theme');
-    if (savedTheme) {
-      applyTheme(savedTheme, false); // Don't show confirmation on load
-    }
+  a.button, button.button {
+    display: inline-flex;
+    align-items: center;
+    margin: 5px;
+    padding: 10px 20px;
+    background-color: var(--primary-color);
+    color: white;
+    text-decoration: none;
+    border-radius: 8px;
+    border: none;
+    cursor: pointer;
+    transition: all 0.3s;
+    font-size: 14px;
+    font-weight: 500;
+    gap: 8px;
+  }
 
-    // Capture all form submissions to show loading
-    document.querySelectorAll('form').forEach(form => {
-      form.addEventListener('submit', function(e) {
-        // Only show loading if form action contains specific paths
-        const action = form.getAttribute('action') || '';
-        if (action.includes('add') || action.includes('edit') || action.includes('delete') || action.includes('process')) {
-          showLoading('Processing request...');
-        }
-      });
-    });
-  });
+  a.button:hover, button.button:hover {
+    background-color: #3b5bdb;
+    transform: translateY(-2px);
+    box-shadow: var(--shadow-md);
+  }
 
-  function applyTheme(themeName, showConfirmation = true) {
-    const themeColors = {
-      'modern-blue': {
-        '--primary-color': '#4361ee',
-        '--secondary-color': '#3a0ca3',
-        '--accent-color': '#4cc9f0',
-        '--dark-color': '#1e293b',
-        '--light-color': '#f8fafc',
-        '--gray-light': '#e2e8f0',
-        '--sidebar-bg-start': '#1e293b',
-        '--sidebar-bg-end': '#0f172a'
-      },
-      'elegant-green': {
-        '--primary-color': '#2ecc71',
-        '--secondary-color': '#27ae60',
-        '--accent-color': '#1abc9c',
-        '--dark-color': '#1e293b',
-        '--light-color': '#f8fafc',
-        '--gray-light': '#e2e8f0',
-        '--sidebar-bg-start': '#1e293b',
-        '--sidebar-bg-end': '#0f172a'
-      },
-      'sunset-orange': {
-        '--primary-color': '#ff7e5f',
-        '--secondary-color': '#feb47b',
-        '--accent-color': '#f39c12',
-        '--dark-color': '#1e293b',
-        '--light-color': '#fff5f5',
-        '--gray-light': '#f8f9fa',
-        '--sidebar-bg-start': '#2c1810',
-        '--sidebar-bg-end': '#1e120b'
-      },
-      'dusk-purple': {
-        '--primary-color': '#654ea3',
-        '--secondary-color': '#da98b4',
-        '--accent-color': '#8e44ad',
-        '--dark-color': '#1e293b',
-        '--light-color': '#f8f0fc',
-        '--gray-light': '#f0e6ff',
-        '--sidebar-bg-start': '#2c0f3e',
-        '--sidebar-bg-end': '#1c0928'
-      },
-      'forest-teal': {
-        '--primary-color': '#11998e',
-        '--secondary-color': '#38ef7d',
-        '--accent-color': '#16a085',
-        '--dark-color': '#1e293b',
-        '--light-color': '#e8f8f5',
-        '--gray-light': '#e8f6f3',
-        '--sidebar-bg-start': '#0d3632',
-        '--sidebar-bg-end': '#0a2824'
-      },
-      'light-theme': {
-        '--primary-color': '#4f46e5',
-        '--secondary-color': '#2563eb',
-        '--accent-color': '#0ea5e9',
-        '--dark-color': '#1f2937',
-        '--light-color': '#ffffff',
-        '--gray-light': '#e5e7eb',
-        '--sidebar-bg-start': '#f9fafb',
-        '--sidebar-bg-end': '#f3f4f6',
-        '--sidebar-text': '#374151',
-        '--sidebar-hover': '#e5e7eb'
-      },
-      'dark-theme': {
-        '--primary-color': '#818cf8',
-        '--secondary-color': '#60a5fa',
-        '--accent-color': '#38bdf8',
-        '--dark-color': '#f9fafb',
-        '--light-color': '#111827',
-        '--gray-light': '#374151',
-        '--sidebar-bg-start': '#1f2937',
-        '--sidebar-bg-end': '#111827',
-        '--sidebar-text': '#d1d5db',
-        '--sidebar-hover': '#374151'
-      }
-    };
+  a.button i, button.button i {
+    font-size: 1rem;
+  }
 
-    const colors = themeColors[themeName];
-    if (colors) {
-      // Apply CSS custom properties
-      Object.entries(colors).forEach(([property, value]) => {
-        document.documentElement.style.setProperty(property, value);
-      });
+  a.button.secondary {
+    background-color: var(--secondary-color);
+  }
 
-      // Update sidebar styles for light/dark themes specifically
-      const sidebar = document.querySelector('.sidebar');
-      if (sidebar) {
-        if (themeName === 'light-theme') {
-          sidebar.style.background = 'linear-gradient(to bottom, #f9fafb, #f3f4f6)';
-          const sidebarLinks = document.querySelectorAll('.sidebar a');
-          sidebarLinks.forEach(link => {
-            link.style.color = '#374151';
-          });
-          const sidebarH2 = document.querySelector('.sidebar h2');
-          if (sidebarH2) sidebarH2.style.color = '#374151';
-          const toggleBtn = document.querySelector('.toggle-btn');
-          if (toggleBtn) toggleBtn.style.background = '#4f46e5';
-        } else if (themeName === 'dark-theme') {
-          sidebar.style.background = 'linear-gradient(to bottom, #1f2937, #111827)';
-          const sidebarLinks = document.querySelectorAll('.sidebar a');
-          sidebarLinks.forEach(link => {
-            link.style.color = '#d1d5db';
-          });
-          const sidebarH2 = document.querySelector('.sidebar h2');
-          if (sidebarH2) sidebarH2.style.color = '#d1d5db';
-          const toggleBtn = document.querySelector('.toggle-btn');
-          if (toggleBtn) toggleBtn.style.background = '#818cf8';
-        } else {
-          // Reset to default gradient for other themes
-          sidebar.style.background = 'linear-gradient(to bottom, var(--sidebar-bg-start), var(--sidebar-bg-end))';
-          const sidebarLinks = document.querySelectorAll('.sidebar a');
-          sidebarLinks.forEach(link => {
-            link.style.color = 'white';
-          });
-          const sidebarH2 = document.querySelector('.sidebar h2');
-          if (sidebarH2) sidebarH2.style.color = 'white';
-          const toggleBtn = document.querySelector('.toggle-btn');
-          if (toggleBtn) toggleBtn.style.background = 'var(--primary-color)';
-        }
-      }
+  a.button.secondary:hover {
+    background-color: #3830a9;
+  }
 
-      // Save theme preference in cookie
-      setCookie('selected_theme', themeName, 30); // 30 days expiry
+  a.button.danger {
+    background-color: var(--danger-color);
+  }
+
+  a.button.danger:hover {
+    background-color: #ef4444;
+  }
 
-      if (showConfirmation) {
-        showThemeApplied(themeName);
-      }
-    }
+  a.button.warning {
+    background-color: var(--warning-color);
+    color: #1e293b;
   }
 
-  function showThemeApplied(themeName) {
-    // Create temporary alert
-    const alertDiv = document.createElement('div');
-    alertDiv.className = 'alert alert-success';
-    alertDiv.innerHTML = `<i class="fas fa-check-circle"></i> Theme "${themeName}" applied successfully!`;
-    alertDiv.style.position = 'fixed';
-    alertDiv.style.top = '20px';
-    alertDiv.style.right = '20px';
-    alertDiv.style.zIndex = '9999';
-    alertDiv.style.opacity = '0';
-    alertDiv.style.transition = 'opacity 0.5s';
+  a.button.warning:hover {
+    background-color: #eab308;
+  }
 
-    document.body.appendChild(alertDiv);
+  form input[type=text], form input[type=number], form input[type=date], form input[type=email], form input[type=tel], form input[type=password], form select, form textarea {
+    padding: 12px 15px;
+    margin: 8px 0;
+    width: 100%;
+    box-sizing: border-box;
+    border: 2px solid var(--gray-light);
+    border-radius: 8px;
+    font-size: 14px;
+    transition: all 0.3s;
+  }
 
-    // Fade in
-    setTimeout(() => {
-      alertDiv.style.opacity = '1';
-    }, 10);
+  form input:focus, form select:focus, form textarea:focus {
+    outline: none;
+    border-color: var(--primary-color);
+    box-shadow: 0 0 0 3px rgba(67, 97, 238, 0.2);
+  }
 
-    // Remove after some time
-    setTimeout(() => {
-      alertDiv.style.opacity = '0';
-      setTimeout(() => {
-        document.body.removeChild(alertDiv);
-      }, 500);
-    }, 3000);
+  img.passport {
+    max-width: 100px;
+    max-height: 100px;
+    border-radius: 8px;
+    border: 2px solid var(--gray-light);
+    object-fit: cover;
   }
 
-  function setCookie(name, value, days) {
-    const expires = new Date();
-    expires.setTime(expires.getTime() + (days * 24 * 60 * 60 * 1000));
-    document.cookie = name + '=' + value + ';expires=' + expires.toUTCString() + ';path=/';
+  .status-present { color: var(--success-color); font-weight: bold; }
+  .status-absent { color: var(--danger-color); font-weight: bold; }
+  .status-late { color: var(--warning-color); font-weight: bold; }
+  .status-excused { color: var(--accent-color); font-weight: bold; }
+
+  .alert {
+    padding: 16px 20px;
+    margin: 15px 0;
+    border-radius: 8px;
+    font-size: 14px;
+    display: flex;
+    align-items: center;
+    gap: 10px;
   }
 
-  function getCookie(name) {
-    const nameEQ = name + "=";
-    const ca = document.cookie.split(';');
-    for(let i = 0; i < ca.length; i++) {
-      let c = ca[i];
-      while (c.charAt(0) === ' ') c = c.substring(1, c.length);
-      if (c.indexOf(nameEQ) === 0) return c.substring(nameEQ.length, c.length);
-    }
-    return null;
+  .alert i {
+    font-size: 1.2rem;
   }
-</script>
-</head>
-<body>
-<div class="loading-overlay">
-  <div>
-    <div class="loading-spinner"></div>
-    <div class="loading-text">Loading...</div>
-  </div>
-</div>
 
-{% if request.endpoint != 'login' %}
-<div class="sidebar">
-  <div class="user-info">
-    <div class="user-avatar">
-      <i class="fas fa-user"></i>
-    </div>
-    <div class="user-name">{{ session.username|default('User') }}</div>
-    <div class="user-role">{{ session.role|default('Guest')|title }}</div>
-  </div>
-  
-  <a href="{{ url_for('index') }}" {% if request.endpoint == 'index' %}class="active"{% endif %}>
-    <i class="fas fa-tachometer-alt"></i> <span>Dashboard</span>
-  </a>
-  
-  {% if session.role in ['admin', 'teacher'] %}
-  <a href="{{ url_for('students') }}" {% if request.endpoint.startswith('student') %}class="active"{% endif %}>
-    <i class="fas fa-users"></i> <span>Students</span>
-  </a>
-  {% endif %}
-  
-  {% if session.role in ['admin'] %}
-  <a href="{{ url_for('teachers') }}" {% if request.endpoint.startswith('teacher') %}class="active"{% endif %}>
-    <i class="fas fa-chalkboard-teacher"></i> <span>Teachers</span>
-  </a>
-  {% endif %}
-  
-  {% if session.role in ['admin', 'teacher'] %}
-  <a href="{{ url_for('classes') }}" {% if request.endpoint.startswith('classes') or request.endpoint.startswith('class') %}class="active"{% endif %}>
-    <i class="fas fa-school"></i> <span>Classes</span>
-  </a>
-  {% endif %}
-  
-  {% if session.role in ['admin'] %}
-  <a href="{{ url_for('fees') }}" {% if request.endpoint.startswith('fee') %}class="active"{% endif %}>
-    <i class="fas fa-money-bill-wave"></i> <span>Fees</span>
-  </a>
-  {% endif %}
-  
-  {% if session.role in ['admin', 'teacher'] %}
-  <a href="{{ url_for('attendance') }}" {% if request.endpoint.startswith('attendance') %}class="active"{% endif %}>
-    <i class="fas fa-clipboard-list"></i> <span>Attendance</span>
-  </a>
-  {% endif %}
-  
-  {% if session.role in ['admin', 'teacher'] %}
-  <a href="{{ url_for('grades') }}" {% if request.endpoint.startswith('grade') %}class="active"{% endif %}>
-    <i class="fas fa-chart-line"></i> <span>Grades</span>
-  </a>
-  {% endif %}
-  
-  {% if session.role in ['admin', 'teacher', 'student'] %}
-  <a href="{{ url_for('timetable') }}" {% if request.endpoint.startswith('timetable') %}class="active"{% endif %}>
-    <i class="fas fa-calendar-alt"></i> <span>Timetable</span>
-  </a>
-  {% endif %}
-  
-  {% if session.role == 'admin' %}
-  <a href="{{ url_for('settings') }}" {% if request.endpoint.startswith('settings') %}class="active"{% endif %}>
-    <i class="fas fa-cog"></i> <span>Settings</span>
-  </a>
-  <a href="{{ url_for('themes') }}" {% if request.endpoint == 'themes' %}class="active"{% endif %}>
-    <i class="fas fa-palette"></i> <span>Themes</span>
-  </a>
-  <a href="{{ url_for('user_management') }}" {% if request.endpoint.startswith('user_management') %}class="active"{% endif %}>
-    <i class="fas fa-user-cog"></i> <span>User Management</span>
-  </a>
-  {% endif %}
-  
-  {% if session.role == 'student' %}
-  <a href="{{ url_for('student_dashboard') }}" {% if request.endpoint == 'student_dashboard' %}class="active"{% endif %}>
-    <i class="fas fa-graduation-cap"></i> <span>My Dashboard</span>
-  </a>
-  <a href="{{ url_for('student_grades') }}" {% if request.endpoint == 'student_grades' %}class="active"{% endif %}>
-    <i class="fas fa-chart-line"></i> <span>My Grades</span>
-  </a>
-  <a href="{{ url_for('student_attendance') }}" {% if request.endpoint == 'student_attendance' %}class="active"{% endif %}>
-    <i class="fas fa-clipboard-list"></i> <span>My Attendance</span>
-  </a>
-  <a href="{{ url_for('student_fees') }}" {% if request.endpoint == 'student_fees' %}class="active"{% endif %}>
-    <i class="fas fa-money-bill-wave"></i> <span>My Fees</span>
-  </a>
-  {% endif %}
-  
-  {% if session.role == 'teacher' %}
-  <a href="{{ url_for('teacher_dashboard') }}" {% if request.endpoint == 'teacher_dashboard' %}class="active"{% endif %}>
-    <i class="fas fa-chalkboard-teacher"></i> <span>Teacher Dashboard</span>
-  </a>
-  {% endif %}
-  
-  <button class="logout-btn" onclick="window.location.href='{{ url_for('logout') }}'">
-    <i class="fas fa-sign-out-alt"></i> <span>Logout</span>
-  </button>
-</div>
-{% endif %}
+  .alert-success {
+    background-color: #dcfce7;
+    color: #166534;
+    border: 1px solid #bbf7d0;
+  }
 
-<div class="content">
-  {% with messages = get_flashed_messages(with_categories=true) %}
-    {% if messages %}
-      {% for category, message in messages %}
-        <div class="alert alert-{{ category }}"><i class="fas fa-info-circle"></i> {{ message }}</div>
-      {% endfor %}
-    {% endif %}
-  {% endwith %}
-  {% block content %}{% endblock %}
-</div>
-</body>
-</html>''',
+  .alert-error {
+    background-color: #fecaca;
+    color: #991b1b;
+    border: 1px solid #fecaca;
+  }
 
-    'login.html': '''{% extends "base.html" %}
-{% block content %}
-<div class="login-container">
-  <div class="login-card">
-    <div class="login-logo">
-      <h2>School Management System</h2>
-    </div>
-    
-    <h2>Login to Your Account</h2>
-    
-    <form method="post" action="{{ url_for('login') }}">
-      <div class="form-group">
-        <label for="username">Username</label>
-        <input type="text" id="username" name="username" required placeholder="Enter your username">
-      </div>
-      
-      <div class="form-group">
-        <label for="password">Password</label>
-        <div class="password-toggle">
-          <input type="password" id="password" name="password" required placeholder="Enter your password">
-          <span class="toggle-icon" onclick="togglePassword('password')">
-            <i class="fas fa-eye"></i>
-          </span>
-        </div>
-      </div>
-      
-      <div class="form-group">
-        <label for="role">Login As</label>
-        <select id="role" name="role" required>
-          <option value="">Select Role</option>
-          <option value="admin">Administrator</option>
-          <option value="teacher">Teacher</option>
-          <option value="student">Student</option>
-        </select>
-      </div>
-      
-      <button type="submit" class="button full-width" style="margin-top: 20px;">
-        <i class="fas fa-sign-in-alt"></i> Login
-      </button>
-      
-      <div style="text-align: center; margin-top: 20px; color: #64748b;">
-        <p>Default Admin: admin / school123</p>
-      </div>
-    </form>
-  </div>
-</div>
+  .alert-warning {
+    background-color: #fef3c7;
+    color: #92400e;
+    border: 1px solid #fde68a;
+  }
 
-<script>
-  function togglePassword(inputId) {
-    const input = document.getElementById(inputId);
-    const icon = document.querySelector(`[onclick="togglePassword('${inputId}')"] i`);
-    
-    if (input.type === 'password') {
-      input.type = 'text';
-      icon.classList.remove('fa-eye');
-      icon.classList.add('fa-eye-slash');
-    } else {
-      input.type = 'password';
-      icon.classList.remove('fa-eye-slash');
-      icon.classList.add('fa-eye');
-    }
+  .filter-form {
+    background-color: #f1f5f9;
+    padding: 20px;
+    border-radius: 12px;
+    margin-bottom: 20px;
+    box-shadow: var(--shadow-sm);
   }
-</script>
-{% endblock %}''',
 
-    'user_management.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>User Management</h1>
+  .filter-form label {
+    display: inline-block;
+    margin-right: 10px;
+    font-weight: 600;
+    margin-bottom: 5px;
+    color: #334155;
+  }
 
-<div class="tabs">
-  <button class="tab active" onclick="toggleTabs('manageUsers')">Manage Users</button>
-  <button class="tab" onclick="toggleTabs('addUser')">Add New User</button>
-  <button class="tab" onclick="toggleTabs('resetPassword')">Reset Password</button>
-</div>
+  .filter-form input, .filter-form select {
+    margin-right: 20px;
+    margin-bottom: 10px;
+    padding: 10px 15px;
+  }
 
-<div id="manageUsers" class="tab-content active">
-  <div class="action-buttons">
-    <a href="{{ url_for('user_management') }}?role=all" class="button {% if role_filter == 'all' %}active{% endif %}">All Users</a>
-    <a href="{{ url_for('user_management') }}?role=student" class="button {% if role_filter == 'student' %}active{% endif %}">Students</a>
-    <a href="{{ url_for('user_management') }}?role=teacher" class="button {% if role_filter == 'teacher' %}active{% endif %}">Teachers</a>
-    <a href="{{ url_for('user_management') }}?role=admin" class="button {% if role_filter == 'admin' %}active{% endif %}">Admins</a>
-  </div>
+  .receipt {
+    border: 1px solid var(--gray-light);
+    padding: 30px;
+    margin: 20px auto;
+    background-color: white;
+    max-width: 800px;
+    border-radius: 12px;
+    box-shadow: var(--shadow-lg);
+  }
 
-  <div class="search-box">
-    <input type="text" id="userSearch" onkeyup="filterTable('userSearch', 'usersTable')" placeholder="Search users by name, username, or role...">
-  </div>
+  .receipt-header {
+    text-align: center;
+    border-bottom: 2px solid var(--primary-color);
+    padding-bottom: 20px;
+    margin-bottom: 30px;
+  }
 
-  <table id="usersTable">
-    <thead>
-      <tr>
-        <th>ID</th>
-        <th>Username</th>
-        <th>Full Name</th>
-        <th>Role</th>
-        <th>Status</th>
-        <th>Last Login</th>
-        <th>Created</th>
-        <th>Actions</th>
-      </tr>
-    </thead>
-    <tbody>
-      {% for user in users %}
-      <tr>
-        <td>{{ user.id }}</td>
-        <td>{{ user.username }}</td>
-        <td>{{ user.full_name or 'N/A' }}</td>
-        <td>
-          {% if user.role == 'admin' %}
-            <span class="badge badge-danger">Admin</span>
-          {% elif user.role == 'teacher' %}
-            <span class="badge badge-warning">Teacher</span>
-          {% elif user.role == 'student' %}
-            <span class="badge badge-info">Student</span>
-          {% endif %}
-        </td>
-        <td>
-          {% if user.is_active %}
-            <span class="badge badge-success">Active</span>
-          {% else %}
-            <span class="badge badge-danger">Inactive</span>
-          {% endif %}
-        </td>
-        <td>{{ user.last_login or 'Never' }}</td>
-        <td>{{ user.created_at[:10] }}</td>
-        <td>
-          <a href="{{ url_for('edit_user', id=user.id) }}" class="button" style="padding: 5px 10px; font-size: 12px;">Edit</a>
-          {% if user.role != 'admin' or user.id != session.user_id %}
-          <a href="{{ url_for('toggle_user_status', id=user.id) }}" class="button {% if user.is_active %}danger{% else %}secondary{% endif %}" style="padding: 5px 10px; font-size: 12px;" onclick="return confirmDelete('{% if user.is_active %}Deactivate{% else %}Activate{% endif %} this user?')">
-            {% if user.is_active %}Deactivate{% else %}Activate{% endif %}
-          </a>
-          {% endif %}
-          {% if user.id != session.user_id %}
-          <a href="{{ url_for('reset_user_password', id=user.id) }}" class="button warning" style="padding: 5px 10px; font-size: 12px;" onclick="return confirmDelete('Reset password for {{ user.username }}? Default password will be set.')">Reset Password</a>
-          {% endif %}
-        </td>
-      </tr>
-      {% endfor %}
-    </tbody>
-  </table>
-</div>
+  .receipt-header h2 {
+    color: var(--dark-color);
+    margin: 0;
+  }
 
-<div id="addUser" class="tab-content">
-  <div class="card">
-    <h3>Add New User</h3>
-    <form method="post" action="{{ url_for('add_user') }}">
-      <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
-        <div>
-          <div class="form-group">
-            <label for="username">Username *</label>
-            <input type="text" id="username" name="username" required>
-          </div>
-          
-          <div class="form-group">
-            <label for="full_name">Full Name</label>
-            <input type="text" id="full_name" name="full_name">
-          </div>
-          
-          <div class="form-group">
-            <label for="email">Email</label>
-            <input type="email" id="email" name="email">
-          </div>
-        </div>
-        
-        <div>
-          <div class="form-group">
-            <label for="role">Role *</label>
-            <select id="role" name="role" required onchange="toggleRoleFields()">
-              <option value="">Select Role</option>
-              <option value="admin">Administrator</option>
-              <option value="teacher">Teacher</option>
-              <option value="student">Student</option>
-            </select>
-          </div>
-          
-          <div class="form-group" id="studentField" style="display: none;">
-            <label for="admission_number">Student Admission Number</label>
-            <input type="text" id="admission_number" name="admission_number">
-          </div>
-          
-          <div class="form-group" id="teacherField" style="display: none;">
-            <label for="teacher_id">Teacher</label>
-            <select id="teacher_id" name="teacher_id">
-              <option value="">Select Teacher</option>
-              {% for teacher in teachers %}
-              <option value="{{ teacher.id }}">{{ teacher.name }}</option>
-              {% endfor %}
-            </select>
-          </div>
-          
-          <div class="form-group">
-            <label for="is_active">
-              <input type="checkbox" id="is_active" name="is_active" checked>
-              Active Account
-            </label>
-          </div>
-        </div>
-      </div>
-      
-      <div style="text-align: center; margin-top: 20px;">
-        <button type="submit" class="button">Add User</button>
-        <button type="reset" class="button secondary">Clear</button>
-      </div>
-    </form>
-  </div>
-  
-  <div class="card">
-    <h4>Default Password</h4>
-    <p>New users will be created with the default password: <strong>school123</strong></p>
-    <p>Users should change their password after first login.</p>
-  </div>
-</div>
+  .receipt-details {
+    margin: 20px 0;
+    width: 100%;
+  }
 
-<div id="resetPassword" class="tab-content">
-  <div class="card">
-    <h3>Reset User Password</h3>
-    <form method="post" action="{{ url_for('reset_password_bulk') }}">
-      <div class="form-group">
-        <label for="user_id">Select User *</label>
-        <select id="user_id" name="user_id" required>
-          <option value="">Select User</option>
-          {% for user in all_users %}
-          <option value="{{ user.id }}">{{ user.username }} ({{ user.role }} - {{ user.full_name or 'N/A' }})</option>
-          {% endfor %}
-        </select>
-      </div>
-      
-      <div class="form-group">
-        <label for="new_password">New Password (optional)</label>
-        <div class="password-toggle">
-          <input type="password" id="new_password" name="new_password" placeholder="Leave blank for default password">
-          <span class="toggle-icon" onclick="togglePassword('new_password')">
-            <i class="fas fa-eye"></i>
-          </span>
-        </div>
-        <small>If left blank, password will be reset to default: school123</small>
-      </div>
-      
-      <div style="text-align: center; margin-top: 20px;">
-        <button type="submit" class="button">Reset Password</button>
-      </div>
-    </form>
-  </div>
-</div>
+  .receipt-details td {
+    padding: 10px 15px;
+    vertical-align: top;
+  }
+
+  .receipt-details tr:nth-child(even) {
+    background-color: #f8fafc;
+  }
+
+  .balance {
+    font-weight: bold;
+    color: #dc2626;
+    font-size: 1.1em;
+  }
+
+  .paid {
+    font-weight: bold;
+    color: #16a34a;
+    font-size: 1.1em;
+  }
+
+  .total-row {
+    border-top: 2px solid var(--dark-color);
+    font-weight: bold;
+    font-size: 1.1em;
+  }
 
-<script>
-  function toggleRoleFields() {
-    const role = document.getElementById('role').value;
-    document.getElementById('studentField').style.display = role === 'student' ? 'block' : 'none';
-    document.getElementById('teacherField').style.display = role === 'teacher' ? 'block' : 'none';
+  .dashboard-stats {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+    gap: 20px;
+    margin: 30px 0;
   }
-  
-  function togglePassword(inputId) {
-    const input = document.getElementById(inputId);
-    const icon = document.querySelector(`[onclick="togglePassword('${inputId}')"] i`);
-    
-    if (input.type === 'password') {
-      input.type = 'text';
-      icon.classList.remove('fa-eye');
-      icon.classList.add('fa-eye-slash');
-    } else {
-      input.type = 'password';
-      icon.classList.remove('fa-eye-slash');
-      icon.classList.add('fa-eye');
-    }
+
+  .stat-card {
+    background: white;
+    padding: 24px;
+    border-radius: 12px;
+    text-align: center;
+    box-shadow: var(--shadow-md);
+    transition: transform 0.3s;
+    border-top: 4px solid var(--primary-color);
   }
-</script>
-{% endblock %}''',
 
-    'edit_user.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Edit User</h1>
-<div class="card">
-  <form method="post">
-    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
-      <div>
-        <div class="form-group">
-          <label for="username">Username *</label>
-          <input type="text" id="username" name="username" value="{{ user.username }}" required>
-        </div>
-        
-        <div class="form-group">
-          <label for="full_name">Full Name</label>
-          <input type="text" id="full_name" name="full_name" value="{{ user.full_name or '' }}">
-        </div>
-        
-        <div class="form-group">
-          <label for="email">Email</label>
-          <input type="email" id="email" name="email" value="{{ user.email or '' }}">
-        </div>
-      </div>
-      
-      <div>
-        <div class="form-group">
-          <label for="role">Role *</label>
-          <select id="role" name="role" required>
-            <option value="admin" {% if user.role == 'admin' %}selected{% endif %}>Administrator</option>
-            <option value="teacher" {% if user.role == 'teacher' %}selected{% endif %}>Teacher</option>
-            <option value="student" {% if user.role == 'student' %}selected{% endif %}>Student</option>
-          </select>
-        </div>
-        
-        <div class="form-group">
-          <label for="is_active">
-            <input type="checkbox" id="is_active" name="is_active" {% if user.is_active %}checked{% endif %}>
-            Active Account
-          </label>
-        </div>
-        
-        {% if user.role == 'student' and user.admission_number %}
-        <div class="form-group">
-          <label>Linked Student</label>
-          <input type="text" value="{{ user.admission_number }}" readonly>
-        </div>
-        {% endif %}
-        
-        {% if user.role == 'teacher' and user.teacher_name %}
-        <div class="form-group">
-          <label>Linked Teacher</label>
-          <input type="text" value="{{ user.teacher_name }}" readonly>
-        </div>
-        {% endif %}
-      </div>
-    </div>
-    
-    <div style="text-align: center; margin-top: 20px;">
-      <button type="submit" class="button">Update User</button>
-      <a href="{{ url_for('user_management') }}" class="button secondary">Cancel</a>
-    </div>
-  </form>
-</div>
+  .stat-card:hover {
+    transform: translateY(-5px);
+    box-shadow: var(--shadow-lg);
+  }
 
-<div class="card">
-  <h3>Account Information</h3>
-  <table>
-    <tr>
-      <th>Created:</th>
-      <td>{{ user.created_at[:19] }}</td>
-    </tr>
-    <tr>
-      <th>Last Login:</th>
-      <td>{{ user.last_login or 'Never' }}</td>
-    </tr>
-    <tr>
-      <th>Last Updated:</th>
-      <td>{{ user.updated_at[:19] if user.updated_at else 'N/A' }}</td>
-    </tr>
-  </table>
-</div>
-{% endblock %}''',
+  .stat-card h3 {
+    margin: 0 0 10px 0;
+    color: #64748b;
+    font-size: 14px;
+    text-transform: uppercase;
+    font-weight: 600;
+  }
 
-    'student_dashboard.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Student Dashboard</h1>
-<p>Welcome back, {{ student.name }}!</p>
+  .stat-card .value {
+    font-size: 32px;
+    font-weight: 700;
+    color: var(--primary-color);
+  }
 
-<div class="dashboard-stats">
-  <div class="stat-card">
-    <h3>Current Class</h3>
-    <div class="value">{{ student.class }}</div>
-  </div>
-  <div class="stat-card">
-    <h3>Attendance Rate</h3>
-    <div class="value">{{ attendance_rate }}%</div>
-  </div>
-  <div class="stat-card">
-    <h3>Average Grade</h3>
-    <div class="value">{{ average_grade }}</div>
-  </div>
-  <div class="stat-card">
-    <h3>Fee Balance</h3>
-    <div class="value">{{ fee_balance }}</div>
-  </div>
-</div>
+  .action-buttons {
+    display: flex;
+    flex-wrap: wrap;
+    gap: 12px;
+    margin: 20px 0;
+  }
 
-<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(400px, 1fr)); gap: 20px; margin-top: 30px;">
-  <div class="card">
-    <h3>Today's Timetable</h3>
-    {% if today_timetable %}
-    <table>
-      <thead>
-        <tr><th>Period</th><th>Subject</th><th>Teacher</th><th>Room</th></tr>
-      </thead>
-      <tbody>
-        {% for entry in today_timetable %}
-        <tr>
-          <td>Period {{ entry.period }}</td>
-          <td>{{ entry.subject }}</td>
-          <td>{{ entry.teacher_name or 'N/A' }}</td>
-          <td>{{ entry.room or 'N/A' }}</td>
-        </tr>
-        {% endfor %}
-      </tbody>
-    </table>
-    {% else %}
-    <p>No classes scheduled for today.</p>
-    {% endif %}
-  </div>
-  
-  <div class="card">
-    <h3>Recent Grades</h3>
-    {% if recent_grades %}
-    <table>
-      <thead>
-        <tr><th>Subject</th><th>Term</th><th>Score</th><th>Grade</th></tr>
-      </thead>
-      <tbody>
-        {% for grade in recent_grades %}
-        <tr>
-          <td>{{ grade.subject }}</td>
-          <td>{{ grade.term }}</td>
-          <td>{{ grade.score }}</td>
-          <td class="grade-{{ grade.grade }}">{{ grade.grade }}</td>
-        </tr>
-        {% endfor %}
-      </tbody>
-    </table>
-    <a href="{{ url_for('student_grades') }}" class="button" style="margin-top: 10px;">View All Grades</a>
-    {% else %}
-    <p>No grades recorded yet.</p>
-    {% endif %}
-  </div>
-</div>
+  .search-box {
+    margin: 20px 0;
+    padding: 15px;
+    background: white;
+    border-radius: 12px;
+    box-shadow: var(--shadow-sm);
+  }
+
+  .search-box input {
+    width: 300px;
+    max-width: 100%;
+    padding: 12px 15px;
+  }
+
+  .print-only {
+    display: none;
+  }
+
+  @media print {
+    .sidebar, .button, .no-print {
+      display: none !important;
+    }
+    .content {
+      margin-left: 0 !important;
+      padding: 0 !important;
+    }
+    .print-only {
+      display: block;
+    }
+    .receipt {
+      border: none;
+      box-shadow: none;
+      margin: 0;
+      padding: 0;
+    }
+    .timetable {
+      border: none !important;
+      box-shadow: none !important;
+    }
+    .timetable th, .timetable td {
+      border: 1px solid #000 !important;
+    }
+  }
+
+  .form-group {
+    margin-bottom: 18px;
+  }
 
-<div class="card">
-  <h3>Quick Links</h3>
-  <div class="action-buttons">
-    <a href="{{ url_for('student_grades') }}" class="button">My Grades</a>
-    <a href="{{ url_for('student_attendance') }}" class="button secondary">My Attendance</a>
-    <a href="{{ url_for('student_fees') }}" class="button">My Fees</a>
-    <a href="{{ url_for('timetable') }}?class_filter={{ student.class }}" class="button secondary">Full Timetable</a>
-    {% if medical_info %}
-    <a href="#medical-info" class="button warning">Medical Information</a>
-    {% endif %}
-  </div>
-</div>
+  .form-group label {
+    display: block;
+    margin-bottom: 6px;
+    font-weight: 600;
+    color: #334155;
+  }
 
-{% if medical_info %}
-<div class="card" id="medical-info">
-  <h3>Medical Information</h3>
-  <div class="medical-alert {% if medical_info.has_condition %}danger{% else %}info{% endif %}">
-    <i class="fas fa-heartbeat"></i>
-    <strong>Medical Status:</strong>
-    {% if medical_info.has_condition %}
-    Has Special Medical Condition
-    {% else %}
-    No Special Medical Conditions
-    {% endif %}
-  </div>
-  
-  {% if medical_info.conditions %}
-  <div style="margin-top: 15px;">
-    <h4>Medical Conditions</h4>
-    <p>{{ medical_info.conditions }}</p>
-  </div>
-  {% endif %}
-  
-  {% if medical_info.allergies %}
-  <div style="margin-top: 15px;">
-    <h4>Allergies</h4>
-    <p>{{ medical_info.allergies }}</p>
-  </div>
-  {% endif %}
-  
-  {% if medical_info.medications %}
-  <div style="margin-top: 15px;">
-    <h4>Current Medications</h4>
-    <p>{{ medical_info.medications }}</p>
-  </div>
-  {% endif %}
-  
-  {% if medical_info.emergency_contact_name %}
-  <div style="margin-top: 15px;">
-    <h4>Emergency Contact</h4>
-    <table>
-      <tr>
-        <th>Name:</th>
-        <td>{{ medical_info.emergency_contact_name }}</td>
-      </tr>
-      <tr>
-        <th>Relationship:</th>
-        <td>{{ medical_info.emergency_contact_relation }}</td>
-      </tr>
-      <tr>
-        <th>Phone:</th>
-        <td>{{ medical_info.emergency_contact_phone }}</td>
-      </tr>
-      {% if medical_info.emergency_contact_alt_phone %}
-      <tr>
-        <th>Alternate Phone:</th>
-        <td>{{ medical_info.emergency_contact_alt_phone }}</td>
-      </tr>
-      {% endif %}
-    </table>
-  </div>
-  {% endif %}
-</div>
-{% endif %}
-{% endblock %}''',
+  .badge {
+    display: inline-block;
+    padding: 4px 10px;
+    border-radius: 20px;
+    font-size: 12px;
+    font-weight: 600;
+    margin: 2px;
+  }
 
-    'student_grades.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>My Grades</h1>
+  .badge-success { background-color: #dcfce7; color: #166534; }
+  .badge-warning { background-color: #fef3c7; color: #92400e; }
+  .badge-danger { background-color: #fecaca; color: #991b1b; }
+  .badge-info { background-color: #dbeafe; color: #1d4ed8; }
 
-<div class="card">
-  <h3>Grade Summary</h3>
-  <table>
-    <thead>
-      <tr>
-        <th>Term</th>
-        <th>Number of Subjects</th>
-        <th>Average Score</th>
-        <th>Average Grade</th>
-        <th>Position</th>
-      </tr>
-    </thead>
-    <tbody>
-      {% for term, data in term_summary.items() %}
-      <tr>
-        <td>{{ term }}</td>
-        <td>{{ data.count }}</td>
-        <td>{{ "%.2f"|format(data.average) }}%</td>
-        <td class="grade-{{ data.grade }}">{{ data.grade }}</td>
-        <td>{{ data.position or 'N/A' }}</td>
-      </tr>
-      {% endfor %}
-    </tbody>
-  </table>
-</div>
+  .tabs {
+    display: flex;
+    border-bottom: 1px solid var(--gray-light);
+    margin-bottom: 20px;
+    background: white;
+    border-radius: 8px;
+    overflow: hidden;
+    box-shadow: var(--shadow-sm);
+  }
 
-<div class="card">
-  <h3>All Grades</h3>
-  {% if grades %}
-  <table>
-    <thead>
-      <tr>
-        <th>Subject</th>
-        <th>Term</th>
-        <th>Year</th>
-        <th>Score</th>
-        <th>Grade</th>
-        <th>Date Recorded</th>
-      </tr>
-    </thead>
-    <tbody>
-      {% for grade in grades %}
-      <tr>
-        <td>{{ grade.subject }}</td>
-        <td>{{ grade.term }}</td>
-        <td>{{ grade.year }}</td>
-        <td>{{ grade.score }}</td>
-        <td class="grade-{{ grade.grade }}">{{ grade.grade }}</td>
-        <td>{{ grade.created_at[:10] }}</td>
-      </tr>
-      {% endfor %}
-    </tbody>
-  </table>
-  {% else %}
-  <p>No grades recorded yet.</p>
-  {% endif %}
-</div>
+  .tab {
+    padding: 12px 24px;
+    cursor: pointer;
+    border: none;
+    background: none;
+    font-size: 16px;
+    color: #64748b;
+    font-weight: 500;
+    transition: all 0.3s;
+  }
 
-<div class="card">
-  <h3>Subject Performance</h3>
-  {% if subject_performance %}
-  {% for subject in subject_performance %}
-  <div class="subject-performance" data-score="{{ subject.average_score|round }}" data-grade="{{ subject.grade }}">
-    <div class="subject-name">{{ subject.name }}</div>
-    <div class="score-bar">
-      <div class="score-fill" style="width: {{ subject.average_score|round }}%;"></div>
-      <div class="score-text">{{ subject.average_score|round }}% ({{ subject.grade }})</div>
-    </div>
-  </div>
-  {% endfor %}
-  {% else %}
-  <p>No subject performance data available.</p>
-  {% endif %}
-</div>
+  .tab:hover {
+    background-color: #f1f5f9;
+  }
 
-<script>
-  document.addEventListener('DOMContentLoaded', function() {
-    updateScoreBars();
-  });
-</script>
-{% endblock %}''',
+  .tab.active {
+    color: var(--primary-color);
+    background-color: #eff6ff;
+    border-bottom: 3px solid var(--primary-color);
+  }
 
-    'student_attendance.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>My Attendance</h1>
+  .tab-content {
+    display: none;
+  }
 
-<div class="dashboard-stats">
-  <div class="stat-card">
-    <h3>Present Days</h3>
-    <div class="value">{{ attendance_stats.present }}</div>
-  </div>
-  <div class="stat-card">
-    <h3>Absent Days</h3>
-    <div class="value">{{ attendance_stats.absent }}</div>
-  </div>
-  <div class="stat-card">
-    <h3>Late Days</h3>
-    <div class="value">{{ attendance_stats.late }}</div>
-  </div>
-  <div class="stat-card">
-    <h3>Attendance Rate</h3>
-    <div class="value">{{ attendance_stats.rate }}%</div>
-  </div>
-</div>
+  .tab-content.active {
+    display: block;
+  }
+
+  .grade-A { color: #22c55e; font-weight: bold; }
+  .grade-B { color: #2563eb; font-weight: bold; }
+  .grade-C { color: #f59e0b; font-weight: bold; }
+  .grade-D { color: #f97316; font-weight: bold; }
+  .grade-F { color: #ef4444; font-weight: bold; }
+
+  .report-card {
+    border: 1px solid var(--gray-light);
+    padding: 30px;
+    margin: 20px auto;
+    background-color: white;
+    max-width: 1000px;
+    border-radius: 12px;
+    box-shadow: var(--shadow-lg);
+  }
+
+  .report-header {
+    text-align: center;
+    border-bottom: 2px solid var(--primary-color);
+    padding-bottom: 20px;
+    margin-bottom: 30px;
+  }
+
+  .performance-summary {
+    background: #f1f5f9;
+    padding: 20px;
+    border-radius: 12px;
+    margin: 20px 0;
+  }
 
-<div class="card">
-  <h3>Recent Attendance</h3>
-  {% if recent_attendance %}
-  <table>
-    <thead>
-      <tr>
-        <th>Date</th>
-        <th>Status</th>
-        <th>Remarks</th>
-      </tr>
-    </thead>
-    <tbody>
-      {% for record in recent_attendance %}
-      <tr>
-        <td>{{ record.date }}</td>
-        <td>
-          {% if record.status == 'Present' %}
-            <span class="status-present">Present</span>
-          {% elif record.status == 'Absent' %}
-            <span class="status-absent">Absent</span>
-          {% elif record.status == 'Late' %}
-            <span class="status-late">Late</span>
-          {% elif record.status == 'Excused' %}
-            <span class="status-excused">Excused</span>
-          {% endif %}
-        </td>
-        <td>{{ record.remarks or '-' }}</td>
-      </tr>
-      {% endfor %}
-    </tbody>
-  </table>
-  {% else %}
-  <p>No attendance records found.</p>
-  {% endif %}
-</div>
+  /* Timetable Styles */
+  .timetable {
+    width: 100%;
+    border-collapse: separate;
+    border-spacing: 4px;
+    margin: 20px 0;
+    background: white;
+    border-radius: 12px;
+    overflow: hidden;
+    box-shadow: var(--shadow-md);
+  }
 
-<div class="card">
-  <h3>Monthly Attendance Summary</h3>
-  <form method="get" style="display: flex; gap: 10px; margin-bottom: 20px;">
-    <input type="month" name="month" value="{{ month }}" onchange="this.form.submit()">
-  </form>
-  
-  {% if monthly_attendance %}
-  <table>
-    <thead>
-      <tr>
-        <th>Date</th>
-        <th>Day</th>
-        <th>Status</th>
-        <th>Remarks</th>
-      </tr>
-    </thead>
-    <tbody>
-      {% for record in monthly_attendance %}
-      <tr>
-        <td>{{ record.date }}</td>
-        <td>{{ record.day_name }}</td>
-        <td>
-          {% if record.status == 'Present' %}
-            <span class="status-present">Present</span>
-          {% elif record.status == 'Absent' %}
-            <span class="status-absent">Absent</span>
-          {% elif record.status == 'Late' %}
-            <span class="status-late">Late</span>
-          {% elif record.status == 'Excused' %}
-            <span class="status-excused">Excused</span>
-          {% endif %}
-        </td>
-        <td>{{ record.remarks or '-' }}</td>
-      </tr>
-      {% endfor %}
-    </tbody>
-  </table>
-  {% else %}
-  <p>No attendance records for {{ month }}.</p>
-  {% endif %}
-</div>
-{% endblock %}''',
+  .timetable th {
+    background:skyblue;
+    color: white;
+    padding: 16px;
+    text-align: center;
+    font-weight: 600;
+    border-radius: 8px 8px 0 0;
+  }
 
-    'student_fees.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>My Fees</h1>
+  .timetable td {
+    padding: 8px;
+    border-radius: 8px;
+    vertical-align: top;
+    height: 120px;
+    background-color: #f8fafc;
+    position: relative;
+  }
 
-<div class="dashboard-stats">
-  <div class="stat-card">
-    <h3>Total Fee</h3>
-    <div class="value">{{ fee_summary.total_fee }}</div>
-  </div>
-  <div class="stat-card">
-    <h3>Total Paid</h3>
-    <div class="value">{{ fee_summary.total_paid }}</div>
-  </div>
-  <div class="stat-card">
-    <h3>Balance</h3>
-    <div class="value {% if fee_summary.balance > 0 %}balance{% else %}paid{% endif %}">{{ fee_summary.balance }}</div>
-  </div>
-  <div class="stat-card">
-    <h3>Payment Status</h3>
-    <div class="value">
-      {% if fee_summary.balance <= 0 %}
-        <span class="paid">Paid</span>
-      {% elif fee_summary.balance < fee_summary.total_fee %}
-        <span style="color: #f59e0b;">Partial</span>
-      {% else %}
-        <span class="balance">Pending</span>
-      {% endif %}
-    </div>
-  </div>
-</div>
+  .timetable tr:first-child td {
+    border-top: none;
+  }
 
-<div class="card">
-  <h3>Fee Structures</h3>
-  {% if fee_structures %}
-  <table>
-    <thead>
-      <tr>
-        <th>Term</th>
-        <th>Year</th>
-        <th>Total Amount</th>
-        <th>Paid Amount</th>
-        <th>Balance</th>
-        <th>Status</th>
-      </tr>
-    </thead>
-    <tbody>
-      {% for fs in fee_structures %}
-      <tr>
-        <td>{{ fs.term }}</td>
-        <td>{{ fs.year }}</td>
-        <td>{{ fs.amount }}</td>
-        <td class="paid">{{ fs.paid_amount }}</td>
-        <td class="{% if fs.balance > 0 %}balance{% else %}paid{% endif %}">{{ fs.balance }}</td>
-        <td>
-          {% if fs.balance <= 0 %}
-            <span class="badge badge-success">Paid</span>
-          {% elif fs.paid_amount > 0 %}
-            <span class="badge badge-warning">Partial</span>
-          {% else %}
-            <span class="badge badge-danger">Unpaid</span>
-          {% endif %}
-        </td>
-      </tr>
-      {% endfor %}
-    </tbody>
-  </table>
-  {% else %}
-  <p>No fee structures found.</p>
-  {% endif %}
-</div>
+  .timetable .time-slot {
+    background: #f1f5f9;
+    font-weight: 600;
+    text-align: center;
+    width: 100px;
+    padding: 10px;
+    border-radius: 6px;
+  }
 
-<div class="card">
-  <h3>Payment History</h3>
-  {% if payments %}
-  <table>
-    <thead>
-      <tr>
-        <th>Date</th>
-        <th>Receipt No</th>
-        <th>Term</th>
-        <th>Year</th>
-        <th>Amount Paid</th>
-        <th>Payment Method</th>
-        <th>Remarks</th>
-      </tr>
-    </thead>
-    <tbody>
-      {% for payment in payments %}
-      <tr>
-        <td>{{ payment.date_paid }}</td>
-        <td>{{ payment.receipt_number }}</td>
-        <td>{{ payment.term }}</td>
-        <td>{{ payment.year }}</td>
-        <td class="paid">{{ payment.amount_paid }}</td>
-        <td>{{ payment.payment_method or 'Cash' }}</td>
-        <td>{{ payment.remarks or '-' }}</td>
-      </tr>
-      {% endfor %}
-    </tbody>
-  </table>
-  {% else %}
-  <p>No payment history found.</p>
-  {% endif %}
-</div>
-{% endblock %}''',
+  .timetable .period {
+    border-radius: 8px;
+    padding: 10px;
+    margin: 3px 0;
+    color: white;
+    font-weight: 600;
+    position: relative;
+    min-height: 80px;
+    border: 2px solid rgba(255,255, 255, 0.3);
+    transition: all 0.2s;
+    display: flex;
+    flex-direction: column;
+    justify-content: center;
+  }
 
-    'teacher_dashboard.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Teacher Dashboard</h1>
-<p>Welcome, {{ teacher.name }}!</p>
+  .timetable .period:hover {
+    opacity: 0.95;
+    transform: scale(1.02);
+    cursor: pointer;
+    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
+  }
+
+  .period-empty {
+    background: #f8fafc;
+    color: #94a3b8;
+    text-align: center;
+    padding: 15px;
+    border-radius: 8px;
+    font-style: italic;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    min-height: 80px;
+  }
+
+  .subject-math { background: linear-gradient(135deg, #667eea, #764ba2); }
+  .subject-english { background: linear-gradient(135deg, #f093fb, #f5576c); }
+  .subject-science { background: linear-gradient(135deg, #4facfe, #00f2fe); }
+  .subject-history { background: linear-gradient(135deg, #43e97b, #38f9d7); }
+  .subject-geography { background: linear-gradient(135deg, #fa709a, #fee140); }
+  .subject-physics { background: linear-gradient(135deg, #30cfd0, #330867); }
+  .subject-chemistry { background: linear-gradient(135deg, #a8edea, #fed6e3); }
+  .subject-biology { background: linear-gradient(135deg, #5ee7df, #b490ca); }
+  .subject-computer { background: linear-gradient(135deg, #d299c2, #fef9d7); }
+  .subject-art { background: linear-gradient(135deg, #f6d365, #fda085); }
+  .subject-pe { background: linear-gradient(135deg, #a1c4fd, #c2e9fb); }
+  .subject-music { background: linear-gradient(135deg, #ffecd2, #fcb69f); }
+  .break-period {
+    background: repeating-linear-gradient(45deg, #e0e7ff, #e0e7ff 10px, #c7d2fe 10px, #c7d2fe 20px);
+    color: #4f46e5;
+    text-align: center;
+    font-weight: 600;
+  }
 
-<div class="dashboard-stats">
-  <div class="stat-card">
-    <h3>Assigned Classes</h3>
-    <div class="value">{{ stats.class_count }}</div>
-  </div>
-  <div class="stat-card">
-    <h3>Total Students</h3>
-    <div class="value">{{ stats.student_count }}</div>
-  </div>
-  <div class="stat-card">
-    <h3>Today's Classes</h3>
-    <div class="value">{{ stats.today_classes }}</div>
-  </div>
-  <div class="stat-card">
-    <h3>Pending Grades</h3>
-    <div class="value">{{ stats.pending_grades }}</div>
-  </div>
-</div>
+  .period-details {
+    font-size: 11px;
+  }
 
-<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(400px, 1fr)); gap: 20px; margin-top: 30px;">
-  <div class="card">
-    <h3>Today's Schedule</h3>
-    {% if today_schedule %}
-    <table>
-      <thead>
-        <tr><th>Time</th><th>Class</th><th>Subject</th><th>Room</th></tr>
-      </thead>
-      <tbody>
-        {% for entry in today_schedule %}
-        <tr>
-          <td>Period {{ entry.period }}</td>
-          <td>{{ entry.class }}</td>
-          <td>{{ entry.subject }}</td>
-          <td>{{ entry.room or 'N/A' }}</td>
-        </tr>
-        {% endfor %}
-      </tbody>
-    </table>
-    {% else %}
-    <p>No classes scheduled for today.</p>
-    {% endif %}
-  </div>
-  
-  <div class="card">
-    <h3>My Classes</h3>
-    {% if my_classes %}
-    <table>
-      <thead>
-        <tr><th>Class</th><th>Students</th><th>Action</th></tr>
-      </thead>
-      <tbody>
-        {% for cls in my_classes %}
-        <tr>
-          <td>{{ cls.name }}</td>
-          <td>{{ cls.student_count }}</td>
-          <td>
-            <a href="{{ url_for('attendance') }}?class_filter={{ cls.name }}" class="button" style="padding: 5px 10px; font-size: 12px;">Take Attendance</a>
-          </td>
-        </tr>
-        {% endfor %}
-      </tbody>
-    </table>
-    {% else %}
-    <p>No classes assigned yet.</p>
-    {% endif %}
-  </div>
-</div>
+  .period-details .subject {
+    font-size: 13px;
+    font-weight: 600;
+    margin-bottom: 5px;
+  }
 
-<div class="card">
-  <h3>Quick Actions</h3>
-  <div class="action-buttons">
-    <a href="{{ url_for('mark_attendance') }}" class="button">Mark Attendance</a>
-    <a href="{{ url_for('add_grade') }}" class="button secondary">Add Grades</a>
-    <a href="{{ url_for('timetable') }}" class="button">View Timetable</a>
-    <a href="{{ url_for('grades') }}" class="button secondary">View All Grades</a>
-  </div>
-</div>
+  .period-details .teacher {
+    font-size: 11px;
+    opacity: 0.9;
+  }
 
-<div class="card">
-  <h3>Recent Attendance Updates</h3>
-  {% if recent_attendance %}
-  <table>
-    <thead>
-      <tr>
-        <th>Date</th>
-        <th>Class</th>
-        <th>Student</th>
-        <th>Status</th>
-      </tr>
-    </thead>
-    <tbody>
-      {% for record in recent_attendance %}
-      <tr>
-        <td>{{ record.date }}</td>
-        <td>{{ record.class }}</td>
-        <td>{{ record.student_name }}</td>
-        <td>
-          {% if record.status == 'Present' %}
-            <span class="status-present">Present</span>
-          {% elif record.status == 'Absent' %}
-            <span class="status-absent">Absent</span>
-          {% elif record.status == 'Late' %}
-            <span class="status-late">Late</span>
-          {% elif record.status == 'Excused' %}
-            <span class="status-excused">Excused</span>
-          {% endif %}
-        </td>
-      </tr>
-      {% endfor %}
-    </tbody>
-  </table>
-  {% else %}
-  <p>No recent attendance records.</p>
-  {% endif %}
-</div>
-{% endblock %}''',
+  .period-details .room {
+    font-size: 10px;
+    opacity: 0.85;
+    background: rgba(0,0,0,0.2);
+    padding: 2px 6px;
+    border-radius: 4px;
+    display: inline-block;
+    margin-top: 3px;
+  }
 
-    'index.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Dashboard</h1>
-<p>Welcome back, {{ session.username }}!</p>
+  .timetable-controls {
+    background: white;
+    padding: 18px;
+    border-radius: 12px;
+    margin-bottom: 20px;
+    display: flex;
+    flex-wrap: wrap;
+    gap: 15px;
+    align-items: center;
+    box-shadow: var(--shadow-sm);
+  }
 
-<div class="dashboard-stats">
-  <div class="stat-card">
-    <h3>Total Students</h3>
-    <div class="value">{{ total_students }}</div>
-  </div>
-  <div class="stat-card">
-    <h3>Total Teachers</h3>
-    <div class="value">{{ total_teachers }}</div>
-  </div>
-  <div class="stat-card">
-    <h3>Total Classes</h3>
-    <div class="value">{{ total_classes }}</div>
-  </div>
-</div>
+  .timetable-controls select, .timetable-controls input {
+    padding: 10px 15px;
+    border: 2px solid var(--gray-light);
+    border-radius: 8px;
+    font-size: 14px;
+    transition: all 0.3s;
+  }
 
-<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(400px, 1fr)); gap: 20px; margin-top: 30px;">
-  <div class="card">
-    <h3>Recent Students</h3>
-    {% if recent_students %}
-    <table>
-      <thead>
-        <tr><th>Admission No</th><th>Name</th><th>Class</th><th>Date Added</th></tr>
-      </thead>
-      <tbody>
-        {% for student in recent_students %}
-        <tr>
-          <td>{{ student.admission_number }}</td>
-          <td>{{ student.name }}</td>
-          <td>{{ student.class }}</td>
-          <td>{{ student.created_at[:10] }}</td>
-        </tr>
-        {% endfor %}
-      </tbody>
-    </table>
-    {% else %}
-    <p>No students found.</p>
-    {% endif %}
-    <a href="{{ url_for('students') }}" class="button" style="margin-top: 10px;">View All Students</a>
-  </div>
-  
-  <div class="card">
-    <h3>Recent Payments</h3>
-    {% if recent_payments %}
-    <table>
-      <thead>
-        <tr><th>Receipt No</th><th>Student</th><th>Amount</th><th>Date</th></tr>
-      </thead>
-      <tbody>
-        {% for payment in recent_payments %}
-        <tr>
-          <td>{{ payment.receipt_number }}</td>
-          <td>{{ payment.student_name }}</td>
-          <td>{{ payment.amount_paid }}</td>
-          <td>{{ payment.date_paid }}</td>
-        </tr>
-        {% endfor %}
-      </tbody>
-    </table>
-    {% else %}
-    <p>No recent payments.</p>
-    {% endif %}
-    <a href="{{ url_for('fees') }}" class="button" style="margin-top: 10px;">View All Fees</a>
-  </div>
-</div>
+  .timetable-controls select:focus, .timetable-controls input:focus {
+    outline: none;
+    border-color: var(--primary-color);
+    box-shadow: 0 0 0 3px rgba(67, 97, 238, 0.2);
+  }
 
-<div class="card">
-  <h3>Quick Actions</h3>
-  <div class="action-buttons">
-    <a href="{{ url_for('add_student') }}" class="button">Add New Student</a>
-    <a href="{{ url_for('add_teacher') }}" class="button secondary">Add New Teacher</a>
-    <a href="{{ url_for('attendance') }}" class="button">Mark Attendance</a>
-    <a href="{{ url_for('add_fee_structure') }}" class="button secondary">Add Fee Structure</a>
-    <a href="{{ url_for('timetable') }}" class="button">Manage Timetable</a>
-    <a href="{{ url_for('settings') }}" class="button secondary">System Settings</a>
-  </div>
-</div>
-{% endblock %}''',
+  .color-legend {
+    display: flex;
+    flex-wrap: wrap;
+    gap: 12px;
+    margin: 20px 0;
+    padding: 18px;
+    background: white;
+    border-radius: 12px;
+    box-shadow: var(--shadow-sm);
+  }
 
-    'students.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Students</h1>
+  .color-item {
+    display: flex;
+    align-items: center;
+    gap: 6px;
+    padding: 6px 12px;
+    background: #f8fafc;
+    border-radius: 6px;
+    border: 1px solid var(--gray-light);
+  }
 
-<div class="action-buttons">
-  <a href="{{ url_for('add_student') }}" class="button">Add New Student</a>
-</div>
+  .color-box {
+    width: 20px;
+    height: 20px;
+    border-radius: 4px;
+  }
 
-<div class="search-box">
-  <input type="text" id="studentSearch" onkeyup="filterTable('studentSearch', 'studentsTable')" placeholder="Search students by name, admission number, or class...">
-</div>
+  .full-width {
+    width: 100%;
+  }
 
-<table id="studentsTable">
-  <thead>
-    <tr>
-      <th>ID</th>
-      <th>Admission No</th>
-      <th>Name</th>
-      <th>Age</th>
-      <th>Class</th>
-      <th>Guardian</th>
-      <th>Guardian Contacts</th>
-      <th>Medical Info</th>
-      <th>Actions</th>
-    </tr>
-  </thead>
-  <tbody>
-    {% for student in students %}
-    <tr>
-      <td>{{ student.id }}</td>
-      <td>{{ student.admission_number }}</td>
-      <td>{{ student.name }}</td>
-      <td>{{ student.age or 'N/A' }}</td>
-      <td>{{ student.class or 'N/A' }}</td>
-      <td>{{ student.guardian_name or 'N/A' }}</td>
-      <td>{{ student.guardian_contacts or 'N/A' }}</td>
-      <td>
-        {% if student.has_medical_condition %}
-          <span class="badge badge-danger">Medical</span>
-        {% else %}
-          <span class="badge badge-success">Healthy</span>
-        {% endif %}
-      </td>
-      <td>
-        <a href="{{ url_for('edit_student', id=student.id) }}" class="button" style="padding: 5px 10px; font-size: 12px;">Edit</a>
-        <a href="{{ url_for('view_medical_info', id=student.id) }}" class="button warning" style="padding: 5px 10px; font-size: 12px;">Medical</a>
-      </td>
-    </tr>
-    {% endfor %}
-  </tbody>
-</table>
+  .day-header {
+    text-align: center;
+    background: linear-gradient(to right, var(--primary-color), var(--secondary-color));
+    color: white;
+    padding: 10px;
+    border-radius: 6px;
+    margin-bottom: 5px;
+  }
 
-<script>
-  function filterTable(inputId, tableId) {
-    const input = document.getElementById(inputId);
-    const filter = input.value.toUpperCase();
-    const table = document.getElementById(tableId);
-    const rows = table.getElementsByTagName('tr');
+  .timetable-container {
+    overflow-x: auto;
+  }
 
-    for (let i = 1; i < rows.length; i++) {
-      const cells = rows[i].getElementsByTagName('td');
-      let match = false;
-      
-      for (let j = 0; j < cells.length; j++) {
-        const cell = cells[j];
-        if (cell) {
-          if (cell.textContent.toUpperCase().indexOf(filter) > -1) {
-            match = true;
-            break;
-          }
-        }
-      }
-      rows[i].style.display = match ? '' : 'none';
-    }
+  /* Loading animation styles */
+  .loading-overlay {
+    position: fixed;
+    top: 0;
+    left: 0;
+    width: 100%;
+    height: 100%;
+    background: rgba(0, 0, 0, 0.5);
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    z-index: 9999;
+    opacity: 0;
+    visibility: hidden;
+    transition: all 0.3s ease;
   }
-</script>
-{% endblock %}''',
 
-    'add_student.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Add New Student</h1>
+  .loading-overlay.show {
+    opacity: 1;
+    visibility: visible;
+  }
 
-<div class="card">
-  <form method="post">
-    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
-      <div>
-        <div class="form-group">
-          <label for="admission_number">Admission Number *</label>
-          <input type="text" id="admission_number" name="admission_number" required>
-        </div>
-        
-        <div class="form-group">
-          <label for="name">Full Name *</label>
-          <input type="text" id="name" name="name" required>
-        </div>
-        
-        <div class="form-group">
-          <label for="age">Age</label>
-          <input type="number" id="age" name="age" min="1" max="30">
-        </div>
-        
-        <div class="form-group">
-          <label for="class">Class *</label>
-          <select id="class" name="class" required>
-            <option value="">Select Class</option>
-            <option value="Form 1">Form 1</option>
-            <option value="Form 2">Form 2</option>
-            <option value="Form 3">Form 3</option>
-            <option value="Form 4">Form 4</option>
-            <option value="Form 5">Form 5</option>
-            <option value="Form 6">Form 6</option>
-          </select>
-        </div>
-      </div>
-      
-      <div>
-        <div class="form-group">
-          <label for="guardian_name">Guardian Name</label>
-          <input type="text" id="guardian_name" name="guardian_name">
-        </div>
-        
-        <div class="form-group">
-          <label for="guardian_contacts">Guardian Contacts</label>
-          <input type="text" id="guardian_contacts" name="guardian_contacts" placeholder="Phone numbers">
-        </div>
-        
-        <div class="form-group">
-          <label for="guardian_email">Guardian Email</label>
-          <input type="email" id="guardian_email" name="guardian_email">
-        </div>
-        
-        <div class="form-group">
-          <label for="address">Address</label>
-          <textarea id="address" name="address" rows="3"></textarea>
-        </div>
-      </div>
-    </div>
-    
-    <h3>Medical Information</h3>
-    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px; margin-top: 20px;">
-      <div>
-        <div class="form-group">
-          <label for="has_medical_condition">
-            <input type="checkbox" id="has_medical_condition" name="has_medical_condition">
-            Has Special Medical Condition
-          </label>
-        </div>
-        
-        <div class="form-group">
-          <label for="medical_conditions">Medical Conditions</label>
-          <textarea id="medical_conditions" name="medical_conditions" rows="3" placeholder="Describe any medical conditions"></textarea>
-        </div>
-        
-        <div class="form-group">
-          <label for="allergies">Allergies</label>
-          <textarea id="allergies" name="allergies" rows="2" placeholder="List any allergies"></textarea>
-        </div>
-      </div>
-      
-      <div>
-        <div class="form-group">
-          <label for="medications">Current Medications</label>
-          <textarea id="medications" name="medications" rows="2"></textarea>
-        </div>
-        
-        <div class="form-group">
-          <label for="blood_type">Blood Type</label>
-          <input type="text" id="blood_type" name="blood_type" placeholder="e.g., O+">
-        </div>
-      </div>
-    </div>
-    
-    <h3>Emergency Contact</h3>
-    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px; margin-top: 20px;">
-      <div>
-        <div class="form-group">
-          <label for="emergency_contact_name">Emergency Contact Name</label>
-          <input type="text" id="emergency_contact_name" name="emergency_contact_name">
-        </div>
-        
-        <div class="form-group">
-          <label for="emergency_contact_relation">Relationship</label>
-          <input type="text" id="emergency_contact_relation" name="emergency_contact_relation" placeholder="e.g., Father, Mother">
-        </div>
-      </div>
-      
-      <div>
-        <div class="form-group">
-          <label for="emergency_contact_phone">Emergency Phone</label>
-          <input type="tel" id="emergency_contact_phone" name="emergency_contact_phone">
-        </div>
-        
-        <div class="form-group">
-          <label for="emergency_contact_alt_phone">Alternate Phone</label>
-          <input type="tel" id="emergency_contact_alt_phone" name="emergency_contact_alt_phone">
-        </div>
-      </div>
-    </div>
-    
-    <div style="text-align: center; margin-top: 20px;">
-      <button type="submit" class="button">Add Student</button>
-      <button type="reset" class="button secondary">Clear</button>
-    </div>
-  </form>
-</div>
-{% endblock %}''',
+  .loading-spinner {
+    width: 50px;
+    height: 50px;
+    border: 5px solid rgba(255, 255, 255, 0.3);
+    border-radius: 50%;
+    border-top-color: #fff;
+    animation: spin 1s linear infinite;
+  }
 
-    'edit_student.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Edit Student</h1>
+  @keyframes spin {
+    to { transform: rotate(360deg); }
+  }
 
-<div class="card">
-  <form method="post">
-    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
-      <div>
-        <div class="form-group">
-          <label for="admission_number">Admission Number</label>
-          <input type="text" id="admission_number" name="admission_number" value="{{ student.admission_number }}" readonly>
-        </div>
-        
-        <div class="form-group">
-          <label for="name">Full Name *</label>
-          <input type="text" id="name" name="name" value="{{ student.name }}" required>
-        </div>
-        
-        <div class="form-group">
-          <label for="age">Age</label>
-          <input type="number" id="age" name="age" min="1" max="30" value="{{ student.age or '' }}">
-        </div>
-        
-        <div class="form-group">
-          <label for="class">Class *</label>
-          <select id="class" name="class" required>
-            <option value="">Select Class</option>
-            <option value="Form 1" {% if student.class == 'Form 1' %}selected{% endif %}>Form 1</option>
-            <option value="Form 2" {% if student.class == 'Form 2' %}selected{% endif %}>Form 2</option>
-            <option value="Form 3" {% if student.class == 'Form 3' %}selected{% endif %}>Form 3</option>
-            <option value="Form 4" {% if student.class == 'Form 4' %}selected{% endif %}>Form 4</option>
-            <option value="Form 5" {% if student.class == 'Form 5' %}selected{% endif %}>Form 5</option>
-            <option value="Form 6" {% if student.class == 'Form 6' %}selected{% endif %}>Form 6</option>
-          </select>
-        </div>
-      </div>
-      
-      <div>
-        <div class="form-group">
-          <label for="guardian_name">Guardian Name</label>
-          <input type="text" id="guardian_name" name="guardian_name" value="{{ student.guardian_name or '' }}">
-        </div>
-        
-        <div class="form-group">
-          <label for="guardian_contacts">Guardian Contacts</label>
-          <input type="text" id="guardian_contacts" name="guardian_contacts" value="{{ student.guardian_contacts or '' }}" placeholder="Phone numbers">
-        </div>
-        
-        <div class="form-group">
-          <label for="guardian_email">Guardian Email</label>
-          <input type="email" id="guardian_email" name="guardian_email" value="{{ student.guardian_email or '' }}">
-        </div>
-        
-        <div class="form-group">
-          <label for="address">Address</label>
-          <textarea id="address" name="address" rows="3">{{ student.address or '' }}</textarea>
-        </div>
-      </div>
-    </div>
-    
-    <h3>Medical Information</h3>
-    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px; margin-top: 20px;">
-      <div>
-        <div class="form-group">
-          <label for="has_medical_condition">
-            <input type="checkbox" id="has_medical_condition" name="has_medical_condition" {% if student.has_medical_condition %}checked{% endif %}>
-            Has Special Medical Condition
-          </label>
-        </div>
-        
-        <div class="form-group">
-          <label for="medical_conditions">Medical Conditions</label>
-          <textarea id="medical_conditions" name="medical_conditions" rows="3">{{ student.medical_conditions or '' }}</textarea>
-        </div>
-        
-        <div class="form-group">
-          <label for="allergies">Allergies</label>
-          <textarea id="allergies" name="allergies" rows="2">{{ student.allergies or '' }}</textarea>
-        </div>
-      </div>
-      
-      <div>
-        <div class="form-group">
-          <label for="medications">Current Medications</label>
-          <textarea id="medications" name="medications" rows="2">{{ student.medications or '' }}</textarea>
-        </div>
-        
-        <div class="form-group">
-          <label for="blood_type">Blood Type</label>
-          <input type="text" id="blood_type" name="blood_type" value="{{ student.blood_type or '' }}">
-        </div>
-      </div>
-    </div>
-    
-    <h3>Emergency Contact</h3>
-    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px; margin-top: 20px;">
-      <div>
-        <div class="form-group">
-          <label for="emergency_contact_name">Emergency Contact Name</label>
-          <input type="text" id="emergency_contact_name" name="emergency_contact_name" value="{{ student.emergency_contact_name or '' }}">
-        </div>
-        
-        <div class="form-group">
-          <label for="emergency_contact_relation">Relationship</label>
-          <input type="text" id="emergency_contact_relation" name="emergency_contact_relation" value="{{ student.emergency_contact_relation or '' }}">
-        </div>
-      </div>
-      
-      <div>
-        <div class="form-group">
-          <label for="emergency_contact_phone">Emergency Phone</label>
-          <input type="tel" id="emergency_contact_phone" name="emergency_contact_phone" value="{{ student.emergency_contact_phone or '' }}">
-        </div>
-        
-        <div class="form-group">
-          <label for="emergency_contact_alt_phone">Alternate Phone</label>
-          <input type="tel" id="emergency_contact_alt_phone" name="emergency_contact_alt_phone" value="{{ student.emergency_contact_alt_phone or '' }}">
-        </div>
-      </div>
-    </div>
-    
-    <div style="text-align: center; margin-top: 20px;">
-      <button type="submit" class="button">Update Student</button>
-      <a href="{{ url_for('students') }}" class="button secondary">Cancel</a>
-    </div>
-  </form>
-</div>
-{% endblock %}''',
+  .loading-text {
+    color: white;
+    margin-top: 10px;
+    font-size: 16px;
+    font-weight: 500;
+  }
 
-    'medical_info.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Medical Information - {{ student.name }}</h1>
+  /* Chart Styles */
+  .chart-container {
+    background: white;
+    padding: 20px;
+    border-radius: 12px;
+    box-shadow: var(--shadow-md);
+    margin: 20px 0;
+  }
 
-<div class="card">
-  <h3>Basic Information</h3>
-  <table>
-    <tr>
-      <th>Admission Number:</th>
-      <td>{{ student.admission_number }}</td>
-    </tr>
-    <tr>
-      <th>Name:</th>
-      <td>{{ student.name }}</td>
-    </tr>
-    <tr>
-      <th>Class:</th>
-      <td>{{ student.class }}</td>
-    </tr>
-    <tr>
-      <th>Age:</th>
-      <td>{{ student.age or 'N/A' }}</td>
-    </tr>
-  </table>
-</div>
+  .chart-title {
+    text-align: center;
+    margin-bottom: 20px;
+    color: var(--dark-color);
+  }
 
-<div class="card">
-  <h3>Medical Status</h3>
-  <div class="medical-alert {% if student.has_medical_condition %}danger{% else %}info{% endif %}">
-    <i class="fas fa-heartbeat"></i>
-    <strong>Medical Condition:</strong>
-    {% if student.has_medical_condition %}
-    Has Special Medical Condition
-    {% else %}
-    No Special Medical Conditions
-    {% endif %}
-  </div>
-  
-  {% if student.medical_conditions %}
-  <div style="margin-top: 15px;">
-    <h4>Medical Conditions</h4>
-    <p>{{ student.medical_conditions }}</p>
-  </div>
-  {% endif %}
-  
-  {% if student.allergies %}
-  <div style="margin-top: 15px;">
-    <h4>Allergies</h4>
-    <p>{{ student.allergies }}</p>
-  </div>
-  {% endif %}
-  
-  {% if student.medications %}
-  <div style="margin-top: 15px;">
-    <h4>Current Medications</h4>
-    <p>{{ student.medications }}</p>
-  </div>
-  {% endif %}
-  
-  {% if student.blood_type %}
-  <div style="margin-top: 15px;">
-    <h4>Blood Type</h4>
-    <p>{{ student.blood_type }}</p>
-  </div>
-  {% endif %}
-</div>
+  .chart-img {
+    width: 100%;
+    max-width: 800px;
+    height: auto;
+    display: block;
+    margin: 0 auto;
+    border-radius: 8px;
+  }
+
+  .chart-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(350px, 1fr));
+    gap: 20px;
+    margin: 20px 0;
+  }
+
+  /* School Logo Styles */
+  .logo-container {
+    text-align: center;
+    margin: 20px 0;
+  }
+
+  .school-logo {
+    max-width: 200px;
+    max-height: 100px;
+    object-fit: contain;
+  }
+
+  .logo-preview {
+    border: 2px dashed var(--gray-light);
+    padding: 20px;
+    border-radius: 8px;
+    margin: 15px 0;
+    text-align: center;
+  }
+
+  .grading-system-table {
+    width: 100%;
+    margin: 20px 0;
+  }
 
-<div class="card">
-  <h3>Emergency Contact</h3>
-  {% if student.emergency_contact_name %}
-  <table>
-    <tr>
-      <th>Name:</th>
-      <td>{{ student.emergency_contact_name }}</td>
-    </tr>
-    <tr>
-      <th>Relationship:</th>
-      <td>{{ student.emergency_contact_relation }}</td>
-    </tr>
-    <tr>
-      <th>Phone:</th>
-      <td>{{ student.emergency_contact_phone }}</td>
-    </tr>
-    {% if student.emergency_contact_alt_phone %}
-    <tr>
-      <th>Alternate Phone:</th>
-      <td>{{ student.emergency_contact_alt_phone }}</td>
-    </tr>
-    {% endif %}
-  </table>
-  {% else %}
-  <p>No emergency contact information available.</p>
-  {% endif %}
-</div>
+  .grading-system-table th {
+    background: var(--primary-color);
+    color: white;
+  }
 
-<div class="action-buttons">
-  <a href="{{ url_for('edit_student', id=student.id) }}" class="button">Edit Student</a>
-  <a href="{{ url_for('students') }}" class="button secondary">Back to Students</a>
-</div>
-{% endblock %}''',
+  .grade-color-box {
+    width: 20px;
+    height: 20px;
+    display: inline-block;
+    margin-right: 10px;
+    border-radius: 4px;
+    vertical-align: middle;
+  }
 
-    'teachers.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Teachers</h1>
+  .grade-A-bg { background-color: #22c55e; }
+  .grade-B-bg { background-color: #2563eb; }
+  .grade-C-bg { background-color: #f59e0b; }
+  .grade-D-bg { background-color: #f97316; }
+  .grade-F-bg { background-color: #ef4444; }
 
-<div class="action-buttons">
-  <a href="{{ url_for('add_teacher') }}" class="button">Add New Teacher</a>
-</div>
+  .performance-metrics {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+    gap: 15px;
+    margin: 20px 0;
+  }
 
-<table id="teachersTable">
-  <thead>
-    <tr>
-      <th>ID</th>
-      <th>Name</th>
-      <th>Email</th>
-      <th>Phone</th>
-      <th>Qualification</th>
-      <th>Actions</th>
-    </tr>
-  </thead>
-  <tbody>
-    {% for teacher in teachers %}
-    <tr>
-      <td>{{ teacher.id }}</td>
-      <td>{{ teacher.name }}</td>
-      <td>{{ teacher.email or 'N/A' }}</td>
-      <td>{{ teacher.phone or 'N/A' }}</td>
-      <td>{{ teacher.qualification or 'N/A' }}</td>
-      <td>
-        <a href="{{ url_for('edit_teacher', id=teacher.id) }}" class="button" style="padding: 5px 10px; font-size: 12px;">Edit</a>
-        <a href="{{ url_for('delete_teacher', id=teacher.id) }}" class="button danger" style="padding: 5px 10px; font-size: 12px;" onclick="return confirmDelete('Delete this teacher?')">Delete</a>
-      </td>
-    </tr>
-    {% endfor %}
-  </tbody>
-</table>
-{% endblock %}''',
+  .metric-card {
+    background: white;
+    padding: 20px;
+    border-radius: 8px;
+    box-shadow: var(--shadow-sm);
+    text-align: center;
+  }
 
-    'add_teacher.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Add New Teacher</h1>
+  .metric-value {
+    font-size: 24px;
+    font-weight: bold;
+    color: var(--primary-color);
+  }
 
-<div class="card">
-  <form method="post">
-    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
-      <div>
-        <div class="form-group">
-          <label for="name">Full Name *</label>
-          <input type="text" id="name" name="name" required>
-        </div>
-        
-        <div class="form-group">
-          <label for="email">Email</label>
-          <input type="email" id="email" name="email">
-        </div>
-      </div>
-      
-      <div>
-        <div class="form-group">
-          <label for="phone">Phone</label>
-          <input type="tel" id="phone" name="phone">
-        </div>
-        
-        <div class="form-group">
-          <label for="qualification">Qualification</label>
-          <input type="text" id="qualification" name="qualification" placeholder="e.g., B.Ed, M.Ed">
-        </div>
-      </div>
-    </div>
-    
-    <div style="text-align: center; margin-top: 20px;">
-      <button type="submit" class="button">Add Teacher</button>
-      <button type="reset" class="button secondary">Clear</button>
-    </div>
-  </form>
-</div>
-{% endblock %}''',
+  .metric-label {
+    color: #64748b;
+    font-size: 14px;
+    margin-top: 5px;
+  }
 
-    'edit_teacher.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Edit Teacher</h1>
+  .subject-performance {
+    display: flex;
+    align-items: center;
+    gap: 15px;
+    margin: 10px 0;
+    padding: 10px;
+    background: #f8fafc;
+    border-radius: 6px;
+  }
 
-<div class="card">
-  <form method="post">
-    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
-      <div>
-        <div class="form-group">
-          <label for="name">Full Name *</label>
-          <input type="text" id="name" name="name" value="{{ teacher.name }}" required>
-        </div>
-        
-        <div class="form-group">
-          <label for="email">Email</label>
-          <input type="email" id="email" name="email" value="{{ teacher.email or '' }}">
-        </div>
-      </div>
-      
-      <div>
-        <div class="form-group">
-          <label for="phone">Phone</label>
-          <input type="tel" id="phone" name="phone" value="{{ teacher.phone or '' }}">
-        </div>
-        
-        <div class="form-group">
-          <label for="qualification">Qualification</label>
-          <input type="text" id="qualification" name="qualification" value="{{ teacher.qualification or '' }}">
-        </div>
-      </div>
-    </div>
-    
-    <div style="text-align: center; margin-top: 20px;">
-      <button type="submit" class="button">Update Teacher</button>
-      <a href="{{ url_for('teachers') }}" class="button secondary">Cancel</a>
-    </div>
-  </form>
-</div>
-{% endblock %}''',
+  .subject-name {
+    min-width: 150px;
+    font-weight: 600;
+  }
 
-    'classes.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Classes</h1>
+  .score-bar {
+    flex: 1;
+    height: 20px;
+    background: #e2e8f0;
+    border-radius: 10px;
+    overflow: hidden;
+    position: relative;
+  }
 
-<div class="action-buttons">
-  <a href="{{ url_for('add_class') }}" class="button">Add New Class</a>
-</div>
+  .score-fill {
+    height: 100%;
+    border-radius: 10px;
+    transition: width 0.5s ease;
+  }
+
+  .score-text {
+    position: absolute;
+    right: 10px;
+    top: 0;
+    line-height: 20px;
+    font-size: 12px;
+    font-weight: 600;
+  }
+
+  /* Login Styles */
+  .login-container {
+    display: flex;
+    justify-content: center;
+    align-items: center;
+    min-height: 100vh;
+    background: linear-gradient(135deg, #4361ee, #3a0ca3);
+  }
+
+  .login-card {
+    background: white;
+    padding: 40px;
+    border-radius: 16px;
+    box-shadow: var(--shadow-lg);
+    width: 100%;
+    max-width: 400px;
+    margin: 20px;
+  }
+
+  .login-card h2 {
+    text-align: center;
+    margin-bottom: 30px;
+    color: var(--dark-color);
+  }
+
+  .login-logo {
+    text-align: center;
+    margin-bottom: 30px;
+  }
+
+  .login-logo img {
+    max-width: 150px;
+  }
 
-<table id="classesTable">
-  <thead>
-    <tr>
-      <th>ID</th>
-      <th>Class Name</th>
-      <th>Teacher</th>
-      <th>Students</th>
-      <th>Description</th>
-      <th>Actions</th>
-    </tr>
-  </thead>
-  <tbody>
-    {% for cls in classes %}
-    <tr>
-      <td>{{ cls.id }}</td>
-      <td>{{ cls.name }}</td>
-      <td>{{ cls.teacher_name or 'Not Assigned' }}</td>
-      <td>{{ cls.student_count }}</td>
-      <td>{{ cls.description or 'N/A' }}</td>
-      <td>
-        <a href="{{ url_for('edit_class', id=cls.id) }}" class="button" style="padding: 5px 10px; font-size: 12px;">Edit</a>
-        <a href="{{ url_for('delete_class', id=cls.id) }}" class="button danger" style="padding: 5px 10px; font-size: 12px;" onclick="return confirmDelete('Delete this class?')">Delete</a>
-      </td>
-    </tr>
-    {% endfor %}
-  </tbody>
-</table>
-{% endblock %}''',
+  .password-toggle {
+    position: relative;
+  }
 
-    'add_class.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Add New Class</h1>
+  .password-toggle input {
+    padding-right: 40px;
+  }
 
-<div class="card">
-  <form method="post">
-    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
-      <div>
-        <div class="form-group">
-          <label for="name">Class Name *</label>
-          <input type="text" id="name" name="name" required placeholder="e.g., Form 1A">
-        </div>
-        
-        <div class="form-group">
-          <label for="teacher_id">Class Teacher</label>
-          <select id="teacher_id" name="teacher_id">
-            <option value="">Select Teacher</option>
-            {% for teacher in teachers %}
-            <option value="{{ teacher.id }}">{{ teacher.name }}</option>
-            {% endfor %}
-          </select>
-        </div>
-      </div>
-      
-      <div>
-        <div class="form-group">
-          <label for="description">Description</label>
-          <textarea id="description" name="description" rows="4" placeholder="Class description..."></textarea>
-        </div>
-      </div>
-    </div>
-    
-    <div style="text-align: center; margin-top: 20px;">
-      <button type="submit" class="button">Add Class</button>
-      <button type="reset" class="button secondary">Clear</button>
-    </div>
-  </form>
-</div>
-{% endblock %}''',
+  .password-toggle .toggle-icon {
+    position: absolute;
+    right: 15px;
+    top: 50%;
+    transform: translateY(-50%);
+    cursor: pointer;
+    color: var(--gray-medium);
+  }
 
-    'edit_class.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Edit Class</h1>
+  /* User info in sidebar */
+  .user-info {
+    padding: 15px;
+    text-align: center;
+    border-bottom: 1px solid rgba(255,255,255,0.1);
+    margin-bottom: 10px;
+  }
 
-<div class="card">
-  <form method="post">
-    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
-      <div>
-        <div class="form-group">
-          <label for="name">Class Name *</label>
-          <input type="text" id="name" name="name" value="{{ cls.name }}" required>
-        </div>
-        
-        <div class="form-group">
-          <label for="teacher_id">Class Teacher</label>
-          <select id="teacher_id" name="teacher_id">
-            <option value="">Select Teacher</option>
-            {% for teacher in teachers %}
-            <option value="{{ teacher.id }}" {% if cls.teacher_id == teacher.id %}selected{% endif %}>{{ teacher.name }}</option>
-            {% endfor %}
-          </select>
-        </div>
-      </div>
-      
-      <div>
-        <div class="form-group">
-          <label for="description">Description</label>
-          <textarea id="description" name="description" rows="4">{{ cls.description or '' }}</textarea>
-        </div>
-      </div>
-    </div>
-    
-    <div style="text-align: center; margin-top: 20px;">
-      <button type="submit" class="button">Update Class</button>
-      <a href="{{ url_for('classes') }}" class="button secondary">Cancel</a>
-    </div>
-  </form>
-</div>
-{% endblock %}''',
+  .user-avatar {
+    width: 50px;
+    height: 50px;
+    border-radius: 50%;
+    background: var(--accent-color);
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    margin: 0 auto 10px;
+    color: white;
+    font-size: 20px;
+  }
 
-    'fees.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Fee Management</h1>
+  .user-name {
+    color: white;
+    font-weight: 600;
+    margin-bottom: 5px;
+  }
 
-<div class="tabs">
-  <button class="tab active" onclick="toggleTabs('recentPayments')">Recent Payments</button>
-  <button class="tab" onclick="toggleTabs('feeStructures')">Fee Structures</button>
-  <button class="tab" onclick="toggleTabs('addPayment')">Add Payment</button>
-  <button class="tab" onclick="toggleTabs('addStructure')">Add Structure</button>
-</div>
+  .user-role {
+    color: rgba(255,255,255,0.8);
+    font-size: 12px;
+    background: rgba(255,255,255,0.1);
+    padding: 3px 8px;
+    border-radius: 10px;
+    display: inline-block;
+  }
 
-<div id="recentPayments" class="tab-content active">
-  <div class="card">
-    <h3>Recent Fee Payments</h3>
-    {% if recent_payments %}
-    <table>
-      <thead>
-        <tr>
-          <th>Receipt No</th>
-          <th>Student</th>
-          <th>Class</th>
-          <th>Term</th>
-          <th>Year</th>
-          <th>Amount Paid</th>
-          <th>Balance</th>
-          <th>Date</th>
-          <th>Actions</th>
-        </tr>
-      </thead>
-      <tbody>
-        {% for payment in recent_payments %}
-        <tr>
-          <td>{{ payment.receipt_number }}</td>
-          <td>{{ payment.student_name }}</td>
-          <td>{{ payment.class_name }}</td>
-          <td>{{ payment.term }}</td>
-          <td>{{ payment.year }}</td>
-          <td class="paid">{{ payment.amount_paid }}</td>
-          <td class="{% if payment.balance > 0 %}balance{% else %}paid{% endif %}">{{ payment.balance }}</td>
-          <td>{{ payment.date_paid }}</td>
-          <td>
-            <a href="{{ url_for('view_receipt', id=payment.id) }}" class="button" style="padding: 5px 10px; font-size: 12px;">Receipt</a>
-          </td>
-        </tr>
-        {% endfor %}
-      </tbody>
-    </table>
-    {% else %}
-    <p>No recent payments found.</p>
-    {% endif %}
-  </div>
-</div>
+  /* Medical alert styles */
+  .medical-alert {
+    background-color: #fef3c7;
+    border-left: 4px solid #f59e0b;
+    padding: 12px 16px;
+    margin: 10px 0;
+    border-radius: 4px;
+  }
 
-<div id="feeStructures" class="tab-content">
-  <div class="card">
-    <h3>Fee Structures</h3>
-    {% if fee_structures %}
-    <table>
-      <thead>
-        <tr>
-          <th>Class</th>
-          <th>Term</th>
-          <th>Year</th>
-          <th>Amount</th>
-          <th>Due Date</th>
-          <th>Description</th>
-          <th>Actions</th>
-        </tr>
-      </thead>
-      <tbody>
-        {% for fs in fee_structures %}
-        <tr>
-          <td>{{ fs.class }}</td>
-          <td>{{ fs.term }}</td>
-          <td>{{ fs.year }}</td>
-          <td>{{ fs.amount }}</td>
-          <td>{{ fs.due_date or 'N/A' }}</td>
-          <td>{{ fs.description or 'N/A' }}</td>
-          <td>
-            <a href="{{ url_for('edit_fee_structure', id=fs.id) }}" class="button" style="padding: 5px 10px; font-size: 12px;">Edit</a>
-            <a href="{{ url_for('delete_fee_structure', id=fs.id) }}" class="button danger" style="padding: 5px 10px; font-size: 12px;" onclick="return confirmDelete('Delete this fee structure?')">Delete</a>
-          </td>
-        </tr>
-        {% endfor %}
-      </tbody>
-    </table>
-    {% else %}
-    <p>No fee structures found.</p>
-    {% endif %}
-  </div>
-</div>
+  .medical-alert.danger {
+    background-color: #fecaca;
+    border-left-color: #ef4444;
+  }
+
+  .medical-alert.info {
+    background-color: #dbeafe;
+    border-left-color: #3b82f6;
+  }
 
-<div id="addPayment" class="tab-content">
-  <div class="card">
-    <h3>Add Fee Payment</h3>
-    <form method="post" action="{{ url_for('add_fee_payment') }}">
-      <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
-        <div>
-          <div class="form-group">
-            <label for="student_id">Student *</label>
-            <select id="student_id" name="student_id" required>
-              <option value="">Select Student</option>
-              {% for student in students %}
-              <option value="{{ student.id }}">{{ student.name }} ({{ student.admission_number }}) - {{ student.class }}</option>
-              {% endfor %}
-            </select>
-          </div>
-          
-          <div class="form-group">
-            <label for="fee_structure_id">Fee Structure *</label>
-            <select id="fee_structure_id" name="fee_structure_id" required>
-              <option value="">Select Fee Structure</option>
-              {% for fs in fee_structures %}
-              <option value="{{ fs.id }}">{{ fs.class }} - {{ fs.term }} {{ fs.year }} - {{ fs.amount }}</option>
-              {% endfor %}
-            </select>
-          </div>
-        </div>
-        
-        <div>
-          <div class="form-group">
-            <label for="amount_paid">Amount Paid *</label>
-            <input type="number" id="amount_paid" name="amount_paid" step="0.01" min="0" required>
-          </div>
-          
-          <div class="form-group">
-            <label for="payment_method">Payment Method</label>
-            <select id="payment_method" name="payment_method">
-              <option value="Cash">Cash</option>
-              <option value="Bank Transfer">Bank Transfer</option>
-              <option value="Mobile Money">Mobile Money</option>
-              <option value="Cheque">Cheque</option>
-              <option value="Other">Other</option>
-            </select>
-          </div>
-          
-          <div class="form-group">
-            <label for="remarks">Remarks</label>
-            <input type="text" id="remarks" name="remarks" placeholder="Payment remarks">
-          </div>
-        </div>
-      </div>
-      
-      <div style="text-align: center; margin-top: 20px;">
-        <button type="submit" class="button">Record Payment</button>
-        <button type="reset" class="button secondary">Clear</button>
-      </div>
-    </form>
-  </div>
-</div>
+  .medical-badge {
+    font-size: 11px;
+    padding: 2px 8px;
+    border-radius: 12px;
+    font-weight: 600;
+    margin-left: 5px;
+  }
 
-<div id="addStructure" class="tab-content">
-  <div class="card">
-    <h3>Add Fee Structure</h3>
-    <form method="post" action="{{ url_for('add_fee_structure') }}">
-      <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
-        <div>
-          <div class="form-group">
-            <label for="class">Class *</label>
-            <select id="class" name="class" required>
-              <option value="">Select Class</option>
-              <option value="Form 1">Form 1</option>
-              <option value="Form 2">Form 2</option>
-              <option value="Form 3">Form 3</option>
-              <option value="Form 4">Form 4</option>
-              <option value="Form 5">Form 5</option>
-              <option value="Form 6">Form 6</option>
-            </select>
-          </div>
-          
-          <div class="form-group">
-            <label for="term">Term *</label>
-            <select id="term" name="term" required>
-              <option value="">Select Term</option>
-              <option value="Term 1">Term 1</option>
-              <option value="Term 2">Term 2</option>
-              <option value="Term 3">Term 3</option>
-            </select>
-          </div>
-        </div>
-        
-        <div>
-          <div class="form-group">
-            <label for="year">Year *</label>
-            <input type="number" id="year" name="year" min="2000" max="2100" value="{{ current_year }}" required>
-          </div>
-          
-          <div class="form-group">
-            <label for="amount">Amount *</label>
-            <input type="number" id="amount" name="amount" step="0.01" min="0" required>
-          </div>
-        </div>
-      </div>
-      
-      <div class="form-group">
-        <label for="description">Description</label>
-        <input type="text" id="description" name="description" placeholder="Fee structure description">
-      </div>
-      
-      <div class="form-group">
-        <label for="due_date">Due Date</label>
-        <input type="date" id="due_date" name="due_date">
-      </div>
-      
-      <div style="text-align: center; margin-top: 20px;">
-        <button type="submit" class="button">Add Fee Structure</button>
-        <button type="reset" class="button secondary">Clear</button>
-      </div>
-    </form>
-  </div>
-</div>
-{% endblock %}''',
+  .medical-badge.condition {
+    background-color: #fef3c7;
+    color: #92400e;
+  }
 
-    'attendance.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Attendance Management</h1>
+  .medical-badge.emergency {
+    background-color: #fee2e2;
+    color: #991b1b;
+  }
 
-<div class="filter-form">
-  <form method="get">
-    <div style="display: flex; flex-wrap: wrap; gap: 15px; align-items: center;">
-      <div>
-        <label for="class_filter">Filter by Class:</label>
-        <select id="class_filter" name="class_filter" onchange="this.form.submit()">
-          <option value="">All Classes</option>
-          {% for class_name in class_list %}
-          <option value="{{ class_name }}" {% if current_class == class_name %}selected{% endif %}>{{ class_name }}</option>
-          {% endfor %}
-        </select>
-      </div>
-      
-      <div>
-        <label for="date">Select Date:</label>
-        <input type="date" id="date" name="date" value="{{ selected_date }}" onchange="this.form.submit()">
-      </div>
-      
-      <div>
-        <button type="submit" class="button">Apply Filters</button>
-        <a href="{{ url_for('attendance') }}" class="button secondary">Reset</a>
-      </div>
-    </div>
-  </form>
-</div>
+  .medical-badge.allergy {
+    background-color: #f0f9ff;
+    color: #0369a1;
+  }
 
-{% if today_stats %}
-<div class="dashboard-stats">
-  <div class="stat-card">
-    <h3>Present Today</h3>
-    <div class="value">{{ today_stats.present or 0 }}</div>
-  </div>
-  <div class="stat-card">
-    <h3>Absent Today</h3>
-    <div class="value">{{ today_stats.absent or 0 }}</div>
-  </div>
-  <div class="stat-card">
-    <h3>Late Today</h3>
-    <div class="value">{{ today_stats.late or 0 }}</div>
-  </div>
-  <div class="stat-card">
-    <h3>Excused Today</h3>
-    <div class="value">{{ today_stats.excused or 0 }}</div>
-  </div>
-</div>
-{% endif %}
+  /* Login button in sidebar */
+  .logout-btn {
+    margin-top: auto;
+    margin-bottom: 20px;
+    padding: 15px 20px;
+    background: rgba(255, 255, 255, 0.1);
+    border: none;
+    color: white;
+    cursor: pointer;
+    font-size: 14px;
+    text-align: left;
+    transition: all 0.3s;
+    border-left: 4px solid transparent;
+  }
 
-<div class="card">
-  <h3>Mark Attendance for {{ selected_date }}</h3>
-  <form method="post" action="{{ url_for('save_attendance') }}">
-    <input type="hidden" name="date" value="{{ selected_date }}">
-    {% if current_class %}
-    <input type="hidden" name="class_filter" value="{{ current_class }}">
-    {% endif %}
-    
-    <table>
-      <thead>
-        <tr>
-          <th>Admission No</th>
-          <th>Name</th>
-          <th>Class</th>
-          <th>Last 7 Days</th>
-          <th>Status</th>
-          <th>Remarks</th>
-        </tr>
-      </thead>
-      <tbody>
-        {% for student in students %}
-        <tr>
-          <td>{{ student.admission_number }}</td>
-          <td>{{ student.name }}</td>
-          <td>{{ student.class }}</td>
-          <td>
-            {% if student.attendance_summary %}
-            P:{{ student.attendance_summary.present }} 
-            A:{{ student.attendance_summary.absent }}
-            L:{{ student.attendance_summary.late }}
-            {% else %}
-            No data
-            {% endif %}
-          </td>
-          <td>
-            <select name="status_{{ student.id }}">
-              <option value="Present" {% if student.status == 'Present' %}selected{% endif %}>Present</option>
-              <option value="Absent" {% if student.status == 'Absent' %}selected{% endif %}>Absent</option>
-              <option value="Late" {% if student.status == 'Late' %}selected{% endif %}>Late</option>
-              <option value="Excused" {% if student.status == 'Excused' %}selected{% endif %}>Excused</option>
-            </select>
-          </td>
-          <td>
-            <input type="text" name="remarks_{{ student.id }}" placeholder="Remarks" value="">
-          </td>
-        </tr>
-        {% endfor %}
-      </tbody>
-    </table>
-    
-    <div style="text-align: center; margin-top: 20px;">
-      <button type="submit" class="button">Save Attendance</button>
-    </div>
-  </form>
-</div>
-{% endblock %}''',
+  .logout-btn:hover {
+    background: rgba(255, 255, 255, 0.2);
+    border-left: 4px solid var(--danger-color);
+  }
 
-    'grades.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Grades Management</h1>
+  .logout-btn i {
+    margin-right: 12px;
+  }
 
-<div class="action-buttons">
-  <a href="{{ url_for('add_grade') }}" class="button">Add New Grade</a>
-  <a href="{{ url_for('export_grades') }}" class="button secondary">Export Grades</a>
-</div>
+  /* Profile dropdown */
+  .profile-dropdown {
+    position: relative;
+  }
 
-<div class="card">
-  <h3>Recent Grades</h3>
-  {% if recent_grades %}
-  <table>
-    <thead>
-      <tr>
-        <th>Student</th>
-        <th>Admission No</th>
-        <th>Class</th>
-        <th>Subject</th>
-        <th>Term</th>
-        <th>Year</th>
-        <th>Score</th>
-        <th>Grade</th>
-        <th>Remarks</th>
-        <th>Date</th>
-        <th>Actions</th>
-      </tr>
-    </thead>
-    <tbody>
-      {% for grade in recent_grades %}
-      <tr>
-        <td>{{ grade.student_name }}</td>
-        <td>{{ grade.admission_number }}</td>
-        <td>{{ grade.class }}</td>
-        <td>{{ grade.subject }}</td>
-        <td>{{ grade.term }}</td>
-        <td>{{ grade.year }}</td>
-        <td>{{ grade.score }}</td>
-        <td class="grade-{{ grade.grade }}">{{ grade.grade }}</td>
-        <td>{{ grade.remarks or '-' }}</td>
-        <td>{{ grade.created_at[:10] }}</td>
-        <td>
-          <a href="{{ url_for('edit_grade', id=grade.id) }}" class="button" style="padding: 5px 10px; font-size: 12px;">Edit</a>
-          <a href="{{ url_for('delete_grade', id=grade.id) }}" class="button danger" style="padding: 5px 10px; font-size: 12px;" onclick="return confirmDelete('Delete this grade?')">Delete</a>
-        </td>
-      </tr>
-      {% endfor %}
-    </tbody>
-  </table>
-  {% else %}
-  <p>No grades recorded yet.</p>
-  {% endif %}
-</div>
-{% endblock %}''',
+  .profile-menu {
+    position: absolute;
+    top: 100%;
+    left: 0;
+    background: white;
+    box-shadow: var(--shadow-lg);
+    border-radius: 8px;
+    min-width: 200px;
+    z-index: 1000;
+    display: none;
+  }
 
-    'add_grade.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Add New Grade</h1>
+  .profile-dropdown:hover .profile-menu {
+    display: block;
+  }
 
-<div class="card">
-  <form method="post">
-    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
-      <div>
-        <div class="form-group">
-          <label for="student_id">Student *</label>
-          <select id="student_id" name="student_id" required>
-            <option value="">Select Student</option>
-            {% for student in students %}
-            <option value="{{ student.id }}">{{ student.name }} ({{ student.admission_number }}) - {{ student.class }}</option>
-            {% endfor %}
-          </select>
-        </div>
-        
-        <div class="form-group">
-          <label for="subject">Subject *</label>
-          <input type="text" id="subject" name="subject" required placeholder="e.g., Mathematics">
-        </div>
-        
-        <div class="form-group">
-          <label for="term">Term *</label>
-          <select id="term" name="term" required>
-            <option value="">Select Term</option>
-            <option value="Term 1">Term 1</option>
-            <option value="Term 2">Term 2</option>
-            <option value="Term 3">Term 3</option>
-          </select>
-        </div>
-      </div>
-      
-      <div>
-        <div class="form-group">
-          <label for="year">Year *</label>
-          <input type="number" id="year" name="year" min="2000" max="2100" value="{{ current_year }}" required>
-        </div>
-        
-        <div class="form-group">
-          <label for="score">Score *</label>
-          <input type="number" id="score" name="score" min="0" max="100" step="0.01" required placeholder="0-100">
-        </div>
-        
-        <div class="form-group">
-          <label for="remarks">Remarks</label>
-          <input type="text" id="remarks" name="remarks" placeholder="Grade remarks">
-        </div>
-      </div>
-    </div>
-    
-    <div style="text-align: center; margin-top: 20px;">
-      <button type="submit" class="button">Add Grade</button>
-      <button type="reset" class="button secondary">Clear</button>
-    </div>
-  </form>
-</div>
+  .profile-menu a {
+    padding: 12px 16px;
+    color: var(--dark-color);
+    text-decoration: none;
+    display: block;
+    border-bottom: 1px solid var(--gray-light);
+  }
 
-<div class="card">
-  <h3>Grading System</h3>
-  <table class="grading-system-table">
-    <thead>
-      <tr>
-        <th>Grade</th>
-        <th>Score Range</th>
-        <th>Color</th>
-      </tr>
-    </thead>
-    <tbody>
-      <tr>
-        <td class="grade-A">A</td>
-        <td>{{ grading.min_a }} - {{ grading.max_a }}</td>
-        <td><div class="grade-color-box grade-A-bg"></div></td>
-      </tr>
-      <tr>
-        <td class="grade-B">B</td>
-        <td>{{ grading.min_b }} - {{ grading.max_b }}</td>
-        <td><div class="grade-color-box grade-B-bg"></div></td>
-      </tr>
-      <tr>
-        <td class="grade-C">C</td>
-        <td>{{ grading.min_c }} - {{ grading.max_c }}</td>
-        <td><div class="grade-color-box grade-C-bg"></div></td>
-      </tr>
-      <tr>
-        <td class="grade-D">D</td>
-        <td>{{ grading.min_d }} - {{ grading.max_d }}</td>
-        <td><div class="grade-color-box grade-D-bg"></div></td>
-      </tr>
-      <tr>
-        <td class="grade-F">F</td>
-        <td>{{ grading.min_f }} - {{ grading.max_f }}</td>
-        <td><div class="grade-color-box grade-F-bg"></div></td>
-      </tr>
-    </tbody>
-  </table>
-</div>
-{% endblock %}''',
+  .profile-menu a:hover {
+    background: var(--gray-light);
+  }
 
-    'edit_grade.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Edit Grade</h1>
+  .profile-menu a:last-child {
+    border-bottom: none;
+  }''',
 
-<div class="card">
-  <form method="post">
-    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
-      <div>
-        <div class="form-group">
-          <label for="student_id">Student</label>
-          <input type="text" value="{{ grade.student_name }} ({{ grade.admission_number }}) - {{ grade.class }}" readonly>
-        </div>
-        
-        <div class="form-group">
-          <label for="subject">Subject *</label>
-          <input type="text" id="subject" name="subject" value="{{ grade.subject }}" required>
-        </div>
-        
-        <div class="form-group">
-          <label for="term">Term *</label>
-          <select id="term" name="term" required>
-            <option value="Term 1" {% if grade.term == 'Term 1' %}selected{% endif %}>Term 1</option>
-            <option value="Term 2" {% if grade.term == 'Term 2' %}selected{% endif %}>Term 2</option>
-            <option value="Term 3" {% if grade.term == 'Term 3' %}selected{% endif %}>Term 3</option>
-          </select>
-        </div>
-      </div>
-      
-      <div>
-        <div class="form-group">
-          <label for="year">Year *</label>
-          <input type="number" id="year" name="year" min="2000" max="2100" value="{{ grade.year }}" required>
-        </div>
-        
-        <div class="form-group">
-          <label for="score">Score *</label>
-          <input type="number" id="score" name="score" min="0" max="100" step="0.01" value="{{ grade.score }}" required>
-        </div>
-        
-        <div class="form-group">
-          <label for="remarks">Remarks</label>
-          <input type="text" id="remarks" name="remarks" value="{{ grade.remarks or '' }}">
-        </div>
-      </div>
-    </div>
-    
-    <div style="text-align: center; margin-top: 20px;">
-      <button type="submit" class="button">Update Grade</button>
-      <a href="{{ url_for('grades') }}" class="button secondary">Cancel</a>
-    </div>
-  </form>
-</div>
-{% endblock %}''',
+    'base.js': '''  function confirmDelete(message) {
+    return confirm(message || 'Are you sure you want to delete this?');
+  }
+
+  function toggleTabs(tabName) {
+    document.querySelectorAll('.tab').forEach(tab => tab.classList.remove('active'));
+    document.querySelectorAll('.tab-content').forEach(content => content.classList.remove('active'));
+
+    const tabElement = document.querySelector(`[onclick*="${tabName}"]`);
+    if (tabElement) tabElement.classList.add('active');
+    const contentElement = document.getElementById(tabName);
+    if (contentElement) contentElement.classList.add('active');
+  }
+
+  function filterTable(inputId, tableId) {
+    const input = document.getElementById(inputId);
+    const filter = input.value.toUpperCase();
+    const table = document.getElementById(tableId);
+    const rows = table.getElementsByTagName('tr');
 
-    'timetable.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Timetable Management</h1>
+    for (let i = 1; i < rows.length; i++) {
+      let match = false;
+      const cells = rows[i].getElementsByTagName('td');
+      for (let j = 0; j < cells.length; j++) {
+        const cell = cells[j];
+        if (cell) {
+          if (cell.textContent.toUpperCase().indexOf(filter) > -1) {
+            match = true;
+            break;
+          }
+        }
+      }
+      rows[i].style.display = match ? '' : 'none';
+    }
+  }
 
-<div class="tabs">
-  <button class="tab active" onclick="toggleTabs('viewTimetable')">View Timetable</button>
-  <button class="tab" onclick="toggleTabs('manageTimetable')">Manage Timetable</button>
-  <button class="tab" onclick="toggleTabs('addEntry')">Add Entry</button>
-</div>
+  function printReceipt() {
+    window.print();
+  }
 
-<div id="viewTimetable" class="tab-content active">
-  <div class="timetable-controls">
-    <div style="display: flex; flex-wrap: wrap; gap: 15px; align-items: center;">
-      <div>
-        <label for="class_filter">Class:</label>
-        <select id="class_filter" onchange="filterTimetable()">
-          <option value="">All Classes</option>
-          {% for class_name in all_classes %}
-          <option value="{{ class_name }}" {% if selected_class == class_name %}selected{% endif %}>{{ class_name }}</option>
-          {% endfor %}
-        </select>
-      </div>
-      
-      <div>
-        <label for="teacher_filter">Teacher:</label>
-        <select id="teacher_filter" onchange="filterTimetable()">
-          <option value="">All Teachers</option>
-          {% for teacher in teachers %}
-          <option value="{{ teacher.name }}" {% if selected_teacher == teacher.name %}selected{% endif %}>{{ teacher.name }}</option>
-          {% endfor %}
-        </select>
-      </div>
-      
-      <div>
-        <label for="day_filter">Day:</label>
-        <select id="day_filter" onchange="filterTimetable()">
-          <option value="">All Days</option>
-          <option value="Monday" {% if selected_day == 'Monday' %}selected{% endif %}>Monday</option>
-          <option value="Tuesday" {% if selected_day == 'Tuesday' %}selected{% endif %}>Tuesday</option>
-          <option value="Wednesday" {% if selected_day == 'Wednesday' %}selected{% endif %}>Wednesday</option>
-          <option value="Thursday" {% if selected_day == 'Thursday' %}selected{% endif %}>Thursday</option>
-          <option value="Friday" {% if selected_day == 'Friday' %}selected{% endif %}>Friday</option>
-          <option value="Saturday" {% if selected_day == 'Saturday' %}selected{% endif %}>Saturday</option>
-        </select>
-      </div>
-    </div>
-  </div>
+  function generateColor(subject) {
+    if (!subject) return '#999999';
 
-  <div class="color-legend">
-    {% for subject in subjects %}
-    <div class="color-item">
-      <div class="color-box" style="background-color: {{ generate_color(subject) }};"></div>
-      <span>{{ subject }}</span>
-    </div>
-    {% endfor %}
-  </div>
+    const colorMap = {
+      'mathematics': '#667eea',
+      'english': '#f5576c',
+      'science': '#4facfe',
+      'history': '#43e97b',
+      'geography': '#fee140',
+      'physics': '#30cfd0',
+      'chemistry': '#a8edea',
+      'biology': '#5ee7df',
+      'computer': '#d299c2',
+      'art': '#f6d365',
+      'physical education': '#a1c4fd',
+      'pe': '#a1c4fd',
+      'music': '#fcb69f',
+      'business': '#c2e9fb',
+      'religious': '#fed6e3'
+    };
 
-  {% if timetable_entries %}
-  <div class="timetable-container">
-    <table class="timetable">
-      <thead>
-        <tr>
-          <th>Period</th>
-          <th>Monday</th>
-          <th>Tuesday</th>
-          <th>Wednesday</th>
-          <th>Thursday</th>
-          <th>Friday</th>
-          <th>Saturday</th>
-        </tr>
-      </thead>
-      <tbody>
-        {% for period in range(1, 9) %}
-        <tr>
-          <td class="time-slot">Period {{ period }}</td>
-          {% for day in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'] %}
-          <td>
-            {% set entry = timetable_entries|selectattr('day', 'equalto', day)|selectattr('period', 'equalto', period)|first %}
-            {% if entry %}
-            <div class="period" data-subject="{{ entry.subject }}" style="background: {{ generate_color(entry.subject) }}">
-              <div class="period-details">
-                <div class="subject">{{ entry.subject }}</div>
-                <div class="teacher">{{ entry.teacher_name or 'N/A' }}</div>
-                <div class="room">{{ entry.room or 'N/A' }}</div>
-                {% if entry.description %}
-                <div style="font-size: 10px; margin-top: 5px;">{{ entry.description }}</div>
-                {% endif %}
-              </div>
-            </div>
-            {% else %}
-            <div class="period-empty">Free Period</div>
-            {% endif %}
-          </td>
-          {% endfor %}
-        </tr>
-        {% endfor %}
-      </tbody>
-    </table>
-  </div>
-  {% else %}
-  <div class="card">
-    <p>No timetable entries found for the selected filters.</p>
-  </div>
-  {% endif %}
-</div>
+    subject = subject.toLowerCase().trim();
+    for (const [key, color] of Object.entries(colorMap)) {
+      if (subject.includes(key)) {
+        return color;
+      }
+    }
 
-<div id="manageTimetable" class="tab-content">
-  <div class="card">
-    <h3>All Timetable Entries</h3>
-    {% if all_entries %}
-    <table>
-      <thead>
-        <tr>
-          <th>Class</th>
-          <th>Day</th>
-          <th>Period</th>
-          <th>Subject</th>
-          <th>Teacher</th>
-          <th>Room</th>
-          <th>Actions</th>
-        </tr>
-      </thead>
-      <tbody>
-        {% for entry in all_entries %}
-        <tr>
-          <td>{{ entry.class }}</td>
-          <td>{{ entry.day }}</td>
-          <td>Period {{ entry.period }}</td>
-          <td>{{ entry.subject }}</td>
-          <td>{{ entry.teacher_name or 'N/A' }}</td>
-          <td>{{ entry.room or 'N/A' }}</td>
-          <td>
-            <a href="{{ url_for('edit_timetable_entry', id=entry.id) }}" class="button" style="padding: 5px 10px; font-size: 12px;">Edit</a>
-            <a href="{{ url_for('delete_timetable_entry', id=entry.id) }}" class="button danger" style="padding: 5px 10px; font-size: 12px;" onclick="return confirmDelete('Delete this timetable entry?')">Delete</a>
-          </td>
-        </tr>
-        {% endfor %}
-      </tbody>
-    </table>
-    {% else %}
-    <p>No timetable entries found.</p>
-    {% endif %}
-  </div>
-</div>
+    // Generate consistent color from subject name
+    let hash = 0;
+    for (let i = 0; i < subject.length; i++) {
+      hash = subject.charCodeAt(i) + ((hash << 5) - hash);
+    }
+    const hue = hash % 360;
+    return `hsl(${hue}, 70%, 60%)`;
+  }
 
-<div id="addEntry" class="tab-content">
-  <div class="card">
-    <h3>Add Timetable Entry</h3>
-    <form method="post" action="{{ url_for('add_timetable_entry') }}">
-      <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
-        <div>
-          <div class="form-group">
-            <label for="class">Class *</label>
-            <select id="class" name="class" required>
-              <option value="">Select Class</option>
-              {% for class_name in all_classes %}
-              <option value="{{ class_name }}">{{ class_name }}</option>
-              {% endfor %}
-            </select>
-          </div>
-          
-          <div class="form-group">
-            <label for="day">Day *</label>
-            <select id="day" name="day" required>
-              <option value="">Select Day</option>
-              <option value="Monday">Monday</option>
-              <option value="Tuesday">Tuesday</option>
-              <option value="Wednesday">Wednesday</option>
-              <option value="Thursday">Thursday</option>
-              <option value="Friday">Friday</option>
-              <option value="Saturday">Saturday</option>
-            </select>
-          </div>
-          
-          <div class="form-group">
-            <label for="period">Period *</label>
-            <select id="period" name="period" required>
-              <option value="">Select Period</option>
-              {% for i in range(1, 9) %}
-              <option value="{{ i }}">Period {{ i }}</option>
-              {% endfor %}
-            </select>
-          </div>
-        </div>
-        
-        <div>
-          <div class="form-group">
-            <label for="subject">Subject *</label>
-            <input type="text" id="subject" name="subject" required placeholder="e.g., Mathematics">
-          </div>
-          
-          <div class="form-group">
-            <label for="teacher_id">Teacher</label>
-            <select id="teacher_id" name="teacher_id">
-              <option value="">Select Teacher</option>
-              {% for teacher in teachers %}
-              <option value="{{ teacher.id }}">{{ teacher.name }}</option>
-              {% endfor %}
-            </select>
-          </div>
-          
-          <div class="form-group">
-            <label for="room">Room</label>
-            <input type="text" id="room" name="room" placeholder="e.g., Room 101">
-          </div>
-        </div>
-      </div>
-      
-      <div class="form-group">
-        <label for="description">Description</label>
-        <textarea id="description" name="description" rows="3" placeholder="Optional description"></textarea>
-      </div>
-      
-      <div style="text-align: center; margin-top: 20px;">
-        <button type="submit" class="button">Add Timetable Entry</button>
-        <button type="reset" class="button secondary">Clear</button>
-      </div>
-    </form>
-  </div>
-</div>
+  // Toggle sidebar function
+  function toggleSidebar() {
+    const sidebar = document.querySelector('.sidebar');
+    sidebar.classList.toggle('collapsed');
+  }
+
+  // Show loading animation
+  function showLoading(text = 'Loading...') {
+    const overlay = document.querySelector('.loading-overlay');
+    const textElement = overlay.querySelector('.loading-text');
+    textElement.textContent = text;
+    overlay.classList.add('show');
+  }
+
+  // Hide loading animation
+  function hideLoading() {
+    const overlay = document.querySelector('.loading-overlay');
+    overlay.classList.remove('show');
+  }
 
-<script>
-  function filterTimetable() {
-    const classFilter = document.getElementById('class_filter').value;
-    const teacherFilter = document.getElementById('teacher_filter').value;
-    const dayFilter = document.getElementById('day_filter').value;
-    
-    let url = '{{ url_for("timetable") }}?';
-    if (classFilter) url += 'class_filter=' + encodeURIComponent(classFilter) + '&';
-    if (teacherFilter) url += 'teacher=' + encodeURIComponent(teacherFilter) + '&';
-    if (dayFilter) url += 'day=' + encodeURIComponent(dayFilter);
+  // Toggle password visibility
+  function togglePassword(inputId) {
+    const input = document.getElementById(inputId);
+    const icon = document.querySelector(`[onclick="togglePassword('${inputId}')"] i`);
     
-    window.location.href = url;
+    if (input.type === 'password') {
+      input.type = 'text';
+      icon.classList.remove('fa-eye');
+      icon.classList.add('fa-eye-slash');
+    } else {
+      input.type = 'password';
+      icon.classList.remove('fa-eye-slash');
+      icon.classList.add('fa-eye');
+    }
   }
-</script>
-{% endblock %}''',
 
-    'settings.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>System Settings</h1>
+  // Add loading animation to forms on submit
+  document.addEventListener('DOMContentLoaded', function() {
+    // Add sidebar toggle button
+    const sidebar = document.querySelector('.sidebar');
+    const sidebarHeader = document.createElement('div');
+    sidebarHeader.className = 'sidebar-header';
+    sidebarHeader.innerHTML = `
+      <button class="toggle-btn" onclick="toggleSidebar()" title="Toggle Sidebar">
+        <i class="fas fa-bars"></i>
+      </button>
+    `;
+    sidebar.insertBefore(sidebarHeader, sidebar.firstChild);
 
-<div class="tabs">
-  <button class="tab active" onclick="toggleTabs('schoolSettings')">School Settings</button>
-  <button class="tab" onclick="toggleTabs('gradingSystem')">Grading System</button>
-  <button class="tab" onclick="toggleTabs('backupRestore')">Backup & Restore</button>
-</div>
+    // Auto-hide alerts after 5 seconds
+    setTimeout(function() {
+      const alerts = document.querySelectorAll('.alert');
+      alerts.forEach(alert => {
+        alert.style.opacity = '0';
+        alert.style.transition = 'opacity 0.5s';
+        setTimeout(() => alert.style.display = 'none', 500);
+      });
+    }, 5000);
 
-<div id="schoolSettings" class="tab-content active">
-  <div class="card">
-    <h3>School Information</h3>
-    <form method="post" action="{{ url_for('update_school_settings') }}" enctype="multipart/form-data">
-      <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
-        <div>
-          <div class="form-group">
-            <label for="school_name">School Name *</label>
-            <input type="text" id="school_name" name="school_name" value="{{ settings.school_name }}" required>
-          </div>
-          
-          <div class="form-group">
-            <label for="school_address">School Address</label>
-            <textarea id="school_address" name="school_address" rows="3">{{ settings.school_address or '' }}</textarea>
-          </div>
-        </div>
-        
-        <div>
-          <div class="form-group">
-            <label for="school_phone">School Phone</label>
-            <input type="tel" id="school_phone" name="school_phone" value="{{ settings.school_phone or '' }}">
-          </div>
-          
-          <div class="form-group">
-            <label for="school_email">School Email</label>
-            <input type="email" id="school_email" name="school_email" value="{{ settings.school_email or '' }}">
-          </div>
-          
-          <div class="form-group">
-            <label for="logo">School Logo</label>
-            <input type="file" id="logo" name="logo" accept="image/*">
-            {% if settings.logo_path and os.path.exists(settings.logo_path) %}
-            <div class="logo-preview">
-              <img src="{{ url_for('static', filename=settings.logo_path.replace('static/', '')) }}" alt="School Logo" class="school-logo">
-              <p>Current Logo</p>
-            </div>
-            {% endif %}
-          </div>
-        </div>
-      </div>
-      
-      <div style="text-align: center; margin-top: 20px;">
-        <button type="submit" class="button">Save Settings</button>
-      </div>
-    </form>
-  </div>
-</div>
+    // Initialize timetable colors
+    document.querySelectorAll('.period').forEach(period => {
+      const subject = period.getAttribute('data-subject');
+      if (subject) {
+        const color = generateColor(subject);
+        period.style.background = color;
+      }
+    });
 
-<div id="gradingSystem" class="tab-content">
-  <div class="card">
-    <h3>Current Grading System</h3>
-    <table class="grading-system-table">
-      <thead>
-        <tr>
-          <th>Grade</th>
-          <th>Minimum Score</th>
-          <th>Maximum Score</th>
-          <th>Color</th>
-        </tr>
-      </thead>
-      <tbody>
-        <tr>
-          <td class="grade-A">A</td>
-          <td>{{ default_grading.min_a }}</td>
-          <td>{{ default_grading.max_a }}</td>
-          <td><div class="grade-color-box grade-A-bg"></div></td>
-        </tr>
-        <tr>
-          <td class="grade-B">B</td>
-          <td>{{ default_grading.min_b }}</td>
-          <td>{{ default_grading.max_b }}</td>
-          <td><div class="grade-color-box grade-B-bg"></div></td>
-        </tr>
-        <tr>
-          <td class="grade-C">C</td>
-          <td>{{ default_grading.min_c }}</td>
-          <td>{{ default_grading.max_c }}</td>
-          <td><div class="grade-color-box grade-C-bg"></div></td>
-        </tr>
-        <tr>
-          <td class="grade-D">D</td>
-          <td>{{ default_grading.min_d }}</td>
-          <td>{{ default_grading.max_d }}</td>
-          <td><div class="grade-color-box grade-D-bg"></div></td>
-        </tr>
-        <tr>
-          <td class="grade-F">F</td>
-          <td>{{ default_grading.min_f }}</td>
-          <td>{{ default_grading.max_f }}</td>
-          <td><div class="grade-color-box grade-F-bg"></div></td>
-        </tr>
-      </tbody>
-    </table>
-  </div>
-  
-  <div class="card">
-    <h3>Edit Grading System</h3>
-    <form method="post" action="{{ url_for('update_grading_system') }}">
-      <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px;">
-        <div class="form-group">
-          <label for="min_a">Min A</label>
-          <input type="number" id="min_a" name="min_a" min="0" max="100" value="{{ default_grading.min_a }}" required>
-        </div>
-        <div class="form-group">
-          <label for="max_a">Max A</label>
-          <input type="number" id="max_a" name="max_a" min="0" max="100" value="{{ default_grading.max_a }}" required>
-        </div>
-        <div class="form-group">
-          <label for="min_b">Min B</label>
-          <input type="number" id="min_b" name="min_b" min="0" max="100" value="{{ default_grading.min_b }}" required>
-        </div>
-        <div class="form-group">
-          <label for="max_b">Max B</label>
-          <input type="number" id="max_b" name="max_b" min="0" max="100" value="{{ default_grading.max_b }}" required>
-        </div>
-        <div class="form-group">
-          <label for="min_c">Min C</label>
-          <input type="number" id="min_c" name="min_c" min="0" max="100" value="{{ default_grading.min_c }}" required>
-        </div>
-        <div class="form-group">
-          <label for="max_c">Max C</label>
-          <input type="number" id="max_c" name="max_c" min="0" max="100" value="{{ default_grading.max_c }}" required>
-        </div>
-        <div class="form-group">
-          <label for="min_d">Min D</label>
-          <input type="number" id="min_d" name="min_d" min="0" max="100" value="{{ default_grading.min_d }}" required>
-        </div>
-        <div class="form-group">
-          <label for="max_d">Max D</label>
-          <input type="number" id="max_d" name="max_d" min="0" max="100" value="{{ default_grading.max_d }}" required>
-        </div>
-        <div class="form-group">
-          <label for="min_f">Min F</label>
-          <input type="number" id="min_f" name="min_f" min="0" max="100" value="{{ default_grading.min_f }}" required>
-        </div>
-        <div class="form-group">
-          <label for="max_f">Max F</label>
-          <input type="number" id="max_f" name="max_f" min="0" max="100" value="{{ default_grading.max_f }}" required>
-        </div>
-      </div>
-      
-      <div style="text-align: center; margin-top: 20px;">
-        <button type="submit" class="button">Update Grading System</button>
-      </div>
-    </form>
-  </div>
-</div>
+    // Auto-select today in date inputs
+    const today = new Date().toISOString().split('T')[0];
+    document.querySelectorAll('input[type="date"]').forEach(input => {
+      if (!input.value && (input.id.includes('date') || input.name.includes('date'))) {
+        input.value = today;
+      }
+    });
 
-<div id="backupRestore" class="tab-content">
-  <div class="card">
-    <h3>Database Backup</h3>
-    <p>Create a backup of the entire database.</p>
-    <div class="action-buttons">
-      <a href="{{ url_for('backup_database') }}" class="button" onclick="return confirm('Create database backup?')">
-        <i class="fas fa-download"></i> Backup Database
-      </a>
-    </div>
-  </div>
-  
-  <div class="card">
-    <h3>Restore Database</h3>
-    <p>Warning: This will replace all current data with the backup file.</p>
-    <form method="post" action="{{ url_for('restore_database') }}" enctype="multipart/form-data">
-      <div class="form-group">
-        <label for="backup_file">Select Backup File</label>
-        <input type="file" id="backup_file" name="backup_file" accept=".db,.sqlite,.sqlite3" required>
-      </div>
+    // Add loading animation to forms
+    document.querySelectorAll('form').forEach(form => {
+      form.addEventListener('submit', function() {
+        showLoading('Processing...');
+      });
+    });
+
+    // Add loading for anchor links that might take time
+    document.querySelectorAll('a').forEach(link => {
+      if (link.href.includes('add_') || link.href.includes('edit_') || link.href.includes('delete_')) {
+        link.addEventListener('click', function() {
+          showLoading('Loading...');
+          setTimeout(hideLoading, 1000); // Hide after 1 second
+        });
+      }
+    });
+
+    // Update score bars
+    updateScoreBars();
+  });
+
+  function updateScoreBars() {
+    document.querySelectorAll('.subject-performance').forEach(item => {
+      const score = parseInt(item.getAttribute('data-score'));
+      const grade = item.getAttribute('data-grade');
+      const fill = item.querySelector('.score-fill');
+      const text = item.querySelector('.score-text');
       
-      <div style="text-align: center; margin-top: 20px;">
-        <button type="submit" class="button danger" onclick="return confirm('WARNING: This will overwrite all current data. Continue?')">
-          <i class="fas fa-upload"></i> Restore Database
-        </button>
-      </div>
-    </form>
-  </div>
-</div>
-{% endblock %}''',
+      if (fill && text) {
+        fill.style.width = score + '%';
+        
+        // Set color based on grade
+        if (grade === 'A') fill.style.background = '#22c55e';
+        else if (grade === 'B') fill.style.background = '#2563eb';
+        else if (grade === 'C') fill.style.background = '#f59e0b';
+        else if (grade === 'D') fill.style.background = '#f97316';
+        else fill.style.background = '#ef4444';
+        
+        text.textContent = score + '%';
+      }
+    });
+  }
 
-    'themes.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Theme Selection</h1>
+  // Initialize theme on page load
+  document.addEventListener('DOMContentLoaded', function() {
+    const savedTheme = getCookie('selected_theme');
+    if (savedTheme) {
+      applyTheme(savedTheme, false); // Don't show confirmation on load
+    }
 
-<div class="card">
-  <h3>Select Theme</h3>
-  <p>Choose a theme for the School Management System:</p>
-  
-  <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 20px; margin-top: 20px;">
-    <div class="card theme-preview" onclick="applyTheme('modern-blue')" style="cursor: pointer; text-align: center;">
-      <div style="width: 100%; height: 100px; background: linear-gradient(135deg, #4361ee, #3a0ca3); border-radius: 8px;"></div>
-      <h4>Modern Blue</h4>
-      <p>Default blue theme</p>
-    </div>
-    
-    <div class="card theme-preview" onclick="applyTheme('elegant-green')" style="cursor: pointer; text-align: center;">
-      <div style="width: 100%; height: 100px; background: linear-gradient(135deg, #2ecc71, #27ae60); border-radius: 8px;"></div>
-      <h4>Elegant Green</h4>
-      <p>Fresh green theme</p>
-    </div>
-    
-    <div class="card theme-preview" onclick="applyTheme('sunset-orange')" style="cursor: pointer; text-align: center;">
-      <div style="width: 100%; height: 100px; background: linear-gradient(135deg, #ff7e5f, #feb47b); border-radius: 8px;"></div>
-      <h4>Sunset Orange</h4>
-      <p>Warm orange theme</p>
-    </div>
-    
-    <div class="card theme-preview" onclick="applyTheme('dusk-purple')" style="cursor: pointer; text-align: center;">
-      <div style="width: 100%; height: 100px; background: linear-gradient(135deg, #654ea3, #da98b4); border-radius: 8px;"></div>
-      <h4>Dusk Purple</h4>
-      <p>Royal purple theme</p>
-    </div>
-    
-    <div class="card theme-preview" onclick="applyTheme('forest-teal')" style="cursor: pointer; text-align: center;">
-      <div style="width: 100%; height: 100px; background: linear-gradient(135deg, #11998e, #38ef7d); border-radius: 8px;"></div>
-      <h4>Forest Teal</h4>
-      <p>Nature teal theme</p>
-    </div>
-    
-    <div class="card theme-preview" onclick="applyTheme('light-theme')" style="cursor: pointer; text-align: center;">
-      <div style="width: 100%; height: 100px; background: linear-gradient(135deg, #f9fafb, #f3f4f6); border-radius: 8px;"></div>
-      <h4>Light Theme</h4>
-      <p>Light mode theme</p>
-    </div>
-    
-    <div class="card theme-preview" onclick="applyTheme('dark-theme')" style="cursor: pointer; text-align: center;">
-      <div style="width: 100%; height: 100px; background: linear-gradient(135deg, #1f2937, #111827); border-radius: 8px;"></div>
-      <h4>Dark Theme</h4>
-      <p>Dark mode theme</p>
-    </div>
-  </div>
-</div>
+    // Capture all form submissions to show loading
+    document.querySelectorAll('form').forEach(form => {
+      form.addEventListener('submit', function(e) {
+        // Only show loading if form action contains specific paths
+        const action = form.getAttribute('action') || '';
+        if (action.includes('add') || action.includes('edit') || action.includes('delete') || action.includes('process')) {
+          showLoading('Processing request...');
+        }
+      });
+    });
+  });
 
-<div class="card">
-  <h3>Current Theme</h3>
-  <p>Your current theme preferences are saved in your browser.</p>
-  <p>To reset to default theme, clear your browser cookies or select "Modern Blue".</p>
-</div>
-{% endblock %}''',
+  function applyTheme(themeName, showConfirmation = true) {
+    const themeColors = {
+      'modern-blue': {
+        '--primary-color': '#4361ee',
+        '--secondary-color': '#3a0ca3',
+        '--accent-color': '#4cc9f0',
+        '--dark-color': '#1e293b',
+        '--light-color': '#f8fafc',
+        '--gray-light': '#e2e8f0',
+        '--sidebar-bg-start': '#1e293b',
+        '--sidebar-bg-end': '#0f172a'
+      },
+      'elegant-green': {
+        '--primary-color': '#2ecc71',
+        '--secondary-color': '#27ae60',
+        '--accent-color': '#1abc9c',
+        '--dark-color': '#1e293b',
+        '--light-color': '#f8fafc',
+        '--gray-light': '#e2e8f0',
+        '--sidebar-bg-start': '#1e293b',
+        '--sidebar-bg-end': '#0f172a'
+      },
+      'sunset-orange': {
+        '--primary-color': '#ff7e5f',
+        '--secondary-color': '#feb47b',
+        '--accent-color': '#f39c12',
+        '--dark-color': '#1e293b',
+        '--light-color': '#fff5f5',
+        '--gray-light': '#f8f9fa',
+        '--sidebar-bg-start': '#2c1810',
+        '--sidebar-bg-end': '#1e120b'
+      },
+      'dusk-purple': {
+        '--primary-color': '#654ea3',
+        '--secondary-color': '#da98b4',
+        '--accent-color': '#8e44ad',
+        '--dark-color': '#1e293b',
+        '--light-color': '#f8f0fc',
+        '--gray-light': '#f0e6ff',
+        '--sidebar-bg-start': '#2c0f3e',
+        '--sidebar-bg-end': '#1c0928'
+      },
+      'forest-teal': {
+        '--primary-color': '#11998e',
+        '--secondary-color': '#38ef7d',
+        '--accent-color': '#16a085',
+        '--dark-color': '#1e293b',
+        '--light-color': '#e8f8f5',
+        '--gray-light': '#e8f6f3',
+        '--sidebar-bg-start': '#0d3632',
+        '--sidebar-bg-end': '#0a2824'
+      },
+      'light-theme': {
+        '--primary-color': '#4f46e5',
+        '--secondary-color': '#2563eb',
+        '--accent-color': '#0ea5e9',
+        '--dark-color': '#1f2937',
+        '--light-color': '#ffffff',
+        '--gray-light': '#e5e7eb',
+        '--sidebar-bg-start': '#f9fafb',
+        '--sidebar-bg-end': '#f3f4f6',
+        '--sidebar-text': '#374151',
+        '--sidebar-hover': '#e5e7eb'
+      },
+      'dark-theme': {
+        '--primary-color': '#818cf8',
+        '--secondary-color': '#60a5fa',
+        '--accent-color': '#38bdf8',
+        '--dark-color': '#f9fafb',
+        '--light-color': '#111827',
+        '--gray-light': '#374151',
+        '--sidebar-bg-start': '#1f2937',
+        '--sidebar-bg-end': '#111827',
+        '--sidebar-text': '#d1d5db',
+        '--sidebar-hover': '#374151'
+      }
+    };
 
-    'receipt.html': '''{% extends "base.html" %}
-{% block content %}
-<div class="receipt">
-  <div class="receipt-header">
-    <h2>FEE PAYMENT RECEIPT</h2>
-    <p>{{ settings.school_name }}</p>
-    {% if settings.school_address %}<p>{{ settings.school_address }}</p>{% endif %}
-    {% if settings.school_phone %}<p>Tel: {{ settings.school_phone }}</p>{% endif %}
-  </div>
-  
-  <table class="receipt-details">
-    <tr>
-      <td><strong>Receipt No:</strong></td>
-      <td>{{ payment.receipt_number }}</td>
-      <td><strong>Date:</strong></td>
-      <td>{{ payment.date_paid }}</td>
-    </tr>
-    <tr>
-      <td><strong>Student Name:</strong></td>
-      <td>{{ student.name }}</td>
-      <td><strong>Admission No:</strong></td>
-      <td>{{ student.admission_number }}</td>
-    </tr>
-    <tr>
-      <td><strong>Class:</strong></td>
-      <td>{{ student.class }}</td>
-      <td><strong>Term:</strong></td>
-      <td>{{ payment.term }} {{ payment.year }}</td>
-    </tr>
-    <tr>
-      <td><strong>Total Fee:</strong></td>
-      <td>{{ fee_structure.amount }}</td>
-      <td><strong>Amount Paid:</strong></td>
-      <td class="paid">{{ payment.amount_paid }}</td>
-    </tr>
-    <tr>
-      <td><strong>Previous Balance:</strong></td>
-      <td>{{ previous_balance }}</td>
-      <td><strong>New Balance:</strong></td>
-      <td class="balance">{{ new_balance }}</td>
-    </tr>
-    <tr>
-      <td><strong>Payment Method:</strong></td>
-      <td>{{ payment.payment_method or 'Cash' }}</td>
-      <td><strong>Transaction ID:</strong></td>
-      <td>{{ payment.transaction_id or 'N/A' }}</td>
-    </tr>
-    {% if payment.remarks %}
-    <tr>
-      <td><strong>Remarks:</strong></td>
-      <td colspan="3">{{ payment.remarks }}</td>
-    </tr>
-    {% endif %}
-  </table>
-  
-  <div style="text-align: center; margin-top: 40px;">
-    <p>_________________________</p>
-    <p>Cashier's Signature</p>
-  </div>
-  
-  <div style="text-align: center; margin-top: 20px; font-size: 12px; color: #666;">
-    <p>Thank you for your payment!</p>
-    <p>Keep this receipt for your records.</p>
-  </div>
-</div>
+    const colors = themeColors[themeName];
+    if (colors) {
+      // Apply CSS custom properties
+      Object.entries(colors).forEach(([property, value]) => {
+        document.documentElement.style.setProperty(property, value);
+      });
+
+      // Update sidebar styles for light/dark themes specifically
+      const sidebar = document.querySelector('.sidebar');
+      if (sidebar) {
+        if (themeName === 'light-theme') {
+          sidebar.style.background = 'linear-gradient(to bottom, #f9fafb, #f3f4f6)';
+          const sidebarLinks = document.querySelectorAll('.sidebar a');
+          sidebarLinks.forEach(link => {
+            link.style.color = '#374151';
+          });
+          const sidebarH2 = document.querySelector('.sidebar h2');
+          if (sidebarH2) sidebarH2.style.color = '#374151';
+          const toggleBtn = document.querySelector('.toggle-btn');
+          if (toggleBtn) toggleBtn.style.background = '#4f46e5';
+        } else if (themeName === 'dark-theme') {
+          sidebar.style.background = 'linear-gradient(to bottom, #1f2937, #111827)';
+          const sidebarLinks = document.querySelectorAll('.sidebar a');
+          sidebarLinks.forEach(link => {
+            link.style.color = '#d1d5db';
+          });
+          const sidebarH2 = document.querySelector('.sidebar h2');
+          if (sidebarH2) sidebarH2.style.color = '#d1d5db';
+          const toggleBtn = document.querySelector('.toggle-btn');
+          if (toggleBtn) toggleBtn.style.background = '#818cf8';
+        } else {
+          // Reset to default gradient for other themes
+          sidebar.style.background = 'linear-gradient(to bottom, var(--sidebar-bg-start), var(--sidebar-bg-end))';
+          const sidebarLinks = document.querySelectorAll('.sidebar a');
+          sidebarLinks.forEach(link => {
+            link.style.color = 'white';
+          });
+          const sidebarH2 = document.querySelector('.sidebar h2');
+          if (sidebarH2) sidebarH2.style.color = 'white';
+          const toggleBtn = document.querySelector('.toggle-btn');
+          if (toggleBtn) toggleBtn.style.background = 'var(--primary-color)';
+        }
+      }
 
-<div class="action-buttons no-print">
-  <button onclick="printReceipt()" class="button"><i class="fas fa-print"></i> Print Receipt</button>
-  <a href="{{ url_for('fees') }}" class="button secondary"><i class="fas fa-arrow-left"></i> Back to Fees</a>
-</div>
-{% endblock %}''',
+      // Save theme preference in cookie
+      setCookie('selected_theme', themeName, 30); // 30 days expiry
 
-    'medical_info.html': '''{% extends "base.html" %}
-{% block content %}
-<h1>Medical Information - {{ student.name }}</h1>
+      if (showConfirmation) {
+        showThemeApplied(themeName);
+      }
+    }
+  }
 
-<div class="card">
-  <h3>Basic Information</h3>
-  <table>
-    <tr>
-      <th>Admission Number:</th>
-      <td>{{ student.admission_number }}</td>
-    </tr>
-    <tr>
-      <th>Name:</th>
-      <td>{{ student.name }}</td>
-    </tr>
-    <tr>
-      <th>Class:</th>
-      <td>{{ student.class }}</td>
-    </tr>
-    <tr>
-      <th>Age:</th>
-      <td>{{ student.age or 'N/A' }}</td>
-    </tr>
-  </table>
-</div>
+  function showThemeApplied(themeName) {
+    // Create temporary alert
+    const alertDiv = document.createElement('div');
+    alertDiv.className = 'alert alert-success';
+    alertDiv.innerHTML = `<i class="fas fa-check-circle"></i> Theme "${themeName}" applied successfully!`;
+    alertDiv.style.position = 'fixed';
+    alertDiv.style.top = '20px';
+    alertDiv.style.right = '20px';
+    alertDiv.style.zIndex = '9999';
+    alertDiv.style.opacity = '0';
+    alertDiv.style.transition = 'opacity 0.5s';
 
-<div class="card">
-  <h3>Medical Status</h3>
-  <div class="medical-alert {% if student.has_medical_condition %}danger{% else %}info{% endif %}">
-    <i class="fas fa-heartbeat"></i>
-    <strong>Medical Condition:</strong>
-    {% if student.has_medical_condition %}
-    Has Special Medical Condition
-    {% else %}
-    No Special Medical Conditions
-    {% endif %}
-  </div>
-  
-  {% if student.medical_conditions %}
-  <div style="margin-top: 15px;">
-    <h4>Medical Conditions</h4>
-    <p>{{ student.medical_conditions }}</p>
-  </div>
-  {% endif %}
-  
-  {% if student.allergies %}
-  <div style="margin-top: 15px;">
-    <h4>Allergies</h4>
-    <p>{{ student.allergies }}</p>
-  </div>
-  {% endif %}
-  
-  {% if student.medications %}
-  <div style="margin-top: 15px;">
-    <h4>Current Medications</h4>
-    <p>{{ student.medications }}</p>
-  </div>
-  {% endif %}
-  
-  {% if student.blood_type %}
-  <div style="margin-top: 15px;">
-    <h4>Blood Type</h4>
-    <p>{{ student.blood_type }}</p>
-  </div>
-  {% endif %}
-</div>
+    document.body.appendChild(alertDiv);
 
-<div class="card">
-  <h3>Emergency Contact</h3>
-  {% if student.emergency_contact_name %}
-  <table>
-    <tr>
-      <th>Name:</th>
-      <td>{{ student.emergency_contact_name }}</td>
-    </tr>
-    <tr>
-      <th>Relationship:</th>
-      <td>{{ student.emergency_contact_relation }}</td>
-    </tr>
-    <tr>
-      <th>Phone:</th>
-      <td>{{ student.emergency_contact_phone }}</td>
-    </tr>
-    {% if student.emergency_contact_alt_phone %}
-    <tr>
-      <th>Alternate Phone:</th>
-      <td>{{ student.emergency_contact_alt_phone }}</td>
-    </tr>
-    {% endif %}
-  </table>
-  {% else %}
-  <p>No emergency contact information available.</p>
-  {% endif %}
-</div>
+    // Fade in
+    setTimeout(() => {
+      alertDiv.style.opacity = '1';
+    }, 10);
 
-<div class="action-buttons">
-  <a href="{{ url_for('edit_student', id=student.id) }}" class="button">Edit Student</a>
-  <a href="{{ url_for('students') }}" class="button secondary">Back to Students</a>
-</div>
-{% endblock %}'''
+    // Remove after some time
+    setTimeout(() => {
+      alertDiv.style.opacity = '0';
+      setTimeout(() => {
+        document.body.removeChild(alertDiv);
+      }, 500);
+    }, 3000);
+  }
+
+  function setCookie(name, value, days) {
+    const expires = new Date();
+    expires.setTime(expires.getTime() + (days * 24 * 60 * 60 * 1000));
+    document.cookie = name + '=' + value + ';expires=' + expires.toUTCString() + ';path=/';
+  }
+
+  function getCookie(name) {
+    const nameEQ = name + "=";
+    const ca = document.cookie.split(';');
+    for(let i = 0; i < ca.length; i++) {
+      let c = ca[i];
+      while (c.charAt(0) === ' ') c = c.substring(1, c.length);
+      if (c.indexOf(nameEQ) === 0) return c.substring(nameEQ.length, c.length);
+    }
+    return null;
+  }'''
 }
 
 # Set Jinja loader
 app.jinja_loader = DictLoader(templates)
 
-# Database connection
+# Bytecode is keyed by template name and checked against a hash of the
+# source, so editing a template simply recompiles it
+if app.config['JINJA_BYTECODE_CACHE']:
+    jinja_cache_folder = os.path.join(app.config['CACHE_FOLDER'], 'jinja')
+    os.makedirs(jinja_cache_folder, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(jinja_cache_folder)
+
+def precompile_templates():
+    """Load every template into the Jinja cache ahead of the first request"""
+    for name in templates:
+        app.jinja_env.get_template(name)
+
+if app.config['JINJA_PRECOMPILE']:
+    precompile_templates()
+
+ASSET_MIMETYPES = {
+    '.css': 'text/css',
+    '.js': 'application/javascript'
+}
+
+def minify_asset(name, source):
+    """Drop comments, indentation and blank lines from a CSS or JS asset"""
+    if name.endswith('.css'):
+        source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    lines = (line.strip() for line in source.splitlines())
+    if name.endswith('.js'):
+        lines = (line for line in lines if not line.startswith('//'))
+    return '\n'.join(line for line in lines if line)
+
+def build_assets():
+    """Build every asset once, naming each file after a hash of its content"""
+    built = {}
+    for name, source in assets.items():
+        if app.config['ASSET_MINIFY']:
+            source = minify_asset(name, source)
+        body = source.encode('utf-8')
+        stem, ext = os.path.splitext(name)
+        built[name] = (f'{stem}.{hashlib.sha256(body).hexdigest()[:12]}{ext}', body)
+    return built
+
+asset_bundle = build_assets()
+asset_files = {filename: body for filename, body in asset_bundle.values()}
+
+@app.template_global()
+def asset_url(name):
+    return url_for('static_asset', filename=asset_bundle[name][0])
+
+@app.route('/assets/<filename>')
+def static_asset(filename):
+    body = asset_files.get(filename)
+    if body is None:
+        abort(404)
+    
+    # The name changes whenever the content does, so browsers never need to revalidate
+    response = Response(body, mimetype=ASSET_MIMETYPES.get(os.path.splitext(filename)[1]))
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+# Response compression
+COMPRESSIBLE_MIMETYPES = {
+    'text/html', 'text/css', 'text/csv', 'text/plain', 'text/xml',
+    'application/javascript', 'application/json', 'application/xml', 'image/svg+xml'
+}
+
+class BrotliCompressor:
+    """Gives brotli's streaming compressor the zlib compress/flush interface"""
+
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.finish()
+
+class CompressionMiddleware:
+    """WSGI middleware that gzip- or brotli-compresses responses on the fly"""
+
+    def __init__(self, wsgi_app, min_size=500, level=6, brotli_quality=5):
+        self.wsgi_app = wsgi_app
+        self.min_size = min_size
+        self.level = level
+        self.brotli_quality = brotli_quality
+        self._lock = threading.Lock()
+        self._counters = {
+            'compressed': 0,
+            'skipped': 0,
+            'bytes_in': 0,
+            'bytes_out': 0,
+        }
+
+    def choose_encoding(self, accept_encoding):
+        """Pick brotli or gzip from an Accept-Encoding header, honouring q=0"""
+        accepted = {}
+        for part in accept_encoding.split(','):
+            name, _, params = part.strip().partition(';')
+            quality = 1.0
+            params = params.strip()
+            if params.startswith('q='):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[name.strip().lower()] = quality
+        
+        for encoding in ('br', 'gzip'):
+            if encoding == 'br' and brotli is None:
+                continue
+            if accepted.get(encoding, accepted.get('*', 0)) > 0:
+                return encoding
+        return None
+
+    def should_compress(self, environ, status, headers):
+        if environ.get('REQUEST_METHOD') == 'HEAD':
+            return False
+        if not status.startswith('200'):
+            return False
+        
+        header_map = {name.lower(): value for name, value in headers}
+        if 'content-encoding' in header_map:
+            return False
+        if header_map.get('content-type', '').split(';')[0].strip() not in COMPRESSIBLE_MIMETYPES:
+            return False
+        
+        # Streamed responses have no length and are always worth compressing
+        content_length = header_map.get('content-length')
+        return content_length is None or int(content_length) >= self.min_size
+
+    def _count(self, **amounts):
+        with self._lock:
+            for name, amount in amounts.items():
+                self._counters[name] += amount
+
+    def __call__(self, environ, start_response):
+        encoding = self.choose_encoding(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            self._count(skipped=1)
+            return self.wsgi_app(environ, start_response)
+        
+        compressing = []
+        
+        def compressing_start_response(status, headers, exc_info=None):
+            if self.should_compress(environ, status, headers):
+                vary = [value for name, value in headers if name.lower() == 'vary']
+                # The compressed body is not byte-for-byte the entity a strong
+                # ETag promises, so it only keeps a weak one
+                headers = [(name, value if name.lower() != 'etag' or value.startswith('W/') else f'W/{value}')
+                           for name, value in headers if name.lower() not in ('content-length', 'vary')]
+                headers.append(('Content-Encoding', encoding))
+                headers.append(('Vary', ', '.join(vary + ['Accept-Encoding'])))
+                compressing.append(True)
+            return start_response(status, headers, exc_info)
+        
+        app_iter = self.wsgi_app(environ, compressing_start_response)
+        if not compressing:
+            self._count(skipped=1)
+            return app_iter
+        
+        if encoding == 'br':
+            compressor = BrotliCompressor(self.brotli_quality)
+        else:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return self._compress(app_iter, compressor)
+
+    def _compress(self, app_iter, compressor):
+        bytes_in = bytes_out = 0
+        try:
+            for chunk in app_iter:
+                bytes_in += len(chunk)
+                compressed = compressor.compress(chunk)
+                if compressed:
+                    bytes_out += len(compressed)
+                    yield compressed
+            compressed = compressor.flush()
+            bytes_out += len(compressed)
+            yield compressed
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+            self._count(compressed=1, bytes_in=bytes_in, bytes_out=bytes_out)
+
+    def stats(self):
+        """Snapshot of how many responses were compressed and the bytes saved"""
+        with self._lock:
+            stats = dict(self._counters)
+        stats['bytes_saved'] = stats['bytes_in'] - stats['bytes_out']
+        stats['ratio'] = round(stats['bytes_out'] / stats['bytes_in'], 3) if stats['bytes_in'] else None
+        stats['brotli_available'] = brotli is not None
+        return stats
+
+compression = CompressionMiddleware(app.wsgi_app,
+                                    min_size=app.config['COMPRESS_MIN_SIZE'],
+                                    level=app.config['COMPRESS_LEVEL'],
+                                    brotli_quality=app.config['COMPRESS_BROTLI_QUALITY'])
+if app.config['COMPRESS_RESPONSES']:
+    app.wsgi_app = compression
+if app.config['PROXY_FIX_X_FOR']:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+
+# Database connection pool
+class PoolTimeoutError(sqlite3.OperationalError):
+    """Raised when no pooled connection becomes free in time"""
+
+class PooledConnection(sqlite3.Connection):
+    """SQLite connection that goes back to its pool when closed"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+        self.generation = 0
+        self.checked_out = False
+        self.request_bound = False
+
+    def close(self):
+        # A request-bound connection is shared by the view and every helper
+        # it calls, so it is only released by the teardown handler
+        if self.request_bound:
+            return
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            super().close()
+
+    def discard(self):
+        """Really close the underlying SQLite connection"""
+        super().close()
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections owned by one worker process"""
+
+    def __init__(self, database, size=5, timeout=10, pragmas=None):
+        self.database = database
+        self.size = size
+        self.timeout = timeout
+        self.pragmas = dict(pragmas or {})
+        self._cond = threading.Condition()
+        self._idle = []
+        self._created = 0
+        self._generation = 0
+        self._pid = os.getpid()
+        self._counters = {
+            'connects': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'total_wait_ms': 0.0,
+            'max_wait_ms': 0.0,
+        }
+
+    def _connect(self):
+        conn = sqlite3.connect(self.database, factory=PooledConnection, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        conn.pool = self
+        conn.generation = self._generation
+        return conn
+
+    def _check_fork(self):
+        # Connections must never cross a fork(); a new worker starts empty
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle = []
+            self._created = 0
+
+    def acquire(self):
+        """Check out a connection, waiting up to `timeout` seconds for one"""
+        started = time.monotonic()
+        waited = False
+        conn = None
+        with self._cond:
+            self._check_fork()
+            while not self._idle and self._created >= self.size:
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._counters['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f'No database connection available after {self.timeout}s '
+                        f'(pool size {self.size})')
+                waited = True
+                self._cond.wait(remaining)
+            if self._idle:
+                conn = self._idle.pop()
+            else:
+                self._created += 1
+            wait_ms = (time.monotonic() - started) * 1000
+            self._counters['checkouts'] += 1
+            if waited:
+                self._counters['waits'] += 1
+                self._counters['total_wait_ms'] += wait_ms
+                self._counters['max_wait_ms'] = max(self._counters['max_wait_ms'], wait_ms)
+
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._counters['connects'] += 1
+
+        conn.checked_out = True
+        return conn
+
+    def release(self, conn):
+        """Return a connection to the pool, rolling back any open transaction"""
+        if not conn.checked_out:
+            return
+        conn.checked_out = False
+        conn.request_bound = False
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            reusable = True
+        except sqlite3.Error:
+            reusable = False
+
+        with self._cond:
+            if reusable and conn.generation == self._generation and self._pid == os.getpid():
+                self._idle.append(conn)
+            else:
+                conn.discard()
+                self._created = max(self._created - 1, 0)
+            self._cond.notify()
+
+    def reset(self):
+        """Close idle connections and retire those currently checked out"""
+        with self._cond:
+            self._generation += 1
+            for conn in self._idle:
+                conn.discard()
+            self._created = max(self._created - len(self._idle), 0)
+            self._idle = []
+            self._cond.notify_all()
+
+    def stats(self):
+        """Snapshot of pool occupancy and wait times"""
+        with self._cond:
+            stats = dict(self._counters)
+            stats['size'] = self.size
+            stats['timeout'] = self.timeout
+            stats['open'] = self._created
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._created - len(self._idle)
+        stats['avg_wait_ms'] = round(stats['total_wait_ms'] / stats['waits'], 3) if stats['waits'] else 0.0
+        stats['total_wait_ms'] = round(stats['total_wait_ms'], 3)
+        stats['max_wait_ms'] = round(stats['max_wait_ms'], 3)
+        return stats
+
+db_pool = ConnectionPool(app.config['DATABASE'],
+                         size=app.config['DB_POOL_SIZE'],
+                         timeout=app.config['DB_POOL_TIMEOUT'],
+                         pragmas=app.config['DB_PRAGMAS'])
+
 def get_db_connection():
-    conn = sqlite3.connect('school.db')
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get a pooled connection, shared for the rest of the request if there is one"""
+    if has_app_context():
+        if 'db' not in g:
+            conn = db_pool.acquire()
+            conn.request_bound = True
+            g.db = conn
+        return g.db
+    return db_pool.acquire()
+
+@app.teardown_appcontext
+def release_db_connection(exception=None):
+    conn = g.pop('db', None)
+    if conn is not None:
+        db_pool.release(conn)
 
 # Initialize database with enhanced schema
+FEE_LEDGER_QUERY = '''
+    SELECT fp.student_id, fp.fee_structure_id, fs.amount as amount_due,
+           SUM(fp.amount_paid) as total_paid, fs.amount - SUM(fp.amount_paid) as balance,
+           COUNT(*) as payment_count, MAX(fp.date_paid) as last_payment_date
+    FROM fee_payments fp
+    JOIN fee_structures fs ON fs.id = fp.fee_structure_id
+    GROUP BY fp.student_id, fp.fee_structure_id
+'''
+
+def rebuild_fee_ledger(conn):
+    """Recompute the fee ledger from fee_payments"""
+    conn.execute('DELETE FROM fee_ledger')
+    conn.execute(f'''
+        INSERT INTO fee_ledger (student_id, fee_structure_id, amount_due, total_paid, balance,
+                                payment_count, last_payment_date)
+        {FEE_LEDGER_QUERY}
+    ''')
+
+def diff_fee_ledger(conn):
+    """Compare the fee ledger with a fresh recomputation; returns the rows that differ"""
+    expected = {(row['student_id'], row['fee_structure_id']): dict(row) for row in conn.execute(FEE_LEDGER_QUERY)}
+    differences = []
+    for row in conn.execute('SELECT * FROM fee_ledger'):
+        key = (row['student_id'], row['fee_structure_id'])
+        want = expected.pop(key, None)
+        if want is None:
+            differences.append({'key': key, 'ledger': dict(row), 'expected': None})
+        elif (abs(row['total_paid'] - want['total_paid']) > 0.005
+              or abs(row['amount_due'] - want['amount_due']) > 0.005
+              or abs(row['balance'] - want['balance']) > 0.005
+              or row['payment_count'] != want['payment_count']
+              or row['last_payment_date'] != want['last_payment_date']):
+            differences.append({'key': key, 'ledger': dict(row), 'expected': want})
+    for key, want in expected.items():
+        differences.append({'key': key, 'ledger': None, 'expected': want})
+    return differences
+
+# Payments without a transaction id (cash, cheques) are not covered by the unique index
+PAYMENT_TRANSACTION_WHERE = "transaction_id IS NOT NULL AND transaction_id != ''"
+
+# Partial indexes backing timetable clash detection: (name, column, rows covered)
+TIMETABLE_SLOT_INDEXES = [
+    ('idx_timetable_teacher_slot', 'teacher_id', 'teacher_id IS NOT NULL'),
+    ('idx_timetable_room_slot', 'room', "room IS NOT NULL AND room != ''"),
+    ('idx_timetable_class_slot', 'class', 'class IS NOT NULL')
+]
+
 def init_db():
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -4741,6 +5945,28 @@ def init_db():
         FOREIGN KEY (teacher_id) REFERENCES teachers(id) ON DELETE SET NULL
     );
     
+    -- Weekly lessons each class needs, used by the timetable generator
+    CREATE TABLE IF NOT EXISTS timetable_requirements (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        class TEXT NOT NULL,
+        subject TEXT NOT NULL,
+        periods_per_week INTEGER NOT NULL CHECK(periods_per_week > 0),
+        teacher_id INTEGER,
+        room TEXT,
+        UNIQUE (class, subject),
+        FOREIGN KEY (teacher_id) REFERENCES teachers(id) ON DELETE SET NULL
+    );
+    
+    -- Periods a teacher cannot be timetabled (a NULL period blocks the whole day)
+    CREATE TABLE IF NOT EXISTS teacher_unavailability (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        teacher_id INTEGER NOT NULL,
+        day TEXT NOT NULL,
+        period INTEGER,
+        UNIQUE (teacher_id, day, period),
+        FOREIGN KEY (teacher_id) REFERENCES teachers(id) ON DELETE CASCADE
+    );
+    
     -- Grading system table - NEW
     CREATE TABLE IF NOT EXISTS grading_system (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -4771,28 +5997,148 @@ def init_db():
         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     );
     
+    -- Class statistics table - student counts kept current by triggers
+    CREATE TABLE IF NOT EXISTS class_stats (
+        class TEXT PRIMARY KEY,
+        student_count INTEGER NOT NULL DEFAULT 0
+    );
+    
+    CREATE TRIGGER IF NOT EXISTS trg_class_stats_student_insert
+    AFTER INSERT ON students WHEN NEW.class IS NOT NULL
+    BEGIN
+        INSERT INTO class_stats (class, student_count) VALUES (NEW.class, 1)
+        ON CONFLICT(class) DO UPDATE SET student_count = student_count + 1;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_class_stats_student_delete
+    AFTER DELETE ON students WHEN OLD.class IS NOT NULL
+    BEGIN
+        UPDATE class_stats SET student_count = student_count - 1 WHERE class = OLD.class;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_class_stats_student_update
+    AFTER UPDATE OF class ON students WHEN OLD.class IS NOT NEW.class
+    BEGIN
+        UPDATE class_stats SET student_count = student_count - 1 WHERE class = OLD.class;
+        INSERT INTO class_stats (class, student_count) SELECT NEW.class, 1 WHERE NEW.class IS NOT NULL
+        ON CONFLICT(class) DO UPDATE SET student_count = student_count + 1;
+    END;
+    
+    -- Fee ledger - total paid and balance per student per fee structure,
+    -- kept current by triggers on fee_payments and fee_structures
+    CREATE TABLE IF NOT EXISTS fee_ledger (
+        student_id INTEGER NOT NULL,
+        fee_structure_id INTEGER NOT NULL,
+        amount_due REAL NOT NULL DEFAULT 0,
+        total_paid REAL NOT NULL DEFAULT 0,
+        balance REAL NOT NULL DEFAULT 0,
+        payment_count INTEGER NOT NULL DEFAULT 0,
+        last_payment_date TEXT,
+        PRIMARY KEY (student_id, fee_structure_id),
+        FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+        FOREIGN KEY (fee_structure_id) REFERENCES fee_structures(id) ON DELETE CASCADE
+    ) WITHOUT ROWID;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_fee_ledger_payment_insert
+    AFTER INSERT ON fee_payments
+    BEGIN
+        INSERT INTO fee_ledger (student_id, fee_structure_id, amount_due, total_paid, balance,
+                                payment_count, last_payment_date)
+        SELECT NEW.student_id, NEW.fee_structure_id, fs.amount, NEW.amount_paid, fs.amount - NEW.amount_paid,
+               1, NEW.date_paid
+        FROM fee_structures fs WHERE fs.id = NEW.fee_structure_id
+        ON CONFLICT(student_id, fee_structure_id) DO UPDATE SET
+            total_paid = total_paid + excluded.total_paid,
+            balance = amount_due - (total_paid + excluded.total_paid),
+            payment_count = payment_count + 1,
+            last_payment_date = MAX(COALESCE(last_payment_date, ''), excluded.last_payment_date);
+    END;
+    
+    -- Deletes and edits are rare, so the affected rows are simply recomputed
+    CREATE TRIGGER IF NOT EXISTS trg_fee_ledger_payment_delete
+    AFTER DELETE ON fee_payments
+    BEGIN
+        DELETE FROM fee_ledger WHERE student_id = OLD.student_id AND fee_structure_id = OLD.fee_structure_id;
+        INSERT INTO fee_ledger (student_id, fee_structure_id, amount_due, total_paid, balance,
+                                payment_count, last_payment_date)
+        SELECT fp.student_id, fp.fee_structure_id, fs.amount, SUM(fp.amount_paid), fs.amount - SUM(fp.amount_paid),
+               COUNT(*), MAX(fp.date_paid)
+        FROM fee_payments fp JOIN fee_structures fs ON fs.id = fp.fee_structure_id
+        WHERE fp.student_id = OLD.student_id AND fp.fee_structure_id = OLD.fee_structure_id
+        GROUP BY fp.student_id, fp.fee_structure_id;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_fee_ledger_payment_update
+    AFTER UPDATE OF student_id, fee_structure_id, amount_paid, date_paid ON fee_payments
+    BEGIN
+        DELETE FROM fee_ledger
+        WHERE (student_id = OLD.student_id AND fee_structure_id = OLD.fee_structure_id)
+           OR (student_id = NEW.student_id AND fee_structure_id = NEW.fee_structure_id);
+        INSERT INTO fee_ledger (student_id, fee_structure_id, amount_due, total_paid, balance,
+                                payment_count, last_payment_date)
+        SELECT fp.student_id, fp.fee_structure_id, fs.amount, SUM(fp.amount_paid), fs.amount - SUM(fp.amount_paid),
+               COUNT(*), MAX(fp.date_paid)
+        FROM fee_payments fp JOIN fee_structures fs ON fs.id = fp.fee_structure_id
+        WHERE (fp.student_id = OLD.student_id AND fp.fee_structure_id = OLD.fee_structure_id)
+           OR (fp.student_id = NEW.student_id AND fp.fee_structure_id = NEW.fee_structure_id)
+        GROUP BY fp.student_id, fp.fee_structure_id;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_fee_ledger_structure_amount
+    AFTER UPDATE OF amount ON fee_structures
+    BEGIN
+        UPDATE fee_ledger SET amount_due = NEW.amount, balance = NEW.amount - total_paid
+        WHERE fee_structure_id = NEW.id;
+    END;
+    
+    -- Statement rows that could not be matched to a student, waiting for review
+    CREATE TABLE IF NOT EXISTS statement_review (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        transaction_id TEXT,
+        date_paid TEXT,
+        amount REAL,
+        reference TEXT,
+        payer TEXT,
+        payment_method TEXT,
+        reason TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending' CHECK(status IN ('pending', 'posted', 'dismissed')),
+        payment_id INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (payment_id) REFERENCES fee_payments(id) ON DELETE SET NULL
+    );
+    
     -- Create indexes for better performance
     CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
     CREATE INDEX IF NOT EXISTS idx_users_role ON users(role);
     CREATE INDEX IF NOT EXISTS idx_users_admission ON users(admission_number);
+    CREATE INDEX IF NOT EXISTS idx_users_teacher ON users(teacher_id);
     
     CREATE INDEX IF NOT EXISTS idx_students_admission ON students(admission_number);
     CREATE INDEX IF NOT EXISTS idx_students_class ON students(class);
     CREATE INDEX IF NOT EXISTS idx_students_created ON students(created_at);
     
+    -- Sort-key indexes so each paginated listing page is an index range scan
+    CREATE INDEX IF NOT EXISTS idx_students_class_name ON students(COALESCE(class, ''), name, id);
+    CREATE INDEX IF NOT EXISTS idx_teachers_name ON teachers(name, id);
+    CREATE INDEX IF NOT EXISTS idx_users_role_username ON users(role, username, id);
+    CREATE INDEX IF NOT EXISTS idx_grades_created ON grades(COALESCE(created_at, ''), id);
+    
     CREATE INDEX IF NOT EXISTS idx_attendance_date ON attendance(date);
     CREATE INDEX IF NOT EXISTS idx_attendance_student ON attendance(student_id);
-    CREATE INDEX IF NOT EXISTS idx_attendance_student_date ON attendance(student_id, date);
     
     CREATE INDEX IF NOT EXISTS idx_fee_payments_receipt ON fee_payments(receipt_number);
     CREATE INDEX IF NOT EXISTS idx_fee_payments_date ON fee_payments(date_paid);
     CREATE INDEX IF NOT EXISTS idx_fee_payments_student ON fee_payments(student_id);
     CREATE INDEX IF NOT EXISTS idx_fee_payments_structure ON fee_payments(fee_structure_id);
+    CREATE INDEX IF NOT EXISTS idx_fee_payments_student_structure ON fee_payments(student_id, fee_structure_id);
+    CREATE INDEX IF NOT EXISTS idx_fee_ledger_structure ON fee_ledger(fee_structure_id);
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_statement_review_transaction ON statement_review(transaction_id)
+        WHERE transaction_id IS NOT NULL AND transaction_id != '';
+    CREATE INDEX IF NOT EXISTS idx_statement_review_status ON statement_review(status, id);
     
     CREATE INDEX IF NOT EXISTS idx_fee_structures_class ON fee_structures(class);
     CREATE INDEX IF NOT EXISTS idx_fee_structures_term ON fee_structures(term, year);
     
-    CREATE INDEX IF NOT EXISTS idx_grades_student ON grades(student_id);
     CREATE INDEX IF NOT EXISTS idx_grades_subject ON grades(subject);
     CREATE INDEX IF NOT EXISTS idx_grades_term_year ON grades(term, year);
     
@@ -4814,7 +6160,118 @@ def init_db():
     -- Insert default school settings if none exists
     INSERT OR IGNORE INTO school_settings (id, school_name) VALUES (1, 'School Management System');
     ''')
-
+
+    # Full-text index over students, kept in sync by triggers; filled from
+    # the students table the first time it is created
+    has_student_search = cursor.execute('''
+        SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'students_fts'
+    ''').fetchone()
+    cursor.executescript('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5(
+        name, admission_number, guardian_name, guardian_contacts, class,
+        content = 'students', content_rowid = 'id', prefix = '2 3'
+    );
+    
+    CREATE TRIGGER IF NOT EXISTS trg_students_fts_insert AFTER INSERT ON students
+    BEGIN
+        INSERT INTO students_fts (rowid, name, admission_number, guardian_name, guardian_contacts, class)
+        VALUES (NEW.id, NEW.name, NEW.admission_number, NEW.guardian_name, NEW.guardian_contacts, NEW.class);
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_students_fts_delete AFTER DELETE ON students
+    BEGIN
+        INSERT INTO students_fts (students_fts, rowid, name, admission_number, guardian_name, guardian_contacts, class)
+        VALUES ('delete', OLD.id, OLD.name, OLD.admission_number, OLD.guardian_name, OLD.guardian_contacts, OLD.class);
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_students_fts_update
+    AFTER UPDATE OF name, admission_number, guardian_name, guardian_contacts, class ON students
+    BEGIN
+        INSERT INTO students_fts (students_fts, rowid, name, admission_number, guardian_name, guardian_contacts, class)
+        VALUES ('delete', OLD.id, OLD.name, OLD.admission_number, OLD.guardian_name, OLD.guardian_contacts, OLD.class);
+        INSERT INTO students_fts (rowid, name, admission_number, guardian_name, guardian_contacts, class)
+        VALUES (NEW.id, NEW.name, NEW.admission_number, NEW.guardian_name, NEW.guardian_contacts, NEW.class);
+    END;
+    ''')
+    if not has_student_search:
+        cursor.execute("INSERT INTO students_fts (students_fts) VALUES ('rebuild')")
+        # Rank weights: name, admission number, guardian name, guardian contacts, class
+        cursor.execute("INSERT INTO students_fts (students_fts, rank) VALUES ('rank', 'bm25(10.0, 10.0, 3.0, 3.0, 1.0)')")
+    
+    # One attendance row per student per day: drop duplicates left by the
+    # old check-then-insert save path, keeping the latest, then enforce it
+    has_attendance_key = cursor.execute('''
+        SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_attendance_student_date_unique'
+    ''').fetchone()
+    if not has_attendance_key:
+        cursor.execute('''
+            DELETE FROM attendance
+            WHERE id NOT IN (SELECT MAX(id) FROM attendance GROUP BY student_id, date)
+        ''')
+        cursor.execute('DROP INDEX IF EXISTS idx_attendance_student_date')
+        cursor.execute('CREATE UNIQUE INDEX idx_attendance_student_date_unique ON attendance(student_id, date)')
+    
+    # One score per student, subject and term: drop duplicates left by
+    # repeated submissions, keeping the latest, then enforce it
+    has_grade_key = cursor.execute('''
+        SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_grades_student_subject_term_year'
+    ''').fetchone()
+    if not has_grade_key:
+        cursor.execute('''
+            DELETE FROM grades
+            WHERE id NOT IN (SELECT MAX(id) FROM grades GROUP BY student_id, subject, term, year)
+        ''')
+        cursor.execute('DROP INDEX IF EXISTS idx_grades_student')
+        cursor.execute('''
+            CREATE UNIQUE INDEX idx_grades_student_subject_term_year ON grades(student_id, subject, term, year)
+        ''')
+    
+    # A teacher, room or class can only be in one place per period. Legacy
+    # timetables may already hold clashes, so those databases keep a plain
+    # index until validate_timetable's report has been worked through
+    for index_name, column, where in TIMETABLE_SLOT_INDEXES:
+        index = cursor.execute('''
+            SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?
+        ''', (index_name,)).fetchone()
+        if index and index[0].startswith('CREATE UNIQUE'):
+            continue
+        cursor.execute(f'DROP INDEX IF EXISTS {index_name}')
+        try:
+            cursor.execute(f'CREATE UNIQUE INDEX {index_name} ON timetable(day, period, {column}) WHERE {where}')
+        except sqlite3.IntegrityError:
+            print(f"Warning: timetable has {column} clashes; {index_name} is not enforced until they are resolved")
+            cursor.execute(f'CREATE INDEX {index_name} ON timetable(day, period, {column}) WHERE {where}')
+    
+    # A bank or mobile-money transaction can only be posted once. Payments
+    # typed in by hand before statement imports may repeat an id, so those
+    # databases keep a plain index until the duplicates are corrected
+    index = cursor.execute('''
+        SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'idx_fee_payments_transaction'
+    ''').fetchone()
+    if not (index and index[0].startswith('CREATE UNIQUE')):
+        cursor.execute('DROP INDEX IF EXISTS idx_fee_payments_transaction')
+        try:
+            cursor.execute(f'CREATE UNIQUE INDEX idx_fee_payments_transaction ON fee_payments(transaction_id) WHERE {PAYMENT_TRANSACTION_WHERE}')
+        except sqlite3.IntegrityError:
+            print("Warning: fee_payments has repeated transaction ids; idx_fee_payments_transaction is not enforced until they are corrected")
+            cursor.execute(f'CREATE INDEX idx_fee_payments_transaction ON fee_payments(transaction_id) WHERE {PAYMENT_TRANSACTION_WHERE}')
+    
+    # Rebuild class statistics so they are correct even for databases
+    # created or restored before the triggers existed
+    cursor.execute('DELETE FROM class_stats')
+    cursor.execute('''
+        INSERT INTO class_stats (class, student_count)
+        SELECT class, COUNT(*) FROM students WHERE class IS NOT NULL GROUP BY class
+    ''')
+    
+    # Fill the fee ledger for payments recorded before it existed; after
+    # that the triggers keep it current and check-fee-ledger audits it
+    ledger_missing = cursor.execute('''
+        SELECT NOT EXISTS (SELECT 1 FROM fee_ledger) AND EXISTS (SELECT 1 FROM fee_payments)
+    ''').fetchone()[0]
+    if ledger_missing:
+        rebuild_fee_ledger(conn)
+    
     # Check if admin user exists
     admin_exists = cursor.execute('SELECT id FROM users WHERE username = "admin"').fetchone()
     
@@ -4829,86 +6286,172 @@ def init_db():
     conn.commit()
     conn.close()
 
+# PRAGMA values as SQLite reports them back
+PRAGMA_VALUE_NAMES = {
+    'synchronous': {0: 'OFF', 1: 'NORMAL', 2: 'FULL', 3: 'EXTRA'},
+    'temp_store': {0: 'DEFAULT', 1: 'FILE', 2: 'MEMORY'},
+    'foreign_keys': {0: 'OFF', 1: 'ON'},
+}
+
+def check_storage_profile():
+    """Compare the configured storage profile with what SQLite actually applied"""
+    conn = get_db_connection()
+    try:
+        report = {}
+        for name, expected in app.config['DB_PRAGMAS'].items():
+            actual = conn.execute(f'PRAGMA {name}').fetchone()[0]
+            actual = PRAGMA_VALUE_NAMES.get(name, {}).get(actual, actual)
+            report[name] = {
+                'expected': expected,
+                'actual': actual,
+                'ok': str(actual).upper() == str(expected).upper()
+            }
+        return report
+    finally:
+        conn.close()
+
 # Call init at startup
 init_db()
 
+storage_profile = check_storage_profile()
+for pragma_name, result in storage_profile.items():
+    if not result['ok']:
+        print(f"Warning: PRAGMA {pragma_name} is {result['actual']}, expected {result['expected']}")
+
+# Shared cache versions
+class SharedVersion:
+    """Version stamp shared by all worker processes through a small file.
+
+    Writers call bump() after changing the data a cache is built from;
+    readers compare current() with the version their cache was built at.
+    Other workers re-read the file at most every `check_interval` seconds.
+    """
+
+    def __init__(self, path, check_interval=2):
+        self.path = path
+        self.check_interval = check_interval
+        self._version = None
+        self._checked_at = 0.0
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return ''
+
+    def current(self):
+        now = time.monotonic()
+        if self._version is None or now - self._checked_at >= self.check_interval:
+            self._version = self._read()
+            self._checked_at = now
+        return self._version
+
+    def bump(self):
+        version = uuid.uuid4().hex
+        tmp_path = f'{self.path}.{version}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(version)
+        os.replace(tmp_path, self.path)
+        self._version = version
+        self._checked_at = time.monotonic()
+        return version
+
+def shared_version(name):
+    return SharedVersion(os.path.join(app.config['CACHE_FOLDER'], f'{name}.version'),
+                         app.config['CACHE_VERSION_CHECK_INTERVAL'])
+
+settings_version = shared_version('school_settings')
+_settings_cache = (None, None)  # (version, settings row)
+
+# Versions of the data charts and reports are built from
+data_versions = {name: shared_version(name) for name in ('attendance', 'fees', 'grades', 'timetable')}
+
+def bump_data_version(*names):
+    """Mark data as changed so cached charts built from it are redrawn"""
+    for name in names:
+        data_versions[name].bump()
+
 # Helper functions
 def generate_receipt_number():
     """Generate a unique receipt number"""
     return f"RCPT-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:6].upper()}"
 
-def calculate_grade(score):
-    """Calculate grade based on custom grading system"""
-    conn = get_db_connection()
+def generate_receipt_numbers(count):
+    """Generate receipt numbers for a batch of payments: one random prefix, then a sequence"""
+    prefix = f"RCPT-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:6].upper()}"
+    return [f'{prefix}-{number:05d}' for number in range(1, count + 1)]
+
+class GradingTable:
+    """Grade boundaries compiled into a sorted array for bisect lookups"""
+
+    def __init__(self, boundaries, floor_grade='F'):
+        boundaries = sorted(boundaries)
+        self.minimums = [minimum for minimum, _ in boundaries]
+        self.grades = [floor_grade] + [grade for _, grade in boundaries]
+
+    @classmethod
+    def from_row(cls, grading):
+        return cls([(grading['min_a'], 'A'), (grading['min_b'], 'B'),
+                    (grading['min_c'], 'C'), (grading['min_d'], 'D')])
+
+    def grade(self, score):
+        return self.grades[bisect_right(self.minimums, float(score))]
+
+    def grade_many(self, scores):
+        minimums, grades = self.minimums, self.grades
+        return [grades[bisect_right(minimums, float(score))] for score in scores]
+
+DEFAULT_GRADING_TABLE = GradingTable([(80, 'A'), (70, 'B'), (60, 'C'), (50, 'D')])
+
+grading_version = shared_version('grading_system')
+_grading_cache = (None, None)  # (version, GradingTable)
+
+def get_grading_table():
+    """Get the default grading system, compiled once per grading_version"""
+    global _grading_cache
+    version = grading_version.current()
+    cached_version, table = _grading_cache
+    if table is not None and cached_version == version:
+        return table
     
+    conn = get_db_connection()
     try:
         # Get the default grading system
         grading = conn.execute('''
             SELECT * FROM grading_system WHERE is_default = 1 LIMIT 1
         ''').fetchone()
-        
-        if not grading:
-            # Fallback to default if no grading system found
-            if score >= 80:
-                return 'A'
-            elif score >= 70:
-                return 'B'
-            elif score >= 60:
-                return 'C'
-            elif score >= 50:
-                return 'D'
-            else:
-                return 'F'
-        
-        # Use custom grading system
-        score = float(score)
-        if score >= grading['min_a'] and score <= grading['max_a']:
-            return 'A'
-        elif score >= grading['min_b'] and score <= grading['max_b']:
-            return 'B'
-        elif score >= grading['min_c'] and score <= grading['max_c']:
-            return 'C'
-        elif score >= grading['min_d'] and score <= grading['max_d']:
-            return 'D'
-        else:
-            return 'F'
-            
+        # Fallback to default if no grading system found
+        table = GradingTable.from_row(grading) if grading else DEFAULT_GRADING_TABLE
     except Exception as e:
-        print(f"Error calculating grade: {e}")
-        # Fallback to simple calculation
-        if score >= 80:
-            return 'A'
-        elif score >= 70:
-            return 'B'
-        elif score >= 60:
-            return 'C'
-        elif score >= 50:
-            return 'D'
-        else:
-            return 'F'
+        print(f"Error loading grading system: {e}")
+        return DEFAULT_GRADING_TABLE
     finally:
         conn.close()
+    
+    _grading_cache = (version, table)
+    return table
+
+def calculate_grade(score):
+    """Calculate grade based on custom grading system"""
+    return get_grading_table().grade(score)
+
+def calculate_grades(scores):
+    """Calculate grades for a batch of scores in one pass"""
+    return get_grading_table().grade_many(scores)
 
 def calculate_student_balance(student_id, fee_structure_id):
     """Calculate balance for a student's fee structure"""
     conn = get_db_connection()
     
     try:
-        # Get total paid for this fee structure
-        total_paid_result = conn.execute('''
-            SELECT COALESCE(SUM(amount_paid), 0) as total_paid
-            FROM fee_payments 
-            WHERE student_id = ? AND fee_structure_id = ?
+        result = conn.execute('''
+            SELECT fs.amount - COALESCE(l.total_paid, 0) as balance
+            FROM fee_structures fs
+            LEFT JOIN fee_ledger l ON l.student_id = ? AND l.fee_structure_id = fs.id
+            WHERE fs.id = ?
         ''', (student_id, fee_structure_id)).fetchone()
-        total_paid = total_paid_result['total_paid'] if total_paid_result else 0
-        
-        # Get total fee amount
-        fee_amount_result = conn.execute('''
-            SELECT amount FROM fee_structures WHERE id = ?
-        ''', (fee_structure_id,)).fetchone()
-        fee_amount = fee_amount_result['amount'] if fee_amount_result else 0
-        
-        return fee_amount - total_paid
+        return result['balance'] if result else 0
     except Exception as e:
         print(f"Error calculating balance: {e}")
         return 0
@@ -4920,8 +6463,8 @@ def get_total_paid_for_student(student_id):
     conn = get_db_connection()
     try:
         result = conn.execute('''
-            SELECT COALESCE(SUM(amount_paid), 0) as total_paid
-            FROM fee_payments 
+            SELECT COALESCE(SUM(total_paid), 0) as total_paid
+            FROM fee_ledger
             WHERE student_id = ?
         ''', (student_id,)).fetchone()
         return result['total_paid'] if result else 0
@@ -4976,8 +6519,30 @@ def generate_color(subject):
     hue = hash_val % 360
     return f'hsl({hue}, 70%, 60%)'
 
+_pyplot = None
+
+def get_pyplot():
+    """Import matplotlib's pyplot on first use.
+
+    matplotlib takes hundreds of milliseconds and tens of MB to import, so
+    workers only pay for it once a chart is actually drawn.
+    """
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib
+        matplotlib.use('Agg')  # Use non-interactive backend
+        import matplotlib.pyplot as plt
+        _pyplot = plt
+    return _pyplot
+
 def get_school_settings():
-    """Get school settings"""
+    """Get school settings, cached until settings_version is bumped"""
+    global _settings_cache
+    version = settings_version.current()
+    cached_version, cached_settings = _settings_cache
+    if cached_settings is not None and cached_version == version:
+        return dict(cached_settings)
+    
     conn = get_db_connection()
     try:
         settings = conn.execute('SELECT * FROM school_settings WHERE id = 1').fetchone()
@@ -4988,10 +6553,189 @@ def get_school_settings():
             ''')
             conn.commit()
             settings = conn.execute('SELECT * FROM school_settings WHERE id = 1').fetchone()
-        return dict(settings) if settings else {}
+        settings = dict(settings) if settings else {}
+        _settings_cache = (version, settings)
+        return dict(settings)
+    finally:
+        conn.close()
+
+def get_class_roster(teacher_id=None):
+    """Get classes with teacher names and student counts in one query"""
+    if app.config['USE_CLASS_STATS']:
+        counts = 'SELECT class, student_count FROM class_stats'
+    else:
+        counts = 'SELECT class, COUNT(*) as student_count FROM students GROUP BY class'
+    
+    query = f'''
+        SELECT c.*, t.name as teacher_name, COALESCE(sc.student_count, 0) as student_count
+        FROM classes c
+        LEFT JOIN teachers t ON c.teacher_id = t.id
+        LEFT JOIN ({counts}) sc ON sc.class = c.name
+    '''
+    params = []
+    
+    if teacher_id is not None:
+        query += ' WHERE c.teacher_id = ?'
+        params.append(teacher_id)
+    
+    query += ' ORDER BY c.name'
+    
+    conn = get_db_connection()
+    try:
+        return [dict(row) for row in conn.execute(query, params).fetchall()]
     finally:
         conn.close()
 
+def encode_cursor(values):
+    """Encode sort-key values into an opaque URL-safe page token"""
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(token, length):
+    """Decode a page token holding `length` sort keys, returning None if it is missing or malformed"""
+    if not token:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != length:
+        return None
+    # Every key is bound as an SQL parameter, so only SQLite scalars are allowed
+    for value in values:
+        if isinstance(value, bool) or not isinstance(value, (str, int, float, type(None))):
+            return None
+        if isinstance(value, int) and not -2**63 <= value < 2**63:
+            return None
+    return values
+
+def get_page_size():
+    """Get the requested page size, clamped to the configured maximum"""
+    try:
+        page_size = int(request.args.get('page_size', app.config['PAGE_SIZE']))
+    except ValueError:
+        page_size = app.config['PAGE_SIZE']
+    return max(1, min(page_size, app.config['MAX_PAGE_SIZE']))
+
+class KeysetPage:
+    """One page of a keyset-paginated listing"""
+
+    def __init__(self, rows, next_cursor=None, prev_cursor=None):
+        self.rows = rows
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.next_url = self._url('after', next_cursor)
+        self.prev_url = self._url('before', prev_cursor)
+
+    @staticmethod
+    def _url(direction, cursor):
+        if cursor is None:
+            return None
+        args = request.args.to_dict()
+        args.pop('after', None)
+        args.pop('before', None)
+        args[direction] = cursor
+        return url_for(request.endpoint, **(request.view_args or {}), **args)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+def paginate(conn, select, from_clause, order_by, where=None, params=(), descending=False):
+    """Fetch one page of rows using keyset pagination on `order_by`.
+
+    `order_by` is a list of SQL expressions that together are unique per row
+    (end it with the primary key). The page position comes from the `after`
+    or `before` request arguments, which hold the sort keys of the last or
+    first row of the neighbouring page.
+    """
+    page_size = get_page_size()
+    after = decode_cursor(request.args.get('after'), len(order_by))
+    before = decode_cursor(request.args.get('before'), len(order_by)) if after is None else None
+    
+    conditions = list(where or [])
+    params = list(params)
+    key_list = ', '.join(order_by)
+    for cursor, forward in ((after, True), (before, False)):
+        if cursor is not None:
+            operator = '>' if forward != descending else '<'
+            # The redundant bound on the leading key lets SQLite seek an
+            # expression index, which it will not do for the row value alone
+            conditions.append(f'{order_by[0]} {operator}= ?')
+            conditions.append(f'({key_list}) {operator} ({", ".join("?" * len(order_by))})')
+            params.append(cursor[0])
+            params.extend(cursor)
+    
+    # Walk backwards from the cursor when paging to the previous page
+    backwards = before is not None and len(before) == len(order_by)
+    direction = 'DESC' if descending != backwards else 'ASC'
+    key_columns = ', '.join(f'{key} AS _sort_key_{i}' for i, key in enumerate(order_by))
+    query = f'SELECT {select}, {key_columns} {from_clause}'
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(f'({condition})' for condition in conditions)
+    query += ' ORDER BY ' + ', '.join(f'{key} {direction}' for key in order_by)
+    query += ' LIMIT ?'
+    params.append(page_size + 1)
+    
+    rows = conn.execute(query, params).fetchall()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backwards:
+        rows.reverse()
+    
+    def cursor_for(row):
+        return encode_cursor([row[f'_sort_key_{i}'] for i in range(len(order_by))])
+    
+    if not rows:
+        return KeysetPage(rows)
+    if backwards:
+        next_cursor = cursor_for(rows[-1])
+        prev_cursor = cursor_for(rows[0]) if has_more else None
+    else:
+        next_cursor = cursor_for(rows[-1]) if has_more else None
+        prev_cursor = cursor_for(rows[0]) if after is not None else None
+    return KeysetPage(rows, next_cursor, prev_cursor)
+
+def build_search_query(text):
+    """Turn free text into an FTS5 query where every word is a prefix match"""
+    words = re.findall(r'\w+', text or '')
+    return ' '.join(f'"{word}"*' for word in words)
+
+def search_students(conn, text, limit, offset=0):
+    """Find students matching `text`, best matches first"""
+    match = build_search_query(text)
+    if not match:
+        return []
+    
+    # Rank inside the index first so only the returned page is joined
+    return conn.execute('''
+        SELECT s.*, m.search_rank
+        FROM (
+            SELECT rowid, rank as search_rank
+            FROM students_fts
+            WHERE students_fts MATCH ?
+            ORDER BY rank
+            LIMIT ? OFFSET ?
+        ) m
+        JOIN students s ON s.id = m.rowid
+        ORDER BY m.search_rank
+    ''', (match, limit, offset)).fetchall()
+
+def paginate_student_search(conn, text):
+    """One page of students matching `text`, best matches first, with keyset cursors like the full list"""
+    match = build_search_query(text)
+    if not match:
+        return KeysetPage([])
+    return paginate(conn, 's.*, m.search_rank', '''
+        FROM (
+            SELECT rowid, rank as search_rank
+            FROM students_fts
+            WHERE students_fts MATCH ?
+        ) m
+        JOIN students s ON s.id = m.rowid
+    ''', ['m.search_rank', 's.id'], params=(match,))
+
 def get_current_user_role():
     """Get current user's role from session"""
     return session.get('role')
@@ -5008,10 +6752,154 @@ def inject_today():
         'current_year': datetime.now().year,
         'generate_color': generate_color,
         'calculate_grade': calculate_grade,
+        'calculate_grades': calculate_grades,
         'school_settings': get_school_settings(),
         'os': os
     }
 
+# Password hashing and login throttling
+class PasswordHasherBusy(RuntimeError):
+    """Raised when too many password hashes are already queued"""
+
+class PasswordHasher:
+    """Bounded thread pool for password hashing.
+
+    scrypt releases the GIL, so hashes run beside other requests, but at
+    most `workers` at a time; past `max_pending` queued or running hashes,
+    callers are turned away instead of piling up behind a login storm.
+    """
+
+    def __init__(self, workers=1, max_pending=32):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._counters = {
+            'hashes': 0,
+            'rejected': 0,
+            'total_queue_ms': 0.0,
+            'max_queue_ms': 0.0,
+            'total_hash_ms': 0.0
+        }
+
+    def _run(self, function, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._counters['rejected'] += 1
+            raise PasswordHasherBusy('Too many sign-ins in progress, please try again in a moment')
+        submitted = time.perf_counter()
+        
+        def task():
+            started = time.perf_counter()
+            try:
+                return function(*args)
+            finally:
+                queue_ms = (started - submitted) * 1000
+                with self._lock:
+                    self._counters['hashes'] += 1
+                    self._counters['total_queue_ms'] += queue_ms
+                    self._counters['max_queue_ms'] = max(self._counters['max_queue_ms'], queue_ms)
+                    self._counters['total_hash_ms'] += (time.perf_counter() - started) * 1000
+        
+        with self._lock:
+            self._pending += 1
+        try:
+            return self._executor.submit(task).result()
+        finally:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+
+    def generate(self, password):
+        return self._run(generate_password_hash, password, app.config['PASSWORD_HASH_METHOD'])
+
+    def check(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def stats(self):
+        """Snapshot of hashes run, time spent queued and requests turned away"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['pending'] = self._pending
+        stats['workers'] = self.workers
+        stats['max_pending'] = self.max_pending
+        stats['avg_queue_ms'] = round(stats['total_queue_ms'] / stats['hashes'], 3) if stats['hashes'] else 0.0
+        stats['avg_hash_ms'] = round(stats['total_hash_ms'] / stats['hashes'], 3) if stats['hashes'] else 0.0
+        for key in ('total_queue_ms', 'max_queue_ms', 'total_hash_ms'):
+            stats[key] = round(stats[key], 3)
+        return stats
+
+class LoginThrottle:
+    """Sliding-window limit on failed logins.
+
+    Failures are limited per username and IP, so one user's typos never
+    lock out classmates behind the same NAT, and per IP across every
+    username, with a much higher limit, which is what guessing across
+    accounts looks like. Both limits are checked before the username is
+    looked up, so a blocked IP gets the same answer for real and unknown
+    accounts. Failures are counted in this worker process only, so with
+    several workers an attacker gets up to that many times the configured
+    limits.
+    """
+
+    def __init__(self, window=300, max_per_user=5, max_per_ip=100):
+        self.window = window
+        self.limits = {'user': max_per_user, 'ip': max_per_ip}
+        self._failures = {}  # key -> recent failure times, at most the key's limit
+        self._lock = threading.Lock()
+        self._counters = {'failures': 0, 'blocked': 0}
+
+    def _keys(self, username, ip):
+        return [('user', username.lower(), ip), ('ip', ip)]
+
+    def retry_after(self, username, ip):
+        """Seconds until this username may be tried again from this IP; 0 if not throttled"""
+        now = time.monotonic()
+        wait = 0
+        with self._lock:
+            for key in self._keys(username, ip):
+                failures = self._failures.get(key)
+                if failures and len(failures) >= self.limits[key[0]]:
+                    wait = max(wait, failures[0] + self.window - now)
+            if wait > 0:
+                self._counters['blocked'] += 1
+        return math.ceil(wait) if wait > 0 else 0
+
+    def record_failure(self, username, ip):
+        now = time.monotonic()
+        with self._lock:
+            self._counters['failures'] += 1
+            for key in self._keys(username, ip):
+                if key not in self._failures:
+                    self._failures[key] = deque(maxlen=self.limits[key[0]])
+                self._failures[key].append(now)
+            if len(self._failures) > 10000:
+                # Forget keys whose failures have all aged out
+                cutoff = now - self.window
+                self._failures = {key: failures for key, failures in self._failures.items()
+                                  if failures[-1] > cutoff}
+
+    def record_success(self, username, ip):
+        with self._lock:
+            self._failures.pop(('user', username.lower(), ip), None)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['tracked_keys'] = len(self._failures)
+        stats['window'] = self.window
+        stats['max_per_user'] = self.limits['user']
+        stats['max_per_ip'] = self.limits['ip']
+        return stats
+
+password_hasher = PasswordHasher(workers=app.config['PASSWORD_HASH_WORKERS'],
+                                 max_pending=app.config['PASSWORD_HASH_MAX_PENDING'])
+login_throttle = LoginThrottle(window=app.config['LOGIN_THROTTLE_WINDOW'],
+                               max_per_user=app.config['LOGIN_MAX_FAILURES_PER_USER'],
+                               max_per_ip=app.config['LOGIN_MAX_FAILURES_PER_IP'])
+
 # -------- Authentication Routes --------
 
 @app.route('/login', methods=['GET', 'POST'])
@@ -5021,16 +6909,37 @@ def login():
         password = request.form['password']
         role = request.form['role']
         
+        # Throttled attempts are refused before the username is looked up
+        # or any hashing is done
+        retry_after = login_throttle.retry_after(username, request.remote_addr)
+        if retry_after:
+            flash(f'Too many failed logins. Try again in {retry_after} seconds.', 'error')
+            return render_template('login.html'), 429, {'Retry-After': str(retry_after)}
+        
         conn = get_db_connection()
         user = conn.execute('''
-            SELECT * FROM users 
+            SELECT id, username, role, full_name, password_hash FROM users 
             WHERE username = ? AND role = ? AND is_active = 1
         ''', (username, role)).fetchone()
+        user = dict(user) if user else None
+        # Hand the connection back while hashing, so queued hashes cannot
+        # hold every pooled connection
+        release_db_connection()
+        
+        try:
+            valid = bool(user) and password_hasher.check(user['password_hash'], password)
+        except PasswordHasherBusy as e:
+            flash(str(e), 'error')
+            return render_template('login.html'), 503, {'Retry-After': '5'}
         
-        if user and check_password_hash(user['password_hash'], password):
+        if valid:
+            login_throttle.record_success(username, request.remote_addr)
+            
             # Update last login
+            conn = get_db_connection()
             conn.execute('UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = ?', (user['id'],))
             conn.commit()
+            conn.close()
             
             # Set session
             session['user_id'] = user['id']
@@ -5046,9 +6955,8 @@ def login():
             elif role == 'student':
                 return redirect(url_for('student_dashboard'))
         else:
+            login_throttle.record_failure(username, request.remote_addr)
             flash('Invalid username, password, or role', 'error')
-        
-        conn.close()
     
     return render_template('login.html')
 
@@ -5068,22 +6976,20 @@ def user_management():
     
     conn = get_db_connection()
     
-    query = '''
-        SELECT u.*, s.name as student_name, t.name as teacher_name
-        FROM users u
-        LEFT JOIN students s ON u.admission_number = s.admission_number
-        LEFT JOIN teachers t ON u.teacher_id = t.id
-        WHERE u.id != ?
-    '''
+    where = ['u.id != ?']
     params = [session['user_id']]
     
     if role_filter != 'all':
-        query += ' AND u.role = ?'
+        where.append('u.role = ?')
         params.append(role_filter)
     
-    query += ' ORDER BY u.role, u.username'
-    
-    users = conn.execute(query, params).fetchall()
+    users = paginate(conn,
+                     'u.*, s.name as student_name, t.name as teacher_name',
+                     '''FROM users u
+                        LEFT JOIN students s ON u.admission_number = s.admission_number
+                        LEFT JOIN teachers t ON u.teacher_id = t.id''',
+                     ['u.role', 'u.username', 'u.id'],
+                     where=where, params=params)
     
     # Get all users for reset password dropdown
     all_users = conn.execute('SELECT id, username, role, full_name FROM users WHERE id != ?', 
@@ -5112,8 +7018,8 @@ def add_user():
     teacher_id = request.form.get('teacher_id', '') if role == 'teacher' else None
     is_active = 'is_active' in request.form
     
-    # Default password
-    password_hash = generate_password_hash('school123')
+    if teacher_id == '':
+        teacher_id = None
     
     conn = get_db_connection()
     
@@ -5124,6 +7030,9 @@ def add_user():
             flash('Username already exists!', 'error')
             return redirect(url_for('user_management'))
         
+        # Default password
+        password_hash = password_hasher.generate('school123')
+        
         # Insert new user
         conn.execute('''
             INSERT INTO users (username, password_hash, full_name, email, role, 
@@ -5135,7 +7044,7 @@ def add_user():
         conn.commit()
         flash(f'User {username} added successfully! Default password: school123', 'success')
         
-    except sqlite3.IntegrityError as e:
+    except (sqlite3.IntegrityError, PasswordHasherBusy) as e:
         flash(f'Error adding user: {str(e)}', 'error')
     finally:
         conn.close()
@@ -5232,7 +7141,7 @@ def reset_user_password(id):
     
     try:
         # Reset to default password
-        password_hash = generate_password_hash('school123')
+        password_hash = password_hasher.generate('school123')
         conn.execute('''
             UPDATE users 
             SET password_hash = ?, updated_at = CURRENT_TIMESTAMP 
@@ -5261,7 +7170,7 @@ def reset_password_bulk():
     conn = get_db_connection()
     
     try:
-        password_hash = generate_password_hash(new_password)
+        password_hash = password_hasher.generate(new_password)
         conn.execute('''
             UPDATE users 
             SET password_hash = ?, updated_at = CURRENT_TIMESTAMP 
@@ -5277,6 +7186,169 @@ def reset_password_bulk():
     
     return redirect(url_for('user_management'))
 
+def accounts_to_provision(conn, role):
+    """Accounts for every student or teacher without one; returns (accounts, usernames already taken)"""
+    taken = {row[0] for row in conn.execute('SELECT username FROM users')}
+    accounts = []
+    conflicts = []
+    if role == 'student':
+        # Students sign in with their admission number
+        rows = conn.execute('''
+            SELECT s.admission_number, s.name FROM students s
+            WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.admission_number = s.admission_number)
+            ORDER BY s.admission_number
+        ''')
+        for admission_number, name in rows:
+            if admission_number in taken:
+                conflicts.append(admission_number)
+            else:
+                accounts.append((admission_number, name, None, admission_number, None))
+    else:
+        rows = conn.execute('''
+            SELECT t.id, t.name, t.email FROM teachers t
+            WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.teacher_id = t.id)
+            ORDER BY t.id
+        ''')
+        for teacher_id, name, email in rows:
+            username = (email or '').split('@')[0].lower() or re.sub(r'[^a-z0-9]+', '.', name.lower()).strip('.')
+            if not username or username in taken:
+                # Suffix with the teacher id, then a counter, until the name is free
+                base = f'{username or "teacher"}{teacher_id}'
+                username, suffix = base, 1
+                while username in taken:
+                    suffix += 1
+                    username = f'{base}.{suffix}'
+            taken.add(username)
+            accounts.append((username, name, email, None, teacher_id))
+    return accounts, conflicts
+
+def provision_accounts(role, job_id=None, password='school123', workers=None):
+    """Create accounts for every student or teacher without one, publishing progress to the job's status file"""
+    status = {
+        'state': 'running',
+        'role': role,
+        'total': 0,
+        'processed': 0,
+        'created': 0,
+        'skipped': 0,
+        'failed': 0,
+        'errors': [],
+        'progress': 0,
+        'accounts_per_second': 0
+    }
+    started = time.perf_counter()
+    method = app.config['PASSWORD_HASH_METHOD']
+    batch_size = app.config['PROVISION_BATCH_SIZE']
+    workers = workers or app.config['PROVISION_WORKERS']
+    
+    def publish():
+        if job_id:
+            write_import_status(job_id, status)
+    
+    conn = None
+    executor = None
+    try:
+        conn = db_pool.acquire()
+        accounts, conflicts = accounts_to_provision(conn, role)
+        status['total'] = len(accounts) + len(conflicts)
+        for username in conflicts:
+            status['processed'] += 1
+            status['failed'] += 1
+            if len(status['errors']) < app.config['STUDENT_IMPORT_MAX_ERRORS']:
+                status['errors'].append({'username': username, 'error': 'username already belongs to another user'})
+        publish()
+        
+        # Hashing dominates, so batches are hashed in parallel in low-priority
+        # processes, leaving this worker's CPU to requests, and each batch is
+        # inserted as soon as it comes back, in order
+        batches = [accounts[start:start + batch_size] for start in range(0, len(accounts), batch_size)]
+        if batches:
+            executor = ProcessPoolExecutor(max_workers=min(workers, len(batches)), mp_context=WORKER_MP_CONTEXT,
+                                           initializer=password_worker.init_worker,
+                                           initargs=(app.config['PROVISION_NICENESS'],))
+            hashed = executor.map(password_worker.hash_passwords, [password] * len(batches),
+                                  [len(batch) for batch in batches], [method] * len(batches))
+        else:
+            hashed = []
+        
+        for batch, hashes in zip(batches, hashed):
+            with conn:
+                created = conn.executemany('''
+                    INSERT INTO users (username, password_hash, full_name, email, role,
+                                       admission_number, teacher_id, is_active)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+                    ON CONFLICT(username) DO NOTHING
+                ''', [(username, password_hash, full_name, email, role, admission_number, teacher_id)
+                      for (username, full_name, email, admission_number, teacher_id), password_hash
+                      in zip(batch, hashes)]).rowcount
+            status['processed'] += len(batch)
+            status['created'] += created
+            status['skipped'] += len(batch) - created
+            
+            elapsed = time.perf_counter() - started
+            status['progress'] = min(int(status['processed'] * 100 / status['total']), 99)
+            status['accounts_per_second'] = round(status['processed'] / elapsed, 1) if elapsed else 0
+            publish()
+        
+        elapsed = time.perf_counter() - started
+        status.update(state='done', progress=100, seconds=round(elapsed, 1),
+                      accounts_per_second=round(status['processed'] / elapsed, 1) if elapsed else 0)
+    except (sqlite3.Error, OSError) as e:
+        print(f"Account provisioning failed: {e}")
+        status.update(state='failed', message=str(e))
+    except Exception as e:
+        # Anything else would kill the thread and leave the status page polling forever
+        print(f"Account provisioning failed unexpectedly: {e!r}")
+        status.update(state='failed', message=f'Unexpected error: {e}')
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if conn is not None:
+            conn.close()
+    
+    publish()
+    return status
+
+@app.route('/user/provision', methods=['GET', 'POST'])
+@login_required
+@role_required('admin')
+def provision_users():
+    if request.method == 'POST':
+        role = request.form.get('role', '')
+        if role not in ('student', 'teacher'):
+            flash('Choose students or teachers to provision!', 'error')
+            return redirect(url_for('provision_users'))
+        
+        job_id = uuid.uuid4().hex
+        os.makedirs(os.path.join(app.config['CACHE_FOLDER'], 'imports'), exist_ok=True)
+        write_import_status(job_id, {'state': 'queued', 'role': role, 'progress': 0, 'processed': 0})
+        
+        threading.Thread(target=provision_accounts, args=(role, job_id),
+                         name=f'provision-{job_id[:8]}', daemon=True).start()
+        return redirect(url_for('provision_users', job=job_id))
+    
+    conn = get_db_connection()
+    missing = conn.execute('''
+        SELECT (SELECT COUNT(*) FROM students s
+                WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.admission_number = s.admission_number)) as students,
+               (SELECT COUNT(*) FROM teachers t
+                WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.teacher_id = t.id)) as teachers
+    ''').fetchone()
+    conn.close()
+    
+    job_id = request.args.get('job', '')
+    status = read_import_status(job_id) if job_id else None
+    return render_template('provision_users.html', job_id=job_id if status else '', status=status, missing=missing)
+
+@app.route('/user/provision/<job_id>')
+@login_required
+@role_required('admin')
+def provision_users_status(job_id):
+    status = read_import_status(job_id)
+    if status is None:
+        abort(404)
+    return jsonify(status)
+
 # -------- Student Dashboard Routes --------
 
 @app.route('/student/dashboard')
@@ -5339,14 +7411,9 @@ def student_dashboard():
     
     # Calculate fee balance
     fee_structures = conn.execute('''
-        SELECT fs.*, 
-               COALESCE((
-                   SELECT SUM(fp.amount_paid) 
-                   FROM fee_payments fp 
-                   WHERE fp.fee_structure_id = fs.id 
-                   AND fp.student_id = ?
-               ), 0) as paid_amount
+        SELECT fs.*, COALESCE(l.total_paid, 0) as paid_amount
         FROM fee_structures fs
+        LEFT JOIN fee_ledger l ON l.student_id = ? AND l.fee_structure_id = fs.id
         WHERE fs.class = ?
     ''', (student['id'], student['class'])).fetchall()
     
@@ -5408,9 +7475,12 @@ def student_grades():
     for term, data in term_summary.items():
         data['count'] = len(data['scores'])
         data['average'] = sum(data['scores']) / len(data['scores'])
-        data['grade'] = calculate_grade(data['average'])
         # You can add position calculation here if you track class rankings
     
+    term_grades = calculate_grades(data['average'] for data in term_summary.values())
+    for data, grade in zip(term_summary.values(), term_grades):
+        data['grade'] = grade
+    
     # Calculate subject performance
     subject_scores = {}
     for grade in grades:
@@ -5419,13 +7489,15 @@ def student_grades():
             subject_scores[subject] = []
         subject_scores[subject].append(grade['score'])
     
+    subject_averages = {subject: sum(scores) / len(scores) for subject, scores in subject_scores.items()}
+    subject_grades = calculate_grades(subject_averages.values())
+    
     subject_performance = []
-    for subject, scores in subject_scores.items():
-        avg_score = sum(scores) / len(scores)
+    for (subject, avg_score), grade in zip(subject_averages.items(), subject_grades):
         subject_performance.append({
             'name': subject,
             'average_score': avg_score,
-            'grade': calculate_grade(avg_score)
+            'grade': grade
         })
     
     conn.close()
@@ -5525,19 +7597,10 @@ def student_fees():
     # Get fee structures with payments
     fee_structures = conn.execute('''
         SELECT fs.*, 
-               COALESCE((
-                   SELECT SUM(fp.amount_paid) 
-                   FROM fee_payments fp 
-                   WHERE fp.fee_structure_id = fs.id 
-                   AND fp.student_id = ?
-               ), 0) as paid_amount,
-               fs.amount - COALESCE((
-                   SELECT SUM(fp.amount_paid) 
-                   FROM fee_payments fp 
-                   WHERE fp.fee_structure_id = fs.id 
-                   AND fp.student_id = ?
-               ), 0) as balance
+               COALESCE(l.total_paid, 0) as paid_amount,
+               fs.amount - COALESCE(l.total_paid, 0) as balance
         FROM fee_structures fs
+        LEFT JOIN fee_ledger l ON l.student_id = ? AND l.fee_structure_id = fs.id
         WHERE fs.class = ?
         ORDER BY fs.year DESC, 
                  CASE fs.term 
@@ -5545,7 +7608,7 @@ def student_fees():
                      WHEN 'Term 2' THEN 2 
                      WHEN 'Term 3' THEN 3 
                  END
-    ''', (student['id'], student['id'], student['class'])).fetchall()
+    ''', (student['id'], student['class'])).fetchall()
     
     # Calculate fee summary
     total_fee = sum(fs['amount'] for fs in fee_structures)
@@ -5605,13 +7668,7 @@ def teacher_dashboard():
     ''', (teacher['id'], today)).fetchall()
     
     # Get assigned classes
-    my_classes = conn.execute('''
-        SELECT c.*, 
-               (SELECT COUNT(*) FROM students s WHERE s.class = c.name) as student_count
-        FROM classes c
-        WHERE c.teacher_id = ?
-        ORDER BY c.name
-    ''', (teacher['id'],)).fetchall()
+    my_classes = get_class_roster(teacher_id=teacher['id'])
     
     # Get recent attendance marked by this teacher
     recent_attendance = conn.execute('''
@@ -5649,10 +7706,45 @@ def teacher_dashboard():
 @login_required
 @role_required('admin', 'teacher')
 def students():
+    search_query = request.args.get('q', '').strip()
+    
+    conn = get_db_connection()
+    if search_query:
+        students = paginate_student_search(conn, search_query)
+    else:
+        students = paginate(conn, 's.*', 'FROM students s', ["COALESCE(s.class, '')", 's.name', 's.id'])
+    conn.close()
+    return render_template('students.html', students=students, search_query=search_query)
+
+@app.route('/students/search')
+@login_required
+@role_required('admin', 'teacher')
+def search_students_json():
+    query = request.args.get('q', '').strip()
+    page_size = get_page_size()
+    try:
+        page = max(int(request.args.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+    
     conn = get_db_connection()
-    students = conn.execute('SELECT * FROM students ORDER BY class, name').fetchall()
+    matches = search_students(conn, query, page_size + 1, (page - 1) * page_size)
     conn.close()
-    return render_template('students.html', students=students)
+    
+    return jsonify({
+        'query': query,
+        'page': page,
+        'next_page': page + 1 if len(matches) > page_size else None,
+        'results': [{
+            'id': student['id'],
+            'admission_number': student['admission_number'],
+            'name': student['name'],
+            'class': student['class'],
+            'guardian_name': student['guardian_name'],
+            'guardian_contacts': student['guardian_contacts'],
+            'url': url_for('edit_student', id=student['id'])
+        } for student in matches[:page_size]]
+    })
 
 @app.route('/students/add', methods=['GET', 'POST'])
 @login_required
@@ -5715,6 +7807,227 @@ def add_student():
     
     return render_template('add_student.html')
 
+# CSV header (lower-cased, punctuation folded to '_') -> students column.
+# Accepts the column names and the headings used by the students export.
+STUDENT_IMPORT_COLUMNS = {
+    'admission_number': 'admission_number',
+    'admission_no': 'admission_number',
+    'name': 'name',
+    'age': 'age',
+    'class': 'class',
+    'guardian_name': 'guardian_name',
+    'guardian_contacts': 'guardian_contacts',
+    'guardian_email': 'guardian_email',
+    'address': 'address',
+    'medical_conditions': 'medical_conditions',
+    'allergies': 'allergies',
+    'medications': 'medications',
+    'blood_type': 'blood_type',
+    'emergency_contact': 'emergency_contact_name',
+    'emergency_contact_name': 'emergency_contact_name',
+    'emergency_contact_relation': 'emergency_contact_relation',
+    'emergency_phone': 'emergency_contact_phone',
+    'emergency_contact_phone': 'emergency_contact_phone',
+    'emergency_contact_alt_phone': 'emergency_contact_alt_phone',
+    'emergency_contact_email': 'emergency_contact_email'
+}
+
+STUDENT_IMPORT_REQUIRED = ['admission_number', 'name', 'class']
+
+def import_job_path(job_id, extension, folder='imports'):
+    """Path of a background job's upload or status file; each kind of job keeps its own folder"""
+    if not re.fullmatch(r'[0-9a-f]{32}', job_id):
+        abort(404)
+    return os.path.join(app.config['CACHE_FOLDER'], folder, f'{job_id}.{extension}')
+
+def write_import_status(job_id, status, folder='imports'):
+    """Publish job progress where every worker can read it"""
+    path = import_job_path(job_id, 'json', folder)
+    tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(status, f)
+    os.replace(tmp_path, path)
+
+def read_import_status(job_id, folder='imports'):
+    try:
+        with open(import_job_path(job_id, 'json', folder)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def parse_student_row(row, columns):
+    """Validate one CSV row; returns (values, error)"""
+    values = {}
+    for header, column in columns.items():
+        values[column] = (row.get(header) or '').strip()
+    
+    missing = [column for column in STUDENT_IMPORT_REQUIRED if not values.get(column)]
+    if missing:
+        return None, f"missing {', '.join(missing)}"
+    
+    if values.get('age'):
+        try:
+            values['age'] = int(values['age'])
+        except ValueError:
+            return None, f"age '{values['age']}' is not a number"
+        if not 1 <= values['age'] <= 100:
+            return None, f"age {values['age']} is out of range"
+    elif 'age' in values:
+        values['age'] = None
+    
+    if 'medical_conditions' in values:
+        values['has_medical_condition'] = 1 if values['medical_conditions'] else 0
+    return values, None
+
+def import_students_csv(job_id, path, on_conflict='skip'):
+    """Import a students CSV in batched transactions, publishing progress as it goes"""
+    status = {
+        'state': 'running',
+        'processed': 0,
+        'inserted': 0,
+        'updated': 0,
+        'skipped': 0,
+        'failed': 0,
+        'errors': [],
+        'progress': 0,
+        'rows_per_second': 0
+    }
+    started = time.perf_counter()
+    total_bytes = os.path.getsize(path) or 1
+    batch_size = app.config['STUDENT_IMPORT_BATCH_SIZE']
+    
+    def fail(line, admission_number, message):
+        status['failed'] += 1
+        # Keep the status file small; the counts still cover every row
+        if len(status['errors']) < app.config['STUDENT_IMPORT_MAX_ERRORS']:
+            status['errors'].append({'line': line, 'admission_number': admission_number, 'error': message})
+    
+    conn = None
+    try:
+        conn = db_pool.acquire()
+        with open(path, 'rb') as raw:
+            reader = csv.DictReader(io.TextIOWrapper(raw, encoding='utf-8-sig', newline=''))
+            columns = {}
+            for header in reader.fieldnames or []:
+                column = STUDENT_IMPORT_COLUMNS.get(re.sub(r'[^a-z0-9]+', '_', header.strip().lower()).strip('_'))
+                if column and column not in columns.values():
+                    columns[header] = column
+            missing = [column for column in STUDENT_IMPORT_REQUIRED if column not in columns.values()]
+            if missing:
+                status.update(state='failed', message=f"CSV is missing the {', '.join(missing)} column(s)")
+                write_import_status(job_id, status)
+                return status
+            
+            # admission_number goes first so flush() can find the existing rows;
+            # has_medical_condition follows medical_conditions when that column is present
+            fields = ['admission_number'] + [column for column in columns.values() if column != 'admission_number']
+            admission_header = next(header for header, column in columns.items() if column == 'admission_number')
+            if 'medical_conditions' in fields:
+                fields.append('has_medical_condition')
+            if on_conflict == 'update':
+                updates = ', '.join(f'{field} = excluded.{field}' for field in fields if field != 'admission_number')
+                conflict = f'DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP'
+            else:
+                conflict = 'DO NOTHING'
+            insert = f'''
+                INSERT INTO students ({', '.join(fields)})
+                VALUES ({', '.join('?' * len(fields))})
+                ON CONFLICT(admission_number) {conflict}
+            '''
+            
+            seen = set()
+            batch = []
+            
+            def flush():
+                numbers = [values[0] for values in batch]
+                existing = {row[0] for row in conn.execute(f'''
+                    SELECT admission_number FROM students
+                    WHERE admission_number IN ({','.join('?' * len(numbers))})
+                ''', numbers)}
+                with conn:
+                    conn.executemany(insert, batch)
+                status['inserted'] += len(batch) - len(existing)
+                status['updated' if on_conflict == 'update' else 'skipped'] += len(existing)
+                batch.clear()
+                
+                elapsed = time.perf_counter() - started
+                status['progress'] = min(int(raw.tell() * 100 / total_bytes), 99)
+                status['rows_per_second'] = int(status['processed'] / elapsed) if elapsed else 0
+                write_import_status(job_id, status)
+            
+            for row in reader:
+                status['processed'] += 1
+                values, error = parse_student_row(row, columns)
+                if error:
+                    fail(reader.line_num, row.get(admission_header) or '', error)
+                    continue
+                if values['admission_number'] in seen:
+                    fail(reader.line_num, values['admission_number'], 'duplicate admission number in file')
+                    continue
+                seen.add(values['admission_number'])
+                batch.append(tuple(values[field] for field in fields))
+                if len(batch) >= batch_size:
+                    flush()
+            if batch:
+                flush()
+        
+        elapsed = time.perf_counter() - started
+        status.update(state='done', progress=100,
+                      rows_per_second=int(status['processed'] / elapsed) if elapsed else 0)
+    except (csv.Error, UnicodeDecodeError, sqlite3.Error) as e:
+        print(f"Student import {job_id} failed: {e}")
+        status.update(state='failed', message=str(e))
+    except Exception as e:
+        # Anything else would kill the thread and leave the status page polling forever
+        print(f"Student import {job_id} failed unexpectedly: {e!r}")
+        status.update(state='failed', message=f'Unexpected error: {e}')
+    finally:
+        if conn is not None:
+            conn.close()
+        os.remove(path)
+    
+    write_import_status(job_id, status)
+    return status
+
+@app.route('/students/import', methods=['GET', 'POST'])
+@login_required
+@role_required('admin')
+def import_students():
+    if request.method == 'POST':
+        upload = request.files.get('csv_file')
+        if not upload or not upload.filename:
+            flash('No CSV file selected!', 'error')
+            return redirect(url_for('import_students'))
+        if not upload.filename.lower().endswith('.csv'):
+            flash('Please upload a .csv file!', 'error')
+            return redirect(url_for('import_students'))
+        
+        on_conflict = 'update' if request.form.get('on_conflict') == 'update' else 'skip'
+        job_id = uuid.uuid4().hex
+        os.makedirs(os.path.join(app.config['CACHE_FOLDER'], 'imports'), exist_ok=True)
+        # The upload is spooled to disk so the import can outlive the request
+        path = import_job_path(job_id, 'csv')
+        upload.save(path)
+        write_import_status(job_id, {'state': 'queued', 'progress': 0, 'processed': 0})
+        
+        threading.Thread(target=import_students_csv, args=(job_id, path, on_conflict),
+                         name=f'student-import-{job_id[:8]}', daemon=True).start()
+        return redirect(url_for('import_students', job=job_id))
+    
+    job_id = request.args.get('job', '')
+    status = read_import_status(job_id) if job_id else None
+    return render_template('import_students.html', job_id=job_id if status else '', status=status,
+                           columns=sorted(set(STUDENT_IMPORT_COLUMNS.values())))
+
+@app.route('/students/import/<job_id>')
+@login_required
+@role_required('admin')
+def import_students_status(job_id):
+    status = read_import_status(job_id)
+    if status is None:
+        abort(404)
+    return jsonify(status)
+
 @app.route('/students/edit/<int:id>', methods=['GET', 'POST'])
 @login_required
 @role_required('admin', 'teacher')
@@ -5803,7 +8116,7 @@ def view_medical_info(id):
 @role_required('admin')
 def teachers():
     conn = get_db_connection()
-    teachers = conn.execute('SELECT * FROM teachers ORDER BY name').fetchall()
+    teachers = paginate(conn, 't.*', 'FROM teachers t', ['t.name', 't.id'])
     conn.close()
     return render_template('teachers.html', teachers=teachers)
 
@@ -5850,6 +8163,8 @@ def edit_teacher(id):
                 WHERE id = ?
             ''', (name, email, phone, qualification, id))
             conn.commit()
+            # Timetable grids show teacher names
+            bump_data_version('timetable')
             flash('Teacher updated successfully!', 'success')
             return redirect(url_for('teachers'))
         finally:
@@ -5872,6 +8187,7 @@ def delete_teacher(id):
     try:
         conn.execute('DELETE FROM teachers WHERE id = ?', (id,))
         conn.commit()
+        bump_data_version('timetable')
         flash('Teacher deleted successfully!', 'success')
     except sqlite3.IntegrityError:
         flash('Cannot delete teacher because they have associated records!', 'error')
@@ -5886,24 +8202,7 @@ def delete_teacher(id):
 @login_required
 @role_required('admin', 'teacher')
 def classes():
-    conn = get_db_connection()
-    classes = conn.execute('''
-        SELECT c.*, t.name as teacher_name
-        FROM classes c
-        LEFT JOIN teachers t ON c.teacher_id = t.id
-        ORDER BY c.name
-    ''').fetchall()
-
-    # Convert classes to dictionaries to allow modification
-    classes = [dict(cls) for cls in classes]
-
-    # Get student counts for each class
-    for cls in classes:
-        count = conn.execute('SELECT COUNT(*) FROM students WHERE class = ?',
-                           (cls['name'],)).fetchone()[0]
-        cls['student_count'] = count
-    
-    conn.close()
+    classes = get_class_roster()
     return render_template('classes.html', classes=classes)
 
 @app.route('/classes/add', methods=['GET', 'POST'])
@@ -6047,17 +8346,11 @@ def fees():
     recent_payments = conn.execute('''
         SELECT fp.*, s.name as student_name, s.admission_number, 
                s.class as class_name, fs.term, fs.year, fs.amount as total_amount,
-               (SELECT COALESCE(SUM(fp2.amount_paid), 0) 
-                FROM fee_payments fp2 
-                WHERE fp2.student_id = fp.student_id 
-                AND fp2.fee_structure_id = fp.fee_structure_id) as total_paid,
-               fs.amount - (SELECT COALESCE(SUM(fp2.amount_paid), 0) 
-                           FROM fee_payments fp2 
-                           WHERE fp2.student_id = fp.student_id 
-                           AND fp2.fee_structure_id = fp.fee_structure_id) as balance
+               COALESCE(l.total_paid, 0) as total_paid, COALESCE(l.balance, fs.amount) as balance
         FROM fee_payments fp
         JOIN students s ON fp.student_id = s.id
         JOIN fee_structures fs ON fp.fee_structure_id = fs.id
+        LEFT JOIN fee_ledger l ON l.student_id = fp.student_id AND l.fee_structure_id = fp.fee_structure_id
         ORDER BY fp.date_paid DESC
         LIMIT 10
     ''').fetchall()
@@ -6107,6 +8400,7 @@ def add_fee_payment():
         ''', (student_id, fee_structure_id, amount_paid, receipt_number, payment_method, remarks))
         
         conn.commit()
+        bump_data_version('fees')
         flash(f'Payment recorded successfully! Receipt: {receipt_number}', 'success')
     except Exception as e:
         flash(f'Error recording payment: {str(e)}', 'error')
@@ -6167,6 +8461,7 @@ def edit_fee_structure(id):
             ''', (class_name, term, year, amount, description, due_date, id))
             
             conn.commit()
+            bump_data_version('fees')
             flash('Fee structure updated successfully!', 'success')
             return redirect(url_for('fees'))
         except Exception as e:
@@ -6198,6 +8493,7 @@ def delete_fee_structure(id):
         else:
             conn.execute('DELETE FROM fee_structures WHERE id = ?', (id,))
             conn.commit()
+            bump_data_version('fees')
             flash('Fee structure deleted successfully!', 'success')
     except Exception as e:
         flash(f'Error deleting fee structure: {str(e)}', 'error')
@@ -6206,6 +8502,477 @@ def delete_fee_structure(id):
     
     return redirect(url_for('fees'))
 
+def arrears_query(class_name='', term='', year=None, as_of=None):
+    """Build the per-student arrears query: expected fees by class, payments from the ledger, aged by due date"""
+    conditions = []
+    params = [as_of or date.today().isoformat()]
+    if class_name:
+        conditions.append('fs.class = ?')
+        params.append(class_name)
+    if term:
+        conditions.append('fs.term = ?')
+        params.append(term)
+    if year:
+        conditions.append('fs.year = ?')
+        params.append(year)
+    where = ('WHERE ' + ' AND '.join(conditions)) if conditions else ''
+    
+    query = f'''
+        SELECT student_id, admission_number, name, class,
+               SUM(amount) as expected,
+               SUM(paid) as paid,
+               SUM(outstanding) as outstanding,
+               SUM(CASE WHEN age IS NULL OR age <= 0 THEN outstanding ELSE 0 END) as not_due,
+               SUM(CASE WHEN age > 0 AND age <= 30 THEN outstanding ELSE 0 END) as days_1_30,
+               SUM(CASE WHEN age > 30 AND age <= 60 THEN outstanding ELSE 0 END) as days_31_60,
+               SUM(CASE WHEN age > 60 AND age <= 90 THEN outstanding ELSE 0 END) as days_61_90,
+               SUM(CASE WHEN age > 90 THEN outstanding ELSE 0 END) as over_90,
+               MAX(last_payment_date) as last_payment_date
+        FROM (
+            SELECT s.id as student_id, s.admission_number, s.name, s.class, fs.amount,
+                   COALESCE(l.total_paid, 0) as paid,
+                   MAX(fs.amount - COALESCE(l.total_paid, 0), 0) as outstanding,
+                   julianday(?1) - julianday(NULLIF(fs.due_date, '')) as age,
+                   l.last_payment_date
+            FROM fee_structures fs
+            JOIN students s ON s.class = fs.class
+            LEFT JOIN fee_ledger l ON l.student_id = s.id AND l.fee_structure_id = fs.id
+            {where}
+        )
+        GROUP BY student_id
+        HAVING SUM(outstanding) > 0.005
+    '''
+    return query, params
+
+def get_arrears_filters():
+    """Read the arrears report filters from the query string"""
+    year = request.args.get('year', '')
+    return {
+        'class_filter': request.args.get('class_filter', ''),
+        'term': request.args.get('term', ''),
+        'year': int(year) if year.isdigit() else None
+    }
+
+@app.route('/fees/arrears')
+@login_required
+@role_required('admin')
+def fee_arrears():
+    filters = get_arrears_filters()
+    query, params = arrears_query(filters['class_filter'], filters['term'], filters['year'])
+    
+    conn = get_db_connection()
+    
+    classes = [row[0] for row in conn.execute('SELECT DISTINCT class FROM fee_structures ORDER BY class')]
+    summary = conn.execute(f'''
+        SELECT COUNT(*) as debtors, SUM(outstanding) as outstanding, SUM(over_90) as over_90
+        FROM ({query})
+    ''', params).fetchone()
+    
+    # Largest debts first
+    arrears = paginate(
+        conn,
+        select='*',
+        from_clause=f'FROM ({query}) arrears',
+        order_by=['outstanding', 'student_id'],
+        params=params,
+        descending=True
+    )
+    
+    conn.close()
+    
+    return render_template('fees_arrears.html',
+                         arrears=arrears,
+                         summary=summary,
+                         classes=classes,
+                         filters={key: value for key, value in filters.items() if value})
+
+# CSV header (lower-cased, punctuation folded to '_') -> statement field.
+# Covers common bank export headings and mobile-money (M-Pesa) statements.
+STATEMENT_IMPORT_COLUMNS = {
+    'transaction_id': 'transaction_id',
+    'transaction_ref': 'transaction_id',
+    'transaction_reference': 'transaction_id',
+    'trans_id': 'transaction_id',
+    'txn_id': 'transaction_id',
+    'receipt_no': 'transaction_id',
+    'bank_reference': 'transaction_id',
+    'date': 'date_paid',
+    'date_paid': 'date_paid',
+    'transaction_date': 'date_paid',
+    'value_date': 'date_paid',
+    'completion_time': 'date_paid',
+    'amount': 'amount',
+    'amount_paid': 'amount',
+    'credit': 'amount',
+    'paid_in': 'amount',
+    'deposit': 'amount',
+    'reference': 'reference',
+    'account': 'reference',
+    'account_no': 'reference',
+    'account_number': 'reference',
+    'bill_ref': 'reference',
+    'bill_reference': 'reference',
+    'admission_number': 'reference',
+    'admission_no': 'reference',
+    'narrative': 'reference',
+    'description': 'reference',
+    'details': 'reference',
+    'payer': 'payer',
+    'payer_name': 'payer',
+    'name': 'payer',
+    'customer_name': 'payer',
+    'other_party_info': 'payer'
+}
+
+STATEMENT_IMPORT_REQUIRED = ['transaction_id', 'amount', 'reference']
+
+STATEMENT_DATE_FORMATS = [
+    '%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S',
+    '%d/%m/%Y', '%d/%m/%Y %H:%M', '%d/%m/%Y %H:%M:%S',
+    '%d-%m-%Y', '%d-%b-%Y', '%d %b %Y'
+]
+
+# Fee structures of a class, oldest term first
+FEE_STRUCTURES_OLDEST_FIRST = '''
+    SELECT id, class, amount FROM fee_structures
+    {where}
+    ORDER BY year,
+             CASE term
+                 WHEN 'Term 1' THEN 1
+                 WHEN 'Term 2' THEN 2
+                 WHEN 'Term 3' THEN 3
+             END,
+             id
+'''
+
+def parse_statement_date(value):
+    """Statement date as YYYY-MM-DD; blank means today, None if unrecognised"""
+    value = value.strip()
+    if not value:
+        return date.today().isoformat()
+    for fmt in STATEMENT_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+def parse_statement_amount(value):
+    """Statement amount as a float, ignoring currency symbols and thousands separators.
+
+    Debits come back negative whether written -500, 500-, (500.00) or
+    500.00 DR. A blank cell (the Paid In column of a withdrawal row) is 0.
+    Returns None for anything that is not plainly 1,234.50 style, such as
+    1.234,50 or 1.234, so the row goes to review instead of being guessed at.
+    """
+    value = value.strip().upper()
+    if not value:
+        return 0.0
+    negative = bool(re.match(r'DR\b', value) or re.search(r'\bDR$', value))
+    # Currency codes and markers with their abbreviation dot (KSH., KES, DR, CR) and symbols
+    value = re.sub(r'[A-Z]+\.?', '', value)
+    value = re.sub(r'[^0-9.,()\-]', '', value)
+    if value.startswith('(') and value.endswith(')'):
+        negative = True
+        value = value[1:-1]
+    if value.endswith('-'):
+        negative = True
+        value = value[:-1]
+    elif value.startswith('-'):
+        negative = True
+        value = value[1:]
+    # Currency amounts have at most two decimals, so 1.234 is a thousands
+    # separator in another locale rather than a small payment
+    if not re.fullmatch(r'(\d{1,3}(,\d{3})+|\d+)(\.\d{1,2})?|\.\d{1,2}', value):
+        return None
+    amount = float(value.replace(',', ''))
+    return -amount if negative else amount
+
+def pick_fee_structure(structures, paid):
+    """Fee structure a payment is credited to: the oldest still owing, else the latest"""
+    for structure_id, amount_due in structures:
+        if amount_due - paid.get(structure_id, 0) > 0.005:
+            return structure_id
+    return structures[-1][0] if structures else None
+
+class PaymentMatcher:
+    """In-memory indexes that match statement rows to students and fee structures"""
+
+    def __init__(self, conn):
+        self.students = {
+            self.normalize(admission_number): (student_id, class_name)
+            for student_id, admission_number, class_name in conn.execute(
+                'SELECT id, admission_number, class FROM students')
+        }
+        self.structures = {}
+        for structure_id, class_name, amount in conn.execute(FEE_STRUCTURES_OLDEST_FIRST.format(where='')):
+            self.structures.setdefault(class_name, []).append((structure_id, amount))
+        self.paid = {}
+        for student_id, structure_id, total_paid in conn.execute(
+                'SELECT student_id, fee_structure_id, total_paid FROM fee_ledger'):
+            self.paid.setdefault(student_id, {})[structure_id] = total_paid
+        self.posted = {row[0] for row in conn.execute(
+            f'SELECT transaction_id FROM fee_payments WHERE {PAYMENT_TRANSACTION_WHERE}')}
+        self.queued = {row[0] for row in conn.execute(
+            f'SELECT transaction_id FROM statement_review WHERE {PAYMENT_TRANSACTION_WHERE}')}
+
+    @staticmethod
+    def normalize(admission_number):
+        return re.sub(r'\s+', '', admission_number or '').upper()
+
+    def find_student(self, references):
+        """Student whose admission number is a reference field or a word in one; returns (student, error)"""
+        # A field that is exactly an admission number (account, bill ref) wins
+        found = {self.students[key] for key in map(self.normalize, references) if key in self.students}
+        if not found:
+            # Only then look for it in narratives such as "Pay Bill from 2547... Acc. ADM/0123"
+            for reference in references:
+                for word in re.findall(r'[A-Z0-9][A-Z0-9/-]*', reference.upper()):
+                    student = self.students.get(word.rstrip('/-'))
+                    if student:
+                        found.add(student)
+        if not found:
+            return None, 'no admission number in the reference'
+        if len(found) > 1:
+            return None, 'reference matches more than one student'
+        return found.pop(), None
+
+    def allocate(self, student_id, class_name, amount):
+        """Fee structure to credit, counting payments allocated earlier in the same statement"""
+        paid = self.paid.setdefault(student_id, {})
+        structure_id = pick_fee_structure(self.structures.get(class_name, []), paid)
+        if structure_id is not None:
+            paid[structure_id] = paid.get(structure_id, 0) + amount
+        return structure_id
+
+INSERT_STATEMENT_PAYMENT = '''
+    INSERT INTO fee_payments (student_id, fee_structure_id, amount_paid, date_paid, receipt_number,
+                              payment_method, transaction_id, reference, remarks)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(transaction_id) WHERE transaction_id IS NOT NULL AND transaction_id != '' DO NOTHING
+'''
+
+def post_fee_statement(conn, stream, payment_method='Bank Transfer'):
+    """Post a bank or mobile-money statement CSV in batched transactions.
+
+    Rows whose reference names one student become payments against that
+    student's oldest unpaid fee structure; the rest go to statement_review.
+    Transaction ids already posted or queued are skipped, so a statement
+    that fails halfway can simply be imported again.
+    """
+    summary = {'processed': 0, 'posted': 0, 'queued': 0, 'duplicates': 0, 'ignored': 0}
+    started = time.perf_counter()
+    batch_size = app.config['STATEMENT_IMPORT_BATCH_SIZE']
+    
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    columns = {}
+    for header in reader.fieldnames or []:
+        column = STATEMENT_IMPORT_COLUMNS.get(re.sub(r'[^a-z0-9]+', '_', header.strip().lower()).strip('_'))
+        # Both the account and the narrative column may carry the admission number
+        if column and (column == 'reference' or column not in columns.values()):
+            columns[header] = column
+    missing = [column for column in STATEMENT_IMPORT_REQUIRED if column not in columns.values()]
+    if missing:
+        raise ValueError(f"CSV is missing the {', '.join(missing)} column(s)")
+    reference_headers = [header for header, column in columns.items() if column == 'reference']
+    
+    # Only the unique index guarantees a statement cannot be posted twice
+    index = conn.execute('''
+        SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'idx_fee_payments_transaction'
+    ''').fetchone()
+    if not (index and index[0].startswith('CREATE UNIQUE')):
+        raise ValueError('fee_payments has repeated transaction ids; correct them and restart before importing statements')
+    
+    matcher = PaymentMatcher(conn)
+    payments = []
+    reviews = []
+    
+    def flush():
+        receipts = generate_receipt_numbers(len(payments))
+        with conn:
+            if payments:
+                posted = conn.executemany(INSERT_STATEMENT_PAYMENT, [
+                    payment[:4] + (receipt,) + payment[4:] for payment, receipt in zip(payments, receipts)
+                ]).rowcount
+                summary['posted'] += posted
+                summary['duplicates'] += len(payments) - posted
+            if reviews:
+                queued = conn.executemany('''
+                    INSERT INTO statement_review (transaction_id, date_paid, amount, reference, payer,
+                                                  payment_method, reason)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(transaction_id) WHERE transaction_id IS NOT NULL AND transaction_id != '' DO NOTHING
+                ''', reviews).rowcount
+                summary['queued'] += queued
+                summary['duplicates'] += len(reviews) - queued
+        payments.clear()
+        reviews.clear()
+    
+    for row in reader:
+        summary['processed'] += 1
+        values = {column: (row.get(header) or '').strip()
+                  for header, column in columns.items() if column != 'reference'}
+        references = [(row.get(header) or '').strip() for header in reference_headers]
+        reference = ' | '.join(filter(None, references))
+        transaction_id = values['transaction_id']
+        payer = values.get('payer', '')
+        raw_date = values.get('date_paid', '')
+        amount = parse_statement_amount(values['amount'])
+        
+        if amount is not None and amount <= 0:
+            # Withdrawals, bank charges and rows with an empty credit column
+            summary['ignored'] += 1
+            continue
+        if transaction_id in matcher.posted or transaction_id in matcher.queued:
+            summary['duplicates'] += 1
+            continue
+        
+        date_paid = parse_statement_date(raw_date)
+        student, reason = matcher.find_student(references)
+        if not transaction_id:
+            reason = 'no transaction id'
+        elif amount is None:
+            reason = f"amount '{values['amount']}' is not a recognised number"
+        elif date_paid is None:
+            reason = f"date '{raw_date}' is not recognised"
+        
+        structure_id = None
+        if not reason:
+            structure_id = matcher.allocate(student[0], student[1], amount)
+            if structure_id is None:
+                reason = f"no fee structure for class {student[1] or '(none)'}"
+        
+        if reason:
+            if transaction_id:
+                matcher.queued.add(transaction_id)
+            reviews.append((transaction_id or None, date_paid or raw_date, amount, reference, payer,
+                            payment_method, reason))
+        else:
+            matcher.posted.add(transaction_id)
+            payments.append((student[0], structure_id, amount, date_paid, payment_method, transaction_id,
+                             reference, f'Statement import: {payer}' if payer else 'Statement import'))
+        
+        if len(payments) + len(reviews) >= batch_size:
+            flush()
+    flush()
+    
+    if summary['posted']:
+        bump_data_version('fees')
+    summary['seconds'] = round(time.perf_counter() - started, 2)
+    return summary
+
+@app.route('/fees/statements', methods=['GET', 'POST'])
+@login_required
+@role_required('admin')
+def import_fee_statement():
+    if request.method == 'POST':
+        upload = request.files.get('csv_file')
+        if not upload or not upload.filename:
+            flash('No CSV file selected!', 'error')
+            return redirect(url_for('import_fee_statement'))
+        if not upload.filename.lower().endswith('.csv'):
+            flash('Please upload a .csv file!', 'error')
+            return redirect(url_for('import_fee_statement'))
+        
+        conn = get_db_connection()
+        try:
+            summary = post_fee_statement(conn, upload.stream, request.form.get('payment_method', 'Bank Transfer'))
+            flash(f"Statement imported in {summary['seconds']}s: {summary['posted']} payments posted, "
+                  f"{summary['queued']} sent for review, {summary['duplicates']} already imported, "
+                  f"{summary['ignored']} debits ignored.", 'success')
+        except (ValueError, csv.Error, UnicodeDecodeError, sqlite3.Error) as e:
+            print(f"Statement import failed: {e}")
+            flash(f'Error importing statement: {str(e)}', 'error')
+        finally:
+            conn.close()
+        return redirect(url_for('import_fee_statement'))
+    
+    conn = get_db_connection()
+    pending = conn.execute('''
+        SELECT COUNT(*) as entries, SUM(amount) as amount FROM statement_review WHERE status = 'pending'
+    ''').fetchone()
+    reviews = paginate(
+        conn,
+        select='*',
+        from_clause='FROM statement_review',
+        order_by=['id'],
+        where=["status = 'pending'"]
+    )
+    conn.close()
+    
+    return render_template('fee_statements.html', reviews=reviews, pending=pending)
+
+@app.route('/fees/statements/review/<int:id>/assign', methods=['POST'])
+@login_required
+@role_required('admin')
+def assign_statement_entry(id):
+    admission_number = request.form.get('admission_number', '').strip()
+    conn = get_db_connection()
+    
+    try:
+        entry = conn.execute('''
+            SELECT * FROM statement_review WHERE id = ? AND status = 'pending'
+        ''', (id,)).fetchone()
+        if not entry:
+            flash('Statement entry not found or already handled!', 'error')
+            return redirect(url_for('import_fee_statement'))
+        
+        student = conn.execute('''
+            SELECT id, class FROM students WHERE admission_number = ?
+        ''', (admission_number,)).fetchone()
+        date_paid = parse_statement_date(entry['date_paid'] or '')
+        if not student:
+            flash(f'No student with admission number {admission_number}!', 'error')
+        elif not entry['amount'] or entry['amount'] <= 0:
+            flash('This entry has no valid amount; dismiss it and record the payment by hand.', 'error')
+        elif date_paid is None:
+            flash('This entry has no valid date; dismiss it and record the payment by hand.', 'error')
+        else:
+            structures = [(row['id'], row['amount']) for row in conn.execute(
+                FEE_STRUCTURES_OLDEST_FIRST.format(where='WHERE class = ?'), (student['class'],))]
+            paid = dict(conn.execute('''
+                SELECT fee_structure_id, total_paid FROM fee_ledger WHERE student_id = ?
+            ''', (student['id'],)).fetchall())
+            structure_id = pick_fee_structure(structures, paid)
+            if structure_id is None:
+                flash(f"No fee structure for class {student['class']}!", 'error')
+                return redirect(url_for('import_fee_statement'))
+            
+            receipt_number = generate_receipt_number()
+            with conn:
+                cursor = conn.execute(INSERT_STATEMENT_PAYMENT, (
+                    student['id'], structure_id, entry['amount'], date_paid, receipt_number,
+                    entry['payment_method'] or 'Bank Transfer', entry['transaction_id'], entry['reference'],
+                    f"Statement import: {entry['payer']}" if entry['payer'] else 'Statement import'
+                ))
+                if not cursor.rowcount:
+                    raise sqlite3.IntegrityError(f"transaction {entry['transaction_id']} is already posted")
+                conn.execute('''
+                    UPDATE statement_review SET status = 'posted', payment_id = ? WHERE id = ?
+                ''', (cursor.lastrowid, id))
+            bump_data_version('fees')
+            flash(f'Payment posted to {admission_number}! Receipt: {receipt_number}', 'success')
+    except sqlite3.Error as e:
+        flash(f'Error posting payment: {str(e)}', 'error')
+    finally:
+        conn.close()
+    
+    return redirect(url_for('import_fee_statement'))
+
+@app.route('/fees/statements/review/<int:id>/dismiss', methods=['POST'])
+@login_required
+@role_required('admin')
+def dismiss_statement_entry(id):
+    conn = get_db_connection()
+    conn.execute('''
+        UPDATE statement_review SET status = 'dismissed' WHERE id = ? AND status = 'pending'
+    ''', (id,))
+    conn.commit()
+    conn.close()
+    
+    flash('Statement entry dismissed.', 'success')
+    return redirect(url_for('import_fee_statement'))
+
 @app.route('/fees/receipt/<int:id>')
 @login_required
 @role_required('admin')
@@ -6226,13 +8993,11 @@ def view_receipt(id):
         return redirect(url_for('fees'))
     
     # Calculate previous balance
-    previous_payments = conn.execute('''
-        SELECT COALESCE(SUM(amount_paid), 0) as total_paid
-        FROM fee_payments 
-        WHERE student_id = ? AND fee_structure_id = ? AND id != ?
-    ''', (payment['student_id'], payment['fee_structure_id'], id)).fetchone()
+    ledger = conn.execute('''
+        SELECT total_paid FROM fee_ledger WHERE student_id = ? AND fee_structure_id = ?
+    ''', (payment['student_id'], payment['fee_structure_id'])).fetchone()
     
-    previous_total = previous_payments['total_paid'] if previous_payments else 0
+    previous_total = (ledger['total_paid'] if ledger else 0) - payment['amount_paid']
     previous_balance = payment['total_amount'] - previous_total
     
     # Calculate new balance
@@ -6268,41 +9033,50 @@ def attendance():
     
     conn = get_db_connection()
     
-    # Get students with selected date's attendance
+    # Get students with selected date's attendance and their last 7 days
+    # summary in one grouped query
+    week_ago = (datetime.today() - timedelta(days=7)).strftime('%Y-%m-%d')
+    
     query = '''
-        SELECT s.id, s.admission_number, s.name, s.class, a.status
+        SELECT s.id, s.admission_number, s.name, s.class, a.status,
+               COALESCE(w.total, 0) as week_total,
+               COALESCE(w.present, 0) as week_present,
+               COALESCE(w.absent, 0) as week_absent,
+               COALESCE(w.late, 0) as week_late,
+               COALESCE(w.excused, 0) as week_excused
         FROM students s
         LEFT JOIN attendance a ON s.id = a.student_id AND a.date = ?
+        LEFT JOIN (
+            SELECT student_id,
+                   COUNT(*) as total,
+                   SUM(CASE WHEN status = 'Present' THEN 1 ELSE 0 END) as present,
+                   SUM(CASE WHEN status = 'Absent' THEN 1 ELSE 0 END) as absent,
+                   SUM(CASE WHEN status = 'Late' THEN 1 ELSE 0 END) as late,
+                   SUM(CASE WHEN status = 'Excused' THEN 1 ELSE 0 END) as excused
+            FROM attendance
+            WHERE date >= ?
+            GROUP BY student_id
+        ) w ON w.student_id = s.id
     '''
-    params = [selected_date]
+    params = [selected_date, week_ago]
     
     if class_filter:
         query += ' WHERE s.class = ?'
         params.append(class_filter)
     
     query += ' ORDER BY s.class, s.name'
-    students = conn.execute(query, params).fetchall()
     
-    # Get attendance statistics for last 7 days
-    week_ago = (datetime.today() - timedelta(days=7)).strftime('%Y-%m-%d')
-
-    # Convert students to dictionaries to allow modification
-    students = [dict(student) for student in students]
-
-    for student in students:
-        # Get attendance summary for last 7 days
-        summary = conn.execute('''
-            SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'Present' THEN 1 ELSE 0 END) as present,
-                SUM(CASE WHEN status = 'Absent' THEN 1 ELSE 0 END) as absent,
-                SUM(CASE WHEN status = 'Late' THEN 1 ELSE 0 END) as late,
-                SUM(CASE WHEN status = 'Excused' THEN 1 ELSE 0 END) as excused
-            FROM attendance
-            WHERE student_id = ? AND date >= ?
-        ''', (student['id'], week_ago)).fetchone()
-
-        student['attendance_summary'] = dict(summary) if summary else None
+    students = []
+    for row in conn.execute(query, params):
+        student = {key: row[key] for key in ('id', 'admission_number', 'name', 'class', 'status')}
+        student['attendance_summary'] = {
+            'total': row['week_total'],
+            'present': row['week_present'],
+            'absent': row['week_absent'],
+            'late': row['week_late'],
+            'excused': row['week_excused']
+        }
+        students.append(student)
     
     # Get today's statistics
     today_stats = conn.execute('''
@@ -6350,35 +9124,25 @@ def save_attendance():
         
         students = conn.execute(query, params).fetchall()
         
+        rows = []
         for student in students:
             student_id = student['id']
             status_key = f'status_{student_id}'
             remarks_key = f'remarks_{student_id}'
             
             if status_key in request.form:
-                status = request.form[status_key]
-                remarks = request.form.get(remarks_key, '')
-                
-                # Check if attendance already exists for this date
-                existing = conn.execute('''
-                    SELECT id FROM attendance WHERE student_id = ? AND date = ?
-                ''', (student_id, date)).fetchone()
-                
-                if existing:
-                    # Update existing attendance
-                    conn.execute('''
-                        UPDATE attendance 
-                        SET status = ?, remarks = ?
-                        WHERE id = ?
-                    ''', (status, remarks, existing['id']))
-                else:
-                    # Insert new attendance
-                    conn.execute('''
-                        INSERT INTO attendance (student_id, date, status, remarks)
-                        VALUES (?, ?, ?, ?)
-                    ''', (student_id, date, status, remarks))
+                rows.append((student_id, date, request.form[status_key], request.form.get(remarks_key, '')))
+        
+        # Insert or update the whole class in one batch
+        conn.executemany('''
+            INSERT INTO attendance (student_id, date, status, remarks)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(student_id, date) DO UPDATE
+            SET status = excluded.status, remarks = excluded.remarks
+        ''', rows)
         
         conn.commit()
+        bump_data_version('attendance')
         flash('Attendance saved successfully!', 'success')
     except Exception as e:
         flash(f'Error saving attendance: {str(e)}', 'error')
@@ -6394,17 +9158,15 @@ def save_attendance():
 # -------- Grade Routes --------
 
 @app.route('/grades')
-@login_required
-@role_required('admin', 'teacher')
-def grades():
-    conn = get_db_connection()
-    recent_grades = conn.execute('''
-        SELECT g.*, s.name as student_name, s.admission_number, s.class
-        FROM grades g
-        JOIN students s ON g.student_id = s.id
-        ORDER BY g.created_at DESC
-        LIMIT 20
-    ''').fetchall()
+@login_required
+@role_required('admin', 'teacher')
+def grades():
+    conn = get_db_connection()
+    recent_grades = paginate(conn,
+                             'g.*, s.name as student_name, s.admission_number, s.class',
+                             'FROM grades g JOIN students s ON g.student_id = s.id',
+                             ["COALESCE(g.created_at, '')", 'g.id'],
+                             descending=True)
     conn.close()
     return render_template('grades.html', recent_grades=recent_grades)
 
@@ -6422,16 +9184,9 @@ def add_grade():
         score = float(request.form['score'])
         remarks = request.form.get('remarks', '')
         
-        # Calculate grade
-        grade = calculate_grade(score)
-        
         try:
-            conn.execute('''
-                INSERT INTO grades (student_id, subject, term, year, score, grade, remarks)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (student_id, subject, term, year, score, grade, remarks))
-            
-            conn.commit()
+            # Re-entering a score for the same subject and term replaces it
+            save_grades(conn, [(student_id, subject, term, year, score, remarks)])
             flash('Grade added successfully!', 'success')
             return redirect(url_for('grades'))
         except Exception as e:
@@ -6446,6 +9201,191 @@ def add_grade():
     
     return render_template('add_grade.html', students=students, grading=grading)
 
+GRADE_TERMS = ['Term 1', 'Term 2', 'Term 3']
+
+def parse_score(value):
+    """Parse a score from a form or CSV; returns (score, error)"""
+    try:
+        score = float(value)
+    except (TypeError, ValueError):
+        return None, f"'{value}' is not a number"
+    if not 0 <= score <= 100:
+        return None, f'{value} is not between 0 and 100'
+    return score, None
+
+def save_grades(conn, entries):
+    """Grade and upsert (student_id, subject, term, year, score, remarks) entries in one transaction"""
+    grades = calculate_grades([entry[4] for entry in entries])
+    with conn:
+        conn.executemany('''
+            INSERT INTO grades (student_id, subject, term, year, score, grade, remarks)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(student_id, subject, term, year) DO UPDATE SET
+                score = excluded.score,
+                grade = excluded.grade,
+                remarks = COALESCE(NULLIF(excluded.remarks, ''), grades.remarks)
+        ''', [entry[:5] + (grade, entry[5]) for entry, grade in zip(entries, grades)])
+    bump_data_version('grades')
+
+@app.route('/grades/entry', methods=['GET', 'POST'])
+@login_required
+@role_required('admin', 'teacher')
+def grade_entry():
+    source = request.form if request.method == 'POST' else request.args
+    class_name = source.get('class_filter', '')
+    term = source.get('term', 'Term 1')
+    year = source.get('year', '')
+    year = int(year) if year.isdigit() else datetime.now().year
+    subjects = [subject for subject in source.getlist('subjects') if subject]
+    
+    conn = get_db_connection()
+    
+    all_classes = [row[0] for row in conn.execute('''
+        SELECT DISTINCT class FROM students WHERE class IS NOT NULL AND class != '' ORDER BY class
+    ''')]
+    all_subjects = [row[0] for row in conn.execute('SELECT name FROM subjects ORDER BY name')]
+    students = []
+    scores = {}
+    errors = []
+    
+    if class_name and subjects:
+        students = conn.execute('''
+            SELECT id, name, admission_number FROM students WHERE class = ? ORDER BY name
+        ''', (class_name,)).fetchall()
+        
+        if request.method == 'POST':
+            entries = []
+            for student in students:
+                for index, subject in enumerate(subjects):
+                    value = request.form.get(f'score_{student["id"]}_{index}', '').strip()
+                    scores[(student['id'], subject)] = value
+                    if value == '':
+                        continue
+                    score, error = parse_score(value)
+                    if error:
+                        errors.append(f"{student['name']} {subject}: {error}")
+                    else:
+                        entries.append((student['id'], subject, term, year, score, ''))
+            
+            if not errors:
+                save_grades(conn, entries)
+                conn.close()
+                flash(f'{len(entries)} scores saved for {class_name} {term} {year}!', 'success')
+                return redirect(url_for('grade_entry', class_filter=class_name, term=term, year=year, subjects=subjects))
+            flash(f'{len(errors)} scores need fixing; nothing was saved.', 'error')
+        else:
+            # Prefill with what has already been entered
+            for row in conn.execute(f'''
+                SELECT g.student_id, g.subject, g.score
+                FROM grades g
+                JOIN students s ON g.student_id = s.id
+                WHERE s.class = ? AND g.term = ? AND g.year = ?
+                  AND g.subject IN ({','.join('?' * len(subjects))})
+            ''', [class_name, term, year] + subjects):
+                scores[(row['student_id'], row['subject'])] = '%g' % row['score']
+    
+    conn.close()
+    
+    return render_template('grade_entry.html',
+                         all_classes=all_classes,
+                         all_subjects=all_subjects,
+                         terms=GRADE_TERMS,
+                         selected_class=class_name,
+                         selected_term=term,
+                         selected_year=year,
+                         selected_subjects=subjects,
+                         students=students,
+                         scores=scores,
+                         errors=errors)
+
+@app.route('/grades/import', methods=['POST'])
+@login_required
+@role_required('admin', 'teacher')
+def import_grades():
+    upload = request.files.get('csv_file')
+    term = request.form.get('term', '')
+    year = request.form.get('year', '')
+    if not upload or not upload.filename:
+        flash('No CSV file selected!', 'error')
+        return redirect(url_for('grade_entry'))
+    
+    conn = get_db_connection()
+    # One lookup table instead of a query per row
+    student_ids = {row['admission_number']: row['id'] for row in conn.execute('SELECT id, admission_number FROM students')}
+    
+    entries = []
+    lines = []  # CSV line of each entry
+    errors = []
+    seen = set()
+    try:
+        reader = csv.DictReader(io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline=''))
+        fields = {re.sub(r'[^a-z0-9]+', '_', header.strip().lower()).strip('_'): header
+                  for header in reader.fieldnames or []}
+        if 'admission_no' in fields and 'admission_number' not in fields:
+            fields['admission_number'] = fields['admission_no']
+        missing = [field for field in ('admission_number', 'subject', 'score') if field not in fields]
+        if missing or (not term and 'term' not in fields) or (not year and 'year' not in fields):
+            conn.close()
+            flash('CSV needs Admission Number, Subject and Score columns, and Term and Year columns '
+                  'unless they are chosen on the form.', 'error')
+            return redirect(url_for('grade_entry'))
+        
+        def column(row, name, default=''):
+            return (row.get(fields[name]) or '').strip() if name in fields else default
+        
+        for row in reader:
+            line = reader.line_num
+            admission_number = column(row, 'admission_number')
+            subject = column(row, 'subject')
+            row_term = column(row, 'term') or term
+            row_year = column(row, 'year') or year
+            student_id = student_ids.get(admission_number)
+            score, error = parse_score(column(row, 'score'))
+            if student_id is None:
+                error = f"unknown admission number '{admission_number}'"
+            elif not subject:
+                error = 'missing subject'
+            elif row_term not in GRADE_TERMS:
+                error = f"unknown term '{row_term}'"
+            elif not row_year.isdigit():
+                error = f"year '{row_year}' is not a number"
+            elif (student_id, subject, row_term, row_year) in seen:
+                error = 'duplicate score in file'
+            if error:
+                errors.append(f'line {line}: {error}')
+                continue
+            seen.add((student_id, subject, row_term, row_year))
+            entries.append((student_id, subject, row_term, int(row_year), score, column(row, 'remarks')))
+            lines.append(line)
+    except (csv.Error, UnicodeDecodeError) as e:
+        conn.close()
+        flash(f'Could not read CSV: {str(e)}', 'error')
+        return redirect(url_for('grade_entry'))
+    
+    if entries:
+        changes = conn.total_changes
+        try:
+            save_grades(conn, entries)
+        except (sqlite3.IntegrityError, ValueError) as e:
+            conn.rollback()
+            conn.close()
+            if isinstance(e, sqlite3.IntegrityError):
+                # executemany stops at the failing row, so the rows written
+                # before it (now rolled back) give its position
+                line = lines[min(conn.total_changes - changes, len(lines) - 1)]
+                flash(f'Nothing was imported: line {line} could not be saved: {str(e)}', 'error')
+            else:
+                flash(f'Nothing was imported: {str(e)}', 'error')
+            return redirect(url_for('grade_entry'))
+    conn.close()
+    
+    flash(f'{len(entries)} scores imported.', 'success' if entries else 'error')
+    if errors:
+        shown = '; '.join(errors[:20])
+        more = f' (and {len(errors) - 20} more)' if len(errors) > 20 else ''
+        flash(f'{len(errors)} rows skipped: {shown}{more}', 'error')
+    return redirect(url_for('grade_entry'))
+
 @app.route('/grades/edit/<int:id>', methods=['GET', 'POST'])
 @login_required
 @role_required('admin', 'teacher')
@@ -6470,6 +9410,7 @@ def edit_grade(id):
             ''', (subject, term, year, score, grade, remarks, id))
             
             conn.commit()
+            bump_data_version('grades')
             flash('Grade updated successfully!', 'success')
             return redirect(url_for('grades'))
         except Exception as e:
@@ -6501,6 +9442,7 @@ def delete_grade(id):
     try:
         conn.execute('DELETE FROM grades WHERE id = ?', (id,))
         conn.commit()
+        bump_data_version('grades')
         flash('Grade deleted successfully!', 'success')
     except Exception as e:
         flash(f'Error deleting grade: {str(e)}', 'error')
@@ -6511,6 +9453,162 @@ def delete_grade(id):
 
 # -------- Timetable Routes --------
 
+TIMETABLE_DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+TIMETABLE_PERIODS = range(1, 9)
+
+_timetable_grid_cache = (None, OrderedDict())  # (version, {(class, teacher, day): rendered grid}), least recently used first
+_timetable_grid_lock = threading.Lock()
+
+def build_timetable_grid(entries):
+    """Index timetable entries by (day, period) in a single pass"""
+    grid = {}
+    for entry in entries:
+        grid.setdefault((entry['day'], entry['period']), []).append(entry)
+    return grid
+
+def get_timetable_grid_html(conn, class_name='', teacher_name='', day=''):
+    """Get the rendered timetable grid for a set of filters, re-rendering after timetable changes"""
+    global _timetable_grid_cache
+    version = data_versions['timetable'].current()
+    key = (class_name, teacher_name, day)
+    with _timetable_grid_lock:
+        cached_version, grids = _timetable_grid_cache
+        if cached_version != version:
+            grids = OrderedDict()
+            _timetable_grid_cache = (version, grids)
+        if key in grids:
+            grids.move_to_end(key)
+            return grids[key]
+    
+    query = '''
+        SELECT t.*, te.name as teacher_name
+        FROM timetable t
+        LEFT JOIN teachers te ON t.teacher_id = te.id
+        WHERE 1=1
+    '''
+    params = []
+    
+    if class_name:
+        query += ' AND t.class = ?'
+        params.append(class_name)
+    
+    if teacher_name:
+        query += ' AND te.name = ?'
+        params.append(teacher_name)
+    
+    if day:
+        query += ' AND t.day = ?'
+        params.append(day)
+    
+    query += ' ORDER BY t.day, t.period, t.class'
+    timetable_grid = build_timetable_grid(conn.execute(query, params))
+    
+    html = render_template('timetable_grid.html',
+                           timetable_grid=timetable_grid,
+                           selected_class=class_name,
+                           days=TIMETABLE_DAYS,
+                           periods=TIMETABLE_PERIODS)
+    # Filters come straight from the query string, so the cache is bounded
+    with _timetable_grid_lock:
+        grids[key] = html
+        while len(grids) > app.config['TIMETABLE_GRID_CACHE_SIZE']:
+            grids.popitem(last=False)
+    return html
+
+def describe_clash(kind, day, period, value, entries):
+    """Human readable description of a timetable clash"""
+    classes = ', '.join(sorted({entry['class'] for entry in entries}))
+    if kind == 'teacher':
+        name = next((entry['teacher_name'] for entry in entries if entry['teacher_name']), f'#{value}')
+        return f'{name} is booked for {classes} on {day} period {period}'
+    if kind == 'room':
+        return f'{value} is booked for {classes} on {day} period {period}'
+    subjects = ', '.join(sorted({entry['subject'] for entry in entries}))
+    return f'{value} has {subjects} at the same time on {day} period {period}'
+
+def find_timetable_clashes(conn, class_name, day, period, teacher_id=None, room='', exclude_id=None):
+    """Find entries that would clash with a new or edited timetable entry"""
+    # Each branch is a single seek on one of the slot indexes
+    rows = conn.execute('''
+        SELECT t.*, te.name as teacher_name
+        FROM timetable t
+        LEFT JOIN teachers te ON t.teacher_id = te.id
+        WHERE t.id IN (
+            SELECT id FROM timetable WHERE day = ? AND period = ? AND class = ? AND class IS NOT NULL
+            UNION
+            SELECT id FROM timetable WHERE day = ? AND period = ? AND teacher_id = ? AND teacher_id IS NOT NULL
+            UNION
+            SELECT id FROM timetable WHERE day = ? AND period = ? AND room = ? AND room IS NOT NULL AND room != ''
+        ) AND t.id != ?
+    ''', (day, period, class_name, day, period, teacher_id, day, period, room or None, exclude_id or 0)).fetchall()
+    
+    clashes = []
+    for row in rows:
+        if row['class'] == class_name:
+            clashes.append(describe_clash('class', day, period, class_name, [row]))
+        if teacher_id is not None and row['teacher_id'] == int(teacher_id):
+            clashes.append(describe_clash('teacher', day, period, teacher_id, [row]))
+        if room and row['room'] == room:
+            clashes.append(describe_clash('room', day, period, room, [row]))
+    return clashes
+
+def validate_timetable(conn, proposed=()):
+    """Find every clash in the timetable, optionally with proposed entries applied, in one pass"""
+    details = {}
+    entries = []
+    for index, entry in enumerate(proposed):
+        teacher_id = entry.get('teacher_id')
+        teacher_id = None if teacher_id in ('', None) else int(teacher_id)
+        # Proposed entries with an id replace the stored row, new ones get a placeholder key;
+        # ids from forms arrive as strings, stored rows have integer ids
+        key = int(entry['id']) if entry.get('id') not in ('', None) else f'new-{index}'
+        details[key] = {'class': entry['class'], 'subject': entry['subject'], 'teacher_id': teacher_id}
+        entries.append((key, entry['class'], entry['day'], int(entry['period']), teacher_id, entry.get('room') or None))
+    replaced = set(details)
+    
+    slots = {}
+    for rows in (conn.execute('SELECT id, class, day, period, teacher_id, room FROM timetable'), entries):
+        for key, class_name, day, period, teacher_id, room in rows:
+            if key in replaced and rows is not entries:
+                continue
+            slots.setdefault(('class', day, period, class_name), []).append(key)
+            if teacher_id is not None:
+                slots.setdefault(('teacher', day, period, teacher_id), []).append(key)
+            if room:
+                slots.setdefault(('room', day, period, room), []).append(key)
+    
+    clashing = [(slot, keys) for slot, keys in slots.items() if len(keys) > 1]
+    if not clashing:
+        return []
+    
+    # Only clashing entries need their subject and teacher for the report
+    stored_ids = sorted({key for slot, keys in clashing for key in keys if key not in details})
+    for start in range(0, len(stored_ids), 500):
+        chunk = stored_ids[start:start + 500]
+        for row in conn.execute(f'''
+            SELECT t.id, t.class, t.subject, t.teacher_id
+            FROM timetable t
+            WHERE t.id IN ({','.join('?' * len(chunk))})
+        ''', chunk):
+            details[row['id']] = dict(row)
+    teacher_names = {row['id']: row['name'] for row in conn.execute('SELECT id, name FROM teachers')}
+    for entry in details.values():
+        entry['teacher_name'] = teacher_names.get(entry['teacher_id'])
+    
+    clashes = []
+    for (kind, day, period, value), keys in clashing:
+        clashes.append({
+            'type': kind,
+            'day': day,
+            'period': period,
+            'value': value,
+            'entry_ids': keys,
+            'message': describe_clash(kind, day, period, value, [details[key] for key in keys])
+        })
+    clashes.sort(key=lambda clash: (TIMETABLE_DAYS.index(clash['day']) if clash['day'] in TIMETABLE_DAYS else len(TIMETABLE_DAYS),
+                                    clash['period'], clash['type']))
+    return clashes
+
 @app.route('/timetable')
 @login_required
 def timetable():
@@ -6538,29 +9636,7 @@ def timetable():
         SELECT DISTINCT subject FROM timetable ORDER BY subject
     ''').fetchall()]
     
-    # Get timetable entries with filters
-    query = '''
-        SELECT t.*, te.name as teacher_name
-        FROM timetable t
-        LEFT JOIN teachers te ON t.teacher_id = te.id
-        WHERE 1=1
-    '''
-    params = []
-    
-    if selected_class:
-        query += ' AND t.class = ?'
-        params.append(selected_class)
-    
-    if selected_teacher:
-        query += ' AND te.name = ?'
-        params.append(selected_teacher)
-    
-    if selected_day:
-        query += ' AND t.day = ?'
-        params.append(selected_day)
-    
-    query += ' ORDER BY t.day, t.period'
-    timetable_entries = conn.execute(query, params).fetchall()
+    timetable_grid_html = get_timetable_grid_html(conn, selected_class, selected_teacher, selected_day)
     
     # Get all entries for management tab
     all_entries = conn.execute('''
@@ -6570,17 +9646,45 @@ def timetable():
         ORDER BY t.class, t.day, t.period
     ''').fetchall()
     
+    # Generator set-up for the admin tab
+    requirements = []
+    unavailability = []
+    subject_names = []
+    if session.get('role') == 'admin':
+        requirements = conn.execute('''
+            SELECT r.*, te.name as teacher_name
+            FROM timetable_requirements r
+            LEFT JOIN teachers te ON r.teacher_id = te.id
+            ORDER BY r.class, r.subject
+        ''').fetchall()
+        unavailability = conn.execute('''
+            SELECT u.*, te.name as teacher_name
+            FROM teacher_unavailability u
+            JOIN teachers te ON u.teacher_id = te.id
+            ORDER BY te.name, u.day, u.period
+        ''').fetchall()
+        subject_names = [row[0] for row in conn.execute('SELECT name FROM subjects ORDER BY name')]
+    
     conn.close()
     
+    generation_id = request.args.get('generation', '')
+    generation = read_import_status(generation_id, TIMETABLE_JOB_FOLDER) if generation_id else None
+    
     return render_template('timetable.html',
+                         generation_id=generation_id if generation else '',
+                         generation=generation,
                          all_classes=all_classes,
                          teachers=teachers,
                          subjects=subjects,
                          selected_class=selected_class,
                          selected_teacher=selected_teacher,
                          selected_day=selected_day,
-                         timetable_entries=timetable_entries,
-                         all_entries=all_entries)
+                         timetable_grid_html=timetable_grid_html,
+                         all_entries=all_entries,
+                         requirements=requirements,
+                         unavailability=unavailability,
+                         subject_names=subject_names,
+                         school_days=app.config['TIMETABLE_SCHOOL_DAYS'])
 
 @app.route('/timetable/add', methods=['POST'])
 @login_required
@@ -6599,6 +9703,12 @@ def add_timetable_entry():
     
     conn = get_db_connection()
     
+    clashes = find_timetable_clashes(conn, class_name, day, period, teacher_id, room)
+    if clashes:
+        conn.close()
+        flash('Timetable clash: ' + '; '.join(clashes), 'error')
+        return redirect(url_for('timetable'))
+    
     try:
         conn.execute('''
             INSERT INTO timetable (class, day, period, subject, teacher_id, room, description)
@@ -6606,6 +9716,7 @@ def add_timetable_entry():
         ''', (class_name, day, period, subject, teacher_id, room, description))
         
         conn.commit()
+        bump_data_version('timetable')
         flash('Timetable entry added successfully!', 'success')
     except Exception as e:
         flash(f'Error adding timetable entry: {str(e)}', 'error')
@@ -6632,6 +9743,12 @@ def edit_timetable_entry(id):
         if teacher_id == '':
             teacher_id = None
         
+        clashes = find_timetable_clashes(conn, class_name, day, period, teacher_id, room, exclude_id=id)
+        if clashes:
+            conn.close()
+            flash('Timetable clash: ' + '; '.join(clashes), 'error')
+            return redirect(url_for('timetable'))
+        
         try:
             conn.execute('''
                 UPDATE timetable 
@@ -6640,6 +9757,7 @@ def edit_timetable_entry(id):
             ''', (class_name, day, period, subject, teacher_id, room, description, id))
             
             conn.commit()
+            bump_data_version('timetable')
             flash('Timetable entry updated successfully!', 'success')
             return redirect(url_for('timetable'))
         except Exception as e:
@@ -6667,6 +9785,7 @@ def delete_timetable_entry(id):
     try:
         conn.execute('DELETE FROM timetable WHERE id = ?', (id,))
         conn.commit()
+        bump_data_version('timetable')
         flash('Timetable entry deleted successfully!', 'success')
     except Exception as e:
         flash(f'Error deleting timetable entry: {str(e)}', 'error')
@@ -6675,6 +9794,341 @@ def delete_timetable_entry(id):
     
     return redirect(url_for('timetable'))
 
+@app.route('/timetable/validate', methods=['GET', 'POST'])
+@login_required
+@role_required('admin', 'teacher')
+def validate_timetable_json():
+    """Report every clash in the timetable; POST a JSON list of entries to check them before saving"""
+    proposed = []
+    if request.method == 'POST':
+        proposed = request.get_json(silent=True)
+        if isinstance(proposed, dict):
+            proposed = proposed.get('entries')
+        if not isinstance(proposed, list):
+            return jsonify({'error': 'Expected a JSON list of timetable entries'}), 400
+        required = ('class', 'day', 'period', 'subject')
+        for entry in proposed:
+            if not isinstance(entry, dict) or any(entry.get(field) in (None, '') for field in required):
+                return jsonify({'error': f"Each entry needs {', '.join(required)}"}), 400
+    
+    conn = get_db_connection()
+    try:
+        clashes = validate_timetable(conn, proposed)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid id, period or teacher_id'}), 400
+    finally:
+        conn.close()
+    
+    return jsonify({'valid': not clashes, 'clash_count': len(clashes), 'clashes': clashes})
+
+# -------- Timetable Generator --------
+
+class TimetableGenerationError(ValueError):
+    """Raised when the timetable requirements cannot be scheduled"""
+
+def load_timetable_inputs(conn, classes=None):
+    """Read the generator's inputs: requirements, qualifications, availability and fixed entries"""
+    query = '''
+        SELECT class, subject, periods_per_week, teacher_id, room
+        FROM timetable_requirements
+    '''
+    params = []
+    if classes:
+        query += f" WHERE class IN ({','.join('?' * len(classes))})"
+        params.extend(classes)
+    requirements = [dict(row) for row in conn.execute(query + ' ORDER BY class, subject', params)]
+    
+    qualified = {}
+    for row in conn.execute('''
+        SELECT s.name, ts.teacher_id
+        FROM teacher_subjects ts
+        JOIN subjects s ON ts.subject_id = s.id
+        ORDER BY ts.teacher_id
+    '''):
+        qualified.setdefault(row['name'].lower(), []).append(row['teacher_id'])
+    
+    unavailable = [(row['teacher_id'], row['day'], row['period'])
+                   for row in conn.execute('SELECT teacher_id, day, period FROM teacher_unavailability')]
+    
+    # Entries of classes that are not being regenerated stay where they are
+    generated = {requirement['class'] for requirement in requirements}
+    fixed = [dict(row) for row in conn.execute('SELECT class, day, period, teacher_id, room FROM timetable')
+             if row['class'] not in generated]
+    
+    return requirements, qualified, unavailable, fixed
+
+def assign_teachers(requirements, qualified, capacity):
+    """Give each requirement without a teacher the qualified teacher with the most free periods"""
+    load = {}
+    for requirement in requirements:
+        if requirement['teacher_id'] is not None:
+            load[requirement['teacher_id']] = load.get(requirement['teacher_id'], 0) + requirement['periods_per_week']
+    
+    # Hardest to staff first: fewest candidates, then most periods
+    open_requirements = [requirement for requirement in requirements if requirement['teacher_id'] is None]
+    open_requirements.sort(key=lambda requirement: (len(qualified.get(requirement['subject'].lower(), [])),
+                                                    -requirement['periods_per_week']))
+    unstaffed = []
+    for requirement in open_requirements:
+        candidates = qualified.get(requirement['subject'].lower(), [])
+        if not candidates:
+            unstaffed.append(requirement)
+            continue
+        teacher_id = max(candidates, key=lambda candidate: capacity.get(candidate, 0) - load.get(candidate, 0))
+        requirement['teacher_id'] = teacher_id
+        load[teacher_id] = load.get(teacher_id, 0) + requirement['periods_per_week']
+    
+    overloaded = [teacher_id for teacher_id, periods in load.items() if periods > capacity.get(teacher_id, 0)]
+    return unstaffed, overloaded
+
+def build_timetable_problem(requirements, qualified, unavailable, fixed, days=None, periods=None):
+    """Turn requirements into lessons and the slots each lesson may use"""
+    days = days or app.config['TIMETABLE_SCHOOL_DAYS']
+    periods = list(periods or TIMETABLE_PERIODS)
+    slots = [(day, period) for day in days for period in periods]
+    slot_index = {slot: index for index, slot in enumerate(slots)}
+    
+    blocked = {}  # teacher or room -> slots taken by availability or fixed entries
+    for teacher_id, day, period in unavailable:
+        for slot_period in ([period] if period else periods):
+            if (day, slot_period) in slot_index:
+                blocked.setdefault(('teacher', teacher_id), set()).add(slot_index[(day, slot_period)])
+    for entry in fixed:
+        index = slot_index.get((entry['day'], entry['period']))
+        if index is None:
+            continue
+        if entry['teacher_id'] is not None:
+            blocked.setdefault(('teacher', entry['teacher_id']), set()).add(index)
+        if entry['room']:
+            blocked.setdefault(('room', entry['room']), set()).add(index)
+    
+    teacher_ids = {teacher_id for teachers in qualified.values() for teacher_id in teachers}
+    teacher_ids.update(requirement['teacher_id'] for requirement in requirements if requirement['teacher_id'] is not None)
+    capacity = {teacher_id: len(slots) - len(blocked.get(('teacher', teacher_id), ())) for teacher_id in teacher_ids}
+    
+    requirements = [dict(requirement) for requirement in requirements]
+    unstaffed, overloaded = assign_teachers(requirements, qualified, capacity)
+    if overloaded:
+        raise TimetableGenerationError(
+            f"Teachers with id {', '.join(str(teacher_id) for teacher_id in sorted(overloaded))} have more periods than free slots")
+    
+    class_load = {}
+    for requirement in requirements:
+        class_load[requirement['class']] = class_load.get(requirement['class'], 0) + requirement['periods_per_week']
+    full = [class_name for class_name, load in class_load.items() if load > len(slots)]
+    if full:
+        raise TimetableGenerationError(f"{', '.join(sorted(full))} need more periods than the week has")
+    
+    lessons = []
+    domains = []
+    for requirement in requirements:
+        taken = set()
+        if requirement['teacher_id'] is not None:
+            taken |= blocked.get(('teacher', requirement['teacher_id']), set())
+        if requirement['room']:
+            taken |= blocked.get(('room', requirement['room']), set())
+        domain = [index for index in range(len(slots)) if index not in taken]
+        if len(domain) < requirement['periods_per_week']:
+            raise TimetableGenerationError(
+                f"{requirement['class']} {requirement['subject']} has fewer free slots than periods")
+        for _ in range(requirement['periods_per_week']):
+            lessons.append((requirement['class'], requirement['subject'], requirement['teacher_id'], requirement['room'] or ''))
+            domains.append(domain)
+    
+    return {
+        'slots': slots,
+        'slot_days': [day for day, period in slots],
+        'lessons': lessons,
+        'domains': domains,
+        'unstaffed': [(requirement['class'], requirement['subject']) for requirement in unstaffed]
+    }
+
+def search_timetable(problem, time_budget=None, workers=None):
+    """Run the solver with a different seed on each core and keep the first schedule found"""
+    time_budget = time_budget or app.config['TIMETABLE_GENERATOR_TIME_BUDGET']
+    workers = workers or app.config['TIMETABLE_GENERATOR_WORKERS']
+    # CLOCK_MONOTONIC is shared by every process, so workers can honour the same deadline
+    deadline = time.monotonic() + time_budget
+    if workers <= 1 or not problem['lessons']:
+        return solve_timetable(problem, 0, deadline)
+    
+    stop_event = WORKER_MP_CONTEXT.Event()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=WORKER_MP_CONTEXT,
+                             initializer=timetable_solver.init_worker, initargs=(stop_event,)) as executor:
+        futures = [executor.submit(timetable_solver.solve_and_signal, problem, seed, deadline)
+                   for seed in range(workers)]
+        for future in as_completed(futures):
+            assignment = future.result()
+            if assignment is not None:
+                stop_event.set()
+                return assignment
+    return None
+
+def generate_timetable(conn, classes=None, time_budget=None, workers=None):
+    """Replace the timetable of the given classes (default: every class with requirements)"""
+    requirements, qualified, unavailable, fixed = load_timetable_inputs(conn, classes)
+    if not requirements:
+        raise TimetableGenerationError('No timetable requirements have been set up')
+    
+    started = time.perf_counter()
+    problem = build_timetable_problem(requirements, qualified, unavailable, fixed)
+    assignment = search_timetable(problem, time_budget, workers)
+    if assignment is None:
+        raise TimetableGenerationError('No clash-free timetable was found within the time budget')
+    
+    rows = []
+    for (class_name, subject, teacher_id, room), slot in zip(problem['lessons'], assignment):
+        day, period = problem['slots'][slot]
+        rows.append((class_name, day, period, subject, teacher_id, room, 'Generated'))
+    
+    generated = sorted({requirement['class'] for requirement in requirements})
+    conn.execute(f"DELETE FROM timetable WHERE class IN ({','.join('?' * len(generated))})", generated)
+    conn.executemany('''
+        INSERT INTO timetable (class, day, period, subject, teacher_id, room, description)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+    bump_data_version('timetable')
+    
+    return {
+        'classes': len(generated),
+        'lessons': len(rows),
+        'unstaffed': problem['unstaffed'],
+        'seconds': round(time.perf_counter() - started, 2)
+    }
+
+@app.route('/timetable/requirements/add', methods=['POST'])
+@login_required
+@role_required('admin')
+def add_timetable_requirement():
+    class_name = request.form['class']
+    subject = request.form['subject']
+    periods_per_week = int(request.form['periods_per_week'])
+    teacher_id = request.form.get('teacher_id', '')
+    room = request.form.get('room', '')
+    
+    if teacher_id == '':
+        teacher_id = None
+    
+    conn = get_db_connection()
+    
+    try:
+        conn.execute('''
+            INSERT INTO timetable_requirements (class, subject, periods_per_week, teacher_id, room)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(class, subject) DO UPDATE SET
+                periods_per_week = excluded.periods_per_week,
+                teacher_id = excluded.teacher_id,
+                room = excluded.room
+        ''', (class_name, subject, periods_per_week, teacher_id, room))
+        conn.commit()
+        flash('Timetable requirement saved successfully!', 'success')
+    except Exception as e:
+        flash(f'Error saving timetable requirement: {str(e)}', 'error')
+    finally:
+        conn.close()
+    
+    return redirect(url_for('timetable'))
+
+@app.route('/timetable/requirements/delete/<int:id>')
+@login_required
+@role_required('admin')
+def delete_timetable_requirement(id):
+    conn = get_db_connection()
+    conn.execute('DELETE FROM timetable_requirements WHERE id = ?', (id,))
+    conn.commit()
+    conn.close()
+    
+    flash('Timetable requirement deleted successfully!', 'success')
+    return redirect(url_for('timetable'))
+
+@app.route('/timetable/unavailability/add', methods=['POST'])
+@login_required
+@role_required('admin')
+def add_teacher_unavailability():
+    teacher_id = request.form['teacher_id']
+    day = request.form['day']
+    period = request.form.get('period', '')
+    
+    conn = get_db_connection()
+    
+    try:
+        conn.execute('''
+            INSERT OR IGNORE INTO teacher_unavailability (teacher_id, day, period)
+            VALUES (?, ?, ?)
+        ''', (teacher_id, day, int(period) if period else None))
+        conn.commit()
+        flash('Teacher availability updated successfully!', 'success')
+    except Exception as e:
+        flash(f'Error updating teacher availability: {str(e)}', 'error')
+    finally:
+        conn.close()
+    
+    return redirect(url_for('timetable'))
+
+@app.route('/timetable/unavailability/delete/<int:id>')
+@login_required
+@role_required('admin')
+def delete_teacher_unavailability(id):
+    conn = get_db_connection()
+    conn.execute('DELETE FROM teacher_unavailability WHERE id = ?', (id,))
+    conn.commit()
+    conn.close()
+    
+    flash('Teacher availability updated successfully!', 'success')
+    return redirect(url_for('timetable'))
+
+# Timetable jobs keep their status files apart from student and account imports
+TIMETABLE_JOB_FOLDER = 'timetable_jobs'
+
+def generate_timetable_job(job_id, classes=None):
+    """Generate the timetable in the background, publishing the outcome to the job's status file"""
+    write_import_status(job_id, {'state': 'running', 'message': ''}, TIMETABLE_JOB_FOLDER)
+    status = {}
+    conn = None
+    try:
+        conn = db_pool.acquire()
+        result = generate_timetable(conn, classes)
+        message = f"Generated {result['lessons']} lessons for {result['classes']} classes in {result['seconds']}s"
+        if result['unstaffed']:
+            message += f" ({len(result['unstaffed'])} subjects have no qualified teacher)"
+        status.update(result, state='done', message=message)
+    except TimetableGenerationError as e:
+        status.update(state='failed', message=f'Could not generate timetable: {str(e)}')
+    except Exception as e:
+        # Anything else would kill the thread and leave the page polling forever
+        print(f"Timetable generation {job_id} failed unexpectedly: {e!r}")
+        status.update(state='failed', message=f'Unexpected error: {e}')
+    finally:
+        if conn is not None:
+            conn.close()
+    
+    write_import_status(job_id, status, TIMETABLE_JOB_FOLDER)
+    return status
+
+@app.route('/timetable/generate', methods=['POST'])
+@login_required
+@role_required('admin')
+def generate_timetable_entries():
+    classes = request.form.getlist('classes')
+    job_id = uuid.uuid4().hex
+    os.makedirs(os.path.join(app.config['CACHE_FOLDER'], TIMETABLE_JOB_FOLDER), exist_ok=True)
+    write_import_status(job_id, {'state': 'queued', 'message': ''}, TIMETABLE_JOB_FOLDER)
+    
+    # The search can run longer than a web worker's request timeout
+    threading.Thread(target=generate_timetable_job, args=(job_id, classes or None),
+                     name=f'timetable-generate-{job_id[:8]}', daemon=True).start()
+    return redirect(url_for('timetable', generation=job_id))
+
+@app.route('/timetable/generate/<job_id>')
+@login_required
+@role_required('admin')
+def generate_timetable_status(job_id):
+    status = read_import_status(job_id, TIMETABLE_JOB_FOLDER)
+    if status is None:
+        abort(404)
+    return jsonify(status)
+
 # -------- Settings Routes --------
 
 @app.route('/settings')
@@ -6731,6 +10185,7 @@ def update_school_settings():
                 conn.execute('UPDATE school_settings SET logo_path = ? WHERE id = 1', (logo_path,))
         
         conn.commit()
+        settings_version.bump()
         flash('School settings updated successfully!', 'success')
     except Exception as e:
         flash(f'Error updating settings: {str(e)}', 'error')
@@ -6767,6 +10222,7 @@ def update_grading_system():
         ''', (min_a, max_a, min_b, max_b, min_c, max_c, min_d, max_d, min_f, max_f))
         
         conn.commit()
+        grading_version.bump()
         flash('Grading system updated successfully!', 'success')
     except Exception as e:
         flash(f'Error updating grading system: {str(e)}', 'error')
@@ -6775,6 +10231,18 @@ def update_grading_system():
     
     return redirect(url_for('settings'))
 
+@app.route('/settings/stats')
+@login_required
+@role_required('admin')
+def runtime_stats():
+    return jsonify({
+        'db_pool': db_pool.stats(),
+        'password_hashing': password_hasher.stats(),
+        'login_throttle': login_throttle.stats(),
+        'compression': compression.stats(),
+        'storage_profile': check_storage_profile()
+    })
+
 @app.route('/settings/backup')
 @login_required
 @role_required('admin')
@@ -6786,8 +10254,13 @@ def backup_database():
     backup_file = os.path.join(backup_dir, f'school_backup_{timestamp}.db')
     
     try:
-        # Copy the database file
-        shutil.copy2('school.db', backup_file)
+        # Use the online backup API so pages still in the WAL are included
+        conn = get_db_connection()
+        backup_conn = sqlite3.connect(backup_file)
+        try:
+            conn.backup(backup_conn)
+        finally:
+            backup_conn.close()
         flash(f'Database backup created successfully: {backup_file}', 'success')
     except Exception as e:
         flash(f'Error creating backup: {str(e)}', 'error')
@@ -6814,15 +10287,23 @@ def restore_database():
         backup_file.save(backup_path)
         
         # Verify it's a valid SQLite database
-        test_conn = sqlite3.connect(backup_path)
-        test_conn.execute('SELECT 1')
-        test_conn.close()
-        
-        # Replace the current database
-        os.replace(backup_path, 'school.db')
+        backup_conn = sqlite3.connect(backup_path)
+        try:
+            backup_conn.execute('SELECT 1')
+            
+            # Copy it over the live database through SQLite rather than
+            # replacing the file, so other workers and the WAL stay consistent
+            conn = get_db_connection()
+            backup_conn.backup(conn)
+        finally:
+            backup_conn.close()
+        os.remove(backup_path)
         
         # Reinitialize the database to ensure schema is correct
         init_db()
+        settings_version.bump()
+        grading_version.bump()
+        bump_data_version(*data_versions)
         
         flash('Database restored successfully!', 'success')
     except Exception as e:
@@ -6838,28 +10319,299 @@ def restore_database():
 def themes():
     return render_template('themes.html')
 
+# -------- Chart Routes --------
+
+class ChartCache:
+    """Rendered charts on disk, evicting the least recently used files"""
+
+    def __init__(self, folder, max_files=200):
+        # send_file resolves relative paths against the app root, not the cwd
+        self.folder = os.path.abspath(folder)
+        self.max_files = max_files
+        os.makedirs(self.folder, exist_ok=True)
+
+    def get(self, key, fmt):
+        path = os.path.join(self.folder, f'{key}.{fmt}')
+        try:
+            # mtime doubles as the last-access time used for eviction. The
+            # bytes are read here, as another request may evict the file
+            # before it could be sent
+            os.utime(path)
+            with open(path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, fmt, data):
+        path = os.path.join(self.folder, f'{key}.{fmt}')
+        tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self.evict()
+        return data
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.folder):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    pass
+        entries.sort()
+        for _, path in entries[:max(len(entries) - self.max_files, 0)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+def draw_attendance_trend(conn, ax, params):
+    since = (date.today() - timedelta(days=params['days'])).isoformat()
+    query = '''
+        SELECT a.date,
+               SUM(CASE WHEN a.status IN ('Present', 'Late') THEN 1 ELSE 0 END) * 100.0 / COUNT(*) as rate
+        FROM attendance a
+        JOIN students s ON a.student_id = s.id
+        WHERE a.date >= ?
+    '''
+    query_params = [since]
+    if params['class']:
+        query += ' AND s.class = ?'
+        query_params.append(params['class'])
+    query += ' GROUP BY a.date ORDER BY a.date'
+    rows = conn.execute(query, query_params).fetchall()
+    
+    ax.plot([row['date'][5:] for row in rows], [row['rate'] for row in rows], marker='o', color='#4361ee')
+    ax.set_ylim(0, 100)
+    ax.set_ylabel('Present (%)')
+    ax.set_title(f"Attendance - last {params['days']} days" + (f" ({params['class']})" if params['class'] else ''))
+    ax.tick_params(axis='x', labelrotation=45, labelsize=8)
+    return bool(rows)
+
+def draw_fee_collection(conn, ax, params):
+    rows = conn.execute('''
+        SELECT substr(date_paid, 1, 7) as month, SUM(amount_paid) as collected
+        FROM fee_payments
+        WHERE substr(date_paid, 1, 4) = ?
+        GROUP BY month
+        ORDER BY month
+    ''', (str(params['year']),)).fetchall()
+    
+    months = [row['month'][5:] for row in rows]
+    collected = [row['collected'] for row in rows]
+    cumulative = []
+    total = 0
+    for amount in collected:
+        total += amount
+        cumulative.append(total)
+    
+    ax.bar(months, collected, color='#4cc9f0', label='Collected')
+    ax.plot(months, cumulative, marker='o', color='#3f37c9', label='Cumulative')
+    ax.set_xlabel('Month')
+    ax.set_title(f"Fee collection - {params['year']}")
+    if rows:
+        ax.legend()
+    return bool(rows)
+
+def draw_grade_distribution(conn, ax, params):
+    query = '''
+        SELECT g.grade, COUNT(*) as count
+        FROM grades g
+        JOIN students s ON g.student_id = s.id
+        WHERE g.year = ?
+    '''
+    query_params = [params['year']]
+    if params['class']:
+        query += ' AND s.class = ?'
+        query_params.append(params['class'])
+    if params['term']:
+        query += ' AND g.term = ?'
+        query_params.append(params['term'])
+    query += ' GROUP BY g.grade'
+    counts = {row['grade']: row['count'] for row in conn.execute(query, query_params)}
+    
+    letters = ['A', 'B', 'C', 'D', 'F']
+    ax.bar(letters, [counts.get(letter, 0) for letter in letters],
+           color=['#43e97b', '#4facfe', '#fee140', '#f6d365', '#d14444'])
+    ax.set_ylabel('Students')
+    ax.set_title(f"Grade distribution - {params['year']}"
+                 + (f" {params['term']}" if params['term'] else '')
+                 + (f" ({params['class']})" if params['class'] else ''))
+    return bool(counts)
+
+# Chart name -> how to draw it, which data it depends on, who may see it and
+# which query parameters it takes
+CHARTS = {
+    'attendance_trend': {
+        'draw': draw_attendance_trend,
+        'sources': ['attendance'],
+        'roles': ['admin', 'teacher', 'student'],
+        'params': ['class', 'days']
+    },
+    'fee_collection': {
+        'draw': draw_fee_collection,
+        'sources': ['fees'],
+        'roles': ['admin'],
+        'params': ['year']
+    },
+    'grade_distribution': {
+        'draw': draw_grade_distribution,
+        'sources': ['grades'],
+        'roles': ['admin', 'teacher', 'student'],
+        'params': ['class', 'year', 'term']
+    }
+}
+
+CHART_MIMETYPES = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml'
+}
+
+chart_cache = ChartCache(os.path.join(app.config['CACHE_FOLDER'], 'charts'),
+                         max_files=app.config['CHART_CACHE_MAX_FILES'])
+chart_executor = ThreadPoolExecutor(max_workers=app.config['CHART_RENDER_WORKERS'],
+                                    thread_name_prefix='chart-render')
+_chart_jobs = {}  # cache key -> Future, so concurrent requests share one render
+_chart_jobs_lock = threading.Lock()
+
+def render_chart(key, name, params, fmt):
+    """Draw a chart and store it in the cache; runs on the chart thread"""
+    plt = get_pyplot()
+    conn = get_db_connection()
+    fig, ax = plt.subplots(figsize=(8, 4), dpi=100)
+    try:
+        if not CHARTS[name]['draw'](conn, ax, params):
+            ax.text(0.5, 0.5, 'No data yet', ha='center', va='center', transform=ax.transAxes, color='#999999')
+        fig.tight_layout()
+        output = BytesIO()
+        fig.savefig(output, format=fmt)
+    finally:
+        plt.close(fig)
+        conn.close()
+    return chart_cache.put(key, fmt, output.getvalue())
+
+def get_chart(name, params, fmt):
+    """Get a rendered chart's cache key and bytes, drawing it off the request thread if needed"""
+    chart = CHARTS[name]
+    version = [data_versions[source].current() for source in chart['sources']]
+    key_source = json.dumps([name, fmt, sorted(params.items()), version, date.today().isoformat()])
+    key = hashlib.sha256(key_source.encode('utf-8')).hexdigest()[:32]
+    
+    data = chart_cache.get(key, fmt)
+    if data is not None:
+        return key, data
+    
+    with _chart_jobs_lock:
+        future = _chart_jobs.get(key)
+        if future is None:
+            future = chart_executor.submit(render_chart, key, name, params, fmt)
+            _chart_jobs[key] = future
+            future.add_done_callback(lambda done: _chart_jobs.pop(key, None))
+    return key, future.result(timeout=app.config['CHART_RENDER_TIMEOUT'])
+
+@app.route('/charts/<name>.<fmt>')
+@login_required
+def chart(name, fmt):
+    chart = CHARTS.get(name)
+    if chart is None or fmt not in CHART_MIMETYPES:
+        abort(404)
+    if session.get('role') not in chart['roles']:
+        abort(403)
+    
+    class_name = request.args.get('class', '')
+    if session.get('role') == 'student':
+        # Students only ever see charts for their own class
+        conn = get_db_connection()
+        student = conn.execute('''
+            SELECT s.class FROM users u
+            JOIN students s ON s.admission_number = u.admission_number
+            WHERE u.id = ?
+        ''', (session['user_id'],)).fetchone()
+        conn.close()
+        if not student:
+            abort(403)
+        class_name = student['class'] or ''
+    
+    try:
+        days = min(max(int(request.args.get('days', 30)), 7), 365)
+        year = int(request.args.get('year', datetime.now().year))
+    except ValueError:
+        abort(400)
+    
+    available = {
+        'class': class_name,
+        'days': days,
+        'year': year,
+        'term': request.args.get('term', '')
+    }
+    params = {name: available[name] for name in chart['params']}
+    
+    try:
+        key, data = get_chart(name, params, fmt)
+    except FutureTimeoutError:
+        # The render carries on in the background and is cached for the retry
+        return 'Chart is still being drawn. Try again shortly.', 503, {'Retry-After': '5'}
+    # The cache key already changes whenever the chart's data does
+    return send_file(BytesIO(data), mimetype=CHART_MIMETYPES[fmt], etag=key, max_age=60)
+
 # -------- Export Routes --------
 
+def stream_csv_rows(query, params, header, format_row):
+    """Yield a CSV export as encoded chunks, fetching rows in batches"""
+    # Use a connection of our own: the generator outlives the request
+    conn = db_pool.acquire()
+    try:
+        output = StringIO()
+        writer = csv.writer(output)
+        writer.writerow(header)
+        
+        cursor = conn.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(app.config['EXPORT_CHUNK_SIZE'])
+            if not rows:
+                break
+            writer.writerows(format_row(row) for row in rows)
+            yield output.getvalue().encode('utf-8')
+            output.seek(0)
+            output.truncate()
+        
+        if output.tell():
+            yield output.getvalue().encode('utf-8')
+    finally:
+        conn.close()
+
+def gzip_chunks(chunks):
+    """Gzip a stream of byte chunks as they are produced"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def csv_download(chunks, filename):
+    """Stream CSV chunks as a download, gzipped if ?gzip=1 was requested"""
+    mimetype = 'text/csv'
+    if request.args.get('gzip') in ('1', 'true', 'yes'):
+        chunks = gzip_chunks(chunks)
+        filename += '.gz'
+        mimetype = 'application/gzip'
+    
+    return Response(chunks, mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename={filename}'
+    })
+
 @app.route('/export/students')
 @login_required
 @role_required('admin')
 def export_students():
-    conn = get_db_connection()
-    students = conn.execute('SELECT * FROM students ORDER BY class, name').fetchall()
-    conn.close()
-    
-    # Create CSV in memory
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    # Write header
-    writer.writerow(['ID', 'Admission Number', 'Name', 'Age', 'Class', 'Guardian Name', 
-                     'Guardian Contacts', 'Guardian Email', 'Address', 'Medical Conditions',
-                     'Allergies', 'Emergency Contact', 'Emergency Phone'])
+    header = ['ID', 'Admission Number', 'Name', 'Age', 'Class', 'Guardian Name', 
+              'Guardian Contacts', 'Guardian Email', 'Address', 'Medical Conditions',
+              'Allergies', 'Emergency Contact', 'Emergency Phone']
     
-    # Write data
-    for student in students:
-        writer.writerow([
+    def format_row(student):
+        return [
             student['id'],
             student['admission_number'],
             student['name'],
@@ -6873,41 +10625,26 @@ def export_students():
             student['allergies'] or '',
             student['emergency_contact_name'] or '',
             student['emergency_contact_phone'] or ''
-        ])
+        ]
     
-    output.seek(0)
-    
-    return send_file(
-        BytesIO(output.getvalue().encode('utf-8')),
-        mimetype='text/csv',
-        as_attachment=True,
-        download_name=f'students_export_{datetime.now().strftime("%Y%m%d")}.csv'
-    )
+    chunks = stream_csv_rows('SELECT * FROM students ORDER BY class, name', (), header, format_row)
+    return csv_download(chunks, f'students_export_{datetime.now().strftime("%Y%m%d")}.csv')
 
 @app.route('/export/grades')
 @login_required
 @role_required('admin', 'teacher')
 def export_grades():
-    conn = get_db_connection()
-    grades = conn.execute('''
+    query = '''
         SELECT g.*, s.name as student_name, s.admission_number, s.class
         FROM grades g
         JOIN students s ON g.student_id = s.id
         ORDER BY g.year DESC, g.term, s.class, s.name
-    ''').fetchall()
-    conn.close()
-    
-    # Create CSV in memory
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    # Write header
-    writer.writerow(['Student Name', 'Admission Number', 'Class', 'Subject', 'Term', 
-                     'Year', 'Score', 'Grade', 'Remarks', 'Date Recorded'])
+    '''
+    header = ['Student Name', 'Admission Number', 'Class', 'Subject', 'Term', 
+              'Year', 'Score', 'Grade', 'Remarks', 'Date Recorded']
     
-    # Write data
-    for grade in grades:
-        writer.writerow([
+    def format_row(grade):
+        return [
             grade['student_name'],
             grade['admission_number'],
             grade['class'],
@@ -6918,16 +10655,227 @@ def export_grades():
             grade['grade'],
             grade['remarks'] or '',
             grade['created_at'][:10] if grade['created_at'] else ''
-        ])
+        ]
     
-    output.seek(0)
+    chunks = stream_csv_rows(query, (), header, format_row)
+    return csv_download(chunks, f'grades_export_{datetime.now().strftime("%Y%m%d")}.csv')
+
+@app.route('/export/fees/arrears')
+@login_required
+@role_required('admin')
+def export_fee_arrears():
+    filters = get_arrears_filters()
+    query, params = arrears_query(filters['class_filter'], filters['term'], filters['year'])
+    query = f'SELECT * FROM ({query}) ORDER BY class, name, student_id'
+    header = ['Admission Number', 'Name', 'Class', 'Expected', 'Paid', 'Outstanding',
+              'Not Yet Due', '1-30 Days', '31-60 Days', '61-90 Days', '90+ Days', 'Last Payment']
+    
+    def format_row(row):
+        return [
+            row['admission_number'],
+            row['name'],
+            row['class'],
+            f"{row['expected']:.2f}",
+            f"{row['paid']:.2f}",
+            f"{row['outstanding']:.2f}",
+            f"{row['not_due']:.2f}",
+            f"{row['days_1_30']:.2f}",
+            f"{row['days_31_60']:.2f}",
+            f"{row['days_61_90']:.2f}",
+            f"{row['over_90']:.2f}",
+            row['last_payment_date'] or ''
+        ]
+    
+    chunks = stream_csv_rows(query, params, header, format_row)
+    return csv_download(chunks, f'fee_arrears_{datetime.now().strftime("%Y%m%d")}.csv')
+
+# -------- CLI Commands --------
+
+STARTUP_BENCHMARK = '''
+import resource, sys, time
+sys.path.insert(0, {app_dir!r})
+started = time.perf_counter()
+import main
+main_ms = (time.perf_counter() - started) * 1000
+main_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+started = time.perf_counter()
+main.get_pyplot()
+charts_ms = (time.perf_counter() - started) * 1000
+charts_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(main_ms, main_rss, charts_ms, charts_rss)
+'''
+
+@app.cli.command('bench-startup')
+def bench_startup():
+    """Measure worker cold-start import time and memory, with and without charts"""
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    runs = []
+    for _ in range(3):
+        # A fresh interpreter per run so nothing is already imported
+        result = subprocess.run([sys.executable, '-c', STARTUP_BENCHMARK.format(app_dir=app_dir)],
+                                capture_output=True, text=True, check=True)
+        runs.append([float(value) for value in result.stdout.split()[-4:]])
+    
+    main_ms, main_rss, charts_ms, charts_rss = [min(run[i] for run in runs) for i in range(4)]
+    # ru_maxrss is in KB on Linux
+    print(f"Worker startup (import main):  {main_ms:8.1f} ms  {main_rss / 1024:6.1f} MB RSS")
+    print(f"First chart (import pyplot):  +{charts_ms:8.1f} ms  {(charts_rss - main_rss) / 1024:+6.1f} MB RSS")
+    print(f"Eager-import equivalent:       {main_ms + charts_ms:8.1f} ms  {charts_rss / 1024:6.1f} MB RSS")
+
+@app.cli.command('generate-timetable')
+@click.option('--class', 'classes', multiple=True, help='Only regenerate these classes (repeatable).')
+@click.option('--time-budget', type=float, help='Seconds before giving up.')
+@click.option('--workers', type=int, help='Solver processes to run in parallel.')
+def generate_timetable_command(classes, time_budget, workers):
+    """Fill the timetable from the class requirements"""
+    conn = get_db_connection()
+    try:
+        result = generate_timetable(conn, list(classes) or None, time_budget, workers)
+    except TimetableGenerationError as e:
+        raise click.ClickException(str(e))
+    finally:
+        conn.close()
     
-    return send_file(
-        BytesIO(output.getvalue().encode('utf-8')),
-        mimetype='text/csv',
-        as_attachment=True,
-        download_name=f'grades_export_{datetime.now().strftime("%Y%m%d")}.csv'
-    )
+    print(f"Generated {result['lessons']} lessons for {result['classes']} classes in {result['seconds']}s")
+    for class_name, subject in result['unstaffed']:
+        print(f"Warning: no qualified teacher for {class_name} {subject}")
+
+@app.cli.command('provision-accounts')
+@click.argument('role', type=click.Choice(['student', 'teacher']))
+@click.option('--workers', type=int, help='Hashing processes to run in parallel.')
+def provision_accounts_command(role, workers):
+    """Create accounts for every student or teacher without one"""
+    status = provision_accounts(role, workers=workers)
+    if status['state'] == 'failed':
+        raise click.ClickException(status['message'])
+    
+    print(f"Created {status['created']} {role} accounts in {status['seconds']}s "
+          f"({status['accounts_per_second']} accounts/s); "
+          f"{status['skipped']} skipped, {status['failed']} failed")
+    for error in status['errors']:
+        print(f"  {error['username']}: {error['error']}")
+
+# (subject, periods per week, specialist room type) for synthetic schools
+SYNTHETIC_CURRICULUM = [
+    ('Mathematics', 7, None),
+    ('English', 6, None),
+    ('Science', 6, 'Lab'),
+    ('Kiswahili', 5, None),
+    ('History', 4, None),
+    ('Geography', 4, None),
+    ('Computer', 3, 'ICT Room'),
+    ('Religious Education', 3, None),
+    ('Physical Education', 2, None)
+]
+
+# (classes, teachers) in each benchmark school
+TIMETABLE_BENCHMARK_SIZES = [(10, 20), (30, 60), (60, 120), (100, 200)]
+
+def synthetic_school(class_count, teacher_count, seed=0):
+    """Generator inputs for a made-up school: requirements, qualifications, availability, fixed entries"""
+    rng = random.Random(seed)
+    days = app.config['TIMETABLE_SCHOOL_DAYS']
+    week = len(days) * len(TIMETABLE_PERIODS)
+    weekly_periods = sum(periods for subject, periods, room in SYNTHETIC_CURRICULUM)
+    
+    # Staff each subject in proportion to its share of the week, with some
+    # teachers also qualified for a second subject
+    qualified = {}
+    teacher_id = 1
+    for subject, periods, room in SYNTHETIC_CURRICULUM:
+        for _ in range(max(1, round(teacher_count * periods / weekly_periods))):
+            qualified.setdefault(subject.lower(), []).append(teacher_id)
+            if rng.random() < 0.3:
+                second = rng.choice(SYNTHETIC_CURRICULUM)[0].lower()
+                if teacher_id not in qualified.setdefault(second, []):
+                    qualified[second].append(teacher_id)
+            teacher_id += 1
+    
+    # Specialist rooms are kept about three quarters busy
+    room_counts = {}
+    for subject, periods, room in SYNTHETIC_CURRICULUM:
+        if room:
+            room_counts[room] = max(1, -(-class_count * periods // int(week * 0.75)))
+    
+    requirements = []
+    for index in range(class_count):
+        class_name = f'Form {index // 4 + 1}{"ABCD"[index % 4]}'
+        for subject, periods, room in SYNTHETIC_CURRICULUM:
+            requirements.append({
+                'class': class_name,
+                'subject': subject,
+                'periods_per_week': periods,
+                'teacher_id': None,
+                'room': f'{room} {index % room_counts[room] + 1}' if room else ''
+            })
+    
+    unavailable = []
+    for teacher in range(1, teacher_id):
+        if rng.random() < 0.1:
+            unavailable.append((teacher, rng.choice(days), None))
+        for _ in range(2):
+            unavailable.append((teacher, rng.choice(days), rng.choice(TIMETABLE_PERIODS)))
+    
+    return requirements, qualified, unavailable, []
+
+@app.cli.command('bench-timetable')
+@click.option('--time-budget', type=float, default=60.0, show_default=True, help='Seconds allowed per school.')
+@click.option('--workers', type=int, help='Solver processes to run in parallel.')
+def bench_timetable(time_budget, workers):
+    """Time the timetable generator on synthetic schools of increasing size"""
+    for class_count, teacher_count in TIMETABLE_BENCHMARK_SIZES:
+        started = time.perf_counter()
+        try:
+            problem = build_timetable_problem(*synthetic_school(class_count, teacher_count))
+            assignment = search_timetable(problem, time_budget, workers)
+        except TimetableGenerationError as e:
+            print(f"{class_count:4d} classes {teacher_count:4d} teachers: {e}")
+            continue
+        elapsed = time.perf_counter() - started
+        
+        status = 'no solution'
+        if assignment is not None:
+            booked = set()
+            clashes = 0
+            for (class_name, subject, teacher_id, room), slot in zip(problem['lessons'], assignment):
+                for key in (('class', class_name), ('teacher', teacher_id), ('room', room)):
+                    if key[1] in (None, ''):
+                        continue
+                    if (key, slot) in booked:
+                        clashes += 1
+                    booked.add((key, slot))
+            status = 'solved' if not clashes else f'{clashes} clashes'
+        print(f"{class_count:4d} classes {teacher_count:4d} teachers {len(problem['lessons']):6d} lessons "
+              f"{elapsed:8.2f} s  {status}")
+
+@app.cli.command('check-fee-ledger')
+@click.option('--repair', is_flag=True, help='Rebuild the ledger if it differs.')
+def check_fee_ledger(repair):
+    """Compare the fee ledger with fee_payments and optionally rebuild it"""
+    conn = get_db_connection()
+    try:
+        differences = diff_fee_ledger(conn)
+        for difference in differences[:20]:
+            student_id, fee_structure_id = difference['key']
+            ledger = difference['ledger']
+            expected = difference['expected']
+            print(f"student {student_id} structure {fee_structure_id}: "
+                  f"ledger paid {ledger['total_paid'] if ledger else '-'}, "
+                  f"payments total {expected['total_paid'] if expected else '-'}")
+        if len(differences) > 20:
+            print(f"... and {len(differences) - 20} more")
+        
+        if not differences:
+            print('Fee ledger is consistent.')
+        elif repair:
+            rebuild_fee_ledger(conn)
+            conn.commit()
+            bump_data_version('fees')
+            print(f'Rebuilt fee ledger ({len(differences)} rows differed).')
+        else:
+            raise click.ClickException(f'{len(differences)} ledger rows differ; run with --repair to rebuild')
+    finally:
+        conn.close()
 
 # -------- Run Application --------
 
@@ -6959,6 +10907,9 @@ if __name__ == '__main__':
     print("- Username: admin")
     print("- Password: school123")
     print("- Role: admin")
+    print("\nStorage Profile:")
+    for name, result in storage_profile.items():
+        print(f"- {name}: {result['actual']}" + ('' if result['ok'] else f" (expected {result['expected']})"))
     print("\nAccess the system at: http://localhost:5000")
     print("=" * 60)
     
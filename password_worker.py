@@ -0,0 +1,16 @@
+"""Password hashing run in provisioning processes.
+
+Kept apart from main.py so the fork server that starts these processes
+only imports this module, not the web application and its start-up work.
+"""
+import os
+
+from werkzeug.security import generate_password_hash
+
+def init_worker(niceness):
+    # Yield the CPU to web requests on the same machine
+    os.nice(niceness)
+
+def hash_passwords(password, count, method):
+    """Hash one password `count` times, each with its own salt"""
+    return [generate_password_hash(password, method=method) for _ in range(count)]
@@ -0,0 +1,96 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='module')
+def app_module(tmp_path_factory):
+    # main creates school.db and its cache folders in the working directory on import
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('school'))
+    try:
+        yield importlib.import_module('main')
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture
+def client(app_module):
+    client = app_module.app.test_client()
+    response = client.post('/login', data={'username': 'admin', 'password': 'school123', 'role': 'admin'})
+    assert response.status_code == 302
+    return client
+
+
+def add_class(main, name, size):
+    """Add a class of `size` students; returns their ids"""
+    conn = main.get_db_connection()
+    conn.executemany('INSERT INTO students (admission_number, name, class) VALUES (?, ?, ?)',
+                     [(f'{name}-{i}', f'Student {i}', name) for i in range(size)])
+    conn.commit()
+    ids = [row[0] for row in conn.execute('SELECT id FROM students WHERE class = ?', (name,))]
+    conn.close()
+    return ids
+
+
+def traced_statements(main, monkeypatch, request):
+    """Run `request` and return every SQL statement the pooled connections executed"""
+    statements = []
+    acquire = main.db_pool.acquire
+
+    def traced_acquire(*args, **kwargs):
+        conn = acquire(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(main.db_pool, 'acquire', traced_acquire)
+    try:
+        request()
+    finally:
+        monkeypatch.setattr(main.db_pool, 'acquire', acquire)
+        for conn in main.db_pool._idle:
+            conn.set_trace_callback(None)
+    return statements
+
+
+def save_register(client, class_name, student_ids):
+    form = {'date': '2026-03-02', 'class_filter': class_name}
+    for student_id in student_ids:
+        form[f'status_{student_id}'] = 'Present'
+    response = client.post('/attendance/save', data=form)
+    assert response.status_code == 302
+
+
+def test_attendance_page_query_count_does_not_grow_with_class_size(app_module, client, monkeypatch):
+    small = add_class(app_module, 'Small', 3)
+    large = add_class(app_module, 'Large', 60)
+    save_register(client, 'Small', small)
+    save_register(client, 'Large', large)
+    client.get('/attendance?class_filter=Small&date=2026-03-02')
+
+    def load(class_name):
+        response = client.get(f'/attendance?class_filter={class_name}&date=2026-03-02')
+        assert response.status_code == 200
+
+    small_count = len(traced_statements(app_module, monkeypatch, lambda: load('Small')))
+    large_count = len(traced_statements(app_module, monkeypatch, lambda: load('Large')))
+    assert large_count == small_count
+
+
+def test_saving_a_register_does_not_query_per_student(app_module, client, monkeypatch):
+    small = add_class(app_module, 'SaveSmall', 3)
+    large = add_class(app_module, 'SaveLarge', 60)
+    save_register(client, 'SaveSmall', small)
+
+    def queries(class_name, student_ids):
+        statements = traced_statements(app_module, monkeypatch,
+                                       lambda: save_register(client, class_name, student_ids))
+        # executemany traces the batched upsert once per row; everything
+        # else must be a fixed number of statements per request
+        return [sql for sql in statements if 'INSERT INTO attendance' not in sql]
+
+    assert len(queries('SaveLarge', large)) == len(queries('SaveSmall', small))
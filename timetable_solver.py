@@ -0,0 +1,82 @@
+"""Timetable search run in solver processes.
+
+Kept apart from main.py so the fork server that starts solver processes
+only imports this module, not the web application and its start-up work.
+"""
+import random
+import time
+from collections import deque
+
+_generator_stop = None  # set in worker processes so the first solution stops the others
+
+def init_worker(stop_event):
+    global _generator_stop
+    _generator_stop = stop_event
+
+def solve_timetable(problem, seed=0, deadline=None):
+    """Place every lesson in a clash-free slot; returns the slot index of each lesson, or None"""
+    rng = random.Random(seed)
+    lessons = problem['lessons']
+    domains = problem['domains']
+    slot_days = problem['slot_days']
+    
+    resources = []
+    for class_name, subject, teacher_id, room in lessons:
+        keys = [('class', class_name)]
+        if teacher_id is not None:
+            keys.append(('teacher', teacher_id))
+        if room:
+            keys.append(('room', room))
+        resources.append(keys)
+    
+    assignment = [None] * len(lessons)
+    busy = {}  # (resource, slot) -> lesson
+    same_day = {}  # (class, subject, day) -> lessons placed, to spread subjects over the week
+    evicted = [0] * len(lessons)
+    
+    # Most constrained lessons first; the random tie-break differs per worker
+    queue = deque(sorted(range(len(lessons)), key=lambda lesson: (len(domains[lesson]), rng.random())))
+    steps = 0
+    while queue:
+        steps += 1
+        if steps % 512 == 0:
+            if deadline is not None and time.monotonic() > deadline:
+                return None
+            if _generator_stop is not None and _generator_stop.is_set():
+                return None
+        
+        lesson = queue.popleft()
+        class_name, subject = lessons[lesson][0], lessons[lesson][1]
+        keys = resources[lesson]
+        best_cost = None
+        for slot in domains[lesson]:
+            conflicts = {busy[key, slot] for key in keys if (key, slot) in busy}
+            # Clashes cost far more than a repeated subject in a day, and lessons
+            # that keep getting bumped become expensive to bump again
+            cost = sum(10 + evicted[other] for other in conflicts) * 10
+            cost += same_day.get((class_name, subject, slot_days[slot]), 0) * 3 + rng.random()
+            if best_cost is None or cost < best_cost:
+                best_cost, best_slot, best_conflicts = cost, slot, conflicts
+        
+        for other in best_conflicts:
+            other_slot = assignment[other]
+            for key in resources[other]:
+                del busy[key, other_slot]
+            same_day[lessons[other][0], lessons[other][1], slot_days[other_slot]] -= 1
+            assignment[other] = None
+            evicted[other] += 1
+            queue.append(other)
+        
+        for key in keys:
+            busy[key, best_slot] = lesson
+        day_key = (class_name, subject, slot_days[best_slot])
+        same_day[day_key] = same_day.get(day_key, 0) + 1
+        assignment[lesson] = best_slot
+    
+    return assignment
+
+def solve_and_signal(problem, seed, deadline):
+    assignment = solve_timetable(problem, seed, deadline)
+    if assignment is not None and _generator_stop is not None:
+        _generator_stop.set()
+    return assignment